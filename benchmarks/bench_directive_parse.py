@@ -0,0 +1,61 @@
+"""
+Benchmark: directive scanning on large generated cells.
+
+Times ``scan_directives`` on cells of increasing length, each mixing string
+literals, inline directives and directives placed after code (the cases that
+exercise string-containment and topmatter checks). Per-line cost should stay
+flat as cells grow.
+
+Usage:
+    python benchmarks/bench_directive_parse.py
+    python benchmarks/bench_directive_parse.py --lines 1000 3000 10000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from nblite.core.directive import scan_directives
+
+
+def make_cell(n_lines: int) -> str:
+    """Build a cell of ``n_lines`` lines with strings and scattered directives."""
+    lines = ["#|export"]
+    for i in range(n_lines - 1):
+        if i % 10 == 0:
+            lines.append(f'msg_{i} = "#|not_a_directive {i}"')
+        elif i % 10 == 5:
+            lines.append(f"value_{i} = {i}  #|func_return_line")
+        elif i % 50 == 7:
+            lines.append("#|hide")
+        else:
+            lines.append(f"from package.module_{i} import name_{i}")
+    return "\n".join(lines)
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs of ``func`` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 3000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'total ms':>10} {'us/line':>9}")
+    for n_lines in args.lines:
+        source = make_cell(n_lines)
+        elapsed = best_of(lambda source=source: scan_directives(source), args.repeat)
+        print(f"{n_lines:>8} {elapsed * 1000:>10.2f} {elapsed * 1e6 / n_lines:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
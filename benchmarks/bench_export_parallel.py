@@ -0,0 +1,99 @@
+"""
+Benchmark: parallel export over a multi-location pipeline.
+
+Builds a project shaped like ``08_multi_pipeline`` (nbs -> pts -> lib) with
+many notebooks and runs a cold full export at several worker counts,
+reporting wall time and speedup over a single worker.
+
+Usage:
+    python benchmarks/bench_export_parallel.py
+    python benchmarks/bench_export_parallel.py --notebooks 600 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from nblite.core.project import NbliteProject
+
+CONFIG = """
+export_pipeline = '''
+nbs -> pts
+pts -> lib
+'''
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.pts]
+path = "pts"
+format = "percent"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+
+[export]
+include_autogenerated_warning = true
+"""
+
+
+def make_project(root: Path, n_notebooks: int, n_cells: int) -> None:
+    """Write a project with n_notebooks notebooks of n_cells exported cells."""
+    (root / "nblite.toml").write_text(CONFIG)
+    for i in range(n_notebooks):
+        folder = root / "nbs" / f"pkg{i % 10}"
+        folder.mkdir(parents=True, exist_ok=True)
+        cells = [f"#|default_exp pkg{i % 10}.mod{i}"] + [
+            f"#|export\ndef func_{i}_{j}(x):\n    '''Docstring {j}.'''\n    return x + {j}"
+            for j in range(n_cells)
+        ]
+        nb = {
+            "cells": [
+                {"cell_type": "code", "source": src, "metadata": {}, "outputs": []} for src in cells
+            ],
+            "metadata": {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        (folder / f"mod{i}.ipynb").write_text(json.dumps(nb))
+
+
+def run(n_workers: int, n_notebooks: int, n_cells: int) -> float:
+    """Export a fresh project; return seconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root, n_notebooks, n_cells)
+        project = NbliteProject.from_path(root)
+        start = time.perf_counter()
+        result = project.export(n_workers=n_workers)
+        elapsed = time.perf_counter() - start
+        if not result.success:
+            raise RuntimeError(result.errors)
+        return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notebooks", type=int, default=600, help="Number of notebooks")
+    parser.add_argument("--cells", type=int, default=10, help="Exported cells per notebook")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.notebooks} notebooks x {args.cells} cells, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for n_workers in args.workers:
+        elapsed = run(n_workers, args.notebooks, args.cells)
+        baseline = baseline or elapsed
+        print(f"{n_workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
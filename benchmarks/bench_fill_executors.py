@@ -0,0 +1,82 @@
+"""
+Benchmark: fill executor backends.
+
+Fills a directory of small notebooks with each executor backend ("thread",
+"process", "async") at several worker counts and reports wall time and
+throughput. Each notebook does a little computation and produces a moderately
+sized output, so the per-notebook Python work (nbformat, cleaning, hashing)
+is visible next to kernel execution time.
+
+Usage:
+    python benchmarks/bench_fill_executors.py
+    python benchmarks/bench_fill_executors.py --notebooks 64 --workers 4 8 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from nblite.fill import fill_notebooks
+
+EXECUTORS = ("thread", "process", "async")
+
+
+def make_notebook(path: Path, index: int, n_cells: int) -> None:
+    """Write a small notebook with n_cells code cells."""
+    cells = [
+        {
+            "cell_type": "code",
+            "execution_count": None,
+            "id": f"cell-{i}",
+            "metadata": {},
+            "outputs": [],
+            "source": f"data = [x * {index} for x in range(2000)]\nprint(sum(data))\ndata[:200]",
+        }
+        for i in range(n_cells)
+    ]
+    nb = {"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+    path.write_text(json.dumps(nb))
+
+
+def run(executor: str, n_workers: int, n_notebooks: int, n_cells: int) -> tuple[float, int]:
+    """Fill a fresh set of notebooks; return (seconds, number of failures)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(n_notebooks):
+            path = Path(tmp) / f"nb_{i:03d}.ipynb"
+            make_notebook(path, i, n_cells)
+            paths.append(path)
+
+        start = time.perf_counter()
+        results = fill_notebooks(
+            paths, n_workers=n_workers, skip_unchanged=False, executor=executor
+        )
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(1 for r in results if r.status != "success")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notebooks", type=int, default=32, help="Notebooks per run")
+    parser.add_argument("--cells", type=int, default=5, help="Code cells per notebook")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--executors", nargs="+", default=list(EXECUTORS), choices=EXECUTORS)
+    args = parser.parse_args()
+
+    print(f"{args.notebooks} notebooks x {args.cells} cells")
+    print(f"{'executor':>10} {'workers':>8} {'seconds':>9} {'nb/s':>7} {'failed':>7}")
+    for n_workers in args.workers:
+        for executor in args.executors:
+            elapsed, failed = run(executor, n_workers, args.notebooks, args.cells)
+            print(
+                f"{executor:>10} {n_workers:>8} {elapsed:>9.2f} "
+                f"{args.notebooks / elapsed:>7.1f} {failed:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
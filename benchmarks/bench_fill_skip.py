@@ -0,0 +1,101 @@
+"""
+Benchmark: deciding which notebooks `nbl fill` must run.
+
+Writes a directory of filled notebooks (outputs and hash in metadata) and
+times the skip/run decision three ways: parsing every notebook and hashing it,
+hashing the raw JSON, and asking a warm FillStateCache (one stat() per file).
+
+Usage:
+    python benchmarks/bench_fill_skip.py
+    python benchmarks/bench_fill_skip.py --notebooks 1000 --cells 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from nblite.core.notebook import Notebook
+from nblite.fill.cache import FillStateCache
+from nblite.fill.hash import (
+    HASH_METADATA_KEY,
+    get_notebook_hash_from_dict,
+    has_notebook_changed,
+    read_notebook_hashes,
+)
+
+
+def make_filled_notebook(path: Path, index: int, n_cells: int) -> None:
+    """Write a notebook that looks like the output of a previous fill."""
+    cells = [
+        {
+            "cell_type": "code",
+            "execution_count": i + 1,
+            "id": f"cell-{i}",
+            "metadata": {},
+            "outputs": [
+                {
+                    "name": "stdout",
+                    "output_type": "stream",
+                    "text": [f"{index * i + j}\n" for j in range(50)],
+                }
+            ],
+            "source": f"for j in range(50):\n    print({index} * {i} + j)",
+        }
+        for i in range(n_cells)
+    ]
+    nb = {"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+    nb["metadata"][HASH_METADATA_KEY] = get_notebook_hash_from_dict(nb)
+    path.write_text(json.dumps(nb, indent=1))
+    # Outside the fill state's racy-mtime window
+    past = time.time_ns() - 10 * 10**9
+    os.utime(path, ns=(past, past))
+
+
+def timed(label: str, decide, paths: list[Path]) -> None:
+    start = time.perf_counter()
+    to_fill = [p for p in paths if decide(p)]
+    elapsed = time.perf_counter() - start
+    print(f"{label:>12} {elapsed * 1000:>10.1f} ms {len(to_fill):>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notebooks", type=int, default=1000, help="Number of notebooks")
+    parser.add_argument("--cells", type=int, default=10, help="Code cells per notebook")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = []
+        for i in range(args.notebooks):
+            path = root / f"nb_{i:04d}.ipynb"
+            make_filled_notebook(path, i, args.cells)
+            paths.append(path)
+
+        cache_dir = root / ".nblite" / "cache"
+        cold = FillStateCache(root, cache_dir)
+        for path in paths:
+            cold.has_changed(path)
+        cold.save()
+
+        print(f"{args.notebooks} notebooks x {args.cells} cells")
+        print(f"{'method':>12} {'time':>13} {'to fill':>8}")
+        timed("parse", lambda p: has_notebook_changed(Notebook.from_file(p)), paths)
+
+        def raw(path: Path) -> bool:
+            current_hash, stored_hash = read_notebook_hashes(path)
+            return current_hash != stored_hash
+
+        timed("raw json", raw, paths)
+        warm = FillStateCache(root, cache_dir)
+        timed("fill state", warm.has_changed, paths)
+        print(f"fill state hashed {warm.hash_count} notebooks")
+
+
+if __name__ == "__main__":
+    main()
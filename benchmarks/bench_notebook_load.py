@@ -0,0 +1,106 @@
+"""
+Benchmark: loading ipynb files with Notebook.from_file.
+
+Compares the direct JSON loader used by ``Notebook.from_file`` for ipynb files
+against the previous notebookx round trip (parse -> serialize -> parse), and
+reports parse time per MB of notebook JSON. The ``outputs=False`` column is the
+export-only load mode that skips cell outputs without decoding them.
+
+Usage:
+    python benchmarks/bench_notebook_load.py
+    python benchmarks/bench_notebook_load.py --sizes 0.1 1 8 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import notebookx
+
+from nblite.core.notebook import Notebook
+
+
+def make_notebook(size_mb: float) -> dict:
+    """Build a notebook dict of roughly ``size_mb`` megabytes."""
+    cells = []
+    payload = "A" * 64_000  # stand-in for a base64 image output
+    target = int(size_mb * 1024 * 1024)
+    total = 0
+    i = 0
+    while total < target:
+        source = f"#|export\ndef func_{i}(x):\n    return x + {i}\n"
+        cells.append(
+            {
+                "cell_type": "code",
+                "execution_count": None,
+                "id": f"cell-{i}",
+                "metadata": {},
+                "outputs": [
+                    {
+                        "output_type": "display_data",
+                        "data": {"image/png": payload, "text/plain": [f"<Figure {i}>"]},
+                        "metadata": {},
+                    }
+                ],
+                "source": source.splitlines(keepends=True),
+            }
+        )
+        total += len(payload) + len(source)
+        i += 1
+    return {"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5}
+
+
+def load_round_trip(path: Path) -> Notebook:
+    """The previous loader: notebookx parse -> ipynb string -> json.loads."""
+    nbx_nb = notebookx.Notebook.from_file(str(path), notebookx.Format.Ipynb)
+    return Notebook.from_notebookx(nbx_nb, source_path=path)
+
+
+def load_without_outputs(path: Path) -> Notebook:
+    """The export-only loader that skips cell outputs."""
+    return Notebook.from_file(path, outputs=False)
+
+
+def best_of(func, path: Path, repeat: int) -> float:
+    """Return the best wall time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1.0, 8.0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'size (MB)':>10} {'direct ms/MB':>14} {'round trip ms/MB':>18} "
+        f"{'speedup':>8} {'outputs=False ms/MB':>21}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes:
+            path = Path(tmp) / f"bench_{size_mb}.ipynb"
+            path.write_text(json.dumps(make_notebook(size_mb), indent=1))
+            actual_mb = path.stat().st_size / (1024 * 1024)
+
+            direct = best_of(Notebook.from_file, path, args.repeat)
+            round_trip = best_of(load_round_trip, path, args.repeat)
+            no_outputs = best_of(load_without_outputs, path, args.repeat)
+
+            print(
+                f"{actual_mb:>10.2f} {direct * 1000 / actual_mb:>14.2f} "
+                f"{round_trip * 1000 / actual_mb:>18.2f} {round_trip / direct:>7.1f}x "
+                f"{no_outputs * 1000 / actual_mb:>21.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: serial, thread and process loading in CodeLocation.get_notebooks.
+
+Generates a synthetic project (see ``synthetic.py``) and loads every notebook
+of its source location with ``get_notebooks(n_workers=..., executor=...)``,
+without a notebook cache so that every run parses every file. Reports the best
+wall time of each mode and its speedup over a serial load.
+
+ipynb notebooks are parsed with ``json.loads``, which holds the GIL; percent
+notebooks are parsed by notebookx. Compare the two layouts to see which parser
+overlaps on threads.
+
+Usage:
+    python benchmarks/bench_parallel_load.py
+    python benchmarks/bench_parallel_load.py --notebooks 2000 --layout percent --workers 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import ProjectSpec, generate_project  # noqa: E402
+
+from nblite.core.code_location import CodeLocation  # noqa: E402
+from nblite.core.project import NbliteProject  # noqa: E402
+
+
+def run(cl: CodeLocation, n_workers: int, executor: str, repeat: int) -> float:
+    """Load every notebook of cl; return the best of repeat runs in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cl.get_notebooks(n_workers=n_workers, executor=executor)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notebooks", type=int, default=2000, help="Number of notebooks")
+    parser.add_argument("--cells", type=int, default=20, help="Cells per notebook")
+    parser.add_argument("--output-size", type=int, default=1000, help="Output bytes per cell")
+    parser.add_argument("--layout", choices=["ipynb", "percent"], default="ipynb")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (best is kept)")
+    args = parser.parse_args()
+
+    spec = ProjectSpec(
+        n_notebooks=args.notebooks,
+        n_cells=args.cells,
+        output_size=args.output_size,
+        layout=args.layout,
+    )
+    with tempfile.TemporaryDirectory(prefix="nblite-bench-") as tmp:
+        root = generate_project(Path(tmp), spec)
+        project = NbliteProject.from_path(root)
+        source = project.get_code_location(project.config.export_pipeline[0].from_key)
+        cl = CodeLocation(key=source.key, path=source.path, format=source.format)
+
+        print(
+            f"{args.layout} layout, {args.notebooks} notebooks x {args.cells} cells, "
+            f"{os.cpu_count()} CPUs"
+        )
+        print(f"{'mode':>10} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+        baseline = run(cl, 1, "thread", args.repeat)
+        print(f"{'serial':>10} {1:>8} {baseline:>9.2f} {1:>8.2f}")
+        for executor in ("thread", "process"):
+            for n_workers in args.workers:
+                elapsed = run(cl, n_workers, executor, args.repeat)
+                print(f"{executor:>10} {n_workers:>8} {elapsed:>9.2f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
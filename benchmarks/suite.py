@@ -0,0 +1,367 @@
+"""
+Benchmark suite: core operations on a synthetic project.
+
+Generates a project with ``synthetic.generate_project`` and times the
+operations that dominate everyday commands: loading notebooks, parsing
+directives, export (cold and incremental), clean, fill change detection,
+docs preparation and staging validation. Results are written as JSON, and
+a previous result file can be passed to ``--compare`` to print the change
+in median time per benchmark.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --notebooks 500 --cells 30 --output-size 2000 --layout module
+    python benchmarks/suite.py --only export clean --repeat 10 --output after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import LAYOUTS, ProjectSpec, generate_project  # noqa: E402
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class Benchmark:
+    """
+    One timed operation.
+
+    Attributes:
+        name: Benchmark name (key in the results)
+        description: One-line description
+        run: Timed callable; receives the value returned by setup
+        setup: Untimed preparation; receives the project root
+        fresh: Whether each repeat needs an untouched copy of the project
+            (for operations that modify it)
+        requires: Executable that must be on PATH, if any
+    """
+
+    name: str
+    description: str
+    run: Callable[[Any], object]
+    setup: Callable[[Path], Any] = lambda root: root
+    fresh: bool = False
+    requires: str | None = None
+
+
+def _project(root: Path) -> Any:
+    from nblite.core.project import NbliteProject
+
+    return NbliteProject.from_path(root)
+
+
+def _source_files(root: Path) -> list[Path]:
+    project = _project(root)
+    source_key = project.config.export_pipeline[0].from_key
+    return project.get_code_location(source_key).get_files()
+
+
+def _setup_sources(root: Path) -> list[str]:
+    from nblite.core.notebook import Notebook
+
+    return [
+        cell.source
+        for path in _source_files(root)
+        for cell in Notebook.from_file(path).cells
+        if cell.is_code
+    ]
+
+
+def _run_load(paths: list[Path]) -> None:
+    from nblite.core.notebook import Notebook
+
+    for path in paths:
+        Notebook.from_file(path)
+
+
+def _run_parse(sources: list[str]) -> None:
+    from nblite.core.directive import parse_directives_from_source
+
+    for source in sources:
+        parse_directives_from_source(source)
+
+
+def _setup_exported(root: Path) -> Path:
+    _project(root).export()
+    return root
+
+
+def _setup_hashed(root: Path) -> list[Any]:
+    from nblite.core.notebook import Notebook
+    from nblite.fill.hash import HASH_METADATA_KEY, get_notebook_hash
+
+    notebooks = [Notebook.from_file(path) for path in _source_files(root)]
+    for nb in notebooks:
+        nb.metadata[HASH_METADATA_KEY] = get_notebook_hash(nb)
+    return notebooks
+
+
+def _run_has_changed(notebooks: list[Any]) -> None:
+    from nblite.fill.hash import has_notebook_changed
+
+    for nb in notebooks:
+        if has_notebook_changed(nb):
+            raise RuntimeError("Unchanged notebook reported as changed")
+
+
+def _run_docs_prepare(root: Path) -> None:
+    from nblite.docs.generator import get_generator
+
+    output_dir = root / "_docs"
+    shutil.rmtree(output_dir, ignore_errors=True)
+    get_generator("mkdocs").prepare(_project(root), output_dir)
+
+
+def _setup_staged(root: Path) -> Path:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+    if not (root / ".git").exists():
+        git("init", "-q")
+    git("add", "-A")
+    return root
+
+
+def _run_validate(root: Path) -> None:
+    from nblite.git.staging import validate_staging
+
+    validate_staging(_project(root))
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark(
+        "notebook_load",
+        "Notebook.from_file on every source notebook",
+        _run_load,
+        setup=_source_files,
+    ),
+    Benchmark(
+        "parse_directives",
+        "parse_directives_from_source on every code cell",
+        _run_parse,
+        setup=_setup_sources,
+    ),
+    Benchmark(
+        "export",
+        "Full export of a never-exported project",
+        lambda root: _project(root).export(),
+        fresh=True,
+    ),
+    Benchmark(
+        "export_incremental",
+        "Incremental export with nothing changed (new project object)",
+        lambda root: _project(root).export(incremental=True),
+        setup=_setup_exported,
+    ),
+    Benchmark(
+        "clean",
+        "Clean every notebook (removes outputs)",
+        lambda root: _project(root).clean(remove_outputs=True),
+        fresh=True,
+    ),
+    Benchmark(
+        "has_notebook_changed",
+        "Fill change detection on loaded notebooks",
+        _run_has_changed,
+        setup=_setup_hashed,
+    ),
+    Benchmark(
+        "docs_prepare",
+        "MkDocs source preparation",
+        _run_docs_prepare,
+    ),
+    Benchmark(
+        "validate_staging",
+        "Staging validation with every file staged",
+        _run_validate,
+        setup=_setup_staged,
+        requires="git",
+    ),
+]
+
+
+def run_benchmark(benchmark: Benchmark, template: Path, workdir: Path, repeat: int) -> list[float]:
+    """
+    Time a benchmark.
+
+    Args:
+        benchmark: Benchmark to run
+        template: Generated project; copied, never modified
+        workdir: Scratch directory for the copies
+        repeat: Number of timed runs
+
+    Returns:
+        Seconds for each run
+    """
+    times: list[float] = []
+    root = workdir / benchmark.name
+    for i in range(repeat):
+        if i == 0 or benchmark.fresh:
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.copytree(template, root, symlinks=True)
+            state = benchmark.setup(root)
+        start = time.perf_counter()
+        benchmark.run(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_commit() -> str | None:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def run_suite(
+    spec: ProjectSpec,
+    repeat: int = 5,
+    only: list[str] | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run the suite on a project generated from spec.
+
+    Args:
+        spec: Shape of the synthetic project
+        repeat: Timed runs per benchmark
+        only: Names of the benchmarks to run (all if None)
+        progress: Called with each benchmark's name before it runs
+
+    Returns:
+        JSON-serializable results
+    """
+    from nblite import __version__
+
+    selected = [b for b in BENCHMARKS if only is None or b.name in only]
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="nblite-bench-") as tmp:
+        template = generate_project(Path(tmp) / "template", spec)
+        for benchmark in selected:
+            if progress is not None:
+                progress(benchmark.name)
+            if benchmark.requires and shutil.which(benchmark.requires) is None:
+                results[benchmark.name] = {"skipped": f"{benchmark.requires} not found"}
+                continue
+            times = run_benchmark(benchmark, template, Path(tmp), repeat)
+            results[benchmark.name] = {
+                "description": benchmark.description,
+                "times": times,
+                "min": min(times),
+                "median": statistics.median(times),
+                "mean": statistics.fmean(times),
+                "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            }
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "nblite_version": __version__,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "spec": spec.to_dict(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def format_results(data: dict[str, Any], baseline: dict[str, Any] | None = None) -> str:
+    """Render results (and the change from a baseline) as a table."""
+    n_notebooks = data["spec"]["n_notebooks"]
+    header = f"{'benchmark':<22} {'median ms':>10} {'min ms':>9} {'ms/notebook':>12}"
+    if baseline is not None:
+        header += f" {'baseline ms':>12} {'change':>8}"
+    lines = [header]
+    for name, result in data["results"].items():
+        if "skipped" in result:
+            lines.append(f"{name:<22} skipped ({result['skipped']})")
+            continue
+        line = (
+            f"{name:<22} {result['median'] * 1000:>10.1f} {result['min'] * 1000:>9.1f} "
+            f"{result['median'] * 1000 / n_notebooks:>12.3f}"
+        )
+        base = (baseline or {}).get("results", {}).get(name, {})
+        if "median" in base:
+            change = result["median"] / base["median"] - 1
+            line += f" {base['median'] * 1000:>12.1f} {change:>+8.0%}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notebooks", type=int, default=200, help="Number of notebooks")
+    parser.add_argument("--cells", type=int, default=20, help="Cells per notebook")
+    parser.add_argument(
+        "--directive-density",
+        type=float,
+        default=0.5,
+        help="Fraction of code cells with directives",
+    )
+    parser.add_argument("--output-size", type=int, default=1000, help="Output bytes per code cell")
+    parser.add_argument("--layout", choices=list(LAYOUTS), default="ipynb")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument(
+        "--only", nargs="+", choices=[b.name for b in BENCHMARKS], help="Benchmarks to run"
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Results JSON of an earlier run")
+    args = parser.parse_args()
+
+    spec = ProjectSpec(
+        n_notebooks=args.notebooks,
+        n_cells=args.cells,
+        directive_density=args.directive_density,
+        output_size=args.output_size,
+        layout=args.layout,
+    )
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    if baseline is not None and baseline["spec"] != spec.to_dict():
+        print("Warning: baseline was run on a different project spec", file=sys.stderr)
+
+    print(
+        f"{spec.layout} layout, {spec.n_notebooks} notebooks x {spec.n_cells} cells, "
+        f"{os.cpu_count()} CPUs",
+        file=sys.stderr,
+    )
+    data = run_suite(
+        spec,
+        repeat=args.repeat,
+        only=args.only,
+        progress=lambda name: print(f"  running {name}...", file=sys.stderr),
+    )
+    print(format_results(data, baseline))
+    if args.output:
+        args.output.write_text(json.dumps(data, indent=2) + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Synthetic nblite projects for benchmarks.
+
+``generate_project`` writes a project of ``n_notebooks`` notebooks with
+``n_cells`` cells each. A ``directive_density`` fraction of the code cells
+carry directives (mostly ``#|export``), and every code cell of an ipynb
+notebook gets a stream output of ``output_size`` bytes.
+
+Layouts, named after the code location formats they put on disk:
+
+- ``ipynb``: ipynb notebooks in ``nbs/``, exported with ``nbs -> lib``.
+- ``percent``: percent notebooks in ``pts/``, exported with ``pts -> lib``.
+- ``module``: ipynb notebooks together with their percent twins and the
+  exported modules, as in a checked-out repository (``nbs -> pts -> lib``).
+
+Usage:
+    python benchmarks/synthetic.py /tmp/bench-project --notebooks 500 --layout module
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import asdict, dataclass
+from itertools import pairwise
+from pathlib import Path
+
+__all__ = ["LAYOUTS", "ProjectSpec", "generate_project"]
+
+LAYOUTS: dict[str, str] = {
+    "ipynb": "nbs -> lib",
+    "percent": "pts -> lib",
+    "module": "nbs -> pts -> lib",
+}
+
+_LOCATIONS = {
+    "nbs": ("nbs", "ipynb"),
+    "pts": ("pts", "percent"),
+    "lib": ("synthpkg", "module"),
+}
+
+# Directives placed on directive-carrying cells other than #|export
+_OTHER_DIRECTIVES = ("#|exporti", "#|hide", "#|eval: false")
+
+
+@dataclass
+class ProjectSpec:
+    """
+    Shape of a synthetic project.
+
+    Attributes:
+        n_notebooks: Number of notebooks
+        n_cells: Cells per notebook (including the #|default_exp cell)
+        directive_density: Fraction of code cells that carry a directive
+        output_size: Bytes of stream output per code cell (ipynb notebooks only)
+        layout: One of LAYOUTS
+        markdown_ratio: Fraction of cells that are markdown
+        seed: Random seed, so that a spec always generates the same project
+    """
+
+    n_notebooks: int = 200
+    n_cells: int = 20
+    directive_density: float = 0.5
+    output_size: int = 0
+    layout: str = "ipynb"
+    markdown_ratio: float = 0.2
+    seed: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def _config(layout: str) -> str:
+    keys = LAYOUTS[layout].split(" -> ")
+    lines = [f'docs_cl = "{keys[0]}"', "export_pipeline = '''"]
+    lines += [f"{a} -> {b}" for a, b in pairwise(keys)]
+    lines.append("'''")
+    for key in keys:
+        path, fmt = _LOCATIONS[key]
+        lines += ["", f"[cl.{key}]", f'path = "{path}"', f'format = "{fmt}"']
+    return "\n".join(lines) + "\n"
+
+
+def _cells(spec: ProjectSpec, rng: random.Random, index: int, module: str) -> list[dict]:
+    """Build the cells of one notebook as nbformat dicts."""
+    cells: list[dict] = [_code_cell(f"#|default_exp {module}", spec, with_output=False)]
+    for j in range(1, spec.n_cells):
+        if rng.random() < spec.markdown_ratio:
+            cells.append(
+                {
+                    "cell_type": "markdown",
+                    "metadata": {},
+                    "source": f"## Section {j}\n\nNotes on `func_{index}_{j}` and its use.",
+                }
+            )
+            continue
+        body = f"def func_{index}_{j}(x, y=1):\n    '''Add {j}.'''\n    total = x + y\n    return total + {j}"
+        if rng.random() < spec.directive_density:
+            directive = "#|export" if rng.random() < 0.75 else rng.choice(_OTHER_DIRECTIVES)
+            body = f"{directive}\n{body}"
+        else:
+            body = f"value_{j} = func_{index}_1({j}) if {j} > 1 else {j}\nvalue_{j}"
+        cells.append(_code_cell(body, spec, with_output=True))
+    return cells
+
+
+def _code_cell(source: str, spec: ProjectSpec, with_output: bool) -> dict:
+    outputs = []
+    if with_output and spec.output_size > 0:
+        line = "x" * 79 + "\n"
+        text = (line * (spec.output_size // len(line) + 1))[: spec.output_size]
+        outputs.append({"name": "stdout", "output_type": "stream", "text": text})
+    return {
+        "cell_type": "code",
+        "execution_count": 1 if outputs else None,
+        "metadata": {},
+        "outputs": outputs,
+        "source": source,
+    }
+
+
+def generate_project(root: Path, spec: ProjectSpec) -> Path:
+    """
+    Write a synthetic project.
+
+    Args:
+        root: Directory to create the project in (created if missing)
+        spec: Shape of the project
+
+    Returns:
+        The project root
+    """
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {spec.layout!r}; use one of {', '.join(LAYOUTS)}")
+
+    rng = random.Random(spec.seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "nblite.toml").write_text(_config(spec.layout))
+    source_key = LAYOUTS[spec.layout].split(" -> ")[0]
+    source_dir = root / _LOCATIONS[source_key][0]
+
+    for i in range(spec.n_notebooks):
+        package = f"sub{i % 10}"
+        module = f"{package}.mod{i}"
+        nb = {
+            "cells": _cells(spec, rng, i, module),
+            "metadata": {
+                "kernelspec": {"display_name": "Python 3", "language": "python", "name": "python3"}
+            },
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+        folder = source_dir / package
+        folder.mkdir(parents=True, exist_ok=True)
+        if source_key == "nbs":
+            (folder / f"mod{i}.ipynb").write_text(json.dumps(nb, indent=1))
+        else:
+            from nblite.core.notebook import Format, Notebook
+
+            Notebook.from_dict(nb).to_file(folder / f"mod{i}.pct.py", format=Format.PERCENT.value)
+
+    if spec.layout == "module":
+        from nblite.core.project import NbliteProject
+
+        # Twins and modules are committed alongside the notebooks
+        result = NbliteProject.from_path(root).export()
+        if not result.success:
+            raise RuntimeError(f"Export of the generated project failed: {result.errors}")
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root", type=Path, help="Directory to create the project in")
+    parser.add_argument("--notebooks", type=int, default=200)
+    parser.add_argument("--cells", type=int, default=20)
+    parser.add_argument("--directive-density", type=float, default=0.5)
+    parser.add_argument("--output-size", type=int, default=0, help="Bytes of output per cell")
+    parser.add_argument("--layout", choices=list(LAYOUTS), default="ipynb")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    spec = ProjectSpec(
+        n_notebooks=args.notebooks,
+        n_cells=args.cells,
+        directive_density=args.directive_density,
+        output_size=args.output_size,
+        layout=args.layout,
+        seed=args.seed,
+    )
+    generate_project(args.root, spec)
+    print(f"Wrote {spec.layout} project with {spec.n_notebooks} notebooks to {args.root}")
+
+
+if __name__ == "__main__":
+    main()
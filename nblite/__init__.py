@@ -10,25 +10,87 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from nblite.core.project import NbliteProject
+    from nblite.docs import show_doc
     from nblite.export.pipeline import ExportResult
 
-try:
-    from importlib.metadata import version
-
-    __version__ = version("nblite")
-except Exception:
-    __version__ = "0.0.0.dev"  # Fallback for development without installation
+    __version__: str
 
 # Environment variable to disable nbl_export
 DISABLE_NBLITE_EXPORT_ENV_VAR = "NBLITE_DISABLE_EXPORT"
 
+# Projects loaded by nbl_export, by root path, with the (size, mtime) of
+# their nblite.toml. Kept for the lifetime of the process (the kernel).
+_PROJECT_CACHE: dict[Path, tuple[tuple[int, int], NbliteProject]] = {}
+
+
+def _cached_project(root_path: Path) -> tuple[NbliteProject, bool]:
+    """
+    Get the project at root_path, loading it only if its config changed.
+
+    Extension hooks register globally, so those of a project loaded earlier
+    are unregistered when its config changed and it is loaded again.
+
+    Returns:
+        Tuple of (project, whether it was reused from an earlier call)
+    """
+    from nblite.core.project import NbliteProject
+
+    root_path = root_path.resolve()
+    stat = (root_path / "nblite.toml").stat()
+    config_stat = (stat.st_size, stat.st_mtime_ns)
+
+    cached = _PROJECT_CACHE.get(root_path)
+    if cached is not None and cached[0] == config_stat:
+        project = cached[1]
+        # Another process may have exported since the last call
+        project.invalidate_export_manifest()
+        return project, True
+
+    if cached is not None:
+        cached[1].unload_extensions()
+    project = NbliteProject.from_path(root_path)
+    _PROJECT_CACHE[root_path] = (config_stat, project)
+    return project, False
+
+
+def _calling_notebook() -> Path:
+    """
+    Get the path of the notebook whose kernel is running.
+
+    Uses the variable VS Code sets in the kernel, or the JPY_SESSION_NAME
+    environment variable set by Jupyter Server 2.
+
+    Raises:
+        RuntimeError: If the notebook path is not known
+    """
+    import sys
+
+    candidates: list[str] = []
+    ipython = sys.modules.get("IPython")
+    shell = ipython.get_ipython() if ipython is not None else None  # type: ignore[attr-defined]
+    if shell is not None and shell.user_ns.get("__vsc_ipynb_file__"):
+        candidates.append(shell.user_ns["__vsc_ipynb_file__"])
+    if os.environ.get("JPY_SESSION_NAME"):
+        candidates.append(os.environ["JPY_SESSION_NAME"])
+    for candidate in candidates:
+        if Path(candidate).is_file():
+            return Path(candidate)
+    raise RuntimeError(
+        "Could not determine the path of the running notebook. "
+        "Pass it as nbl_export(notebook='path/to/notebook.ipynb')."
+    )
+
 
 def nbl_export(
     root_path: str | Path | None = None,
     pipeline: str | None = None,
+    via_server: bool | None = None,
+    notebook: str | Path | bool | None = None,
+    incremental: bool | None = None,
 ) -> ExportResult | None:
     """
     Export notebooks in an nblite project.
@@ -41,20 +103,42 @@ def nbl_export(
     If root_path is not provided, nblite will search for a nblite.toml file
     in the current directory and all parent directories.
 
+    The project is loaded once per process and kept until its nblite.toml
+    changes. The first call exports as configured; later calls reusing the
+    loaded project export incrementally, so re-running the cell only
+    rewrites the outputs of notebooks changed since the last export.
+
     Args:
         root_path: Path to the root folder of the nblite project.
                    If None, searches upward for nblite.toml.
         pipeline: Custom export pipeline string (e.g., 'nbs -> lib').
                   If None, uses the pipeline from config.
+        via_server: Forward the export to the project's resident server
+                    (started on demand), which keeps the project loaded
+                    between calls. If None, set from the NBLITE_VIA_SERVER
+                    environment variable.
+        notebook: Only export this notebook's lineage: its twins along the
+                  pipeline and the modules it exports to. True exports the
+                  lineage of the running notebook. If None, exports all
+                  notebooks.
+        incremental: Skip outputs whose notebooks are unchanged since they
+                     were last exported. If None, True when the project is
+                     reused from an earlier call, and the config value
+                     (export.incremental) otherwise.
 
     Returns:
         ExportResult with success status and file lists, or None if export
         is disabled via environment variable.
 
+    Raises:
+        RuntimeError: If notebook is True and the running notebook's path is
+            not known
+
     Example:
         >>> from nblite import nbl_export
         >>> nbl_export()  # Export using auto-detected project root
         >>> nbl_export(pipeline="nbs -> lib")  # Custom pipeline
+        >>> nbl_export(notebook=True)  # Only this notebook's lineage
     """
     # Check if export is disabled via environment variable
     disable_export = os.environ.get(DISABLE_NBLITE_EXPORT_ENV_VAR, "").lower()
@@ -62,7 +146,6 @@ def nbl_export(
         return None
 
     from nblite.config import find_config_file
-    from nblite.core.project import NbliteProject
 
     # Find project root
     if root_path is None:
@@ -76,13 +159,52 @@ def nbl_export(
     else:
         root_path = Path(root_path)
 
-    # Load project and run export
-    project = NbliteProject.from_path(root_path)
-    return project.export(pipeline=pipeline)
+    if notebook is True:
+        notebook = _calling_notebook()
+    notebooks = [Path(notebook).resolve()] if notebook else None
+
+    if via_server is None:
+        from nblite.server.client import via_server_enabled
+
+        via_server = via_server_enabled()
+    if via_server:
+        from nblite.server import ServerClient, server_supported
 
+        if server_supported():
+            result, _ = ServerClient(root_path).export(
+                notebooks=notebooks, pipeline=pipeline, incremental=incremental
+            )
+            return result
+
+    project, reused = _cached_project(root_path)
+    if incremental is None and reused:
+        # Re-running the cell: only rewrite outputs of changed notebooks
+        incremental = True
+    return project.export(notebooks=notebooks, pipeline=pipeline, incremental=incremental)
+
+
+def _get_version() -> str:
+    try:
+        from importlib.metadata import version
+
+        return version("nblite")
+    except Exception:
+        return "0.0.0.dev"  # Fallback for development without installation
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first access, so that `import nblite` (and so every `nbl`
+    # invocation) doesn't pay for importlib.metadata or the docs package
+    if name == "__version__":
+        value: Any = _get_version()
+    elif name == "show_doc":
+        # Also export show_doc for convenience
+        from nblite.docs import show_doc as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-# Also export show_doc for convenience
-from nblite.docs import show_doc  # noqa: E402
 
 __all__ = [
     "__version__",
@@ -4,12 +4,82 @@ Command-line interface for nblite.
 This module provides the `nbl` CLI command.
 """
 
-from nblite.cli.app import app
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+
+def _run_hook_via_server(argv: list[str]) -> int | None:
+    """
+    Forward ``nbl [--via-server] hook NAME [--full]`` to the project's server.
+
+    Git hooks run on every commit, so this path skips loading the CLI
+    (typer, rich and all commands) altogether.
+
+    Args:
+        argv: Command-line arguments, without the program name
+
+    Returns:
+        Exit code, or None if argv is not a hook invocation routed through
+        the server (the regular CLI handles it then).
+    """
+    args = list(argv)
+    via_server = args[:1] == ["--via-server"]
+    if via_server:
+        args = args[1:]
+    full = args[2:] == ["--full"]
+    if full:
+        args = args[:2]
+    if len(args) != 2 or args[0] != "hook" or os.environ.get("NBLITE_CONFIG"):
+        return None
+
+    from nblite.server.client import via_server_enabled
+    from nblite.server.protocol import ServerError, server_supported
+
+    if not (via_server or via_server_enabled()) or not server_supported():
+        return None
+
+    current = Path.cwd()
+    while not (current / "nblite.toml").is_file():
+        if current.parent == current:
+            # Not in a project, silently exit
+            return 0
+        current = current.parent
+
+    from nblite.server.client import ServerClient
+
+    try:
+        errors = ServerClient(current).run_hook(args[1], full=full)
+    except ServerError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    for error in errors:
+        print(f"Error: {error}", file=sys.stderr)
+    return 1 if errors else 0
 
 
 def main() -> None:
     """Entry point for the nbl CLI."""
+    exit_code = _run_hook_via_server(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from nblite.cli.app import app
+
     app()
 
 
+def __getattr__(name: str) -> Any:
+    # The typer app is imported on first use, so that main() can skip it
+    if name == "app":
+        from nblite.cli.app import app
+
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = ["app", "main"]
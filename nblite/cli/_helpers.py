@@ -4,12 +4,17 @@ from __future__ import annotations
 
 __all__ = [
     "console",
+    "err_console",
     "CONFIG_PATH_KEY",
     "CONFIG_OVERRIDE_KEY",
     "ADD_CODE_LOCATION_KEY",
+    "VIA_SERVER_KEY",
     "version_callback",
     "get_project",
     "get_config_path",
+    "get_server_client",
+    "start_profiling",
+    "print_profile",
 ]
 
 from pathlib import Path
@@ -18,22 +23,27 @@ from typing import TYPE_CHECKING
 import typer
 from rich.console import Console
 
-from nblite import __version__
-
 if TYPE_CHECKING:
     from nblite.core.project import NbliteProject
+    from nblite.server import ServerClient
+    from nblite.utils.tracing import Profiler
 
 console = Console()
+# Diagnostics that must not mix with a command's output (e.g. --profile)
+err_console = Console(stderr=True)
 
 # Global config keys stored in context
 CONFIG_PATH_KEY = "config_path"
 CONFIG_OVERRIDE_KEY = "config_override"
 ADD_CODE_LOCATION_KEY = "add_code_location"
+VIA_SERVER_KEY = "via_server"
 
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
+        from nblite import __version__
+
         console.print(f"nblite version {__version__}")
         raise typer.Exit()
 
@@ -71,3 +81,118 @@ def get_project(ctx: typer.Context) -> NbliteProject:
 def get_config_path(ctx: typer.Context) -> Path | None:
     """Get the config path from context, if set."""
     return ctx.obj.get(CONFIG_PATH_KEY) if ctx.obj else None
+
+
+def get_server_client(ctx: typer.Context) -> ServerClient | None:
+    """
+    Get a client for the project's resident server, if --via-server is set.
+
+    Returns None, so that the command runs in this process, when no project
+    is found (the local code path reports that) or when the config is
+    overridden on the command line, since the server only serves the
+    project as configured in nblite.toml.
+
+    Args:
+        ctx: Typer context
+
+    Returns:
+        ServerClient, or None to run the command in this process
+    """
+    if not (ctx.obj and ctx.obj.get(VIA_SERVER_KEY)):
+        return None
+
+    from nblite.config import find_config_file
+    from nblite.server import ServerClient, server_supported
+
+    if ctx.obj.get(CONFIG_OVERRIDE_KEY) or ctx.obj.get(ADD_CODE_LOCATION_KEY):
+        console.print("[yellow]Config overrides given, running without the server[/yellow]")
+        return None
+    if not server_supported():
+        return None
+
+    config_path = get_config_path(ctx)
+    if config_path is None:
+        config_path = find_config_file()
+        if config_path is None:
+            return None
+    config_path = Path(config_path)
+    root_path = config_path.parent if config_path.name == "nblite.toml" else config_path
+    if not (root_path / "nblite.toml").exists():
+        return None
+    return ServerClient(root_path)
+
+
+def start_profiling(
+    ctx: typer.Context,
+    trace_path: Path | None = None,
+    pstats_path: Path | None = None,
+) -> None:
+    """
+    Record stage timings for the rest of the command.
+
+    When the command finishes, a table of the stages (see
+    nblite.utils.tracing) is printed to stderr and the optional trace and
+    pstats files are written.
+
+    Args:
+        ctx: Typer context of the nbl callback
+        trace_path: Write the stages as a Chrome trace JSON file here
+        pstats_path: Also run cProfile and write its stats here
+    """
+    import cProfile
+
+    from nblite.utils.tracing import Profiler
+
+    profiler = Profiler()
+    cprofile = cProfile.Profile() if pstats_path is not None else None
+
+    def report() -> None:
+        if cprofile is not None:
+            cprofile.disable()
+        profiler.stop()
+        print_profile(profiler)
+        if trace_path is not None:
+            profiler.write_chrome_trace(trace_path)
+            err_console.print(f"[dim]Trace written to {trace_path}[/dim]")
+        if cprofile is not None:
+            cprofile.dump_stats(pstats_path)
+            err_console.print(f"[dim]cProfile stats written to {pstats_path}[/dim]")
+
+    ctx.call_on_close(report)
+    profiler.start()
+    if cprofile is not None:
+        cprofile.enable()
+
+
+def print_profile(profiler: Profiler) -> None:
+    """Print the stage timings and counters of a profiler as tables to stderr."""
+    from rich.table import Table
+
+    wall_time = profiler.wall_time
+    table = Table(title=f"Profile ({wall_time:.3f}s)", title_justify="left")
+    table.add_column("Stage")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Self (s)", justify="right")
+    table.add_column("Max (s)", justify="right")
+    table.add_column("% of command", justify="right")
+
+    for stage in profiler.stages():
+        share = stage.total / wall_time * 100 if wall_time > 0 else 0.0
+        table.add_row(
+            "  " * stage.depth + stage.name,
+            str(stage.calls),
+            f"{stage.total:.3f}",
+            f"{stage.self_time:.3f}",
+            f"{stage.max:.3f}",
+            f"{share:.1f}",
+        )
+    err_console.print(table)
+
+    if profiler.counters:
+        counters = Table(title="Counters", title_justify="left")
+        counters.add_column("Metric")
+        counters.add_column("Total", justify="right")
+        for name, value in sorted(profiler.counters.items()):
+            counters.add_row(name, f"{value:,.0f}")
+        err_console.print(counters)
@@ -9,25 +9,122 @@ from __future__ import annotations
 __all__ = ["app"]
 
 import builtins
+import importlib
 import json
 from pathlib import Path
 from typing import Annotated
 
+import click
 import typer
+import typer.main
+from typer.core import TyperGroup
 
 from nblite.cli._helpers import (
     ADD_CODE_LOCATION_KEY,
     CONFIG_OVERRIDE_KEY,
     CONFIG_PATH_KEY,
+    VIA_SERVER_KEY,
     console,
+    start_profiling,
     version_callback,
 )
 
+# Command name -> (module that registers it, short help for `nbl --help`).
+# A command's module is imported only when that command runs, so `nbl --help`,
+# `nbl --version` and shell completion don't import every command's
+# dependencies. Keep in sync with the commands' docstrings (checked by tests).
+COMMANDS: dict[str, tuple[str, str]] = {
+    "clean": ("nblite.cli.commands.clean", "Clean notebooks by removing outputs and metadata."),
+    "clear": ("nblite.cli.commands.clear", "Clear code locations by removing generated files."),
+    "convert": ("nblite.cli.commands.convert", "Convert notebook between formats."),
+    "render-docs": ("nblite.cli.commands.docs", "Render documentation for the project."),
+    "preview-docs": ("nblite.cli.commands.docs", "Preview documentation with live reload."),
+    "export": ("nblite.cli.commands.export", "Run the export pipeline."),
+    "fill": ("nblite.cli.commands.fill", "Execute notebooks and fill cell outputs."),
+    "test": (
+        "nblite.cli.commands.fill",
+        "Test that notebooks execute without errors (dry run).",
+    ),
+    "from-module": ("nblite.cli.commands.from_module", "Convert Python module(s) to notebook(s)."),
+    "install-hooks": ("nblite.cli.commands.hooks", "Install git hooks for the project."),
+    "uninstall-hooks": ("nblite.cli.commands.hooks", "Remove git hooks for the project."),
+    "validate": ("nblite.cli.commands.hooks", "Validate git staging state."),
+    "hook": ("nblite.cli.commands.hooks", "Run a git hook (internal use)."),
+    "info": ("nblite.cli.commands.info", "Show project information."),
+    "init": ("nblite.cli.commands.init", "Initialize a new nblite project."),
+    "list": ("nblite.cli.commands.list", "List notebooks and files in the project."),
+    "nb-to-script": ("nblite.cli.commands.nb_to_script", "Convert a notebook to a python script."),
+    "new": ("nblite.cli.commands.new", "Create a new notebook."),
+    "prepare": (
+        "nblite.cli.commands.prepare",
+        "Run export, clean, fill, and readme in sequence.",
+    ),
+    "readme": ("nblite.cli.commands.readme", "Generate README.md from a notebook."),
+    "server": ("nblite.cli.commands.server", "Manage the project's resident server."),
+    "install-default-templates": (
+        "nblite.cli.commands.templates",
+        "Download and install default templates from GitHub.",
+    ),
+    "watch": (
+        "nblite.cli.commands.watch",
+        "Watch notebook code locations and re-export on every save.",
+    ),
+}
+
+
+class LazyCommandGroup(TyperGroup):
+    """
+    Click group for `nbl` that imports command modules on demand.
+
+    Commands of modules not imported yet are listed with placeholder
+    commands carrying their short help. Resolving a command to run it (or to
+    show its own help) imports its module, whose ``@app.command`` decorator
+    registers the real command.
+    """
+
+    def list_commands(self, ctx: click.Context) -> builtins.list[str]:
+        names = builtins.list(COMMANDS)
+        names += [name for name in super().list_commands(ctx) if name not in COMMANDS]
+        return names
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in COMMANDS:
+            return click.Command(cmd_name, help=COMMANDS[cmd_name][1])
+        return command
+
+    def resolve_command(
+        self, ctx: click.Context, args: builtins.list[str]
+    ) -> tuple[str | None, click.Command | None, builtins.list[str]]:
+        if args and args[0] in COMMANDS and args[0] not in self.commands:
+            self.load_command(args[0])
+        return super().resolve_command(ctx, args)
+
+    def load_command(self, cmd_name: str) -> click.Command:
+        """Import the module of a command and add the command to this group."""
+        importlib.import_module(COMMANDS[cmd_name][0])
+        for info in app.registered_commands:
+            assert info.callback is not None
+            name = info.name or typer.main.get_command_name(info.callback.__name__)
+            if name == cmd_name:
+                break
+        else:
+            raise RuntimeError(f"{COMMANDS[cmd_name][0]} does not register '{cmd_name}'")
+        command = typer.main.get_command_from_info(
+            info,
+            pretty_exceptions_short=app.pretty_exceptions_short,
+            rich_markup_mode=app.rich_markup_mode,
+        )
+        self.add_command(command, cmd_name)
+        return command
+
+
 # Create app first so commands can import and register themselves
 app = typer.Typer(
     name="nbl",
     help="nblite - Notebook-driven Python package development tool",
     no_args_is_help=True,
+    cls=LazyCommandGroup,
 )
 
 
@@ -57,6 +154,35 @@ def main(
             help='JSON string to add a code location: \'{"name": "cl_name", "path": "...", "format": "..."}\'',
         ),
     ] = None,
+    via_server: Annotated[
+        bool,
+        typer.Option(
+            "--via-server",
+            help="Run export and hooks on the project's resident server (started on demand)",
+            envvar="NBLITE_VIA_SERVER",
+        ),
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Print how long each stage of the command took",
+        ),
+    ] = False,
+    profile_trace: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-trace",
+            help="Write the stage timings as a Chrome trace JSON file (implies --profile)",
+        ),
+    ] = None,
+    profile_pstats: Annotated[
+        Path | None,
+        typer.Option(
+            "--profile-pstats",
+            help="Also run cProfile and write its stats to this file (implies --profile)",
+        ),
+    ] = None,
     version: Annotated[
         bool,
         typer.Option(
@@ -71,8 +197,12 @@ def main(
     """nblite - Notebook-driven Python package development tool."""
     ctx.ensure_object(dict)
 
+    if profile or profile_trace is not None or profile_pstats is not None:
+        start_profiling(ctx, trace_path=profile_trace, pstats_path=profile_pstats)
+
     if config is not None:
         ctx.obj[CONFIG_PATH_KEY] = config
+    ctx.obj[VIA_SERVER_KEY] = via_server
 
     # Parse and store override config
     if override_config is not None:
@@ -98,24 +228,5 @@ def main(
         ctx.obj[ADD_CODE_LOCATION_KEY] = parsed_locations
 
 
-from nblite.cli.commands import (  # noqa: E402, F401
-    clean,
-    clear,
-    convert,
-    docs,
-    export,
-    fill,
-    from_module,
-    hooks,
-    info,
-    init,
-    list,
-    nb_to_script,
-    new,
-    prepare,
-    readme,
-    templates,
-)
-
 if __name__ == "__main__":
     app()
@@ -6,6 +6,8 @@ Clears code locations downstream from a specified location.
 
 from __future__ import annotations
 
+import os
+from pathlib import Path
 from typing import Annotated
 
 import typer
@@ -135,25 +137,10 @@ def _get_location_and_downstream(project, start_key: str) -> list[str]:
     """
     Get the specified location and all locations downstream from it.
 
-    Uses BFS to traverse the export pipeline graph.
+    Downstream locations come from the project's lineage index, in
+    breadth-first order along the export pipeline.
     """
-    visited: set[str] = set()
-    to_visit = [start_key]
-    result: list[str] = []
-
-    while to_visit:
-        current = to_visit.pop(0)
-        if current in visited:
-            continue
-        visited.add(current)
-        result.append(current)
-
-        # Find all rules where current is the source
-        for rule in project.config.export_pipeline:
-            if rule.from_key == current and rule.to_key not in visited:
-                to_visit.append(rule.to_key)
-
-    return result
+    return [start_key, *(cl.key for cl in project.lineage.downstream(start_key))]
 
 
 def _clear_code_location(cl) -> tuple[int, int]:
@@ -166,6 +153,7 @@ def _clear_code_location(cl) -> tuple[int, int]:
         Tuple of (files_deleted, directories_deleted)
     """
     from nblite.config.schema import CodeLocationFormat
+    from nblite.utils.discovery import scan_files
 
     if not cl.path.exists():
         return 0, 0
@@ -173,31 +161,19 @@ def _clear_code_location(cl) -> tuple[int, int]:
     files_deleted = 0
     dirs_deleted = 0
 
-    # Get the file extension for this format
-    ext = cl.file_ext
-
-    # Delete files matching the format
-    for file_path in cl.path.glob(f"**/*{ext}"):
-        if not file_path.is_file():
-            continue
-
-        # Handle .pct.py extension properly
-        if ext == ".pct.py" and not file_path.name.endswith(".pct.py"):
-            continue
-
-        # For module format, skip __init__.py, __main__.py, and hidden files
-        if cl.format == CodeLocationFormat.MODULE:
-            if file_path.name.startswith("__") or file_path.name.startswith("."):
-                continue
-
-        file_path.unlink()
+    # Delete files matching the format. For module format, skip __init__.py,
+    # __main__.py, and hidden files.
+    is_module = cl.format == CodeLocationFormat.MODULE
+    for entry in scan_files(
+        cl.path, cl.file_ext, ignore_dunders=is_module, ignore_hidden=is_module
+    ):
+        entry.path.unlink()
         files_deleted += 1
 
     # Remove empty directories (but not the root code location directory)
-    # Walk from deepest directories first
-    for dir_path in sorted(cl.path.glob("**/*"), key=lambda p: len(p.parts), reverse=True):
-        if not dir_path.is_dir():
-            continue
+    # Walk bottom-up, so directories are visited after their subdirectories
+    for dirpath, _, _ in os.walk(cl.path, topdown=False):
+        dir_path = Path(dirpath)
         if dir_path == cl.path:
             continue
         # Check if directory is empty
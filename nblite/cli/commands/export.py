@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import typer
 
-from nblite.cli._helpers import console, get_project
+from nblite.cli._helpers import console, get_project, get_server_client
 from nblite.cli.app import app
 
+if TYPE_CHECKING:
+    from nblite.export.pipeline import ExportResult
+
 
 @app.command()
 def export(
@@ -51,6 +54,22 @@ def export(
             help="Omit YAML frontmatter when exporting to percent format",
         ),
     ] = False,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            help="Only regenerate outputs whose source notebooks changed since the last export",
+        ),
+    ] = False,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            "--workers",
+            "-w",
+            min=1,
+            help="Number of threads writing outputs concurrently (default: export.n_workers)",
+        ),
+    ] = None,
 ) -> None:
     """Run the export pipeline.
 
@@ -65,20 +84,101 @@ def export(
         nbl export
         nbl export --pipeline 'nbs->lib'
         nbl export --reverse
+        nbl export --incremental
+        nbl export --workers 8
     """
+    if reverse and export_pipeline:
+        console.print("[red]Error: Cannot use --reverse with --pipeline[/red]")
+        raise typer.Exit(1)
+
+    client = None if dry_run else get_server_client(ctx)
+    if client is not None:
+        from nblite.server import ServerError
+
+        try:
+            result, used_pipeline = client.export(
+                notebooks=notebooks,
+                pipeline=export_pipeline,
+                reverse=reverse,
+                silence_warnings=silence_warnings,
+                no_header=no_header if no_header else None,
+                incremental=incremental if incremental else None,
+                n_workers=workers,
+            )
+        except ServerError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1) from None
+        if result is None:
+            console.print(
+                "[yellow]No reversible pipeline rules found (module code locations are excluded)[/yellow]"
+            )
+            return
+        if reverse:
+            console.print(f"[blue]Using reversed pipeline: {used_pipeline}[/blue]")
+        elif export_pipeline:
+            console.print(f"[blue]Using custom pipeline: {export_pipeline}[/blue]")
+    else:
+        result = _export_locally(
+            ctx,
+            notebooks,
+            dry_run=dry_run,
+            export_pipeline=export_pipeline,
+            reverse=reverse,
+            silence_warnings=silence_warnings,
+            no_header=no_header,
+            incremental=incremental,
+            workers=workers,
+        )
+        if result is None:
+            return
+
+    # Print warnings (unless silenced)
+    if result.warnings and not silence_warnings:
+        console.print("[yellow]Warnings:[/yellow]")
+        for warning in result.warnings:
+            console.print(f"  [yellow]⚠[/yellow] {warning}")
+
+    if result.success:
+        console.print("[green]Export completed successfully[/green]")
+        for f in result.files_created:
+            console.print(f"  [green]+[/green] {f}")
+        for f in result.files_updated:
+            console.print(f"  [yellow]~[/yellow] {f}")
+        if result.files_skipped or result.files_unchanged:
+            console.print(
+                f"  [dim]{len(result.files_skipped)} skipped (inputs unchanged), "
+                f"{len(result.files_unchanged)} unchanged[/dim]"
+            )
+    else:
+        console.print("[red]Export completed with errors[/red]")
+        for error in result.errors:
+            console.print(f"  [red]Error:[/red] {error}")
+        raise typer.Exit(1)
+
+
+def _export_locally(
+    ctx: typer.Context,
+    notebooks: list[Path] | None,
+    *,
+    dry_run: bool,
+    export_pipeline: str | None,
+    reverse: bool,
+    silence_warnings: bool,
+    no_header: bool,
+    incremental: bool,
+    workers: int | None,
+) -> ExportResult | None:
+    """Run the export in this process; returns None if there was nothing to export."""
     project = get_project(ctx)
 
     # Handle --reverse flag
     if reverse:
-        if export_pipeline:
-            console.print("[red]Error: Cannot use --reverse with --pipeline[/red]")
-            raise typer.Exit(1)
         reversed_pipeline = project.get_reversed_pipeline()
         if not reversed_pipeline:
             console.print(
                 "[yellow]No reversible pipeline rules found (module code locations are excluded)[/yellow]"
             )
-            return
+            return None
         export_pipeline = reversed_pipeline
         console.print(f"[blue]Using reversed pipeline: {export_pipeline}[/blue]")
 
@@ -92,30 +192,16 @@ def export(
             console.print(f"  {nb.source_path}")
             for twin in twins:
                 console.print(f"    -> {twin}")
-        return
+        return None
 
     if export_pipeline:
         console.print(f"[blue]Using custom pipeline: {export_pipeline}[/blue]")
 
-    result = project.export(
+    return project.export(
         notebooks=notebooks,
         pipeline=export_pipeline,
         silence_warnings=silence_warnings,
         no_header=no_header if no_header else None,
+        incremental=incremental if incremental else None,
+        n_workers=workers,
     )
-
-    # Print warnings (unless silenced)
-    if result.warnings and not silence_warnings:
-        console.print("[yellow]Warnings:[/yellow]")
-        for warning in result.warnings:
-            console.print(f"  [yellow]⚠[/yellow] {warning}")
-
-    if result.success:
-        console.print("[green]Export completed successfully[/green]")
-        for f in result.files_created:
-            console.print(f"  [green]+[/green] {f}")
-    else:
-        console.print("[red]Export completed with errors[/red]")
-        for error in result.errors:
-            console.print(f"  [red]Error:[/red] {error}")
-        raise typer.Exit(1)
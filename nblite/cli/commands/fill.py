@@ -2,10 +2,9 @@
 
 from __future__ import annotations
 
-import fnmatch
 import os
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import typer
 from rich.table import Table
@@ -15,34 +14,9 @@ from nblite import DISABLE_NBLITE_EXPORT_ENV_VAR
 from nblite.cli._helpers import console
 from nblite.cli.app import app
 
-
-def _matches_exclude_pattern(rel_path: str, pattern: str) -> bool:
-    """Check if a relative path matches an exclude pattern.
-
-    Supports ``**`` for matching across directory separators (e.g.
-    ``**/*_v1.ipynb``).  Falls back to plain ``fnmatch`` for simple
-    patterns like ``scratch/*``.
-    """
-    # Normalise separators so patterns work cross-platform
-    rel_path = rel_path.replace(os.sep, "/")
-    pattern = pattern.replace(os.sep, "/")
-
-    if "**" in pattern:
-        # fnmatch doesn't handle ** across directories, so we try matching
-        # against every possible suffix of the path components.
-        parts = rel_path.split("/")
-        for i in range(len(parts)):
-            suffix = "/".join(parts[i:])
-            if fnmatch.fnmatch(suffix, pattern):
-                return True
-        # Also try with ** expanded to zero components (e.g. **/*_v1.ipynb
-        # should match root-level *_v1.ipynb files).
-        collapsed = pattern.replace("**/", "")
-        if fnmatch.fnmatch(rel_path, collapsed):
-            return True
-        return False
-
-    return fnmatch.fnmatch(rel_path, pattern)
+if TYPE_CHECKING:
+    from nblite.core.project import NbliteProject
+    from nblite.utils.discovery import FileEntry
 
 
 def _run_fill(
@@ -61,20 +35,23 @@ def _run_fill(
     allow_export: bool = False,
     config_path: Path | None = None,
     python: str | None = None,
+    project: NbliteProject | None = None,
 ) -> int:
     """
     Internal fill implementation shared by fill and test commands.
 
+    An already loaded project can be passed (e.g. by prepare) so that its
+    caches are shared; otherwise it is loaded from config_path.
+
     Returns exit code (0 = success, 1 = error).
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
     from rich.live import Live
 
     from nblite.config.schema import CodeLocationFormat
-    from nblite.core.notebook import Notebook
     from nblite.core.project import NbliteProject
-    from nblite.fill import FillResult, FillStatus, fill_notebook, has_notebook_changed
+    from nblite.fill import FillResult, FillStatus
+    from nblite.fill.backends import run_fill_jobs
+    from nblite.fill.cache import FillStateCache
 
     # Disable export during fill by default (can interfere with notebook execution)
     prev_disable_export = os.environ.get(DISABLE_NBLITE_EXPORT_ENV_VAR)
@@ -82,7 +59,8 @@ def _run_fill(
         os.environ[DISABLE_NBLITE_EXPORT_ENV_VAR] = "true"
 
     try:
-        project = NbliteProject.from_path(config_path)
+        if project is None:
+            project = NbliteProject.from_path(config_path)
     except FileNotFoundError as e:
         if notebooks:
             project = None
@@ -113,8 +91,9 @@ def _run_fill(
                 os.environ[DISABLE_NBLITE_EXPORT_ENV_VAR] = prev_disable_export
             return 1
 
-    # Collect notebooks to fill
+    # Collect notebooks to fill, keeping the scanned entries for their stats
     nbs_to_fill: list[Path] = []
+    scanned: dict[Path, FileEntry] = {}
 
     if notebooks:
         # Use specified notebooks
@@ -139,20 +118,16 @@ def _run_fill(
             if locations_to_fill is not None and key not in locations_to_fill:
                 continue
 
-            # Get notebooks from this location
-            nbs = cl.get_notebooks(
+            # Get notebook files from this location (no need to parse them).
+            # Exclude patterns are matched against paths relative to the code
+            # location, and prune excluded directories during the scan.
+            for entry in cl.get_file_entries(
                 ignore_dunders=exclude_dunders,
                 ignore_hidden=exclude_hidden,
-            )
-
-            for nb in nbs:
-                if nb.source_path:
-                    # Check exclude patterns against path relative to code location
-                    if exclude_patterns:
-                        rel_path = str(nb.source_path.relative_to(cl.path))
-                        if any(_matches_exclude_pattern(rel_path, p) for p in exclude_patterns):
-                            continue
-                    nbs_to_fill.append(nb.source_path)
+                exclude=exclude_patterns,
+            ):
+                nbs_to_fill.append(entry.path)
+                scanned[entry.path] = entry
 
     if not nbs_to_fill:
         console.print("[yellow]No notebooks to fill[/yellow]")
@@ -167,12 +142,14 @@ def _run_fill(
         task_statuses[nb_path] = ("...", "Pending")
 
     # Filter unchanged notebooks if not filling unchanged
+    fill_state = project.fill_state if project else FillStateCache(Path.cwd())
     to_process: list[Path] = []
     if not fill_unchanged:
         for nb_path in nbs_to_fill:
             try:
-                nb = Notebook.from_file(nb_path)
-                if not has_notebook_changed(nb):
+                scanned_entry = scanned.get(nb_path)
+                stat = scanned_entry.stat() if scanned_entry is not None else None
+                if not fill_state.has_changed(nb_path, stat=stat):
                     task_statuses[nb_path] = ("skip", "Skipped (unchanged)")
                     results.append(
                         FillResult(
@@ -230,50 +207,56 @@ def _run_fill(
 
         kernel_name = exit_stack.enter_context(custom_kernel_environment(effective_python))
 
-    # Process notebooks
-    def process_one(nb_path: Path) -> FillResult:
-        task_statuses[nb_path] = ("run", "Executing...")
-        result = fill_notebook(
-            nb_path,
+    fill_config = project.config.fill if project else None
+
+    # Process notebooks (kernels are started inside the kernel environment)
+    def process_all(live: Live | None = None) -> list[FillResult]:
+        def on_start(nb_path: Path) -> None:
+            task_statuses[nb_path] = ("run", "Executing...")
+            if live:
+                live.update(make_table())
+
+        def on_result(nb_path: Path, result: FillResult) -> None:
+            if result.status == FillStatus.SUCCESS:
+                task_statuses[nb_path] = ("ok", "Success")
+            elif result.status == FillStatus.SKIPPED:
+                task_statuses[nb_path] = ("skip", result.message)
+            else:
+                task_statuses[nb_path] = ("err", result.message[:50])
+            if live:
+                live.update(make_table())
+
+        return run_fill_jobs(
+            to_process,
+            executor=fill_config.executor if fill_config else "thread",
+            n_workers=n_workers,
+            kernel_name=kernel_name,
+            reuse_kernels=fill_config.reuse_kernels if fill_config else False,
             timeout=timeout,
             dry_run=dry_run,
             remove_outputs_first=remove_outputs_first,
             clean=clean,
             save_hash=save_hash,
-            kernel_name=kernel_name,
+            on_start=on_start,
+            on_result=on_result,
         )
-        if result.status == FillStatus.SUCCESS:
-            task_statuses[nb_path] = ("ok", "Success")
-        elif result.status == FillStatus.SKIPPED:
-            task_statuses[nb_path] = ("skip", result.message)
-        else:
-            task_statuses[nb_path] = ("err", result.message[:50])
-        return result
 
     with exit_stack:
         if silent:
             # Silent mode - no output during execution
-            if n_workers <= 1:
-                for nb_path in to_process:
-                    results.append(process_one(nb_path))
-            else:
-                with ThreadPoolExecutor(max_workers=n_workers) as executor:
-                    futures = {executor.submit(process_one, p): p for p in to_process}
-                    for future in as_completed(futures):
-                        results.append(future.result())
+            results.extend(process_all())
         else:
             # Progress display mode
             with Live(make_table(), refresh_per_second=4, console=console) as live:
-                if n_workers <= 1:
-                    for nb_path in to_process:
-                        results.append(process_one(nb_path))
-                        live.update(make_table())
-                else:
-                    with ThreadPoolExecutor(max_workers=n_workers) as executor:
-                        futures = {executor.submit(process_one, p): p for p in to_process}
-                        for future in as_completed(futures):
-                            results.append(future.result())
-                            live.update(make_table())
+                results.extend(process_all(live))
+
+    # Remember the hashes of filled notebooks so the next run skips them cheaply
+    for r in results:
+        if r.status == FillStatus.SUCCESS and r.notebook_hash is not None:
+            fill_state.record(r.path, r.notebook_hash)
+            if project:
+                project.notebook_cache.invalidate(r.path)
+    fill_state.save()
 
     # Summary
     success_count = sum(1 for r in results if r.status == FillStatus.SUCCESS)
@@ -289,6 +272,13 @@ def _run_fill(
         f"[yellow]{skipped_count} skipped[/yellow], "
         f"[red]{error_count} failed[/red]"
     )
+    executed = [r for r in results if r.status != FillStatus.SKIPPED]
+    if executed:
+        kernel_time = sum(r.kernel_time for r in executed)
+        execution_time = sum(r.execution_time for r in executed)
+        console.print(
+            f"[dim]Kernel startup {kernel_time:.1f}s, execution {execution_time:.1f}s[/dim]"
+        )
 
     # Show errors
     if error_count > 0:
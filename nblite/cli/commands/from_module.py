@@ -10,6 +10,7 @@ import typer
 from nblite.cli._helpers import console
 from nblite.cli.app import app
 from nblite.core.notebook import Notebook
+from nblite.utils.discovery import scan_files
 
 __all__ = ["from_module_cmd", "module_to_notebook", "modules_to_notebooks"]
 
@@ -112,21 +113,15 @@ def modules_to_notebooks(
 
     created_files: list[Path] = []
 
-    # Find all Python files
-    pattern = "**/*.py" if recursive else "*.py"
-    for py_file in input_dir.glob(pattern):
+    # Find all Python files (__pycache__ and node_modules are pruned)
+    for entry in scan_files(input_dir, ".py", ignore_hidden=exclude_hidden, recursive=recursive):
+        py_file = entry.path
         # Skip excluded files
-        if exclude_hidden and any(part.startswith(".") for part in py_file.parts):
-            continue
         if exclude_dunders and py_file.name.startswith("__") and py_file.name != "__init__.py":
             continue
         if exclude_init and py_file.name == "__init__.py":
             continue
 
-        # Skip __pycache__ directories
-        if "__pycache__" in py_file.parts:
-            continue
-
         # Calculate relative path and output path
         rel_path = py_file.relative_to(input_dir)
         out_path = output_dir / rel_path.with_suffix(out_ext)
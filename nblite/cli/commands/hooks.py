@@ -6,7 +6,13 @@ from typing import Annotated
 
 import typer
 
-from nblite.cli._helpers import CONFIG_PATH_KEY, console, get_project
+from nblite.cli._helpers import (
+    CONFIG_PATH_KEY,
+    console,
+    err_console,
+    get_project,
+    get_server_client,
+)
 from nblite.cli.app import app
 
 
@@ -21,7 +27,7 @@ def install_hooks_cmd(ctx: typer.Context) -> None:
         install_hooks(project)
         console.print("[green]Git hooks installed[/green]")
     except RuntimeError as e:
-        console.print(f"[red]Error: {e}[/red]")
+        err_console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1) from None
 
 
@@ -46,11 +52,11 @@ def validate_cmd(ctx: typer.Context) -> None:
 
     if result.warnings:
         for warning in result.warnings:
-            console.print(f"[yellow]Warning:[/yellow] {warning}")
+            err_console.print(f"[yellow]Warning:[/yellow] {warning}")
 
     if result.errors:
         for error in result.errors:
-            console.print(f"[red]Error:[/red] {error}")
+            err_console.print(f"[red]Error:[/red] {error}")
         raise typer.Exit(1)
 
     if result.valid and not result.warnings:
@@ -64,31 +70,40 @@ def hook_cmd(
         str,
         typer.Argument(help="Hook name (pre-commit, post-commit)"),
     ],
+    full: Annotated[
+        bool,
+        typer.Option("--full", help="Clean and export the whole project, not just staged files"),
+    ] = False,
 ) -> None:
     """Run a git hook (internal use)."""
-    from nblite.core.project import NbliteProject
+    client = get_server_client(ctx)
+    if client is not None:
+        from nblite.server import ServerError
 
-    config_path = ctx.obj.get(CONFIG_PATH_KEY) if ctx.obj else None
+        try:
+            errors = client.run_hook(hook_name, full=full)
+        except ServerError as e:
+            err_console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1) from None
+    else:
+        from nblite.core.project import NbliteProject
 
-    try:
-        project = NbliteProject.from_path(config_path)
-    except FileNotFoundError:
-        # Not in a project, silently exit
-        return
-
-    if hook_name == "pre-commit":
-        # Auto-clean and validate
-        if project.config.git.auto_clean:
-            project.clean()
-
-        if project.config.git.auto_export:
-            project.export()
-
-        if project.config.git.validate_staging:
-            from nblite.git.staging import validate_staging
-
-            result = validate_staging(project)
-            if not result.valid:
-                for error in result.errors:
-                    console.print(f"[red]Error:[/red] {error}", err=True)
-                raise typer.Exit(1)
+        config_path = ctx.obj.get(CONFIG_PATH_KEY) if ctx.obj else None
+
+        try:
+            project = NbliteProject.from_path(config_path)
+        except FileNotFoundError:
+            # Not in a project, silently exit
+            return
+
+        if hook_name != "pre-commit":
+            return
+
+        from nblite.git.hooks import run_pre_commit
+
+        errors = run_pre_commit(project, full=full)
+
+    if errors:
+        for error in errors:
+            err_console.print(f"[red]Error:[/red] {error}")
+        raise typer.Exit(1)
@@ -62,13 +62,16 @@ def prepare(
 
     project = get_project(ctx)
     config_path = get_config_path(ctx)
+    # Clean needs outputs, so load them during export and parse each notebook once
+    project.notebook_cache.load_outputs = not skip_clean
 
     # Step 1: Export
     if not skip_export:
         console.print("[bold]Step 1: Export[/bold]")
         result = project.export()
         if result.success:
-            console.print(f"  [green]Exported {len(result.files_created)} files[/green]")
+            n_written = len(result.files_created) + len(result.files_updated)
+            console.print(f"  [green]Exported {n_written} files[/green]")
         else:
             console.print("[red]  Export failed[/red]")
             for error in result.errors:
@@ -104,6 +107,7 @@ def prepare(
             silent=False,
             config_path=config_path,
             python=python,
+            project=project,
         )
         if exit_code != 0:
             raise typer.Exit(exit_code)
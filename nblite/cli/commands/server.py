@@ -0,0 +1,81 @@
+"""Server command for nblite CLI."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+import typer
+
+from nblite.cli._helpers import console, get_project
+from nblite.cli.app import app
+
+
+@app.command(name="server")
+def server_cmd(
+    ctx: typer.Context,
+    action: Annotated[
+        str,
+        typer.Argument(help="start, stop or status"),
+    ] = "status",
+    idle_timeout: Annotated[
+        float,
+        typer.Option(
+            "--idle-timeout",
+            min=1,
+            help="Seconds without requests before the server exits",
+        ),
+    ] = 900,
+) -> None:
+    """Manage the project's resident server.
+
+    The server keeps the project loaded between commands. Commands run with
+    --via-server (or with NBLITE_VIA_SERVER=1 set), the git hook and
+    nbl_export() then forward their work to it instead of loading the project
+    themselves. A server is started on demand by the first such command; it
+    exits after --idle-timeout seconds without requests.
+
+    Example:
+        nbl server start
+        nbl server status
+        nbl server stop
+    """
+    from nblite.server import ServerClient, ServerError, server_supported, start_server
+
+    if not server_supported():
+        console.print("[red]Error: The server needs unix domain sockets[/red]")
+        raise typer.Exit(1)
+
+    project = get_project(ctx)
+    client = ServerClient(project.root_path, autostart=False, idle_timeout=idle_timeout)
+
+    if action == "start":
+        status = client.ping()
+        if status is not None:
+            console.print(f"[yellow]Server already running (pid {status['pid']})[/yellow]")
+            return
+        try:
+            start_server(project.root_path, idle_timeout, client.socket_path)
+        except ServerError as e:
+            console.print(f"[red]Error: {e}[/red]")
+            raise typer.Exit(1) from None
+        status = client.ping()
+        pid = status["pid"] if status else "?"
+        console.print(f"[green]Server started (pid {pid})[/green]")
+    elif action == "stop":
+        if client.shutdown():
+            console.print("[green]Server stopped[/green]")
+        else:
+            console.print("[dim]No server running[/dim]")
+    elif action == "status":
+        status = client.ping()
+        if status is None:
+            console.print("[dim]No server running[/dim]")
+            return
+        console.print(f"[green]Server running[/green] (pid {status['pid']})")
+        console.print(f"  Socket: {client.socket_path}")
+        console.print(f"  Uptime: {status['uptime']:.0f}s")
+        console.print(f"  Requests: {status['requests']}")
+        console.print(f"  Idle timeout: {status['idle_timeout']:.0f}s")
+    else:
+        console.print(f"[red]Error: Unknown action '{action}' (use start, stop or status)[/red]")
+        raise typer.Exit(1)
@@ -0,0 +1,110 @@
+"""Watch command for nblite CLI."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+from nblite.cli._helpers import console, get_project
+from nblite.cli.app import app
+
+if TYPE_CHECKING:
+    from nblite.core.project import NbliteProject
+
+
+@app.command()
+def watch(
+    ctx: typer.Context,
+    debounce: Annotated[
+        int,
+        typer.Option(
+            "--debounce",
+            min=0,
+            help="Milliseconds without further changes before exporting",
+        ),
+    ] = 50,
+    poll: Annotated[
+        bool,
+        typer.Option("--poll", help="Use stat polling instead of inotify"),
+    ] = False,
+    interval: Annotated[
+        int,
+        typer.Option("--interval", min=10, help="Polling interval in milliseconds"),
+    ] = 250,
+) -> None:
+    """Watch notebook code locations and re-export on every save.
+
+    The project stays loaded between exports, and each export is
+    incremental: only twins and modules whose source notebooks changed are
+    rewritten. Bursts of saves are debounced into one export. Editing
+    nblite.toml reloads the project.
+
+    Uses inotify on Linux and falls back to polling elsewhere.
+    Press Ctrl+C to stop.
+
+    Example:
+        nbl watch
+        nbl watch --debounce 200
+        nbl watch --poll --interval 500
+    """
+    from nblite.watch import InotifyWatcher, WatchReport, WatchSession
+
+    def load_project() -> NbliteProject:
+        return get_project(ctx)
+
+    session = WatchSession(
+        load_project,
+        debounce=debounce / 1000,
+        force_polling=poll,
+        poll_interval=interval / 1000,
+    )
+
+    def rel(path: Path) -> Path:
+        try:
+            return path.relative_to(session.project.root_path)
+        except ValueError:
+            return path
+
+    def on_report(report: WatchReport) -> None:
+        changed = ", ".join(str(rel(p)) for p in report.changed[:3])
+        if len(report.changed) > 3:
+            changed += f" (+{len(report.changed) - 3} more)"
+        if report.reloaded:
+            console.print("[blue]Config changed, project reloaded[/blue]")
+        if report.error is not None:
+            console.print(f"[red]✗[/red] {changed}: {report.error}")
+            return
+
+        assert report.result is not None
+        for error in report.result.errors:
+            console.print(f"  [red]Error:[/red] {error}")
+        for warning in report.result.warnings:
+            console.print(f"  [yellow]⚠[/yellow] {warning}")
+        status = "[green]✓[/green]" if report.result.success else "[red]✗[/red]"
+        console.print(
+            f"{status} {changed} -> {len(report.written)} written "
+            f"[dim]({report.latency * 1000:.0f} ms, export {report.export_time * 1000:.0f} ms)[/dim]"
+        )
+        for path in report.written:
+            console.print(f"  [yellow]~[/yellow] {rel(path)}")
+
+    with session:
+        n_written = 0
+        try:
+            result = session.export()
+            n_written = len(result.files_created) + len(result.files_updated)
+            for error in result.errors:
+                console.print(f"  [red]Error:[/red] {error}")
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+        backend = "inotify" if isinstance(session.watcher, InotifyWatcher) else "polling"
+        console.print(
+            f"[bold]Watching {len(session.watcher.dirs)} code locations[/bold] "
+            f"[dim]({backend}, {n_written} files exported at startup)[/dim]"
+        )
+        try:
+            session.run(on_report)
+        except KeyboardInterrupt:
+            console.print("[dim]Stopped watching[/dim]")
@@ -13,6 +13,7 @@ from nblite.config.loader import (
     parse_export_pipeline,
 )
 from nblite.config.schema import (
+    CacheConfig,
     CellReferenceStyle,
     CleanConfig,
     CodeLocationConfig,
@@ -22,7 +23,10 @@ from nblite.config.schema import (
     ExportMode,
     ExportRule,
     ExtensionEntry,
+    FillExecutor,
     GitConfig,
+    LoadConfig,
+    LoadExecutor,
     NbliteConfig,
     TemplatesConfig,
 )
@@ -39,8 +43,12 @@ __all__ = [
     "GitConfig",
     "CleanConfig",
     "DocsConfig",
+    "CacheConfig",
+    "LoadConfig",
     "TemplatesConfig",
     "CellReferenceStyle",
+    "FillExecutor",
+    "LoadExecutor",
     # Loader functions
     "load_config",
     "find_config_file",
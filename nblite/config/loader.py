@@ -259,6 +259,10 @@ def load_config(
         config_data["fill"] = raw_config["fill"]
     if "docs" in raw_config:
         config_data["docs"] = raw_config["docs"]
+    if "cache" in raw_config:
+        config_data["cache"] = raw_config["cache"]
+    if "load" in raw_config:
+        config_data["load"] = raw_config["load"]
 
     try:
         config = NbliteConfig(**config_data)
@@ -21,10 +21,14 @@ __all__ = [
     "CleanConfig",
     "FillConfig",
     "DocsConfig",
+    "CacheConfig",
+    "LoadConfig",
     "NbliteConfig",
     "CodeLocationFormat",
     "ExportMode",
     "CellReferenceStyle",
+    "FillExecutor",
+    "LoadExecutor",
 ]
 
 
@@ -43,6 +47,21 @@ class ExportMode(str, Enum):
     PY = "py"  # Export as plain Python without cell markers
 
 
+class FillExecutor(str, Enum):
+    """Executor backend for running notebooks in nbl fill."""
+
+    THREAD = "thread"  # Thread pool sharing warm kernels
+    PROCESS = "process"  # Process pool, one warm kernel per worker process
+    ASYNC = "async"  # One event loop driving all kernels
+
+
+class LoadExecutor(str, Enum):
+    """Executor backend for loading notebooks in parallel."""
+
+    THREAD = "thread"  # Thread pool sharing the notebook cache
+    PROCESS = "process"  # Process pool; parsed notebooks are sent back pickled
+
+
 class CellReferenceStyle(str, Enum):
     """Style for cell references in exported code."""
 
@@ -136,6 +155,8 @@ class ExportConfig(BaseModel):
         include_autogenerated_warning: Include autogenerated warning header
         cell_reference_style: Style for cell references
         no_header: Omit YAML frontmatter when exporting to percent format
+        incremental: Only regenerate outputs whose inputs changed
+        n_workers: Number of threads writing export outputs concurrently
     """
 
     include_autogenerated_warning: bool = Field(
@@ -150,6 +171,15 @@ class ExportConfig(BaseModel):
         default=False,
         description="Omit YAML frontmatter when exporting to percent format",
     )
+    incremental: bool = Field(
+        default=False,
+        description="Only regenerate outputs whose inputs changed since the last export",
+    )
+    n_workers: int = Field(
+        default=1,
+        description="Number of threads writing export outputs concurrently",
+        ge=1,
+    )
 
 
 class GitConfig(BaseModel):
@@ -269,6 +299,9 @@ class FillConfig(BaseModel):
         exclude_patterns: Glob patterns to exclude from fill
         exclude_dunders: Exclude __* notebooks
         exclude_hidden: Exclude .* notebooks
+        reuse_kernels: Reuse warm kernels across notebooks (some process state
+            carries over between notebooks)
+        executor: Executor backend ("thread", "process" or "async")
     """
 
     timeout: int | None = Field(
@@ -308,6 +341,18 @@ class FillConfig(BaseModel):
         default=None,
         description="Path to Python binary for notebook execution (must have ipykernel installed)",
     )
+    reuse_kernels: bool = Field(
+        default=False,
+        description=(
+            "Reuse warm kernels across notebooks (the namespace, os.environ, sys.path, "
+            "warnings filters and decimal context are reset; imported modules and other "
+            "process state carry over)"
+        ),
+    )
+    executor: FillExecutor = Field(
+        default=FillExecutor.THREAD,
+        description="Executor backend for running notebooks",
+    )
 
 
 class DocsConfig(BaseModel):
@@ -349,6 +394,45 @@ class DocsConfig(BaseModel):
     )
 
 
+class CacheConfig(BaseModel):
+    """
+    Configuration for the persistent project index.
+
+    Attributes:
+        enabled: Persist notebook summaries between runs
+        path: Cache directory relative to project root
+    """
+
+    enabled: bool = Field(
+        default=True,
+        description="Persist notebook summaries between runs",
+    )
+    path: str = Field(
+        default=".nblite/cache",
+        description="Cache directory relative to project root",
+    )
+
+
+class LoadConfig(BaseModel):
+    """
+    Configuration for loading notebooks (CodeLocation.get_notebooks).
+
+    Attributes:
+        n_workers: Number of workers loading notebooks concurrently
+        executor: Executor backend ("thread" or "process")
+    """
+
+    n_workers: int = Field(
+        default=1,
+        description="Number of workers loading notebooks concurrently",
+        ge=1,
+    )
+    executor: LoadExecutor = Field(
+        default=LoadExecutor.THREAD,
+        description="Executor backend for loading notebooks",
+    )
+
+
 class NbliteConfig(BaseModel):
     """
     Top-level nblite configuration.
@@ -368,6 +452,8 @@ class NbliteConfig(BaseModel):
         git: Git integration options
         clean: Clean options
         docs: Documentation options
+        cache: Project index cache options
+        load: Notebook loading options
     """
 
     export_pipeline: list[ExportRule] = Field(
@@ -422,3 +508,11 @@ class NbliteConfig(BaseModel):
         default_factory=DocsConfig,
         description="Documentation options",
     )
+    cache: CacheConfig = Field(
+        default_factory=CacheConfig,
+        description="Project index cache options",
+    )
+    load: LoadConfig = Field(
+        default_factory=LoadConfig,
+        description="Notebook loading options",
+    )
@@ -8,6 +8,8 @@ This module contains the core classes:
 - CodeLocation: Represents a code location in the project
 - PyFile: Represents a Python module file
 - NbliteProject: Central project management class
+- NotebookCache: In-memory cache of loaded notebooks
+- LineageIndex: Code location and twin lookups along the export pipeline
 """
 
 from nblite.core.cell import Cell, CellType
@@ -16,13 +18,18 @@ from nblite.core.directive import (
     Directive,
     DirectiveDefinition,
     DirectiveError,
+    DirectiveScan,
     get_directive_definition,
     get_source_without_directives,
     list_directive_definitions,
     parse_directives_from_source,
     register_directive,
+    scan_directives,
 )
+from nblite.core.index import NotebookSummary, ProjectIndex
+from nblite.core.lineage import LineageIndex
 from nblite.core.notebook import Format, Notebook
+from nblite.core.notebook_cache import NotebookCache
 from nblite.core.project import NbliteProject, NotebookLineage
 from nblite.core.pyfile import PyFile, PyFileCell
 
@@ -41,13 +48,20 @@ __all__ = [
     # Project
     "NbliteProject",
     "NotebookLineage",
+    # Index
+    "ProjectIndex",
+    "NotebookSummary",
+    "NotebookCache",
+    "LineageIndex",
     # Directive
     "Directive",
     "DirectiveDefinition",
     "DirectiveError",
+    "DirectiveScan",
     "register_directive",
     "get_directive_definition",
     "list_directive_definitions",
     "parse_directives_from_source",
     "get_source_without_directives",
+    "scan_directives",
 ]
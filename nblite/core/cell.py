@@ -9,11 +9,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
-from nblite.core.directive import (
-    Directive,
-    get_source_without_directives,
-    parse_directives_from_source,
-)
+from nblite.core.directive import Directive, DirectiveScan, scan_directives
+from nblite.extensions import HookRegistry, HookType
 
 if TYPE_CHECKING:
     from nblite.core.notebook import Notebook
@@ -62,6 +59,8 @@ class Cell:
     notebook: Notebook | None = field(default=None, repr=False)
 
     _directives: dict[str, list[Directive]] | None = field(default=None, repr=False, init=False)
+    _scan: DirectiveScan | None = field(default=None, repr=False, init=False, compare=False)
+    _scanned_source: str | None = field(default=None, repr=False, init=False, compare=False)
 
     @classmethod
     def from_dict(
@@ -128,18 +127,40 @@ class Cell:
         Returns:
             Dictionary mapping directive names to lists of Directive objects
         """
-        if self._directives is None:
+        if self._directives is None or self._scanned_source is not self.source:
             self._parse_directives()
         return self._directives  # type: ignore
 
+    def _get_scan(self) -> DirectiveScan:
+        """
+        Scan the cell source for directives, reusing the cached result.
+
+        The scan is recomputed whenever ``source`` has been reassigned. It does
+        not trigger hooks; DIRECTIVE_PARSED fires from ``_parse_directives``.
+        """
+        if self._scan is None or self._scanned_source is not self.source:
+            self._scan = scan_directives(
+                self.source, validate=False, cell=self, trigger_hooks=False
+            )
+            self._scanned_source = self.source
+            self._directives = None
+        return self._scan
+
     def _parse_directives(self) -> None:
-        """Parse directives from cell source."""
-        self._directives = {}
+        """
+        Parse directives from cell source.
+
+        Hooks triggered:
+            DIRECTIVE_PARSED: For each directive (directive=directive, cell=self)
+        """
         if self.cell_type != CellType.CODE:
+            self._directives = {}
             return
 
-        parsed = parse_directives_from_source(self.source, validate=False, cell=self)
+        parsed = self._get_scan().directives
+        self._directives = {}
         for directive in parsed:
+            HookRegistry.trigger(HookType.DIRECTIVE_PARSED, directive=directive, cell=self)
             if directive.name not in self._directives:
                 self._directives[directive.name] = []
             self._directives[directive.name].append(directive)
@@ -154,7 +175,7 @@ class Cell:
         """
         if self.cell_type != CellType.CODE:
             return self.source
-        return get_source_without_directives(self.source)
+        return self._get_scan().source_without_directives
 
     @property
     def is_code(self) -> bool:
@@ -6,19 +6,45 @@ Represents a code location (directory) in an nblite project.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from nblite.config.schema import CodeLocationFormat, ExportMode
+from nblite.config.schema import CodeLocationFormat, ExportMode, LoadExecutor
+from nblite.utils.discovery import PRUNED_DIRS, FileEntry, scan_files
+from nblite.utils.tracing import propagate, span
 
 if TYPE_CHECKING:
     from nblite.core.notebook import Notebook
+    from nblite.core.notebook_cache import MapFunction, NotebookCache
     from nblite.core.pyfile import PyFile
 
 __all__ = ["CodeLocation"]
 
 
+@contextmanager
+def _loader_map(n_workers: int, executor: LoadExecutor, n_items: int) -> Iterator[MapFunction]:
+    """Yield a map function that loads notebooks on n_workers workers."""
+    if n_workers <= 1 or n_items <= 1:
+        yield map
+        return
+
+    n_workers = min(n_workers, n_items)
+    pool: Executor
+    if executor == LoadExecutor.PROCESS:
+        # Send paths in chunks: per-item round trips dominate for small notebooks
+        chunksize = max(1, n_items // (n_workers * 4))
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            yield partial(pool.map, chunksize=chunksize)
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            yield lambda fn, items: pool.map(propagate(fn), items)
+
+
 @dataclass
 class CodeLocation:
     """
@@ -34,6 +60,10 @@ class CodeLocation:
         format: Format type (ipynb, percent, module)
         export_mode: How to export to this location (for module format)
         project_root: Root path of the project (for relative calculations)
+        notebook_cache: Cache that get_notebooks loads through (shared with the
+                        project), or None to load every notebook from disk
+        load_workers: Default number of workers get_notebooks loads with
+        load_executor: Default executor backend of get_notebooks
     """
 
     key: str
@@ -41,6 +71,11 @@ class CodeLocation:
     format: CodeLocationFormat | str
     export_mode: ExportMode = ExportMode.PERCENT
     project_root: Path | None = None
+    notebook_cache: NotebookCache | None = field(default=None, repr=False, compare=False)
+    load_workers: int = field(default=1, repr=False, compare=False)
+    load_executor: LoadExecutor | str = field(
+        default=LoadExecutor.THREAD, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """Normalize format to enum."""
@@ -105,70 +140,162 @@ class CodeLocation:
         Returns:
             List of file paths matching the format
         """
-        if not self.path.exists():
-            return []
-
-        ext = self.file_ext
-        pattern = f"**/*{ext}"
+        entries = self.get_file_entries(ignore_dunders=ignore_dunders, ignore_hidden=ignore_hidden)
+        return [entry.path for entry in entries]
 
-        files: list[Path] = []
-        for file_path in self.path.glob(pattern):
-            if not file_path.is_file():
-                continue
-
-            name = file_path.name
+    def get_file_entries(
+        self,
+        ignore_dunders: bool = True,
+        ignore_hidden: bool = True,
+        exclude: list[str] | None = None,
+    ) -> list[FileEntry]:
+        """
+        Get all files in this code location, with their cached stats.
 
-            # Handle .pct.py extension
-            if ext == ".pct.py" and not name.endswith(".pct.py"):
-                continue
+        Hidden directories (with ignore_hidden), __pycache__ and node_modules
+        are pruned without being listed (see scan_files).
 
-            if ignore_dunders and name.startswith("__"):
-                continue
-            if ignore_hidden and name.startswith("."):
-                continue
+        Args:
+            ignore_dunders: Exclude files starting with __
+            ignore_hidden: Exclude files starting with . (also excludes files in hidden directories)
+            exclude: Glob patterns excluding paths relative to the location
+                (like the fill exclude_patterns)
 
-            # Check if file is inside a hidden directory (e.g., .ipynb_checkpoints)
-            if ignore_hidden:
-                rel_path = file_path.relative_to(self.path)
-                if any(part.startswith(".") for part in rel_path.parts[:-1]):
-                    continue
+        Returns:
+            File entries matching the format, sorted by path
+        """
+        with span("scan", location=self.key):
+            return scan_files(
+                self.path,
+                self.file_ext,
+                ignore_dunders=ignore_dunders,
+                ignore_hidden=ignore_hidden,
+                exclude=exclude or (),
+            )
+
+    def contains(
+        self,
+        path: Path,
+        ignore_dunders: bool = True,
+        ignore_hidden: bool = True,
+    ) -> bool:
+        """
+        Check whether get_files would list a file, without scanning the location.
 
-            files.append(file_path)
+        Args:
+            path: Absolute file path
+            ignore_dunders: Exclude files starting with __
+            ignore_hidden: Exclude files starting with . (also excludes files in hidden directories)
 
-        return sorted(files)
+        Returns:
+            True if path is a file of this code location's format inside it
+        """
+        try:
+            rel_path = path.relative_to(self.path)
+        except ValueError:
+            return False
+
+        name = path.name
+        if not name.endswith(self.file_ext):
+            return False
+        if ignore_dunders and name.startswith("__"):
+            return False
+        if ignore_hidden and any(part.startswith(".") for part in rel_path.parts):
+            return False
+        if any(part in PRUNED_DIRS for part in rel_path.parts[:-1]):
+            return False
+        return path.is_file()
 
     def get_notebooks(
         self,
         ignore_dunders: bool = True,
         ignore_hidden: bool = True,
+        outputs: bool = True,
+        n_workers: int | None = None,
+        executor: LoadExecutor | str | None = None,
     ) -> list[Notebook]:
         """
         Get all notebooks in this code location.
 
-        Only valid for notebook formats (ipynb, percent).
+        Only valid for notebook formats (ipynb, percent). With more than one
+        worker, notebooks are parsed on a thread or process pool; they are
+        returned in sorted path order either way, and a notebook that fails
+        to parse raises the same error as a serial load would (the first in
+        path order).
 
         Args:
             ignore_dunders: Exclude files starting with __
             ignore_hidden: Exclude files starting with .
+            outputs: If False, skip cell outputs when loading (see Notebook.from_file)
+            n_workers: Number of workers loading notebooks (None = load_workers)
+            executor: "thread" or "process" (None = load_executor). Process
+                workers only pay off for large notebooks, since parsed
+                notebooks are pickled back to this process.
 
         Returns:
-            List of Notebook instances
+            List of Notebook instances (shared with the notebook cache, if
+            set; do not modify)
         """
         if not self.is_notebook:
             return []
 
-        from nblite.core.notebook import Notebook
+        from nblite.core.notebook_cache import load_notebook
 
         files = self.get_files(ignore_dunders=ignore_dunders, ignore_hidden=ignore_hidden)
-        notebooks: list[Notebook] = []
-
-        for file_path in files:
-            nb = Notebook.from_file(file_path)
+        n_workers = self.load_workers if n_workers is None else n_workers
+        executor = LoadExecutor(executor if executor is not None else self.load_executor)
+
+        with (
+            span("load", location=self.key),
+            _loader_map(n_workers, executor, len(files)) as map_fn,
+        ):
+            if self.notebook_cache is not None:
+                return self.notebook_cache.get_many(
+                    files, outputs=outputs, map_fn=map_fn, code_location=self.key
+                )
+            notebooks = list(map_fn(partial(load_notebook, outputs=outputs), files))
+
+        for nb in notebooks:
             nb.code_location = self.key
-            notebooks.append(nb)
-
         return notebooks
 
+    def iter_notebooks(
+        self,
+        ignore_dunders: bool = True,
+        ignore_hidden: bool = True,
+        outputs: bool = True,
+    ) -> Iterator[Notebook]:
+        """
+        Iterate over the notebooks in this code location, loading one at a time.
+
+        Streaming counterpart of get_notebooks: notebooks are yielded in the
+        same order, and those not already in the notebook cache are loaded
+        without being kept there, so memory is bounded by the largest notebook
+        rather than the whole location.
+
+        Args:
+            ignore_dunders: Exclude files starting with __
+            ignore_hidden: Exclude files starting with .
+            outputs: If False, skip cell outputs when loading (see Notebook.from_file)
+
+        Yields:
+            Notebook instances
+        """
+        if not self.is_notebook:
+            return
+
+        from nblite.core.notebook_cache import load_notebook
+
+        for file_path in self.get_files(ignore_dunders=ignore_dunders, ignore_hidden=ignore_hidden):
+            if self.notebook_cache is not None:
+                yield self.notebook_cache.get(
+                    file_path, outputs=outputs, store=False, code_location=self.key
+                )
+            else:
+                nb = load_notebook(file_path, outputs=outputs)
+                nb.code_location = self.key
+                yield nb
+
     def get_pyfiles(
         self,
         ignore_dunders: bool = True,
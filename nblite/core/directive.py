@@ -9,6 +9,7 @@ Directives are special comments in notebook cells that control behavior:
 
 from __future__ import annotations
 
+import bisect
 import io
 import re
 import tokenize
@@ -25,10 +26,12 @@ __all__ = [
     "Directive",
     "DirectiveDefinition",
     "DirectiveError",
+    "DirectiveScan",
     "register_directive",
     "get_directive_definition",
     "list_directive_definitions",
     "parse_directives_from_source",
+    "scan_directives",
     "get_unrecognized_directives",
 ]
 
@@ -157,14 +160,6 @@ def _is_code_line(line: str) -> bool:
     return True
 
 
-def _has_code_before(lines: list[str], line_num: int) -> bool:
-    """Check if there's any code before the given line number."""
-    for i in range(line_num):
-        if _is_code_line(lines[i]):
-            return True
-    return False
-
-
 def _get_string_ranges(source: str) -> list[tuple[int, int, int, int]]:
     """
     Get the ranges of all string literals in the source code.
@@ -206,206 +201,251 @@ def _get_string_ranges(source: str) -> list[tuple[int, int, int, int]]:
     return ranges
 
 
-def _is_position_in_string(
-    line_num_0indexed: int,
-    col: int,
-    string_ranges: list[tuple[int, int, int, int]],
-) -> bool:
+class _SourceIndex:
     """
-    Check if a position (line, col) falls inside any string range.
+    Precomputed lookups over a source string for directive parsing.
 
-    Args:
-        line_num_0indexed: 0-indexed line number
-        col: Column position (0-indexed)
-        string_ranges: List of (start_row, start_col, end_row, end_col),
-                       where rows are 1-indexed
+    String literal ranges are stored as sorted, non-overlapping absolute
+    offset intervals so containment checks are a single bisect, and the index
+    of the first code line is found once so topmatter checks are O(1).
 
-    Returns:
-        True if the position is inside a string literal
+    Attributes:
+        lines: Source split on newlines
+        string_ranges: String literal ranges as returned by _get_string_ranges
     """
-    # Convert to 1-indexed for comparison with tokenize output
-    line_num = line_num_0indexed + 1
-
-    for start_row, start_col, end_row, end_col in string_ranges:
-        # Check if position is within this string range
-        if start_row == end_row:
-            # Single-line string
-            if line_num == start_row and start_col <= col < end_col:
-                return True
-        else:
-            # Multi-line string
-            if line_num == start_row and col >= start_col:
-                return True
-            elif line_num == end_row and col < end_col:
-                return True
-            elif start_row < line_num < end_row:
-                return True
-    return False
 
+    def __init__(self, source: str) -> None:
+        self.lines = source.split("\n")
+        self.string_ranges = _get_string_ranges(source)
+
+        self._line_starts: list[int] = [0]
+        offset = 0
+        for line in self.lines[:-1]:
+            offset += len(line) + 1
+            self._line_starts.append(offset)
+
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start_row, start_col, end_row, end_col in self.string_ranges:
+            self._starts.append(self._line_starts[start_row - 1] + start_col)
+            self._ends.append(self._line_starts[end_row - 1] + end_col)
+
+        self._first_code_line: int | None = None
+
+    def offset_in_string(self, offset: int) -> bool:
+        """Check if an absolute offset into the source is inside a string literal."""
+        i = bisect.bisect_right(self._starts, offset) - 1
+        return i >= 0 and offset < self._ends[i]
+
+    def position_in_string(self, line_num_0indexed: int, col: int) -> bool:
+        """Check if a (line, col) position is inside a string literal."""
+        return self.offset_in_string(self._line_starts[line_num_0indexed] + col)
+
+    @property
+    def first_code_line(self) -> int:
+        """Index of the first line containing code, or len(lines) if none does."""
+        if self._first_code_line is None:
+            self._first_code_line = len(self.lines)
+            for i, line in enumerate(self.lines):
+                if _is_code_line(line):
+                    self._first_code_line = i
+                    break
+        return self._first_code_line
+
+    def has_code_before(self, line_num: int) -> bool:
+        """Check if there's any code before the given line number."""
+        return self.first_code_line < line_num
+
+
+@dataclass(frozen=True)
+class DirectiveScan:
+    """
+    Result of a single pass over a cell's source.
 
-def parse_directives_from_source(
+    Attributes:
+        directives: Directives found in the source, in order
+        source_without_directives: Source with directive lines removed
+        string_ranges: String literal ranges as returned by _get_string_ranges.
+                       Empty when the source contains no ``#|``, since
+                       tokenization is skipped entirely in that case.
+    """
+
+    directives: list[Directive]
+    source_without_directives: str
+    string_ranges: list[tuple[int, int, int, int]]
+
+
+def scan_directives(
     source: str,
     validate: bool = False,
     cell: Cell | None = None,
-) -> list[Directive]:
+    trigger_hooks: bool = True,
+) -> DirectiveScan:
     """
-    Parse all directives from cell source code.
+    Parse directives and strip directive lines in one pass over the source.
+
+    The source is tokenized at most once. Sources that contain no ``#|`` at all
+    are returned unchanged without tokenizing.
 
     Args:
         source: The cell source code
         validate: If True, validate topmatter requirements
         cell: Optional cell reference to attach to directives
+        trigger_hooks: If False, do not trigger DIRECTIVE_PARSED (for callers
+            that only need the stripped source)
 
     Returns:
-        List of Directive objects found in the source
+        DirectiveScan with directives, stripped source and string ranges
 
     Raises:
         DirectiveError: If validation fails (e.g., topmatter directive after code)
 
     Hooks triggered:
-        DIRECTIVE_PARSED: For each directive (directive=directive, cell=cell)
+        DIRECTIVE_PARSED: For each directive (directive=directive, cell=cell),
+            unless trigger_hooks is False
     """
+    if "#|" not in source:
+        return DirectiveScan(directives=[], source_without_directives=source, string_ranges=[])
+
     directives: list[Directive] = []
-    lines = source.split("\n")
+    result_lines: list[str] = []
 
-    # Get string ranges to avoid parsing directives inside strings
-    string_ranges = _get_string_ranges(source)
+    # Index string ranges to avoid parsing directives inside strings
+    index = _SourceIndex(source)
+    lines = index.lines
 
     i = 0
     while i < len(lines):
         line = lines[i]
         directive_start_line = i  # Track where directive starts
-        match = DIRECTIVE_PATTERN.match(line)
-
-        if match:
-            py_code = match.group("py_code") or ""
-
-            # Check if the #| is inside a string literal
-            # The #| starts at the end of py_code
-            directive_col = len(py_code)
-            if _is_position_in_string(directive_start_line, directive_col, string_ranges):
-                # Skip this match - it's inside a string
-                i += 1
-                continue
-
-            name = match.group("name")
-            value = match.group("value") or ""
-
-            # Handle multi-line continuation
-            while value.rstrip().endswith("\\") and i + 1 < len(lines):
-                # Remove trailing backslash and continue
-                value = value.rstrip()[:-1]
-                i += 1
-                next_line = lines[i]
-                # Strip leading # and whitespace from continuation line
-                continuation = next_line.lstrip()
-                if continuation.startswith("#"):
-                    continuation = continuation[1:].lstrip()
-                value += continuation
-
-            # Handle escaped backslashes (double backslash -> single)
-            value = value.replace("\\\\", "\x00")  # Temporary placeholder
-            value = value.replace("\\", "")  # Remove single backslashes (continuations)
-            value = value.replace("\x00", "\\")  # Restore escaped backslashes
-            value = value.strip()
-
-            # Determine if directive is in topmatter
-            # Topmatter = at top of cell before any code
-            # A directive with py_code (inline) is NOT in topmatter
-            has_inline_code = bool(py_code.strip())
-            has_code_above = _has_code_before(lines, directive_start_line)
-
-            is_topmatter = not has_inline_code and not has_code_above
-
-            directive = Directive(
-                name=name,
-                value=value,
-                line_num=directive_start_line,
-                py_code=py_code,
-                cell=cell,
-                _is_topmatter=is_topmatter,
-            )
-            directives.append(directive)
+        match = DIRECTIVE_PATTERN.match(line) if "#|" in line else None
+
+        if not match:
+            result_lines.append(line)
+            i += 1
+            continue
 
-            # Trigger DIRECTIVE_PARSED hook
+        py_code = match.group("py_code") or ""
+
+        # Check if the #| is inside a string literal
+        # The #| starts at the end of py_code
+        directive_col = len(py_code)
+        if index.position_in_string(directive_start_line, directive_col):
+            # Not a real directive - keep the line as-is
+            result_lines.append(line)
+            i += 1
+            continue
+
+        name = match.group("name")
+        value = match.group("value") or ""
+
+        # Handle multi-line continuation
+        while value.rstrip().endswith("\\") and i + 1 < len(lines):
+            # Remove trailing backslash and continue
+            value = value.rstrip()[:-1]
+            i += 1
+            next_line = lines[i]
+            # Strip leading # and whitespace from continuation line
+            continuation = next_line.lstrip()
+            if continuation.startswith("#"):
+                continuation = continuation[1:].lstrip()
+            value += continuation
+
+        # If there's code before the directive, keep just the code
+        has_inline_code = bool(py_code.strip())
+        if has_inline_code:
+            result_lines.append(py_code.rstrip())
+
+        # Handle escaped backslashes (double backslash -> single)
+        value = value.replace("\\\\", "\x00")  # Temporary placeholder
+        value = value.replace("\\", "")  # Remove single backslashes (continuations)
+        value = value.replace("\x00", "\\")  # Restore escaped backslashes
+        value = value.strip()
+
+        # Determine if directive is in topmatter
+        # Topmatter = at top of cell before any code
+        # A directive with py_code (inline) is NOT in topmatter
+        has_code_above = index.has_code_before(directive_start_line)
+
+        is_topmatter = not has_inline_code and not has_code_above
+
+        directive = Directive(
+            name=name,
+            value=value,
+            line_num=directive_start_line,
+            py_code=py_code,
+            cell=cell,
+            _is_topmatter=is_topmatter,
+        )
+        directives.append(directive)
+
+        # Trigger DIRECTIVE_PARSED hook
+        if trigger_hooks:
             HookRegistry.trigger(
                 HookType.DIRECTIVE_PARSED,
                 directive=directive,
                 cell=cell,
             )
 
-            # Validate if requested
-            if validate:
-                definition = get_directive_definition(name)
-                if definition:
-                    if definition.in_topmatter and not directive.is_in_topmatter():
-                        if has_inline_code and not definition.allows_inline:
-                            raise DirectiveError(
-                                f"Directive '{name}' must be in topmatter (found inline code: '{py_code.strip()}')"
-                            )
-                        elif has_code_above:
-                            raise DirectiveError(
-                                f"Directive '{name}' must be in topmatter (found after code)"
-                            )
+        # Validate if requested
+        if validate:
+            definition = get_directive_definition(name)
+            if definition:
+                if definition.in_topmatter and not directive.is_in_topmatter():
+                    if has_inline_code and not definition.allows_inline:
+                        raise DirectiveError(
+                            f"Directive '{name}' must be in topmatter (found inline code: '{py_code.strip()}')"
+                        )
+                    elif has_code_above:
+                        raise DirectiveError(
+                            f"Directive '{name}' must be in topmatter (found after code)"
+                        )
 
         i += 1
 
-    return directives
+    return DirectiveScan(
+        directives=directives,
+        source_without_directives="\n".join(result_lines),
+        string_ranges=index.string_ranges,
+    )
 
 
-def get_source_without_directives(source: str) -> str:
+def parse_directives_from_source(
+    source: str,
+    validate: bool = False,
+    cell: Cell | None = None,
+) -> list[Directive]:
     """
-    Remove all directive lines from source code.
+    Parse all directives from cell source code.
 
     Args:
         source: The cell source code
+        validate: If True, validate topmatter requirements
+        cell: Optional cell reference to attach to directives
 
     Returns:
-        Source with directive lines removed
+        List of Directive objects found in the source
+
+    Raises:
+        DirectiveError: If validation fails (e.g., topmatter directive after code)
+
+    Hooks triggered:
+        DIRECTIVE_PARSED: For each directive (directive=directive, cell=cell)
     """
-    lines = source.split("\n")
-    result_lines: list[str] = []
+    return scan_directives(source, validate=validate, cell=cell).directives
 
-    # Get string ranges to avoid treating directives inside strings as real directives
-    string_ranges = _get_string_ranges(source)
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        match = DIRECTIVE_PATTERN.match(line)
-
-        if match:
-            py_code = match.group("py_code") or ""
-
-            # Check if the #| is inside a string literal
-            directive_col = len(py_code)
-            if _is_position_in_string(i, directive_col, string_ranges):
-                # Not a real directive - keep the line as-is
-                result_lines.append(line)
-                i += 1
-                continue
-
-            value = match.group("value") or ""
-
-            # Skip continuation lines
-            while value.rstrip().endswith("\\") and i + 1 < len(lines):
-                value = value.rstrip()[:-1]
-                i += 1
-                next_line = lines[i]
-                continuation = next_line.lstrip()
-                if continuation.startswith("#"):
-                    continuation = continuation[1:].lstrip()
-                value += continuation
-
-            # If there's code before the directive, keep just the code
-            if py_code.strip():
-                result_lines.append(py_code.rstrip())
-        else:
-            result_lines.append(line)
+def get_source_without_directives(source: str) -> str:
+    """
+    Remove all directive lines from source code.
 
-        i += 1
+    Args:
+        source: The cell source code
 
-    return "\n".join(result_lines)
+    Returns:
+        Source with directive lines removed
+    """
+    return scan_directives(source, trigger_hooks=False).source_without_directives
 
 
 # ============================================================================
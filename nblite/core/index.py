@@ -0,0 +1,314 @@
+"""
+Persistent project index for nblite.
+
+Caches a directive summary of every notebook in a project on disk (under
+``.nblite/cache`` by default) so that commands only re-parse notebooks whose
+files changed since the last run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from nblite.core.directive import get_directive_definition
+from nblite.utils.tracing import count
+
+if TYPE_CHECKING:
+    from nblite.core.notebook import Notebook
+    from nblite.core.notebook_cache import NotebookCache
+
+__all__ = ["NotebookSummary", "ProjectIndex"]
+
+# Bump when the summary layout or the way it is computed changes
+INDEX_VERSION = 1
+INDEX_FILENAME = "index.json"
+
+# Files modified this recently may be edited again within the same mtime tick,
+# so their stat is not trusted on its own and the content hash is checked too
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class NotebookSummary:
+    """
+    Directive summary of a notebook, as stored in the project index.
+
+    Attributes:
+        size: File size in bytes
+        mtime_ns: File modification time in nanoseconds
+        sha256: SHA-256 of the file contents
+        default_exp: Module from #|default_exp, or None
+        export_targets: Target modules of exported cells, in notebook order
+            ("" means #|export without #|default_exp)
+        export_to_modules: Modules named by #|export_to directives
+        is_function_notebook: Whether the notebook has #|export_as_func true
+        directives: (name, line_num) of every directive, in cell order
+        cell_hashes: SHA-256 of each cell's type and source
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+    default_exp: str | None = None
+    export_targets: list[str] = field(default_factory=list)
+    export_to_modules: list[str] = field(default_factory=list)
+    is_function_notebook: bool = False
+    directives: list[tuple[str, int]] = field(default_factory=list)
+    cell_hashes: list[str] = field(default_factory=list)
+
+    @property
+    def unrecognized_directives(self) -> list[tuple[str, int]]:
+        """
+        Directives with no registered definition, as (name, line_num).
+
+        Checked against the current directive registry rather than cached, so
+        directives registered by extensions are taken into account.
+        """
+        return [
+            (name, line_num)
+            for name, line_num in self.directives
+            if get_directive_definition(name) is None
+        ]
+
+    @classmethod
+    def from_notebook(
+        cls,
+        notebook: Notebook,
+        size: int,
+        mtime_ns: int,
+        sha256: str,
+    ) -> NotebookSummary:
+        """
+        Summarize a loaded notebook.
+
+        Args:
+            notebook: Notebook to summarize
+            size: File size in bytes
+            mtime_ns: File modification time in nanoseconds
+            sha256: SHA-256 of the file contents
+
+        Returns:
+            NotebookSummary instance
+        """
+        directives: list[tuple[str, int]] = []
+        export_to_modules: list[str] = []
+        cell_hashes: list[str] = []
+        for cell in notebook.cells:
+            for directive_list in cell.directives.values():
+                for directive in directive_list:
+                    directives.append((directive.name, directive.line_num))
+                    if directive.name == "export_to" and directive.value_parsed:
+                        module = directive.value_parsed.get("module", "")
+                        if module and module not in export_to_modules:
+                            export_to_modules.append(module)
+            cell_hashes.append(
+                hashlib.sha256(f"{cell.cell_type}\n{cell.source}".encode()).hexdigest()
+            )
+
+        return cls(
+            size=size,
+            mtime_ns=mtime_ns,
+            sha256=sha256,
+            default_exp=notebook.default_exp,
+            export_targets=list(notebook.export_summary.targets),
+            export_to_modules=export_to_modules,
+            is_function_notebook=notebook.export_summary.is_function_notebook,
+            directives=directives,
+            cell_hashes=cell_hashes,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> NotebookSummary:
+        """Create from a dictionary produced by to_dict."""
+        data = dict(data)
+        data["directives"] = [(name, line_num) for name, line_num in data["directives"]]
+        return cls(**data)
+
+
+class ProjectIndex:
+    """
+    Notebook summaries for a project, persisted between runs.
+
+    Entries are keyed by the notebook path relative to the project root and
+    validated against the file's size and mtime. When those change, the
+    content hash is compared before re-parsing, so touching a file without
+    editing it does not trigger a parse.
+
+    Attributes:
+        root_path: Project root directory
+        cache_dir: Directory holding the index file, or None to keep the
+                   index in memory only
+        notebook_cache: Cache that changed notebooks are loaded through, so the
+                        parse is shared with later steps (e.g. export)
+        parse_count: Number of notebooks parsed (cache misses) by this instance
+
+    Example:
+        >>> index = ProjectIndex(project.root_path, project.root_path / ".nblite/cache")
+        >>> summary = index.get(Path("nbs/core.ipynb"))
+        >>> summary.default_exp
+        'core'
+        >>> index.save()
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        cache_dir: Path | None = None,
+        notebook_cache: NotebookCache | None = None,
+    ) -> None:
+        self.root_path = Path(root_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.notebook_cache = notebook_cache
+        self.parse_count = 0
+        self._entries: dict[str, NotebookSummary] | None = None
+        self._dirty = False
+
+    @property
+    def index_path(self) -> Path | None:
+        """Path of the index file, or None for an in-memory index."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / INDEX_FILENAME
+
+    def _key(self, path: Path) -> str:
+        """Index key for a notebook path."""
+        try:
+            return path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _load(self) -> dict[str, NotebookSummary]:
+        """Load entries from disk, starting empty if the index is missing or stale."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        index_path = self.index_path
+        if index_path is None or not index_path.exists():
+            return self._entries
+
+        from nblite import __version__
+
+        try:
+            data = json.loads(index_path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION or data.get("nblite") != __version__:
+                return self._entries
+            for key, entry in data["notebooks"].items():
+                self._entries[key] = NotebookSummary.from_dict(entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            # A corrupt index is just a cold cache
+            self._entries = {}
+        return self._entries
+
+    def get(self, path: Path | str) -> NotebookSummary:
+        """
+        Get the summary of a notebook, re-parsing it only if the file changed.
+
+        Args:
+            path: Path to the notebook file
+
+        Returns:
+            NotebookSummary for the current file contents
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        from nblite.core.notebook import Notebook
+
+        path = Path(path)
+        entries = self._load()
+        key = self._key(path)
+        stat = path.stat()
+
+        entry = entries.get(key)
+        if (
+            entry is not None
+            and entry.size == stat.st_size
+            and entry.mtime_ns == stat.st_mtime_ns
+            and time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS
+        ):
+            return entry
+
+        data = path.read_bytes()
+        count("files.read", path=path)
+        count("bytes.read", len(data))
+        sha256 = hashlib.sha256(data).hexdigest()
+        if entry is not None and entry.sha256 == sha256:
+            if entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                return entry
+            # Touched but not edited
+            entry.size = stat.st_size
+            entry.mtime_ns = stat.st_mtime_ns
+        else:
+            if self.notebook_cache is not None:
+                notebook = self.notebook_cache.get(path, outputs=False)
+            else:
+                notebook = Notebook.from_file(path, outputs=False)
+            entry = NotebookSummary.from_notebook(
+                notebook, size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha256=sha256
+            )
+            self.parse_count += 1
+
+        entries[key] = entry
+        self._dirty = True
+        return entry
+
+    def invalidate(self, path: Path | str | None = None) -> None:
+        """
+        Drop cached summaries.
+
+        Args:
+            path: Notebook whose summary to drop (all summaries if None)
+        """
+        entries = self._load()
+        if path is None:
+            entries.clear()
+        else:
+            entries.pop(self._key(Path(path)), None)
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the index to disk if it changed.
+
+        Entries for notebooks that no longer exist are dropped. Does nothing
+        for an in-memory index.
+        """
+        index_path = self.index_path
+        if index_path is None or not self._dirty or self._entries is None:
+            return
+
+        from nblite import __version__
+
+        for key in [k for k in self._entries if not (self.root_path / k).exists()]:
+            del self._entries[key]
+
+        assert self.cache_dir is not None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+
+        data = {
+            "version": INDEX_VERSION,
+            "nblite": __version__,
+            "notebooks": {key: entry.to_dict() for key, entry in sorted(self._entries.items())},
+        }
+        tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+        self._dirty = False
+
+    def __repr__(self) -> str:
+        n_entries = len(self._entries) if self._entries is not None else 0
+        return f"ProjectIndex(root_path={self.root_path!r}, entries={n_entries})"
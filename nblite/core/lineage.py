@@ -0,0 +1,180 @@
+"""
+Lineage index for nblite projects.
+
+Maps files to the code locations containing them, and notebooks to their
+twins along the export pipeline. Built once per project from its config, so
+lookups neither loop over code locations nor walk the pipeline graph.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from nblite.config.schema import CodeLocationFormat
+
+if TYPE_CHECKING:
+    from nblite.config.schema import ExportRule
+    from nblite.core.code_location import CodeLocation
+
+__all__ = ["LineageIndex"]
+
+
+def _path_contains_dunder(path: Path) -> bool:
+    """Check if any part of the path starts with double underscores."""
+    return any(part.startswith("__") for part in path.parts)
+
+
+class _TrieNode:
+    """Node of the code location trie, one per path component."""
+
+    __slots__ = ("children", "locations")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        # Code locations whose path ends at this node, in config order
+        self.locations: list[CodeLocation] = []
+
+
+class LineageIndex:
+    """
+    Code location and twin lookups for a project.
+
+    Code locations are stored in a trie of their path components, so finding
+    the location of a file costs one dict lookup per component of its path.
+    The locations downstream of each location are precomputed from the export
+    pipeline, and the twins of each notebook are computed once.
+
+    Example:
+        >>> lineage = LineageIndex(project.code_locations, project.config.export_pipeline)
+        >>> lineage.location_of(project.root_path / "nbs" / "core.ipynb").key
+        'nbs'
+        >>> [cl.key for cl in lineage.downstream("nbs")]
+        ['pts', 'lib']
+    """
+
+    def __init__(
+        self, code_locations: dict[str, CodeLocation], export_rules: list[ExportRule]
+    ) -> None:
+        """
+        Build the index.
+
+        Args:
+            code_locations: Code locations by key
+            export_rules: Rules of the export pipeline
+        """
+        self._root = _TrieNode()
+        for cl in code_locations.values():
+            node = self._root
+            for part in cl.path.parts:
+                node = node.children.setdefault(part, _TrieNode())
+            node.locations.append(cl)
+
+        targets: dict[str, list[CodeLocation]] = {key: [] for key in code_locations}
+        for rule in export_rules:
+            if rule.from_key in targets and rule.to_key in code_locations:
+                targets[rule.from_key].append(code_locations[rule.to_key])
+        self._downstream = {key: self._walk(key, targets) for key in code_locations}
+        self._twins: dict[tuple[Path, str | None], list[tuple[CodeLocation, Path]]] = {}
+
+    @staticmethod
+    def _walk(start_key: str, targets: dict[str, list[CodeLocation]]) -> list[CodeLocation]:
+        """Locations reachable from start_key, in breadth-first order."""
+        visited = {start_key}
+        reachable: list[CodeLocation] = []
+        to_visit = deque([start_key])
+        while to_visit:
+            for cl in targets[to_visit.popleft()]:
+                if cl.key not in visited:
+                    visited.add(cl.key)
+                    reachable.append(cl)
+                    to_visit.append(cl.key)
+        return reachable
+
+    def location_of(self, path: Path, notebook_only: bool = False) -> CodeLocation | None:
+        """
+        Find the code location containing a path.
+
+        Paths are matched by their components, like Path.relative_to. Where
+        code locations are nested, the innermost one is returned.
+
+        Args:
+            path: File or directory path
+            notebook_only: Only consider notebook code locations
+
+        Returns:
+            The code location, or None if no location contains path
+        """
+        node = self._root
+        found: CodeLocation | None = None
+        for part in path.parts:
+            child = node.children.get(part)
+            if child is None:
+                break
+            node = child
+            for cl in node.locations:
+                if cl.is_notebook or not notebook_only:
+                    found = cl
+                    break
+        return found
+
+    def downstream(self, key: str) -> list[CodeLocation]:
+        """
+        Get the code locations a location exports to, directly or indirectly.
+
+        Args:
+            key: Code location key
+
+        Returns:
+            Downstream code locations in breadth-first order (empty for
+            unknown keys)
+        """
+        return list(self._downstream.get(key, []))
+
+    def twins(self, source_path: Path, default_exp: str | None) -> list[tuple[CodeLocation, Path]]:
+        """
+        Get the twins of a notebook along the export pipeline.
+
+        Notebook twins keep the notebook's path within their location. The
+        module twin is named after default_exp, and is omitted without one or
+        for notebooks in dunder folders or files.
+
+        Args:
+            source_path: Notebook path
+            default_exp: The notebook's #|default_exp module, or None
+
+        Returns:
+            (code location, twin path) pairs, in pipeline order
+        """
+        key = (source_path, default_exp)
+        twins = self._twins.get(key)
+        if twins is None:
+            twins = self._twins[key] = self._find_twins(source_path, default_exp)
+        return list(twins)
+
+    def _find_twins(
+        self, source_path: Path, default_exp: str | None
+    ) -> list[tuple[CodeLocation, Path]]:
+        source_cl = self.location_of(source_path)
+        if source_cl is None:
+            return []
+
+        rel_path = source_path.relative_to(source_cl.path)
+        stem = rel_path.stem
+        if stem.endswith(".pct"):
+            stem = stem[:-4]
+
+        twins: list[tuple[CodeLocation, Path]] = []
+        for cl in self._downstream[source_cl.key]:
+            if cl.format == CodeLocationFormat.MODULE:
+                # Dunder notebooks and notebooks without #|default_exp
+                # have no module twin
+                if default_exp is None or _path_contains_dunder(rel_path):
+                    continue
+                twin_path = cl.path / (default_exp.replace(".", "/") + cl.file_ext)
+            else:
+                # Notebook twins preserve the directory structure
+                twin_path = cl.path / rel_path.parent / (stem + cl.file_ext)
+            twins.append((cl, twin_path))
+        return twins
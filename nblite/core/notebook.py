@@ -7,15 +7,22 @@ Extends notebookx notebook functionality with directive parsing.
 from __future__ import annotations
 
 import json
+import os
+import re
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import notebookx
 
 from nblite.core.cell import Cell
 from nblite.core.directive import Directive, DirectiveError
+from nblite.utils.files import write_if_changed
+from nblite.utils.tracing import count, span, tracing_enabled
+
+if TYPE_CHECKING:
+    from nblite.export.summary import ExportSummary
 
 __all__ = ["Notebook", "Format", "FormatError"]
 
@@ -113,6 +120,163 @@ class Format(Enum):
             raise FormatError(f"Invalid notebookx format '{fmt}'")
 
 
+# Characters that matter for locating cell outputs in ipynb JSON text.
+# Numbers, literals and commas are irrelevant and skipped over.
+_JSON_STRUCTURE_PATTERN = re.compile(r'["\[\]{}:]')
+
+# Characters of ipynb text read at a time when skipping outputs
+_READ_CHUNK_SIZE = 1 << 20
+
+
+class _OutputSkipper:
+    """
+    Copy ipynb JSON text fed in chunks, replacing every cell's ``outputs`` with ``[]``.
+
+    Nothing is decoded: strings are skipped with ``str.find``, and text inside
+    outputs arrays is dropped as it is scanned. Only the text outside outputs
+    and the current chunk are held, so large outputs (base64 images, HTML
+    tables) never have to fit in memory.
+    """
+
+    def __init__(self) -> None:
+        self.pieces: list[str] = []
+        self.depth = 0
+        self.cells_open = False  # Inside the top-level "cells" array (depth 2)
+        self.prev_string: str | None = None
+        self.key: str | None = None
+        self.skip_depth: int | None = None
+        # Open string: its first characters (keys are short) and the number
+        # of backslashes it currently ends with
+        self.string_head: str | None = None
+        self.backslashes = 0
+
+    def feed(self, text: str) -> None:
+        """Scan the next chunk of text."""
+        pos = 0
+        keep_start: int | None = 0 if self.skip_depth is None else None
+
+        while True:
+            if self.string_head is not None:
+                pos = self._scan_string(text, pos)
+                if pos == len(text):
+                    break
+                continue
+
+            match = _JSON_STRUCTURE_PATTERN.search(text, pos)
+            if match is None:
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char == '"':
+                self.string_head = '"'
+                self.backslashes = 0
+                continue
+
+            if self.skip_depth is not None:
+                # Inside an outputs array: only track nesting until it closes
+                if char in "[{":
+                    self.depth += 1
+                elif char in "]}":
+                    self.depth -= 1
+                    if self.depth == self.skip_depth:
+                        self.pieces.append("[]")
+                        keep_start = pos
+                        self.skip_depth = None
+                continue
+
+            if char == ":":
+                self.key = self.prev_string
+                self.prev_string = None
+                continue
+            self.prev_string = None
+
+            if char in "[{":
+                if char == "[" and self.key == '"outputs"' and self.cells_open and self.depth == 3:
+                    self.skip_depth = self.depth
+                    if keep_start is not None:
+                        self.pieces.append(text[keep_start : match.start()])
+                    keep_start = None
+                elif char == "[" and self.key == '"cells"' and self.depth == 1:
+                    self.cells_open = True
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 1:
+                    self.cells_open = False
+            self.key = None
+
+        if keep_start is not None:
+            self.pieces.append(text[keep_start:])
+
+    def _scan_string(self, text: str, pos: int) -> int:
+        """Scan the open string from pos; returns where scanning continues."""
+        assert self.string_head is not None
+        end = text.find('"', pos)
+        stop = len(text) if end == -1 else end
+        # Only short strings can be the keys we look for
+        if len(self.string_head) <= 9:
+            self.string_head += text[pos : min(stop + 1, pos + 10)]
+
+        # Count the backslashes right before stop, carrying over a run that
+        # started in an earlier chunk
+        run = stop - pos - len(text[pos:stop].rstrip("\\"))
+        backslashes = run + self.backslashes if run == stop - pos else run
+        if end == -1:
+            self.backslashes = backslashes
+            return len(text)
+
+        self.backslashes = 0
+        if backslashes % 2 == 0:
+            # Unescaped quote: the string is closed
+            head = self.string_head
+            self.prev_string = head if len(head) <= 9 else ""
+            self.key = None
+            self.string_head = None
+        return end + 1
+
+    def result(self) -> str:
+        """The scanned text with outputs emptied."""
+        if self.string_head is not None:
+            raise ValueError("Failed to parse content: unterminated string in ipynb JSON")
+        return "".join(self.pieces)
+
+
+def _load_ipynb_dict(path: Path, outputs: bool = True) -> dict[str, Any]:
+    """
+    Read an ipynb file straight into its JSON dictionary.
+
+    Args:
+        path: Path to the ipynb file
+        outputs: If False, cell outputs are skipped while the file is read,
+            without being decoded or held in memory
+
+    Returns:
+        Notebook dictionary
+
+    Raises:
+        ValueError: If the file is not valid notebook JSON
+    """
+    if outputs:
+        with open(path, "rb") as f:
+            raw = f.read()
+        count("files.read", path=path)
+        count("bytes.read", len(raw))
+        data = json.loads(raw)
+    else:
+        # Outputs are dropped while reading, so they are never held in memory
+        skipper = _OutputSkipper()
+        with open(path, encoding="utf-8-sig") as f:
+            count("files.read", path=path)
+            count("bytes.read", os.fstat(f.fileno()).st_size)
+            while chunk := f.read(_READ_CHUNK_SIZE):
+                skipper.feed(chunk)
+        data = json.loads(skipper.result())
+    if not isinstance(data, dict) or not isinstance(data.get("cells", []), list):
+        raise ValueError(f"Failed to parse content: '{path}' is not a valid ipynb notebook")
+    return data
+
+
 @dataclass
 class Notebook:
     """
@@ -151,39 +315,65 @@ class Notebook:
     nbformat_minor: int = 5
     source_path: Path | None = None
     code_location: str | None = None
+    outputs_loaded: bool = field(default=True, repr=False)
 
     _directives: dict[str, list[Directive]] | None = field(default=None, repr=False, init=False)
+    _export_summary: ExportSummary | None = field(
+        default=None, repr=False, init=False, compare=False
+    )
+    _summarized_sources: list[str] | None = field(
+        default=None, repr=False, init=False, compare=False
+    )
 
     @classmethod
     def from_file(
         cls,
         path: Path | str,
         format: str | None = None,
+        *,
+        outputs: bool = True,
     ) -> Notebook:
         """
         Load notebook from file with directive parsing.
 
+        ipynb files are read directly as JSON; other formats are converted
+        to ipynb through notebookx first.
+
         Args:
             path: Path to notebook file
             format: Format hint (ipynb, percent). Auto-detected if None.
+            outputs: If False, skip cell outputs without decoding them. Use this
+                for export-only loads, which never look at outputs. The returned
+                notebook has ``outputs_loaded=False`` and cannot be written back
+                as ipynb.
 
         Returns:
             Notebook instance
         """
         path = Path(path)
-
-        if format is None:
-            format = Format.from_path(path)
-
-        # Use notebookx to load and convert to ipynb JSON
-        nbx_format = Format.to_notebookx(format)
-        nbx_nb = notebookx.Notebook.from_file(str(path), nbx_format)
-
-        # Get the ipynb JSON representation
-        ipynb_str = nbx_nb.to_string(notebookx.Format.Ipynb)
-        data = json.loads(ipynb_str)
-
-        return cls.from_dict(data, source_path=path)
+        with span("notebook.parse", path=path):
+            if format is None:
+                format = Format.from_path(path)
+
+            # ipynb is already JSON: load it directly instead of round-tripping
+            # through notebookx (parse -> serialize -> parse)
+            if Format.validate(format) == Format.IPYNB.value:
+                notebook = cls.from_dict(_load_ipynb_dict(path, outputs=outputs), source_path=path)
+                notebook.outputs_loaded = outputs
+                return notebook
+
+            # Use notebookx to load and convert to ipynb JSON
+            nbx_format = Format.to_notebookx(format)
+            nbx_nb = notebookx.Notebook.from_file(str(path), nbx_format)
+            if tracing_enabled():
+                count("files.read", path=path)
+                count("bytes.read", path.stat().st_size)
+
+            # Get the ipynb JSON representation
+            ipynb_str = nbx_nb.to_string(notebookx.Format.Ipynb)
+            data = json.loads(ipynb_str)
+
+            return cls.from_dict(data, source_path=path)
 
     @classmethod
     def from_string(
@@ -297,7 +487,13 @@ class Notebook:
 
         Returns:
             Notebook content as string
+
+        Raises:
+            ValueError: If serializing to ipynb a notebook loaded without outputs
         """
+        if Format.validate(format) == Format.IPYNB.value:
+            self._check_outputs_loaded("serialize to ipynb")
+
         # Convert to ipynb JSON first
         ipynb_str = json.dumps(self.to_dict(), indent=2)
 
@@ -326,7 +522,7 @@ class Notebook:
             format = Format.from_path(path)
 
         content = self.to_string(format, no_header=no_header)
-        path.write_text(content)
+        write_if_changed(path, content)
 
     def clean(
         self,
@@ -366,7 +562,12 @@ class Notebook:
 
         Returns:
             New Notebook instance with cleaned content
+
+        Raises:
+            ValueError: If the notebook was loaded without outputs
         """
+        self._check_outputs_loaded("clean")
+
         # Convert to notebookx Notebook
         nbx_nb = self.to_notebookx()
 
@@ -399,6 +600,14 @@ class Notebook:
         # Apply any #|cell-id directives to override normalized IDs
         return cleaned_nb._apply_cell_id_directives()
 
+    def _check_outputs_loaded(self, action: str) -> None:
+        """Raise if the notebook was loaded with outputs skipped."""
+        if not self.outputs_loaded:
+            raise ValueError(
+                f"Cannot {action} notebook '{self.source_path}': it was loaded with "
+                f"outputs=False. Reload it with outputs to avoid losing cell outputs."
+            )
+
     def _apply_cell_id_directives(self) -> Notebook:
         """
         Apply #|cell_id directives to set custom cell IDs.
@@ -471,6 +680,7 @@ class Notebook:
             nbformat_minor=self.nbformat_minor,
             source_path=self.source_path,
             code_location=self.code_location,
+            outputs_loaded=self.outputs_loaded,
         )
 
         # Update notebook references in cells
@@ -500,6 +710,28 @@ class Notebook:
                     self._directives[name] = []
                 self._directives[name].extend(cell_directives)
 
+    @property
+    def export_summary(self) -> ExportSummary:
+        """
+        Export summary of the notebook (see ExportSummary).
+
+        Computed once and shared by every export of the notebook. It is
+        recomputed whenever a cell's ``source`` has been reassigned or cells
+        were added or removed.
+        """
+        sources = self._summarized_sources
+        if (
+            self._export_summary is None
+            or sources is None
+            or len(sources) != len(self.cells)
+            or any(cell.source is not src for cell, src in zip(self.cells, sources, strict=True))
+        ):
+            from nblite.export.summary import ExportSummary
+
+            self._export_summary = ExportSummary.from_notebook(self)
+            self._summarized_sources = [cell.source for cell in self.cells]
+        return self._export_summary
+
     def get_directive(self, name: str) -> Directive | None:
         """
         Get the first (or only) directive with the given name.
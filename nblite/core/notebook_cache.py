@@ -0,0 +1,284 @@
+"""
+In-memory notebook cache for nblite.
+
+Commands that chain several steps (export rules, clean, twin lookups, staging
+checks) used to load the same notebook files repeatedly. NotebookCache keeps
+parsed Notebook objects for the lifetime of a project, so each file is parsed
+at most once while it is unchanged.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from nblite.core.index import _RACY_WINDOW_NS
+
+if TYPE_CHECKING:
+    from nblite.core.notebook import Notebook
+
+# Maps a function over items, like the builtin map or Executor.map
+MapFunction = Callable[[Callable[[Path], "Notebook"], Iterable[Path]], Iterator["Notebook"]]
+
+
+def load_notebook(path: Path, outputs: bool = True) -> Notebook:
+    """
+    Load a notebook from disk, without a cache.
+
+    A module-level function, so that process pools can run it. Errors get a
+    note naming the notebook (on Python 3.11+), since they are often raised
+    far from the loop that requested it.
+
+    Args:
+        path: Path to the notebook file
+        outputs: If False, skip cell outputs (see Notebook.from_file)
+
+    Returns:
+        Notebook instance
+    """
+    from nblite.core.notebook import Notebook
+
+    try:
+        return Notebook.from_file(path, outputs=outputs)
+    except Exception as e:
+        if hasattr(e, "add_note"):
+            e.add_note(f"While loading notebook {path}")
+        raise
+
+
+__all__ = ["NotebookCache"]
+
+
+@dataclass
+class _CacheEntry:
+    """
+    A loaded notebook and the stat of the file it was loaded from.
+
+    sha256 is the content hash of a file that was modified within the racy
+    window when it was loaded, as its stat alone does not show a rewrite in
+    the same mtime tick. It is None once the stat can be trusted.
+    """
+
+    size: int
+    mtime_ns: int
+    notebook: Notebook
+    sha256: str | None = None
+
+
+def _racy_hash(path: Path, stat: os.stat_result) -> str | None:
+    """Content hash of a file modified within the racy window, else None."""
+    if time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS:
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class NotebookCache:
+    """
+    Parsed notebooks keyed by path, validated against file size and mtime.
+
+    A notebook loaded with outputs also serves later requests that do not
+    need them; a notebook loaded without outputs is re-read when outputs are
+    requested. Files modified within the last two seconds are also checked
+    against a hash of their content, since a rewrite within the same mtime
+    tick and with the same size is not detected from the stat alone. Code
+    that writes a notebook file should still call invalidate().
+
+    Cached notebooks are shared between callers and must not be modified.
+    Their code_location is set when they are loaded; a request for another
+    code location gets a shallow copy.
+
+    Attributes:
+        load_outputs: If True, always load outputs, even for requests that do
+            not need them (useful when a later step will need them anyway)
+        load_count: Number of notebook files parsed (cache misses)
+
+    Example:
+        >>> cache = NotebookCache()
+        >>> nb = cache.get(Path("nbs/core.ipynb"))
+        >>> cache.get(Path("nbs/core.ipynb"), outputs=False) is nb
+        True
+        >>> cache.load_count
+        1
+    """
+
+    def __init__(self, load_outputs: bool = False) -> None:
+        self.load_outputs = load_outputs
+        self.load_count = 0
+        self._entries: dict[Path, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Path | str) -> Path:
+        """Cache key for a notebook path."""
+        return Path(os.path.abspath(path))
+
+    def get(
+        self,
+        path: Path | str,
+        format: str | None = None,
+        *,
+        outputs: bool = True,
+        store: bool = True,
+        code_location: str | None = None,
+    ) -> Notebook:
+        """
+        Get a notebook, loading it only if it is not cached or the file changed.
+
+        Args:
+            path: Path to the notebook file
+            format: Format hint (ipynb, percent). Auto-detected if None.
+            outputs: If False, the notebook may be loaded without cell outputs
+                (see Notebook.from_file)
+            store: If False, a notebook that has to be loaded is not kept in
+                the cache (for one-pass scans over many notebooks)
+            code_location: Code location key to set on the notebook
+
+        Returns:
+            Notebook instance (shared; do not modify)
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        from nblite.core.notebook import Notebook
+
+        key = self._key(path)
+        stat = key.stat()
+        with self._lock:
+            entry = self._entries.get(key)
+        if self._is_fresh(entry, key, stat, outputs):
+            assert entry is not None
+            return self._for_location(entry, code_location)
+
+        sha256 = _racy_hash(key, stat)
+        notebook = Notebook.from_file(key, format, outputs=outputs or self.load_outputs)
+        notebook.code_location = code_location
+        with self._lock:
+            if store:
+                self._entries[key] = _CacheEntry(stat.st_size, stat.st_mtime_ns, notebook, sha256)
+            self.load_count += 1
+        return notebook
+
+    def get_many(
+        self,
+        paths: list[Path],
+        *,
+        outputs: bool = True,
+        map_fn: MapFunction = map,
+        code_location: str | None = None,
+    ) -> list[Notebook]:
+        """
+        Get several notebooks, loading those not cached with map_fn.
+
+        Args:
+            paths: Paths to the notebook files
+            outputs: If False, notebooks may be loaded without cell outputs
+            map_fn: Applies the loader to the missing paths (the builtin map,
+                or the map of a thread or process pool)
+            code_location: Code location key to set on the notebooks
+
+        Returns:
+            Notebooks in the order of paths (shared; do not modify)
+
+        Raises:
+            FileNotFoundError: If a file does not exist
+            Exception: The error of the first path (in order) that failed to
+                load, as raised by Notebook.from_file
+        """
+        keys = [self._key(path) for path in paths]
+        stats = {key: key.stat() for key in keys}
+        notebooks: dict[Path, Notebook] = {}
+        missing: list[Path] = []
+        for key, stat in stats.items():
+            with self._lock:
+                entry = self._entries.get(key)
+            if self._is_fresh(entry, key, stat, outputs):
+                assert entry is not None
+                notebooks[key] = self._for_location(entry, code_location)
+            else:
+                missing.append(key)
+
+        hashes = {key: _racy_hash(key, stats[key]) for key in missing}
+        loader = partial(load_notebook, outputs=outputs or self.load_outputs)
+        for key, notebook in zip(missing, map_fn(loader, missing), strict=True):
+            stat = stats[key]
+            notebook.code_location = code_location
+            with self._lock:
+                self._entries[key] = _CacheEntry(
+                    stat.st_size, stat.st_mtime_ns, notebook, hashes[key]
+                )
+                self.load_count += 1
+            notebooks[key] = notebook
+        return [notebooks[key] for key in keys]
+
+    @staticmethod
+    def _is_fresh(
+        entry: _CacheEntry | None, path: Path, stat: os.stat_result, outputs: bool
+    ) -> bool:
+        """Check a cache entry still matches its file and has the outputs needed."""
+        if (
+            entry is None
+            or entry.size != stat.st_size
+            or entry.mtime_ns != stat.st_mtime_ns
+            or not (entry.notebook.outputs_loaded or not outputs)
+        ):
+            return False
+        if entry.sha256 is None:
+            return True
+        if hashlib.sha256(path.read_bytes()).hexdigest() != entry.sha256:
+            return False
+        if time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS:
+            # Any later rewrite will change the mtime
+            entry.sha256 = None
+        return True
+
+    def _for_location(self, entry: _CacheEntry, code_location: str | None) -> Notebook:
+        """
+        A cached notebook, or a shallow copy of it for another code location.
+
+        A copy made for a notebook loaded without a code location replaces it
+        in the cache, so later requests for that location share it.
+        """
+        notebook = entry.notebook
+        if code_location is None or notebook.code_location == code_location:
+            return notebook
+        located = copy.copy(notebook)
+        located.code_location = code_location
+        if notebook.code_location is None:
+            with self._lock:
+                if entry.notebook is notebook:
+                    entry.notebook = located
+                return entry.notebook
+        return located
+
+    def invalidate(self, path: Path | str | None = None) -> None:
+        """
+        Drop cached notebooks.
+
+        Args:
+            path: Notebook file to drop (all notebooks if None)
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(path), None)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, (str, Path)):
+            return False
+        with self._lock:
+            return self._key(path) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"NotebookCache(entries={len(self._entries)}, load_count={self.load_count})"
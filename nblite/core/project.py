@@ -6,31 +6,38 @@ Central project management class that coordinates all nblite functionality.
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from nblite.config import NbliteConfig, find_config_file, load_config, parse_export_pipeline
-from nblite.config.schema import CodeLocationFormat
+from nblite.config.schema import CodeLocationFormat, ExportRule
 from nblite.core.code_location import CodeLocation
+from nblite.core.index import ProjectIndex
+from nblite.core.lineage import LineageIndex, _path_contains_dunder
 from nblite.core.notebook import Format, Notebook
+from nblite.core.notebook_cache import NotebookCache
 from nblite.core.pyfile import PyFile
-from nblite.export.function_export import is_function_notebook
+from nblite.export.manifest import ExportManifest, hash_export_options
 from nblite.export.pipeline import (
     ExportResult,
     export_notebook_to_module,
     export_notebook_to_notebook,
     export_notebooks_to_module,
-    get_export_targets,
 )
+from nblite.export.scheduler import ExportTask, batch_by_output, schedule_rule_waves
 from nblite.extensions import HookRegistry, HookType, load_extension
+from nblite.utils.files import WriteStatus, write_if_changed
+from nblite.utils.tracing import count, propagate, span, traced
 
-__all__ = ["NbliteProject", "NotebookLineage"]
-
+if TYPE_CHECKING:
+    from nblite.fill.cache import FillStateCache
 
-def _path_contains_dunder(path: Path) -> bool:
-    """Check if any part of the path starts with double underscores."""
-    return any(part.startswith("__") for part in path.parts)
+__all__ = ["NbliteProject", "NotebookLineage"]
 
 
 @dataclass
@@ -86,9 +93,20 @@ class NbliteProject:
     config: NbliteConfig
 
     _code_locations: dict[str, CodeLocation] | None = field(default=None, repr=False, init=False)
+    _index: ProjectIndex | None = field(default=None, repr=False, init=False)
+    _lineage: LineageIndex | None = field(default=None, repr=False, init=False)
+    _notebook_cache: NotebookCache | None = field(default=None, repr=False, init=False)
+    _export_manifest: ExportManifest | None = field(default=None, repr=False, init=False)
+    _fill_state: FillStateCache | None = field(default=None, repr=False, init=False)
     _loaded_extensions: list[Any] = field(default_factory=list, repr=False, init=False)
+    # Hooks registered and modules imported while loading the extensions
+    _extension_hooks: list[tuple[HookType, Callable[..., Any]]] = field(
+        default_factory=list, repr=False, init=False
+    )
+    _extension_modules: list[str] = field(default_factory=list, repr=False, init=False)
 
     @classmethod
+    @traced("project.load")
     def from_path(
         cls,
         path: Path | str | None = None,
@@ -140,7 +158,9 @@ class NbliteProject:
 
     def _load_extensions(self) -> None:
         """Load all extensions specified in config."""
+        n_hooks = {hook_type: len(HookRegistry.get_hooks(hook_type)) for hook_type in HookType}
         for ext_entry in self.config.extensions:
+            imported = ext_entry.module is None or ext_entry.module not in sys.modules
             try:
                 # Convert path to absolute if relative
                 ext_path = ext_entry.path
@@ -152,6 +172,8 @@ class NbliteProject:
 
                 loaded = load_extension(path=ext_path, module=ext_entry.module)
                 self._loaded_extensions.append(loaded)
+                if imported:
+                    self._extension_modules.append(loaded.__name__)
             except Exception as e:
                 # Log warning but don't fail - extensions are optional
                 import warnings
@@ -159,6 +181,29 @@ class NbliteProject:
                 source = ext_entry.path or ext_entry.module
                 warnings.warn(f"Failed to load extension '{source}': {e}", stacklevel=2)
 
+        # Callbacks are appended, so those past the old counts are the extensions'
+        for hook_type, n in n_hooks.items():
+            self._extension_hooks.extend(
+                (hook_type, callback) for callback in HookRegistry.get_hooks(hook_type)[n:]
+            )
+
+    def unload_extensions(self) -> None:
+        """
+        Unregister the hooks registered by this project's extensions.
+
+        Hooks registered by other projects or by user code are kept. Extension
+        modules imported by this project are removed from sys.modules, so
+        that loading the project again runs them (and registers their hooks)
+        again.
+        """
+        for hook_type, callback in self._extension_hooks:
+            HookRegistry.unregister(hook_type, callback)
+        for name in self._extension_modules:
+            sys.modules.pop(name, None)
+        self._extension_hooks.clear()
+        self._extension_modules.clear()
+        self._loaded_extensions.clear()
+
     @classmethod
     def find_project_root(cls, start_path: Path | str | None = None) -> Path | None:
         """
@@ -203,8 +248,99 @@ class NbliteProject:
                 format=cl_config.format,
                 export_mode=cl_config.export_mode,
                 project_root=self.root_path,
+                notebook_cache=self.notebook_cache,
+                load_workers=self.config.load.n_workers,
+                load_executor=self.config.load.executor,
             )
 
+    @property
+    def lineage(self) -> LineageIndex:
+        """
+        Code location and twin lookups along the export pipeline.
+
+        Built from the config on first use.
+
+        Returns:
+            LineageIndex for this project
+        """
+        if self._lineage is None:
+            self._lineage = LineageIndex(self.code_locations, self.config.export_pipeline)
+        return self._lineage
+
+    @property
+    def index(self) -> ProjectIndex:
+        """
+        Persistent index of notebook directive summaries.
+
+        Stored under the ``[cache]`` path, or kept in memory only when the
+        cache is disabled.
+
+        Returns:
+            ProjectIndex for this project
+        """
+        if self._index is None:
+            cache_dir = None
+            if self.config.cache.enabled:
+                cache_dir = self.root_path / self.config.cache.path
+            self._index = ProjectIndex(self.root_path, cache_dir, self.notebook_cache)
+        return self._index
+
+    @property
+    def notebook_cache(self) -> NotebookCache:
+        """
+        Notebooks loaded by this project, shared by export, clean and validation.
+
+        Kept in memory for the lifetime of the project, so that a command
+        running several steps parses each unchanged notebook once.
+
+        Returns:
+            NotebookCache for this project
+        """
+        if self._notebook_cache is None:
+            self._notebook_cache = NotebookCache()
+        return self._notebook_cache
+
+    @property
+    def export_manifest(self) -> ExportManifest:
+        """
+        Record of exported files and the inputs they were built from.
+
+        Stored next to the project index, and used by incremental exports.
+
+        Returns:
+            ExportManifest for this project
+        """
+        if self._export_manifest is None:
+            self._export_manifest = ExportManifest(self.root_path, self.index.cache_dir)
+        return self._export_manifest
+
+    def invalidate_export_manifest(self) -> None:
+        """
+        Drop the loaded export manifest, so that it is read again on next use.
+
+        Call this on a long-lived project before exporting, as another
+        process may have exported (and updated the manifest) since.
+        """
+        self._export_manifest = None
+
+    @property
+    def fill_state(self) -> FillStateCache:
+        """
+        Fill hashes of the project's notebooks, keyed by file size and mtime.
+
+        Stored next to the project index, and used by fill to skip unchanged
+        notebooks without reading them.
+
+        Returns:
+            FillStateCache for this project
+        """
+        if self._fill_state is None:
+            # Imported lazily: the fill package pulls in the Jupyter stack
+            from nblite.fill.cache import FillStateCache
+
+            self._fill_state = FillStateCache(self.root_path, self.index.cache_dir)
+        return self._fill_state
+
     def get_code_location(self, key: str) -> CodeLocation:
         """
         Get a code location by key.
@@ -227,6 +363,8 @@ class NbliteProject:
         code_location: str | None = None,
         ignore_dunders: bool = True,
         ignore_hidden: bool = True,
+        outputs: bool = True,
+        n_workers: int | None = None,
     ) -> list[Notebook]:
         """
         Get all notebooks in the project.
@@ -235,6 +373,9 @@ class NbliteProject:
             code_location: Filter by code location key
             ignore_dunders: Exclude __* files
             ignore_hidden: Exclude .* files
+            outputs: If False, skip cell outputs when loading
+            n_workers: Number of workers loading the notebooks of each
+                code location (None = use config value load.n_workers)
 
         Returns:
             List of Notebook objects
@@ -250,14 +391,48 @@ class NbliteProject:
                 nbs = cl.get_notebooks(
                     ignore_dunders=ignore_dunders,
                     ignore_hidden=ignore_hidden,
+                    outputs=outputs,
+                    n_workers=n_workers,
                 )
                 notebooks.extend(nbs)
 
         return notebooks
 
+    def iter_notebooks(
+        self,
+        code_location: str | None = None,
+        ignore_dunders: bool = True,
+        ignore_hidden: bool = True,
+        outputs: bool = True,
+    ) -> Iterator[Notebook]:
+        """
+        Iterate over the notebooks in the project, loading one at a time.
+
+        Streaming counterpart of get_notebooks (see CodeLocation.iter_notebooks).
+
+        Args:
+            code_location: Filter by code location key
+            ignore_dunders: Exclude __* files
+            ignore_hidden: Exclude .* files
+            outputs: If False, skip cell outputs when loading
+
+        Yields:
+            Notebook objects
+        """
+        locations = self.code_locations.values()
+        if code_location:
+            locations = [self.get_code_location(code_location)]
+
+        for cl in locations:
+            yield from cl.iter_notebooks(
+                ignore_dunders=ignore_dunders,
+                ignore_hidden=ignore_hidden,
+                outputs=outputs,
+            )
+
     @property
     def notebooks(self) -> list[Notebook]:
-        """All notebooks in the project."""
+        """All notebooks in the project (see iter_notebooks to stream them)."""
         return self.get_notebooks()
 
     @property
@@ -284,71 +459,14 @@ class NbliteProject:
         """
         if isinstance(notebook, Path):
             source_path = notebook
-            nb = Notebook.from_file(source_path)
+            default_exp = self.index.get(source_path).default_exp
         else:
             if notebook.source_path is None:
                 return []
             source_path = notebook.source_path
-            nb = notebook
-
-        twins: list[Path] = []
+            default_exp = notebook.default_exp
 
-        # Find source code location
-        source_cl = None
-        for cl in self.code_locations.values():
-            try:
-                source_path.relative_to(cl.path)
-                source_cl = cl
-                break
-            except ValueError:
-                continue
-
-        if source_cl is None:
-            return []
-
-        # Get relative path within code location
-        rel_path = source_path.relative_to(source_cl.path)
-        stem = rel_path.stem
-        if stem.endswith(".pct"):
-            stem = stem[:-4]
-
-        # Follow the export pipeline chain to find all twins
-        # Use BFS to find all reachable locations
-        visited = {source_cl.key}
-        to_visit = [source_cl.key]
-
-        while to_visit:
-            current_key = to_visit.pop(0)
-
-            for rule in self.config.export_pipeline:
-                if rule.from_key == current_key and rule.to_key not in visited:
-                    target_cl = self.code_locations.get(rule.to_key)
-                    if target_cl:
-                        if target_cl.format == CodeLocationFormat.MODULE:
-                            # Skip notebooks in dunder folders/files for module exports
-                            if _path_contains_dunder(rel_path):
-                                visited.add(rule.to_key)
-                                to_visit.append(rule.to_key)
-                                continue
-                            # For module exports, use default_exp to determine path
-                            default_exp = nb.default_exp
-                            if default_exp is None:
-                                # No default_exp, skip module twin
-                                visited.add(rule.to_key)
-                                to_visit.append(rule.to_key)
-                                continue
-                            module_path = default_exp.replace(".", "/")
-                            twin_path = target_cl.path / (module_path + target_cl.file_ext)
-                        else:
-                            # For notebook exports, preserve directory structure
-                            twin_path = (
-                                target_cl.path / rel_path.parent / (stem + target_cl.file_ext)
-                            )
-                        twins.append(twin_path)
-                        visited.add(rule.to_key)
-                        to_visit.append(rule.to_key)
-
-        return twins
+        return [twin_path for _, twin_path in self.lineage.twins(source_path, default_exp)]
 
     def get_notebook_lineage(self, notebook: Notebook) -> NotebookLineage:
         """
@@ -366,32 +484,15 @@ class NbliteProject:
                 code_location="unknown",
             )
 
-        # Find source code location
-        source_cl_key = notebook.code_location or "unknown"
-        for cl in self.code_locations.values():
-            if cl.is_notebook:
-                try:
-                    notebook.source_path.relative_to(cl.path)
-                    source_cl_key = cl.key
-                    break
-                except ValueError:
-                    continue
+        source_cl = self.lineage.location_of(notebook.source_path, notebook_only=True)
+        source_cl_key = source_cl.key if source_cl else notebook.code_location or "unknown"
 
-        # Build twins dict
         twins: dict[str, Path] = {}
         module_path: Path | None = None
-
-        for twin_path in self.get_notebook_twins(notebook):
-            # Find which code location this twin belongs to
-            for cl in self.code_locations.values():
-                try:
-                    twin_path.relative_to(cl.path)
-                    twins[cl.key] = twin_path
-                    if cl.format == CodeLocationFormat.MODULE:
-                        module_path = twin_path
-                    break
-                except ValueError:
-                    continue
+        for cl, twin_path in self.lineage.twins(notebook.source_path, notebook.default_exp):
+            twins[cl.key] = twin_path
+            if cl.format == CodeLocationFormat.MODULE:
+                module_path = twin_path
 
         return NotebookLineage(
             source=notebook.source_path,
@@ -440,16 +541,24 @@ class NbliteProject:
 
         return ", ".join(reversed_rules)
 
+    @traced("export")
     def export(
         self,
         notebooks: list[Path] | None = None,
         pipeline: str | None = None,
         silence_warnings: bool = False,
         no_header: bool | None = None,
+        incremental: bool | None = None,
+        n_workers: int | None = None,
     ) -> ExportResult:
         """
         Run the export pipeline.
 
+        Rules that do not depend on each other (see schedule_rule_waves) are
+        exported together, and with more than one worker the output files of
+        such a wave are written concurrently. Results and hooks keep the plan
+        order either way.
+
         Args:
             notebooks: Specific notebooks to export (all if None)
             pipeline: Custom pipeline string (use config if None).
@@ -458,6 +567,11 @@ class NbliteProject:
             silence_warnings: If True, suppress warning messages about unrecognized directives.
             no_header: If True, omit YAML frontmatter when exporting to percent format.
                 If None, uses config value (export.no_header).
+            incremental: If True, skip outputs whose contributing notebooks and export
+                options are unchanged since they were last written (see export_manifest).
+                If None, uses config value (export.incremental).
+            n_workers: Number of threads writing outputs concurrently.
+                If None, uses config value (export.n_workers).
 
         Returns:
             ExportResult with success status and file lists
@@ -467,9 +581,11 @@ class NbliteProject:
             PRE_NOTEBOOK_EXPORT: Before each notebook (notebook=nb, output_path=path)
             POST_NOTEBOOK_EXPORT: After each notebook (notebook=nb, output_path=path, success=bool)
             POST_EXPORT: After export completes (project=self, result=result)
-        """
-        from nblite.core.directive import get_unrecognized_directives
 
+            All hooks run in the calling thread. With n_workers > 1, the
+            PRE_NOTEBOOK_EXPORT hooks of a wave all fire before its outputs are
+            written, and the POST_NOTEBOOK_EXPORT hooks after.
+        """
         result = ExportResult()
 
         # Trigger PRE_EXPORT hook
@@ -479,11 +595,6 @@ class NbliteProject:
             notebooks=notebooks,
         )
 
-        # If specific notebooks provided, convert to Notebook objects
-        specific_nbs: list[Notebook] | None = None
-        if notebooks:
-            specific_nbs = [Notebook.from_file(Path(p).resolve()) for p in notebooks]
-
         # Determine which pipeline rules to use
         if pipeline is not None:
             # Parse the custom pipeline string
@@ -493,250 +604,325 @@ class NbliteProject:
         else:
             export_rules = self.config.export_pipeline
 
-        # Execute pipeline rules
-        for rule in export_rules:
-            from_cl = self.code_locations.get(rule.from_key)
-            to_cl = self.code_locations.get(rule.to_key)
+        if incremental is None:
+            incremental = self.config.export.incremental
+        if n_workers is None:
+            n_workers = self.config.export.n_workers
+        effective_no_header = no_header if no_header is not None else self.config.export.no_header
 
-            if not from_cl or not to_cl:
-                continue
+        # If specific notebooks provided, resolve their paths. Summaries are
+        # looked up eagerly so that missing or unparseable files fail early.
+        specific_paths: list[Path] | None = None
+        if notebooks:
+            specific_paths = [Path(p).resolve() for p in notebooks]
+            for path in specific_paths:
+                self.index.get(path)
+            # Follow the notebooks down the pipeline: their notebook twins are
+            # the sources of later rules (e.g. pts/ in nbs -> pts -> lib)
+            for path in list(specific_paths):
+                for cl, twin in self.lineage.twins(path, self.index.get(path).default_exp):
+                    if cl.is_notebook and twin not in specific_paths:
+                        specific_paths.append(twin)
+
+        # Execute pipeline rules, one wave of independent rules at a time.
+        # A wave is fully planned (from the project index, without loading
+        # notebooks) before any of its outputs are written.
+        export_rules = [
+            rule
+            for rule in export_rules
+            if rule.from_key in self.code_locations and rule.to_key in self.code_locations
+        ]
+        for wave in schedule_rule_waves(export_rules):
+            tasks: list[ExportTask] = []
+            for rule in wave:
+                with span("export.plan", rule=f"{rule.from_key} -> {rule.to_key}"):
+                    tasks.extend(
+                        self._plan_rule(
+                            rule, specific_paths, incremental, effective_no_header, result
+                        )
+                    )
+            for batch in batch_by_output(tasks):
+                self._run_export_tasks(batch, result, n_workers)
 
-            # Get notebooks from source code location for this rule
-            if specific_nbs is not None:
-                # Filter specific notebooks that are in this source location
-                nbs_to_export = []
-                for nb in specific_nbs:
-                    if nb.source_path is None:
-                        continue
-                    try:
-                        nb.source_path.relative_to(from_cl.path)
-                        nbs_to_export.append(nb)
-                    except ValueError:
-                        continue
-            else:
-                # Get all notebooks from source code location
-                # Note: We use ignore_dunders=False here because dunder files should be
-                # exported to notebook formats. The module export code handles filtering
-                # dunder files separately via _path_contains_dunder().
-                if from_cl.is_notebook:
-                    nbs_to_export = from_cl.get_notebooks(ignore_dunders=False)
-                else:
-                    continue
+        with span("export.save_state"):
+            self.index.save()
+            self.export_manifest.save()
 
-            # Handle module exports with two-phase approach for aggregation
+        # Trigger POST_EXPORT hook
+        HookRegistry.trigger(
+            HookType.POST_EXPORT,
+            project=self,
+            result=result,
+        )
+
+        return result
+
+    def _plan_rule(
+        self,
+        rule: ExportRule,
+        specific_paths: list[Path] | None,
+        incremental: bool,
+        no_header: bool,
+        result: ExportResult,
+    ) -> list[ExportTask]:
+        """
+        Plan the outputs of one export rule.
+
+        Adds warnings, skipped outputs and (on full runs) orphaned outputs to
+        the result, and returns the outputs that need writing.
+
+        Raises:
+            ValueError: If notebooks of a module export conflict (duplicate
+                #|default_exp, or #|export without #|default_exp)
+        """
+        from_cl = self.code_locations[rule.from_key]
+        to_cl = self.code_locations[rule.to_key]
+        rule_key = f"{rule.from_key} -> {rule.to_key}"
+        # Outputs written (or confirmed current) by this rule, for orphan detection
+        produced: set[Path] = set()
+        tasks: list[ExportTask] = []
+
+        def plan(
+            output_path: Path,
+            sources: list[tuple[Path, str]],
+            outputs: bool,
+            inputs: dict[str, str],
+            options: str,
+            write: Callable[[list[tuple[Notebook, str]]], WriteStatus],
+            describe: Callable[[list[tuple[Notebook, str]], Exception], str],
+        ) -> None:
+            produced.add(output_path)
+            if incremental and self.export_manifest.is_current(
+                output_path, rule_key, inputs, options
+            ):
+                result.files_skipped.append(output_path)
+                count("files.skipped", path=output_path)
+                return
+            tasks.append(
+                ExportTask(
+                    rule_key=rule_key,
+                    from_location=from_cl,
+                    to_location=to_cl,
+                    output_path=output_path,
+                    sources=sources,
+                    outputs=outputs,
+                    inputs=inputs,
+                    options=options,
+                    write=write,
+                    describe=describe,
+                )
+            )
+
+        # Get notebook paths from source code location for this rule
+        if specific_paths is not None:
+            # Filter specific notebooks that are in this source location.
+            # Twins of the given notebooks exist once earlier rules have run.
+            paths_to_export = [
+                path
+                for path in specific_paths
+                if path.is_relative_to(from_cl.path) and path.exists()
+            ]
             if to_cl.format == CodeLocationFormat.MODULE:
-                # Phase 1: Collect all notebooks and their export targets
-                # Maps target_module -> list of (notebook, source_ref) tuples
-                module_to_notebooks: dict[str, list[tuple[Notebook, str]]] = {}
-                # Track function notebooks separately (they can't aggregate)
-                function_notebooks: list[tuple[Notebook, str, str]] = []  # (nb, source_ref, target)
-                # Track notebooks that claim each module via #|default_exp
-                # Maps module -> notebook source_ref (for error messages)
-                default_exp_owners: dict[str, str] = {}
-
-                for nb in nbs_to_export:
-                    if nb.source_path is None:
-                        continue
-
-                    try:
-                        rel_path = nb.source_path.relative_to(from_cl.path)
-                    except ValueError:
-                        continue
-
-                    # Skip notebooks in dunder folders/files
-                    if _path_contains_dunder(rel_path):
-                        continue
-
-                    # Compute source reference for cell markers
-                    try:
-                        source_ref = str(nb.source_path.relative_to(self.root_path))
-                    except ValueError:
-                        source_ref = str(nb.source_path)
-
-                    # Check for unrecognized directives
-                    all_directives = []
-                    for cell in nb.cells:
-                        for directive_list in cell.directives.values():
-                            all_directives.extend(directive_list)
-                    unrecognized = get_unrecognized_directives(all_directives)
-                    for directive in unrecognized:
-                        warning_msg = (
-                            f"Unrecognized directive '#|{directive.name}' "
-                            f"in '{source_ref}' (line {directive.line_num + 1})"
-                        )
-                        if warning_msg not in result.warnings:
-                            result.warnings.append(warning_msg)
-
-                    # Check for duplicate #|default_exp
-                    if nb.default_exp:
-                        if nb.default_exp in default_exp_owners:
-                            existing_nb = default_exp_owners[nb.default_exp]
-                            raise ValueError(
-                                f"Multiple notebooks have the same #|default_exp '{nb.default_exp}': "
-                                f"'{existing_nb}' and '{source_ref}'. "
-                                f"Each module can only have one notebook with #|default_exp. "
-                                f"Use #|export_to to export cells to a shared module from multiple notebooks."
-                            )
-                        default_exp_owners[nb.default_exp] = source_ref
-
-                    export_targets = get_export_targets(nb)
-                    if not export_targets:
-                        continue
-
-                    # Check for #|export without #|default_exp
-                    if "" in export_targets:
+                paths_to_export = self._module_contributors(from_cl, paths_to_export)
+        elif from_cl.is_notebook:
+            # Get all notebooks from source code location
+            # Note: We use ignore_dunders=False here because dunder files should be
+            # exported to notebook formats. The module export code handles filtering
+            # dunder files separately via _path_contains_dunder().
+            paths_to_export = from_cl.get_files(ignore_dunders=False)
+        else:
+            return tasks
+
+        # Handle module exports with two-phase approach for aggregation
+        if to_cl.format == CodeLocationFormat.MODULE:
+            # Phase 1: Collect all notebooks and their export targets
+            # Maps target_module -> list of (notebook path, source_ref) tuples
+            module_to_notebooks: dict[str, list[tuple[Path, str]]] = {}
+            # Track function notebooks separately (they can't aggregate)
+            # (notebook path, source_ref, target)
+            function_notebooks: list[tuple[Path, str, str]] = []
+            # Track notebooks that claim each module via #|default_exp
+            # Maps module -> notebook source_ref (for error messages)
+            default_exp_owners: dict[str, str] = {}
+
+            for source_path in paths_to_export:
+                try:
+                    rel_path = source_path.relative_to(from_cl.path)
+                except ValueError:
+                    continue
+
+                # Skip notebooks in dunder folders/files
+                if _path_contains_dunder(rel_path):
+                    continue
+
+                # Compute source reference for cell markers
+                source_ref = self._source_ref(source_path)
+
+                summary = self.index.get(source_path)
+
+                # Check for unrecognized directives
+                self._warn_unrecognized_directives(
+                    summary.unrecognized_directives, source_ref, result
+                )
+
+                # Check for duplicate #|default_exp
+                default_exp = summary.default_exp
+                if default_exp:
+                    if default_exp in default_exp_owners:
+                        existing_nb = default_exp_owners[default_exp]
                         raise ValueError(
-                            f"Notebook '{source_ref}' uses #|export or #|exporti without #|default_exp. "
-                            f"Either add #|default_exp to specify the target module, "
-                            f"or use #|export_to to explicitly specify the target module for each cell."
+                            f"Multiple notebooks have the same #|default_exp '{default_exp}': "
+                            f"'{existing_nb}' and '{source_ref}'. "
+                            f"Each module can only have one notebook with #|default_exp. "
+                            f"Use #|export_to to export cells to a shared module from multiple notebooks."
                         )
+                    default_exp_owners[default_exp] = source_ref
 
-                    # Check if this is a function notebook
-                    if is_function_notebook(nb):
-                        # Function notebooks are handled separately (no aggregation)
-                        for target_module in export_targets:
-                            if target_module:
-                                function_notebooks.append((nb, source_ref, target_module))
-                    else:
-                        # Regular notebooks can aggregate
-                        for target_module in export_targets:
-                            if target_module:
-                                if target_module not in module_to_notebooks:
-                                    module_to_notebooks[target_module] = []
-                                module_to_notebooks[target_module].append((nb, source_ref))
-
-                # Phase 2a: Export function notebooks (one at a time, no aggregation)
-                for nb, _source_ref, target_module in function_notebooks:
-                    module_path = target_module.replace(".", "/")
-                    output_path = to_cl.path / (module_path + to_cl.file_ext)
-
-                    # Trigger PRE_NOTEBOOK_EXPORT hook
-                    HookRegistry.trigger(
-                        HookType.PRE_NOTEBOOK_EXPORT,
-                        notebook=nb,
-                        output_path=output_path,
-                        from_location=from_cl,
-                        to_location=to_cl,
+                export_targets = summary.export_targets
+                if not export_targets:
+                    continue
+
+                # Check for #|export without #|default_exp
+                if "" in export_targets:
+                    raise ValueError(
+                        f"Notebook '{source_ref}' uses #|export or #|exporti without #|default_exp. "
+                        f"Either add #|default_exp to specify the target module, "
+                        f"or use #|export_to to explicitly specify the target module for each cell."
                     )
 
-                    export_success = True
-                    try:
-                        package_name = to_cl.path.name
-                        export_notebook_to_module(
-                            nb,
-                            output_path,
-                            self.root_path,
-                            export_mode=to_cl.export_mode,
-                            include_warning=self.config.export.include_autogenerated_warning,
-                            cell_reference_style=self.config.export.cell_reference_style,
-                            package_name=package_name,
-                            target_module=target_module,
-                        )
+                # Check if this is a function notebook
+                if summary.is_function_notebook:
+                    # Function notebooks are handled separately (no aggregation)
+                    for target_module in export_targets:
+                        if target_module:
+                            function_notebooks.append((source_path, source_ref, target_module))
+                else:
+                    # Regular notebooks can aggregate
+                    for target_module in export_targets:
+                        if target_module:
+                            if target_module not in module_to_notebooks:
+                                module_to_notebooks[target_module] = []
+                            module_to_notebooks[target_module].append((source_path, source_ref))
+
+            package_name = to_cl.path.name
+            module_options = {
+                "export_mode": to_cl.export_mode,
+                "include_warning": self.config.export.include_autogenerated_warning,
+                "cell_reference_style": self.config.export.cell_reference_style,
+                "package_name": package_name,
+            }
+
+            # Phase 2a: Export function notebooks (one at a time, no aggregation)
+            for source_path, source_ref, target_module in function_notebooks:
+                module_path = target_module.replace(".", "/")
+                output_path = to_cl.path / (module_path + to_cl.file_ext)
+
+                def write_function(
+                    nbs: list[tuple[Notebook, str]],
+                    output_path: Path = output_path,
+                    target_module: str = target_module,
+                ) -> WriteStatus:
+                    return export_notebook_to_module(
+                        nbs[0][0],
+                        output_path,
+                        self.root_path,
+                        target_module=target_module,
+                        **module_options,
+                    )
 
-                        if output_path.exists():
-                            result.files_created.append(output_path)
+                def describe_function(
+                    nbs: list[tuple[Notebook, str]],
+                    e: Exception,
+                    target_module: str = target_module,
+                ) -> str:
+                    return f"Failed to export {nbs[0][0].source_path} to {target_module}: {e}"
+
+                plan(
+                    output_path,
+                    [(source_path, source_ref)],
+                    False,
+                    {source_ref: self.index.get(source_path).sha256},
+                    hash_export_options(
+                        **module_options, target_module=target_module, function_notebook=True
+                    ),
+                    write_function,
+                    describe_function,
+                )
 
-                    except Exception as e:
-                        result.errors.append(
-                            f"Failed to export {nb.source_path} to {target_module}: {e}"
-                        )
-                        result.success = False
-                        export_success = False
-
-                    # Trigger POST_NOTEBOOK_EXPORT hook
-                    HookRegistry.trigger(
-                        HookType.POST_NOTEBOOK_EXPORT,
-                        notebook=nb,
-                        output_path=output_path,
-                        from_location=from_cl,
-                        to_location=to_cl,
-                        success=export_success,
+            # Phase 2b: Export aggregated regular notebooks
+            for target_module, contributors in module_to_notebooks.items():
+                module_path = target_module.replace(".", "/")
+                output_path = to_cl.path / (module_path + to_cl.file_ext)
+
+                def write_module(
+                    nbs: list[tuple[Notebook, str]],
+                    output_path: Path = output_path,
+                    target_module: str = target_module,
+                ) -> WriteStatus:
+                    return export_notebooks_to_module(
+                        nbs,
+                        output_path,
+                        self.root_path,
+                        target_module=target_module,
+                        **module_options,
                     )
 
-                # Phase 2b: Export aggregated regular notebooks
-                for target_module, notebooks_list in module_to_notebooks.items():
-                    module_path = target_module.replace(".", "/")
-                    output_path = to_cl.path / (module_path + to_cl.file_ext)
-
-                    # Trigger PRE_NOTEBOOK_EXPORT hooks for all contributing notebooks
-                    for nb, _source_ref in notebooks_list:
-                        HookRegistry.trigger(
-                            HookType.PRE_NOTEBOOK_EXPORT,
-                            notebook=nb,
-                            output_path=output_path,
-                            from_location=from_cl,
-                            to_location=to_cl,
-                        )
-
-                    export_success = True
-                    try:
-                        package_name = to_cl.path.name
-                        export_notebooks_to_module(
-                            notebooks_list,
-                            output_path,
-                            self.root_path,
-                            export_mode=to_cl.export_mode,
-                            include_warning=self.config.export.include_autogenerated_warning,
-                            cell_reference_style=self.config.export.cell_reference_style,
-                            package_name=package_name,
-                            target_module=target_module,
-                        )
+                def describe_module(
+                    nbs: list[tuple[Notebook, str]],
+                    e: Exception,
+                    target_module: str = target_module,
+                ) -> str:
+                    nb_paths = ", ".join(str(nb.source_path) for nb, _ in nbs)
+                    return f"Failed to export notebooks ({nb_paths}) to {target_module}: {e}"
+
+                plan(
+                    output_path,
+                    contributors,
+                    False,
+                    # Aggregated modules are rebuilt when any contributor changes
+                    {
+                        source_ref: self.index.get(source_path).sha256
+                        for source_path, source_ref in contributors
+                    },
+                    hash_export_options(
+                        **module_options, target_module=target_module, function_notebook=False
+                    ),
+                    write_module,
+                    describe_module,
+                )
 
-                        if output_path.exists():
-                            result.files_created.append(output_path)
+        # Handle notebook-to-notebook exports
+        else:
+            fmt = (
+                Format.PERCENT.value
+                if to_cl.format == CodeLocationFormat.PERCENT
+                else Format.IPYNB.value
+            )
+            options = hash_export_options(format=fmt, no_header=no_header)
+            needs_outputs = self._rule_needs_outputs(rule.to_key)
 
-                    except Exception as e:
-                        nb_paths = ", ".join(str(nb.source_path) for nb, _ in notebooks_list)
-                        result.errors.append(
-                            f"Failed to export notebooks ({nb_paths}) to {target_module}: {e}"
-                        )
-                        result.success = False
-                        export_success = False
-
-                    # Trigger POST_NOTEBOOK_EXPORT hooks for all contributing notebooks
-                    for nb, _source_ref in notebooks_list:
-                        HookRegistry.trigger(
-                            HookType.POST_NOTEBOOK_EXPORT,
-                            notebook=nb,
-                            output_path=output_path,
-                            from_location=from_cl,
-                            to_location=to_cl,
-                            success=export_success,
-                        )
+            def write_notebook(nbs: list[tuple[Notebook, str]], output_path: Path) -> WriteStatus:
+                return export_notebook_to_notebook(
+                    nbs[0][0], output_path, format=fmt, no_header=no_header
+                )
 
-            # Handle notebook-to-notebook exports
-            for nb in nbs_to_export:
-                if nb.source_path is None:
-                    continue
+            def describe_notebook(nbs: list[tuple[Notebook, str]], e: Exception) -> str:
+                return f"Failed to export {nbs[0][0].source_path}: {e}"
 
+            for source_path in paths_to_export:
                 try:
-                    rel_path = nb.source_path.relative_to(from_cl.path)
+                    rel_path = source_path.relative_to(from_cl.path)
                 except ValueError:
                     continue
 
-                if to_cl.format == CodeLocationFormat.MODULE:
-                    # Module exports already handled above
-                    continue
-
                 # Compute source reference for warnings
-                try:
-                    source_ref = str(nb.source_path.relative_to(self.root_path))
-                except ValueError:
-                    source_ref = str(nb.source_path)
-
-                # Check for unrecognized directives (if not already checked in module export)
-                all_directives = []
-                for cell in nb.cells:
-                    for directive_list in cell.directives.values():
-                        all_directives.extend(directive_list)
-                unrecognized = get_unrecognized_directives(all_directives)
-                for directive in unrecognized:
-                    warning_msg = (
-                        f"Unrecognized directive '#|{directive.name}' "
-                        f"in '{source_ref}' (line {directive.line_num + 1})"
-                    )
-                    if warning_msg not in result.warnings:
-                        result.warnings.append(warning_msg)
+                source_ref = self._source_ref(source_path)
+                summary = self.index.get(source_path)
+
+                # Check for unrecognized directives
+                self._warn_unrecognized_directives(
+                    summary.unrecognized_directives, source_ref, result
+                )
 
                 # For notebook-to-notebook exports, preserve directory structure
                 stem = rel_path.stem
@@ -744,58 +930,183 @@ class NbliteProject:
                     stem = stem[:-4]
                 output_path = to_cl.path / rel_path.parent / (stem + to_cl.file_ext)
 
-                # Trigger PRE_NOTEBOOK_EXPORT hook
-                HookRegistry.trigger(
-                    HookType.PRE_NOTEBOOK_EXPORT,
-                    notebook=nb,
-                    output_path=output_path,
-                    from_location=from_cl,
-                    to_location=to_cl,
+                plan(
+                    output_path,
+                    [(source_path, source_ref)],
+                    needs_outputs,
+                    {source_ref: summary.sha256},
+                    options,
+                    partial(write_notebook, output_path=output_path),
+                    describe_notebook,
                 )
 
-                export_success = True
-                try:
-                    # Export to notebook format
-                    fmt = (
-                        Format.PERCENT.value
-                        if to_cl.format == CodeLocationFormat.PERCENT
-                        else Format.IPYNB.value
-                    )
-                    # Determine no_header value: parameter overrides config
-                    effective_no_header = (
-                        no_header if no_header is not None else self.config.export.no_header
-                    )
-                    export_notebook_to_notebook(
-                        nb, output_path, format=fmt, no_header=effective_no_header
-                    )
+        # Outputs recorded for this rule that no run produces any more
+        # (e.g. a notebook's #|default_exp moved). Only a full run knows.
+        if specific_paths is None:
+            self._report_orphans(rule_key, produced, result)
+
+        return tasks
+
+    def _module_contributors(self, from_cl: CodeLocation, paths: list[Path]) -> list[Path]:
+        """
+        Add the notebooks of a location that export to the same modules as paths.
+
+        A module aggregated from several notebooks is always rebuilt from all
+        of them, so exporting some notebooks never drops the cells the others
+        contribute. Notebooks are returned in the order a full export uses.
+        """
+        targets = {target for path in paths for target in self.index.get(path).export_targets}
+        targets.discard("")
+        if not targets:
+            return paths
+
+        listed = from_cl.get_files(ignore_dunders=False)
+        contributors = [
+            path
+            for path in listed
+            if path in paths or not targets.isdisjoint(self.index.get(path).export_targets)
+        ]
+        unlisted = set(paths).difference(listed)
+        return contributors + [path for path in paths if path in unlisted]
+
+    def _run_export_tasks(
+        self, tasks: list[ExportTask], result: ExportResult, n_workers: int
+    ) -> None:
+        """
+        Write planned outputs, concurrently when n_workers > 1.
+
+        Notebooks are loaded and outputs written on worker threads; hooks,
+        the export result and the manifest are updated in the calling thread,
+        in plan order.
+        """
 
-                    if output_path.exists():
-                        result.files_created.append(output_path)
+        def load(task: ExportTask) -> None:
+            with span("export.load", output=task.output_path):
+                task.notebooks = [
+                    (self._get_rule_notebook(path, task.from_location, task.outputs), ref)
+                    for path, ref in task.sources
+                ]
 
+        def write(task: ExportTask) -> WriteStatus | Exception:
+            with span("export.write", output=task.output_path):
+                try:
+                    return task.write(task.notebooks)
                 except Exception as e:
-                    result.errors.append(f"Failed to export {nb.source_path}: {e}")
-                    result.success = False
-                    export_success = False
+                    return e
 
-                # Trigger POST_NOTEBOOK_EXPORT hook
+        def trigger(task: ExportTask, hook_type: HookType, **kwargs: Any) -> None:
+            for nb, _source_ref in task.notebooks:
                 HookRegistry.trigger(
-                    HookType.POST_NOTEBOOK_EXPORT,
+                    hook_type,
                     notebook=nb,
-                    output_path=output_path,
-                    from_location=from_cl,
-                    to_location=to_cl,
-                    success=export_success,
+                    output_path=task.output_path,
+                    from_location=task.from_location,
+                    to_location=task.to_location,
+                    **kwargs,
                 )
 
-        # Trigger POST_EXPORT hook
-        HookRegistry.trigger(
-            HookType.POST_EXPORT,
-            project=self,
-            result=result,
-        )
+        def finish(task: ExportTask, outcome: WriteStatus | Exception) -> None:
+            if isinstance(outcome, Exception):
+                result.errors.append(task.describe(task.notebooks, outcome))
+                result.success = False
+                self.export_manifest.forget(task.output_path)
+            else:
+                self._record_output(
+                    result, task.output_path, outcome, task.rule_key, task.inputs, task.options
+                )
+            trigger(
+                task,
+                HookType.POST_NOTEBOOK_EXPORT,
+                success=not isinstance(outcome, Exception),
+            )
 
-        return result
+        if n_workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                load(task)
+                trigger(task, HookType.PRE_NOTEBOOK_EXPORT)
+                finish(task, write(task))
+            return
+
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            # map() re-raises a load failure here, like the sequential path
+            list(executor.map(propagate(load), tasks))
+            for task in tasks:
+                trigger(task, HookType.PRE_NOTEBOOK_EXPORT)
+            outcomes = list(executor.map(propagate(write), tasks))
+        for task, outcome in zip(tasks, outcomes, strict=True):
+            finish(task, outcome)
+
+    def _source_ref(self, path: Path) -> str:
+        """Path of a notebook as referenced in exports and warnings."""
+        try:
+            return str(path.relative_to(self.root_path))
+        except ValueError:
+            return str(path)
+
+    def _get_rule_notebook(
+        self,
+        path: Path,
+        code_location: CodeLocation,
+        outputs: bool,
+    ) -> Notebook:
+        """Load a notebook from a code location for export."""
+        return self.notebook_cache.get(path, outputs=outputs, code_location=code_location.key)
+
+    def _record_output(
+        self,
+        result: ExportResult,
+        output_path: Path,
+        status: WriteStatus,
+        rule_key: str,
+        inputs: dict[str, str],
+        options: str,
+    ) -> None:
+        """Add a written output to the export result and the manifest."""
+        if status != WriteStatus.UNCHANGED:
+            # Outputs in notebook locations are read again by later rules
+            self.notebook_cache.invalidate(output_path)
+        if status == WriteStatus.CREATED:
+            result.files_created.append(output_path)
+        elif status == WriteStatus.UPDATED:
+            result.files_updated.append(output_path)
+        else:
+            result.files_unchanged.append(output_path)
+        self.export_manifest.record(output_path, rule_key, inputs, options)
+
+    def _report_orphans(self, rule_key: str, produced: set[Path], result: ExportResult) -> None:
+        """Warn about outputs of a rule that are no longer produced by any notebook."""
+        for output_path in self.export_manifest.outputs_for_rule(rule_key):
+            if output_path in produced:
+                continue
+            if not output_path.exists():
+                self.export_manifest.forget(output_path)
+                continue
+            result.files_orphaned.append(output_path)
+            result.warnings.append(
+                f"Orphaned output '{self._source_ref(output_path)}' is no longer produced "
+                f"by any notebook (rule {rule_key}); delete it if it is not needed"
+            )
+
+    @staticmethod
+    def _warn_unrecognized_directives(
+        unrecognized: list[tuple[str, int]],
+        source_ref: str,
+        result: ExportResult,
+    ) -> None:
+        """Add a warning to the export result for each unrecognized directive."""
+        for name, line_num in unrecognized:
+            warning_msg = (
+                f"Unrecognized directive '#|{name}' in '{source_ref}' (line {line_num + 1})"
+            )
+            if warning_msg not in result.warnings:
+                result.warnings.append(warning_msg)
+
+    def _rule_needs_outputs(self, to_key: str) -> bool:
+        """Whether exporting to a code location needs the source cell outputs."""
+        to_cl = self.code_locations.get(to_key)
+        return to_cl is not None and to_cl.format == CodeLocationFormat.IPYNB
 
+    @traced("clean")
     def clean(
         self,
         notebooks: list[Path] | None = None,
@@ -878,23 +1189,28 @@ class NbliteProject:
             else clean_config.keep_only_metadata,
         }
 
+        nbs_to_clean: Iterable[Notebook]
         if notebooks:
-            nbs_to_clean = [Notebook.from_file(p) for p in notebooks]
+            nbs_to_clean = [self.notebook_cache.get(p) for p in notebooks]
         else:
-            # Clean all ipynb notebooks
-            nbs_to_clean = []
-            for cl in self.code_locations.values():
-                if cl.format == CodeLocationFormat.IPYNB:
-                    nbs_to_clean.extend(cl.get_notebooks())
+            # Clean all ipynb notebooks, streamed one at a time
+            nbs_to_clean = (
+                nb
+                for cl in self.code_locations.values()
+                if cl.format == CodeLocationFormat.IPYNB
+                for nb in cl.iter_notebooks()
+            )
 
         cleaned_notebooks: list[Path] = []
         for nb in nbs_to_clean:
             if nb.source_path is None:
                 continue
 
-            cleaned = nb.clean(**clean_opts)
-            content = json.dumps(cleaned.to_dict(), indent=2) + "\n"
-            nb.source_path.write_text(content)
+            with span("clean.notebook", path=nb.source_path):
+                cleaned = nb.clean(**clean_opts)
+                content = json.dumps(cleaned.to_dict(), indent=2) + "\n"
+                if write_if_changed(nb.source_path, content) != WriteStatus.UNCHANGED:
+                    self.notebook_cache.invalidate(nb.source_path)
             cleaned_notebooks.append(nb.source_path)
 
         # Trigger POST_CLEAN hook
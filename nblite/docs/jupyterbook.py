@@ -14,6 +14,8 @@ from typing import TYPE_CHECKING, Any
 import yaml
 
 from nblite.docs.generator import DocsGenerator
+from nblite.utils.discovery import scan_files
+from nblite.utils.tracing import traced
 
 if TYPE_CHECKING:
     from nblite.core.project import NbliteProject
@@ -29,6 +31,7 @@ class JupyterBookGenerator(DocsGenerator):
     and can build HTML documentation.
     """
 
+    @traced("docs.prepare")
     def prepare(self, project: NbliteProject, output_dir: Path) -> None:
         """
         Prepare Jupyter Book source files.
@@ -51,16 +54,18 @@ class JupyterBookGenerator(DocsGenerator):
         docs_cl = project.config.docs_cl or project.config.docs.code_location
         if docs_cl and docs_cl in project.code_locations:
             docs_location = project.get_code_location(docs_cl)
-            notebooks = docs_location.get_notebooks()
+            notebooks = docs_location.iter_notebooks()
             cl_path = docs_location.path
             cl_format = docs_location.format.value
         else:
             # Fall back to all notebooks
-            notebooks = project.get_notebooks()
+            notebooks = project.iter_notebooks()
             cl_path = project.root_path
             cl_format = "ipynb"
 
         # Process and copy notebooks to output directory
+        # (streamed one at a time, keeping only their paths for the toc)
+        notebook_paths: list[Path] = []
         for nb in notebooks:
             if nb.source_path is None:
                 continue
@@ -75,20 +80,18 @@ class JupyterBookGenerator(DocsGenerator):
 
             # Process notebook for docs (inject API docs, remove hidden cells)
             process_notebook_for_docs(nb.source_path, dest, cl_format)
+            notebook_paths.append(nb.source_path)
 
         # Copy markdown files
         if docs_cl and docs_cl in project.code_locations:
-            for md_file in cl_path.glob("**/*.md"):
+            # Exclude patterns are name prefixes, pruned during the scan
+            exclude_prefixes = [p.rstrip("*") for p in project.config.docs.exclude_patterns]
+            for entry in scan_files(cl_path, ".md", exclude_prefixes=exclude_prefixes):
+                md_file = entry.path
                 rel_path = md_file.relative_to(cl_path)
-                excluded = False
-                for pattern in project.config.docs.exclude_patterns:
-                    if any(part.startswith(pattern.rstrip("*")) for part in rel_path.parts):
-                        excluded = True
-                        break
-                if not excluded:
-                    dest = output_dir / rel_path
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy(md_file, dest)
+                dest = output_dir / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(md_file, dest)
 
         # Generate _config.yml
         config = self._generate_config(project)
@@ -96,10 +99,11 @@ class JupyterBookGenerator(DocsGenerator):
         config_path.write_text(yaml.dump(config, default_flow_style=False))
 
         # Generate _toc.yml
-        toc = self._generate_toc(project, notebooks)
+        toc = self._generate_toc(project, notebook_paths)
         toc_path = output_dir / "_toc.yml"
         toc_path.write_text(yaml.dump(toc, default_flow_style=False))
 
+    @traced("docs.build")
     def build(self, output_dir: Path, final_dir: Path) -> None:
         """
         Build Jupyter Book documentation.
@@ -154,39 +158,29 @@ class JupyterBookGenerator(DocsGenerator):
 
         return config
 
-    def _generate_toc(self, project: NbliteProject, notebooks: list[Any]) -> dict[str, Any]:
+    def _generate_toc(self, project: NbliteProject, notebook_paths: list[Path]) -> dict[str, Any]:
         """Generate Jupyter Book _toc.yml content."""
         # Find index notebook
-        index_nb = None
-        other_nbs = []
+        index_path = None
+        other_paths = []
 
-        for nb in notebooks:
-            if nb.source_path is None:
-                continue
-            name = nb.source_path.stem
-            if name in ("index", "00_index", "00_intro"):
-                index_nb = nb
+        for path in notebook_paths:
+            if path.stem in ("index", "00_index", "00_intro"):
+                index_path = path
             else:
-                other_nbs.append(nb)
+                other_paths.append(path)
 
         # Build TOC structure
         toc: dict[str, Any] = {
             "format": "jb-book",
-            "root": "index"
-            if index_nb
-            else other_nbs[0].source_path.stem
-            if other_nbs
-            else "index",
+            "root": "index" if index_path else other_paths[0].stem if other_paths else "index",
             "chapters": [],
         }
 
-        for nb in other_nbs:
-            if nb.source_path is None:
-                continue
+        for path in other_paths:
             # Skip if this is the root
-            if index_nb is None and nb == other_nbs[0]:
+            if index_path is None and path == other_paths[0]:
                 continue
-            stem = nb.source_path.stem
-            toc["chapters"].append({"file": stem})
+            toc["chapters"].append({"file": path.stem})
 
         return toc
@@ -14,6 +14,8 @@ from typing import TYPE_CHECKING, Any
 import yaml
 
 from nblite.docs.generator import DocsGenerator
+from nblite.utils.discovery import scan_files
+from nblite.utils.tracing import traced
 
 if TYPE_CHECKING:
     from nblite.core.project import NbliteProject
@@ -29,6 +31,7 @@ class MkDocsGenerator(DocsGenerator):
     to the docs directory for building.
     """
 
+    @traced("docs.prepare")
     def prepare(self, project: NbliteProject, output_dir: Path) -> None:
         """
         Prepare MkDocs source files.
@@ -54,16 +57,18 @@ class MkDocsGenerator(DocsGenerator):
         docs_cl = project.config.docs_cl or project.config.docs.code_location
         if docs_cl and docs_cl in project.code_locations:
             docs_location = project.get_code_location(docs_cl)
-            notebooks = docs_location.get_notebooks()
+            notebooks = docs_location.iter_notebooks()
             cl_path = docs_location.path
             cl_format = docs_location.format.value
         else:
             # Fall back to all notebooks
-            notebooks = project.get_notebooks()
+            notebooks = project.iter_notebooks()
             cl_path = project.root_path
             cl_format = "ipynb"
 
         # Process and copy notebooks to docs directory
+        # (streamed one at a time, keeping only their paths for the nav)
+        notebook_paths: list[Path] = []
         for nb in notebooks:
             if nb.source_path is None:
                 continue
@@ -78,26 +83,25 @@ class MkDocsGenerator(DocsGenerator):
 
             # Process notebook for docs (inject API docs, remove hidden cells)
             process_notebook_for_docs(nb.source_path, dest, cl_format)
+            notebook_paths.append(nb.source_path)
 
         # Copy markdown files
         if docs_cl and docs_cl in project.code_locations:
-            for md_file in cl_path.glob("**/*.md"):
+            # Exclude patterns are name prefixes, pruned during the scan
+            exclude_prefixes = [p.rstrip("*") for p in project.config.docs.exclude_patterns]
+            for entry in scan_files(cl_path, ".md", exclude_prefixes=exclude_prefixes):
+                md_file = entry.path
                 rel_path = md_file.relative_to(cl_path)
-                excluded = False
-                for pattern in project.config.docs.exclude_patterns:
-                    if any(part.startswith(pattern.rstrip("*")) for part in rel_path.parts):
-                        excluded = True
-                        break
-                if not excluded:
-                    dest = docs_dir / rel_path
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy(md_file, dest)
+                dest = docs_dir / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(md_file, dest)
 
         # Generate mkdocs.yml
-        config = self._generate_config(project, notebooks)
+        config = self._generate_config(project, notebook_paths)
         config_path = output_dir / "mkdocs.yml"
         config_path.write_text(yaml.dump(config, default_flow_style=False))
 
+    @traced("docs.build")
     def build(self, output_dir: Path, final_dir: Path) -> None:
         """
         Build MkDocs documentation.
@@ -134,12 +138,14 @@ class MkDocsGenerator(DocsGenerator):
             check=True,
         )
 
-    def _generate_config(self, project: NbliteProject, notebooks: list[Any]) -> dict[str, Any]:
+    def _generate_config(
+        self, project: NbliteProject, notebook_paths: list[Path]
+    ) -> dict[str, Any]:
         """Generate MkDocs mkdocs.yml content."""
         title = project.config.docs.title or project.root_path.name
 
         # Build nav structure
-        nav = self._generate_nav(notebooks)
+        nav = self._generate_nav(notebook_paths)
 
         config: dict[str, Any] = {
             "site_name": title,
@@ -155,33 +161,28 @@ class MkDocsGenerator(DocsGenerator):
 
         return config
 
-    def _generate_nav(self, notebooks: list[Any]) -> list[dict[str, str]]:
+    def _generate_nav(self, notebook_paths: list[Path]) -> list[dict[str, str]]:
         """Generate MkDocs nav structure."""
         nav: list[dict[str, str]] = []
 
         # Find index notebook
-        index_nb = None
-        other_nbs = []
+        index_path = None
+        other_paths = []
 
-        for nb in notebooks:
-            if nb.source_path is None:
-                continue
-            name = nb.source_path.stem
-            if name in ("index", "00_index", "00_intro"):
-                index_nb = nb
+        for path in notebook_paths:
+            if path.stem in ("index", "00_index", "00_intro"):
+                index_path = path
             else:
-                other_nbs.append(nb)
+                other_paths.append(path)
 
         # Add index first
-        if index_nb and index_nb.source_path:
-            nav.append({"Home": index_nb.source_path.name})
+        if index_path:
+            nav.append({"Home": index_path.name})
 
         # Add other notebooks
-        for nb in sorted(other_nbs, key=lambda n: n.source_path.name if n.source_path else ""):
-            if nb.source_path is None:
-                continue
+        for path in sorted(other_paths, key=lambda p: p.name):
             # Use stem as title, replace underscores with spaces
-            title = nb.source_path.stem.replace("_", " ").replace("-", " ").title()
-            nav.append({title: nb.source_path.name})
+            title = path.stem.replace("_", " ").replace("-", " ").title()
+            nav.append({title: path.name})
 
         return nav
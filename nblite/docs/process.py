@@ -15,10 +15,12 @@ from typing import Any
 
 from nblite.core.notebook import Notebook
 from nblite.docs.cell_docs import render_cell_doc
+from nblite.utils.tracing import traced
 
 __all__ = ["process_notebook_for_docs"]
 
 
+@traced("docs.notebook")
 def process_notebook_for_docs(
     source_path: Path,
     dest_path: Path,
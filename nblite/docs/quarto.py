@@ -14,6 +14,8 @@ from typing import TYPE_CHECKING, Any
 import yaml
 
 from nblite.docs.generator import DocsGenerator
+from nblite.utils.discovery import scan_files
+from nblite.utils.tracing import traced
 
 if TYPE_CHECKING:
     from nblite.core.project import NbliteProject
@@ -31,6 +33,7 @@ class QuartoGenerator(DocsGenerator):
     Requires Quarto CLI to be installed (https://quarto.org/docs/get-started/).
     """
 
+    @traced("docs.prepare")
     def prepare(self, project: NbliteProject, output_dir: Path) -> None:
         """
         Prepare Quarto source files.
@@ -52,16 +55,16 @@ class QuartoGenerator(DocsGenerator):
         docs_cl = project.config.docs_cl or project.config.docs.code_location
         if docs_cl and docs_cl in project.code_locations:
             docs_location = project.get_code_location(docs_cl)
-            notebooks = docs_location.get_notebooks()
+            notebooks = docs_location.iter_notebooks()
             cl_path = docs_location.path
             cl_format = docs_location.format.value
         else:
             # Fall back to all notebooks
-            notebooks = project.get_notebooks()
+            notebooks = project.iter_notebooks()
             cl_path = project.root_path
             cl_format = "ipynb"
 
-        # Process and copy notebooks
+        # Process and copy notebooks, streamed one at a time
         for nb in notebooks:
             if nb.source_path is None:
                 continue
@@ -79,24 +82,21 @@ class QuartoGenerator(DocsGenerator):
 
         # Copy markdown and qmd files
         if docs_cl and docs_cl in project.code_locations:
-            for md_file in list(cl_path.glob("**/*.md")) + list(cl_path.glob("**/*.qmd")):
+            # Exclude patterns are name prefixes, pruned during the scan
+            exclude_prefixes = [p.rstrip("*") for p in project.config.docs.exclude_patterns]
+            for entry in scan_files(cl_path, (".md", ".qmd"), exclude_prefixes=exclude_prefixes):
+                md_file = entry.path
                 rel_path = md_file.relative_to(cl_path)
-                # Check exclude patterns
-                excluded = False
-                for pattern in project.config.docs.exclude_patterns:
-                    if any(part.startswith(pattern.rstrip("*")) for part in rel_path.parts):
-                        excluded = True
-                        break
-                if not excluded:
-                    dest = output_dir / rel_path
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy(md_file, dest)
+                dest = output_dir / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(md_file, dest)
 
         # Generate _quarto.yml
         config = self._generate_config(project, output_dir)
         config_path = output_dir / "_quarto.yml"
         config_path.write_text(yaml.dump(config, default_flow_style=False, sort_keys=False))
 
+    @traced("docs.build")
     def build(self, output_dir: Path, final_dir: Path) -> None:
         """
         Build Quarto documentation.
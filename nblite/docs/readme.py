@@ -62,11 +62,10 @@ def generate_readme(
 def _find_index_notebook(project: NbliteProject, notebook_name: str | None) -> Notebook | None:
     """Find the index notebook in the project."""
 
-    notebooks = project.get_notebooks()
-
+    # Streamed, so notebooks after the index are never loaded
     if notebook_name:
         # Look for specific notebook
-        for nb in notebooks:
+        for nb in project.iter_notebooks():
             if nb.source_path and nb.source_path.stem == notebook_name:
                 return nb
         return None
@@ -74,7 +73,7 @@ def _find_index_notebook(project: NbliteProject, notebook_name: str | None) -> N
     # Look for common index notebook names
     index_names = {"index", "00_index", "00_intro", "readme", "00_readme"}
 
-    for nb in notebooks:
+    for nb in project.iter_notebooks():
         if nb.source_path and nb.source_path.stem.lower() in index_names:
             return nb
 
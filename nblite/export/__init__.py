@@ -15,6 +15,7 @@ from nblite.export.pipeline import (
     export_notebook_to_module,
     export_notebook_to_notebook,
 )
+from nblite.export.summary import ExportSummary
 
 __all__ = [
     "export_notebook_to_notebook",
@@ -22,4 +23,5 @@ __all__ = [
     "export_function_notebook",
     "is_function_notebook",
     "ExportResult",
+    "ExportSummary",
 ]
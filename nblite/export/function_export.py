@@ -11,6 +11,8 @@ import re
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from nblite.utils.files import WriteStatus, write_if_changed
+
 if TYPE_CHECKING:
     from nblite.core.cell import Cell
     from nblite.core.notebook import Notebook
@@ -64,7 +66,7 @@ def export_function_notebook(
     include_warning: bool = True,
     package_name: str | None = None,
     project_root: Path | str | None = None,
-) -> None:
+) -> WriteStatus:
     """
     Export a function notebook to a Python module.
 
@@ -85,6 +87,9 @@ def export_function_notebook(
             output path is resolved relative to it so an ancestor directory that
             shares the package name is not mistaken for the package root.
 
+    Returns:
+        Whether the output file was created, updated or left unchanged
+
     Raises:
         ValueError: If required directives are missing.
     """
@@ -92,7 +97,6 @@ def export_function_notebook(
     from nblite.export.pipeline import _compute_module_depth, _transform_imports
 
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Calculate module depth for relative imports (shared with pipeline.py so the
     # two export paths can never diverge again).
@@ -156,7 +160,7 @@ def export_function_notebook(
     while "\n\n\n" in content:
         content = content.replace("\n\n\n", "\n\n")
 
-    output_path.write_text(content.strip() + "\n")
+    return write_if_changed(output_path, content.strip() + "\n")
 
 
 def _collect_top_exports(notebook: Notebook) -> list[str]:
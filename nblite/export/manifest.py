@@ -0,0 +1,213 @@
+"""
+Export manifest for incremental exports.
+
+Records, for every file written by the export pipeline, the hashes of the
+notebooks that contributed to it and the export options used. An incremental
+export compares against this record to skip outputs whose inputs are unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+__all__ = ["ExportManifest", "ManifestEntry", "hash_export_options"]
+
+# Bump when the manifest layout changes
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "export_manifest.json"
+
+
+def hash_export_options(**options: Any) -> str:
+    """
+    Hash the options that affect an exported file's content.
+
+    Args:
+        **options: JSON-serializable option values (enums use their value)
+
+    Returns:
+        Hex digest identifying the option set
+    """
+    from nblite import __version__
+
+    normalized = {key: getattr(value, "value", value) for key, value in sorted(options.items())}
+    normalized["nblite"] = __version__
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Record of one exported file.
+
+    Attributes:
+        rule: Pipeline rule that produced the file ("from_key -> to_key")
+        inputs: Contributing notebooks (relative to project root) -> content SHA-256
+        options: Hash of the export options (see hash_export_options)
+        size: Size of the written file in bytes
+        mtime_ns: Modification time of the written file in nanoseconds
+    """
+
+    rule: str
+    inputs: dict[str, str] = field(default_factory=dict)
+    options: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+
+
+class ExportManifest:
+    """
+    Source-to-output record of the export pipeline, persisted between runs.
+
+    Attributes:
+        root_path: Project root directory
+        cache_dir: Directory holding the manifest file, or None to keep the
+                   manifest in memory only
+    """
+
+    def __init__(self, root_path: Path, cache_dir: Path | None = None) -> None:
+        self.root_path = Path(root_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries: dict[str, ManifestEntry] | None = None
+        self._dirty = False
+
+    @property
+    def manifest_path(self) -> Path | None:
+        """Path of the manifest file, or None for an in-memory manifest."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / MANIFEST_FILENAME
+
+    def _key(self, path: Path) -> str:
+        """Manifest key for an output path."""
+        try:
+            return path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    @property
+    def entries(self) -> dict[str, ManifestEntry]:
+        """All entries, keyed by output path relative to the project root."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        manifest_path = self.manifest_path
+        if manifest_path is None or not manifest_path.exists():
+            return self._entries
+
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if data.get("version") != MANIFEST_VERSION:
+                return self._entries
+            for key, entry in data["outputs"].items():
+                self._entries[key] = ManifestEntry(**entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            # A corrupt manifest just means everything is rebuilt
+            self._entries = {}
+        return self._entries
+
+    def is_current(
+        self,
+        output_path: Path,
+        rule: str,
+        inputs: dict[str, str],
+        options: str,
+    ) -> bool:
+        """
+        Check whether an output is up to date.
+
+        An output is current when it was produced by the same rule from the
+        same inputs and options, and has not been modified or deleted since.
+
+        Args:
+            output_path: Output file path
+            rule: Pipeline rule producing the file
+            inputs: Contributing notebooks -> content SHA-256
+            options: Export options hash
+
+        Returns:
+            True if the output can be skipped
+        """
+        entry = self.entries.get(self._key(output_path))
+        if entry is None:
+            return False
+        if entry.rule != rule or entry.inputs != inputs or entry.options != options:
+            return False
+        try:
+            stat = output_path.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
+
+    def record(
+        self,
+        output_path: Path,
+        rule: str,
+        inputs: dict[str, str],
+        options: str,
+    ) -> None:
+        """
+        Record a freshly written output.
+
+        Args:
+            output_path: Output file path
+            rule: Pipeline rule that produced the file
+            inputs: Contributing notebooks -> content SHA-256
+            options: Export options hash
+        """
+        try:
+            stat = output_path.stat()
+        except OSError:
+            self.forget(output_path)
+            return
+        self.entries[self._key(output_path)] = ManifestEntry(
+            rule=rule,
+            inputs=dict(inputs),
+            options=options,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+        self._dirty = True
+
+    def forget(self, output_path: Path) -> None:
+        """Drop the record of an output so that it is rebuilt next time."""
+        if self.entries.pop(self._key(output_path), None) is not None:
+            self._dirty = True
+
+    def outputs_for_rule(self, rule: str) -> list[Path]:
+        """
+        Get all recorded outputs of a pipeline rule.
+
+        Args:
+            rule: Pipeline rule ("from_key -> to_key")
+
+        Returns:
+            Absolute output paths
+        """
+        return [self.root_path / key for key, entry in self.entries.items() if entry.rule == rule]
+
+    def save(self) -> None:
+        """Write the manifest to disk if it changed."""
+        manifest_path = self.manifest_path
+        if manifest_path is None or not self._dirty or self._entries is None:
+            return
+
+        assert self.cache_dir is not None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "outputs": {key: asdict(entry) for key, entry in sorted(self._entries.items())},
+        }
+        tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+        self._dirty = False
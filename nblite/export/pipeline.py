@@ -6,16 +6,16 @@ Handles exporting notebooks to different formats and to Python modules.
 
 from __future__ import annotations
 
-import bisect
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
 
 from nblite.config.schema import CellReferenceStyle, ExportMode
-from nblite.core.cell import Cell
 from nblite.core.notebook import Format, Notebook
-from nblite.export.function_export import export_function_notebook, is_function_notebook
+from nblite.export.function_export import export_function_notebook
+from nblite.export.summary import ExportCell
 from nblite.extensions import HookRegistry, HookType
+from nblite.utils.files import WriteStatus, write_if_changed
 
 __all__ = [
     "export_notebook_to_notebook",
@@ -40,69 +40,29 @@ FROM_IMPORT_PATTERN = re.compile(
 )
 
 
-def _get_cell_order(cell: Cell) -> int:
-    """
-    Get the order value for an exported cell.
-
-    Order values determine the position of cells in the exported module.
-    Default values:
-    - #|export: 0
-    - #|exporti: 0
-    - #|export_to: 1
-
-    Args:
-        cell: The cell to get order from
-
-    Returns:
-        The order value (lower = earlier in output)
-    """
-    # Check export_to first (has module and order)
-    if cell.has_directive("export_to"):
-        directive = cell.get_directive("export_to")
-        if directive and directive.value_parsed:
-            return directive.value_parsed.get("order", 1)
-
-    # Check export/exporti
-    for name in ("export", "exporti"):
-        if cell.has_directive(name):
-            directive = cell.get_directive(name)
-            if directive and directive.value_parsed:
-                return directive.value_parsed.get("order", 0)
-            return 0  # Default if no parsed value
-
-    return 0  # Fallback
-
-
-def _validate_function_only_directives(notebook: Notebook) -> None:
-    """
-    Validate that function-only directives are only used in function notebooks.
-
-    Raises:
-        ValueError: If #|top_export or #|bottom_export used in non-function notebook.
-    """
-    if is_function_notebook(notebook):
-        return  # Function notebook, all directives allowed
-
-    for cell in notebook.cells:
-        if cell.has_directive("top_export"):
-            raise ValueError(
-                f"#|top_export directive can only be used in function notebooks "
-                f"(notebooks with #|export_as_func true). Found in cell {cell.index}."
-            )
-        if cell.has_directive("bottom_export"):
-            raise ValueError(
-                f"#|bottom_export directive can only be used in function notebooks "
-                f"(notebooks with #|export_as_func true). Found in cell {cell.index}."
-            )
-
-
 @dataclass
 class ExportResult:
-    """Result of an export operation."""
+    """
+    Result of an export operation.
+
+    Attributes:
+        success: Whether all exports succeeded
+        files_created: New files written by the export
+        files_updated: Existing files rewritten with new content
+        files_skipped: Files not regenerated because their inputs were unchanged
+            (incremental exports only)
+        files_unchanged: Files regenerated with identical content (left untouched)
+        files_orphaned: Previously exported files no longer produced by any notebook
+        errors: Error messages
+        warnings: Warning messages
+    """
 
     success: bool = True
     files_created: list[Path] = field(default_factory=list)
     files_updated: list[Path] = field(default_factory=list)
+    files_skipped: list[Path] = field(default_factory=list)
+    files_unchanged: list[Path] = field(default_factory=list)
+    files_orphaned: list[Path] = field(default_factory=list)
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
 
@@ -113,7 +73,7 @@ def export_notebook_to_notebook(
     format: str | None = None,
     *,
     no_header: bool = False,
-) -> None:
+) -> WriteStatus:
     """
     Export a notebook to another notebook format.
 
@@ -122,6 +82,9 @@ def export_notebook_to_notebook(
         output_path: Output path for the notebook
         format: Output format (ipynb, percent). Auto-detected if None.
         no_header: If True, omit YAML frontmatter when serializing to percent format.
+
+    Returns:
+        Whether the output file was created, updated or left unchanged
     """
     output_path = Path(output_path)
 
@@ -129,8 +92,7 @@ def export_notebook_to_notebook(
         format = Format.from_path(output_path)
 
     content = notebook.to_string(format, no_header=no_header)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(content)
+    return write_if_changed(output_path, content)
 
 
 def _compute_module_depth(
@@ -184,7 +146,7 @@ def export_notebook_to_module(
     cell_reference_style: CellReferenceStyle = CellReferenceStyle.RELATIVE,
     package_name: str | None = None,
     target_module: str | None = None,
-) -> None:
+) -> WriteStatus:
     """
     Export a notebook to a Python module.
 
@@ -201,23 +163,26 @@ def export_notebook_to_module(
         target_module: If specified, only export cells targeting this module.
             Cells with #|export go to default_exp, cells with #|export_to
             go to their specified module.
+
+    Returns:
+        Whether the output file was created, updated or left unchanged
     """
     output_path = Path(output_path)
     project_root = Path(project_root)
+    summary = notebook.export_summary
 
     # Validate function-only directives
-    _validate_function_only_directives(notebook)
+    summary.check_function_only_directives()
 
     # Check if this is a function notebook
-    if is_function_notebook(notebook):
-        export_function_notebook(
+    if summary.is_function_notebook:
+        return export_function_notebook(
             notebook,
             output_path,
             include_warning=include_warning,
             package_name=package_name,
             project_root=project_root,
         )
-        return
 
     source_path = notebook.source_path
 
@@ -242,7 +207,12 @@ def export_notebook_to_module(
 
     # Collect exported cells
     exported_content = _collect_exported_content(
-        notebook, export_mode, source_ref, package_name, module_depth, target_module
+        notebook,
+        summary.cells_for(target_module),
+        export_mode,
+        source_ref,
+        package_name,
+        module_depth,
     )
 
     # Build module content
@@ -256,9 +226,9 @@ def export_notebook_to_module(
     # Add __all__ list
     all_names = _extract_public_names(exported_content)
     # Add names from #|add_to_all directives
-    all_names.extend(_collect_add_to_all_names(notebook))
+    all_names.extend(summary.add_to_all)
     # Get names from #|exporti cells to exclude
-    exporti_names = _collect_exporti_names(notebook)
+    exporti_names = summary.exporti_names
     # Deduplicate while preserving order, excluding exporti names
     seen = set()
     unique_names = []
@@ -275,8 +245,7 @@ def export_notebook_to_module(
     lines.append(exported_content)
 
     # Write output
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines))
+    return write_if_changed(output_path, "\n".join(lines))
 
 
 def export_notebooks_to_module(
@@ -288,7 +257,7 @@ def export_notebooks_to_module(
     cell_reference_style: CellReferenceStyle = CellReferenceStyle.RELATIVE,
     package_name: str | None = None,
     target_module: str | None = None,
-) -> None:
+) -> WriteStatus:
     """
     Export multiple notebooks to a single Python module.
 
@@ -305,17 +274,20 @@ def export_notebooks_to_module(
         cell_reference_style: Style for cell references (relative or absolute)
         package_name: Package name for converting absolute imports to relative imports.
         target_module: If specified, only export cells targeting this module.
+
+    Returns:
+        Whether the output file was created, updated or left unchanged
     """
     output_path = Path(output_path)
     project_root = Path(project_root)
 
     # Validate function-only directives in all notebooks
     for notebook, _source_ref in notebooks:
-        _validate_function_only_directives(notebook)
+        notebook.export_summary.check_function_only_directives()
 
     # Check if any notebook is a function notebook - these should not be aggregated
     for notebook, _source_ref in notebooks:
-        if is_function_notebook(notebook):
+        if notebook.export_summary.is_function_notebook:
             raise ValueError(
                 f"Function notebooks cannot be aggregated with other notebooks. "
                 f"Notebook {notebook.source_path} has #|export_as_func true."
@@ -349,8 +321,8 @@ def export_notebooks_to_module(
     # Also collect exporti names to exclude
     exporti_names: set[str] = set()
     for nb, _source_ref in notebooks:
-        all_names.extend(_collect_add_to_all_names(nb))
-        exporti_names.update(_collect_exporti_names(nb))
+        all_names.extend(nb.export_summary.add_to_all)
+        exporti_names.update(nb.export_summary.exporti_names)
     # Deduplicate while preserving order, excluding exporti names
     seen = set()
     unique_names = []
@@ -367,8 +339,7 @@ def export_notebooks_to_module(
     lines.append(exported_content)
 
     # Write output
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines))
+    return write_if_changed(output_path, "\n".join(lines))
 
 
 def _collect_exported_content_multi(
@@ -399,41 +370,23 @@ def _collect_exported_content_multi(
         POST_CELL_EXPORT: After each cell export
     """
     # Collect all cells with their metadata for sorting
-    # Each entry: (order, notebook_path_str, cell_index, cell, notebook, source_ref)
-    cells_to_export: list[tuple[int, str, int, Cell, Notebook, str]] = []
+    # Each entry: (order, notebook_path_str, cell_index, export_cell, notebook, source_ref)
+    cells_to_export: list[tuple[int, str, int, ExportCell, Notebook, str]] = []
     source_refs_set: set[str] = set()
 
     for notebook, source_ref in notebooks:
-        default_exp = notebook.default_exp
         notebook_path_str = str(notebook.source_path) if notebook.source_path else ""
 
-        for cell in notebook.cells:
-            if not cell.is_code:
-                continue
-
-            # Check for export directives
-            has_export = cell.has_directive("export") or cell.has_directive("exporti")
-            has_export_to = cell.has_directive("export_to")
-
-            if not (has_export or has_export_to):
-                continue
-
-            # Filter by target module if specified
-            if target_module is not None:
-                cell_target = None
-                if has_export_to:
-                    export_to_directive = cell.get_directive("export_to")
-                    if export_to_directive and export_to_directive.value_parsed:
-                        cell_target = export_to_directive.value_parsed.get("module", "")
-                elif has_export:
-                    cell_target = default_exp
-
-                if cell_target != target_module:
-                    continue
-
-            order = _get_cell_order(cell)
+        for export_cell in notebook.export_summary.cells_for(target_module):
             cells_to_export.append(
-                (order, notebook_path_str, cell.index, cell, notebook, source_ref)
+                (
+                    export_cell.order,
+                    notebook_path_str,
+                    export_cell.cell.index,
+                    export_cell,
+                    notebook,
+                    source_ref,
+                )
             )
             source_refs_set.add(source_ref)
 
@@ -443,7 +396,8 @@ def _collect_exported_content_multi(
     # Output cells in sorted order
     parts: list[str] = []
 
-    for _order, _nb_path, _cell_idx, cell, notebook, source_ref in cells_to_export:
+    for _order, _nb_path, _cell_idx, export_cell, notebook, source_ref in cells_to_export:
+        cell = export_cell.cell
         # Get source without directives
         source = cell.source_without_directives.strip()
         if not source:
@@ -498,45 +452,18 @@ def get_export_targets(notebook: Notebook) -> dict[str, list[int]]:
     Returns:
         Dict mapping module paths to cell indices. Key "" means default_exp target.
     """
-    targets: dict[str, list[int]] = {}
-    default_exp = notebook.default_exp
-
-    for cell in notebook.cells:
-        if not cell.is_code:
-            continue
-
-        has_export = cell.has_directive("export") or cell.has_directive("exporti")
-        has_export_to = cell.has_directive("export_to")
-
-        if not (has_export or has_export_to):
-            continue
-
-        if has_export_to:
-            # Use the module specified in export_to
-            export_to_directive = cell.get_directive("export_to")
-            if export_to_directive and export_to_directive.value_parsed:
-                target_module = export_to_directive.value_parsed.get("module", "")
-                if target_module:
-                    if target_module not in targets:
-                        targets[target_module] = []
-                    targets[target_module].append(cell.index)
-        elif has_export:
-            # Use default_exp target (empty string as key if no default_exp)
-            target_key = default_exp or ""
-            if target_key not in targets:
-                targets[target_key] = []
-            targets[target_key].append(cell.index)
-
-    return targets
+    return {
+        module: list(indices) for module, indices in notebook.export_summary.targets.items()
+    }
 
 
 def _collect_exported_content(
     notebook: Notebook,
+    export_cells: list[ExportCell],
     export_mode: ExportMode,
     source_ref: str | None,
     package_name: str | None = None,
     module_depth: int = 0,
-    target_module: str | None = None,
 ) -> str:
     """
     Collect content from exported cells.
@@ -546,55 +473,23 @@ def _collect_exported_content(
 
     Args:
         notebook: Source notebook
+        export_cells: Cells to export, from the notebook's export summary
         export_mode: Export mode (percent or py)
         source_ref: Source reference string for cell markers
         package_name: Package name for import transformation
         module_depth: Depth of module within package (for relative imports)
-        target_module: If specified, only include cells targeting this module.
-                       Cells with #|export go to default_exp, cells with #|export_to
-                       go to their specified module.
 
     Hooks triggered:
         PRE_CELL_EXPORT: Before each cell export (cell=cell, notebook=notebook)
         POST_CELL_EXPORT: After each cell export (cell=cell, notebook=notebook, source=str)
     """
     parts: list[str] = []
-    default_exp = notebook.default_exp
-
-    # First pass: collect cells that should be exported
-    cells_to_export: list[Cell] = []
-
-    for cell in notebook.cells:
-        if not cell.is_code:
-            continue
-
-        # Check for export directives
-        has_export = cell.has_directive("export") or cell.has_directive("exporti")
-        has_export_to = cell.has_directive("export_to")
-
-        if not (has_export or has_export_to):
-            continue
-
-        # Filter by target module if specified
-        if target_module is not None:
-            cell_target = None
-            if has_export_to:
-                export_to_directive = cell.get_directive("export_to")
-                if export_to_directive and export_to_directive.value_parsed:
-                    cell_target = export_to_directive.value_parsed.get("module", "")
-            elif has_export:
-                cell_target = default_exp
-
-            if cell_target != target_module:
-                continue
-
-        cells_to_export.append(cell)
 
     # Sort cells by order value (stable sort maintains original order for same values)
-    cells_to_export.sort(key=lambda c: (_get_cell_order(c), c.index))
+    cells_to_export = sorted(export_cells, key=lambda c: (c.order, c.cell.index))
 
-    # Second pass: output cells in sorted order
-    for cell in cells_to_export:
+    for export_cell in cells_to_export:
+        cell = export_cell.cell
         # Get source without directives
         source = cell.source_without_directives.strip()
         if not source:
@@ -654,7 +549,11 @@ def _transform_imports(source: str, package_name: str, module_depth: int) -> str
     Returns:
         Transformed source code
     """
-    from nblite.core.directive import _get_string_ranges, _is_position_in_string
+    from nblite.core.directive import _SourceIndex
+
+    # Nothing to rewrite if the package is never mentioned; skip tokenizing
+    if package_name not in source:
+        return source
 
     # Number of dots needed: depth + 1
     # depth 0 (my_lib/core.py) -> 1 dot (.)
@@ -662,23 +561,13 @@ def _transform_imports(source: str, package_name: str, module_depth: int) -> str
     num_dots = module_depth + 1
     dots = "." * num_dots
 
-    # Compute string ranges to avoid rewriting imports inside string literals
-    string_ranges = _get_string_ranges(source)
-
-    # Precompute line start offsets for offset-to-position conversion
-    line_starts = [0]
-    for i, ch in enumerate(source):
-        if ch == "\n":
-            line_starts.append(i + 1)
+    # Index string ranges to avoid rewriting imports inside string literals
+    index = _SourceIndex(source)
 
     def replace_import(match: re.Match) -> str:
         # Skip matches inside string literals (f-strings, docstrings, etc.)
-        if string_ranges:
-            offset = match.start()
-            line_idx = bisect.bisect_right(line_starts, offset) - 1
-            col = offset - line_starts[line_idx]
-            if _is_position_in_string(line_idx, col, string_ranges):
-                return match.group(0)
+        if index.offset_in_string(match.start()):
+            return match.group(0)
 
         indent = match.group(1)
         module_path = match.group(2)
@@ -722,48 +611,3 @@ def _extract_public_names(content: str) -> list[str]:
             names.append(name)
 
     return names
-
-
-def _collect_add_to_all_names(notebook: Notebook) -> list[str]:
-    """
-    Collect names from #|add_to_all directives in a notebook.
-
-    Args:
-        notebook: Source notebook
-
-    Returns:
-        List of names to add to __all__
-    """
-    names: list[str] = []
-    for cell in notebook.cells:
-        if cell.has_directive("add_to_all"):
-            directive = cell.get_directive("add_to_all")
-            if directive and directive.value_parsed:
-                names.extend(directive.value_parsed)
-    return names
-
-
-def _collect_exporti_names(notebook: Notebook) -> set[str]:
-    """
-    Collect names from #|exporti cells to exclude from __all__.
-
-    Args:
-        notebook: Source notebook
-
-    Returns:
-        Set of names to exclude from __all__
-    """
-    names: set[str] = set()
-    for cell in notebook.cells:
-        if not cell.is_code:
-            continue
-        if cell.has_directive("exporti"):
-            source = cell.source_without_directives
-            # Extract names from this cell
-            for match in FUNCTION_PATTERN.finditer(source):
-                names.add(match.group(1))
-            for match in CLASS_PATTERN.finditer(source):
-                names.add(match.group(1))
-            for match in VARIABLE_PATTERN.finditer(source):
-                names.add(match.group(1))
-    return names
@@ -0,0 +1,127 @@
+"""
+Scheduling for the export pipeline.
+
+Rules of the export pipeline form a DAG over code locations. Rules that do
+not depend on each other are grouped into waves, and the outputs of a wave
+are written concurrently, while rules that read or write the same location
+keep their pipeline order.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from nblite.config.schema import ExportRule
+
+if TYPE_CHECKING:
+    from nblite.core.code_location import CodeLocation
+    from nblite.core.notebook import Notebook
+    from nblite.utils.files import WriteStatus
+
+__all__ = ["ExportTask", "batch_by_output", "schedule_rule_waves"]
+
+
+def _depends_on(later: ExportRule, earlier: ExportRule) -> bool:
+    """Whether a rule must run after an earlier rule of the pipeline."""
+    return (
+        # Reads what the earlier rule writes
+        later.from_key == earlier.to_key
+        # Writes the same location (the later rule wins)
+        or later.to_key == earlier.to_key
+        # Overwrites what the earlier rule reads
+        or later.to_key == earlier.from_key
+    )
+
+
+def schedule_rule_waves(rules: list[ExportRule]) -> list[list[ExportRule]]:
+    """
+    Group export rules into waves that can run concurrently.
+
+    A rule is placed in the wave after the latest earlier rule it depends on
+    (it reads that rule's output, or either rule writes what the other reads
+    or writes). Running the waves in order therefore gives the same result as
+    running the rules one by one in pipeline order.
+
+    Args:
+        rules: Export rules in pipeline order.
+
+    Returns:
+        Waves of rules, each in pipeline order.
+
+    Example:
+        >>> rules = parse_export_pipeline("nbs -> pts\\nnbs -> lib\\npts -> docs")
+        >>> [[f"{r.from_key}->{r.to_key}" for r in wave] for wave in schedule_rule_waves(rules)]
+        [['nbs->pts', 'nbs->lib'], ['pts->docs']]
+    """
+    levels: list[int] = []
+    for i, rule in enumerate(rules):
+        level = 0
+        for j in range(i):
+            if _depends_on(rule, rules[j]):
+                level = max(level, levels[j] + 1)
+        levels.append(level)
+
+    waves: list[list[ExportRule]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for rule, level in zip(rules, levels, strict=True):
+        waves[level].append(rule)
+    return waves
+
+
+@dataclass
+class ExportTask:
+    """
+    One output file of an export rule, planned before anything is written.
+
+    Attributes:
+        rule_key: Rule producing the output ("from_key -> to_key")
+        from_location: Source code location
+        to_location: Destination code location
+        output_path: File to write
+        sources: Contributing notebooks as (path, source reference)
+        outputs: Whether the notebooks must be loaded with cell outputs
+        inputs: Contributing notebooks -> content SHA-256 (for the manifest)
+        options: Hash of the export options (for the manifest)
+        write: Writes the output from the loaded (notebook, source reference)
+               pairs and returns the write status
+        describe: Builds the error message for a failed write
+        notebooks: Loaded notebooks, filled in when the task runs
+    """
+
+    rule_key: str
+    from_location: CodeLocation
+    to_location: CodeLocation
+    output_path: Path
+    sources: list[tuple[Path, str]]
+    outputs: bool
+    inputs: dict[str, str]
+    options: str
+    write: Callable[[list[tuple[Notebook, str]]], WriteStatus]
+    describe: Callable[[list[tuple[Notebook, str]], Exception], str]
+    notebooks: list[tuple[Notebook, str]] = field(default_factory=list, repr=False)
+
+
+def batch_by_output(tasks: list[ExportTask]) -> list[list[ExportTask]]:
+    """
+    Split tasks into consecutive batches that never write the same file twice.
+
+    Tasks writing a file already written earlier in the batch start a new
+    batch, so that concurrent writes never race and the last task still wins.
+
+    Args:
+        tasks: Tasks in plan order.
+
+    Returns:
+        Batches of tasks, in plan order.
+    """
+    batches: list[list[ExportTask]] = []
+    seen: set[Path] = set()
+    for task in tasks:
+        if not batches or task.output_path in seen:
+            batches.append([])
+            seen = set()
+        batches[-1].append(task)
+        seen.add(task.output_path)
+    return batches
@@ -0,0 +1,220 @@
+"""
+Export summary of a notebook.
+
+ExportSummary gathers everything module export needs from a notebook's
+directives (export targets, exported cells and their order, function notebook
+flags and __all__ names) in a single pass over its cells. It is computed once
+per notebook and shared by the project index and every export rule.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from nblite.core.cell import Cell
+    from nblite.core.notebook import Notebook
+
+__all__ = ["ExportCell", "ExportSummary"]
+
+
+def _get_cell_order(cell: Cell) -> int:
+    """
+    Get the order value for an exported cell.
+
+    Order values determine the position of cells in the exported module.
+    Default values:
+    - #|export: 0
+    - #|exporti: 0
+    - #|export_to: 1
+
+    Args:
+        cell: The cell to get order from
+
+    Returns:
+        The order value (lower = earlier in output)
+    """
+    # Check export_to first (has module and order)
+    if cell.has_directive("export_to"):
+        directive = cell.get_directive("export_to")
+        if directive and directive.value_parsed:
+            return directive.value_parsed.get("order", 1)
+
+    # Check export/exporti
+    for name in ("export", "exporti"):
+        if cell.has_directive(name):
+            directive = cell.get_directive(name)
+            if directive and directive.value_parsed:
+                return directive.value_parsed.get("order", 0)
+            return 0  # Default if no parsed value
+
+    return 0  # Fallback
+
+
+@dataclass(frozen=True)
+class ExportCell:
+    """
+    A code cell exported with #|export, #|exporti or #|export_to.
+
+    Attributes:
+        cell: The exported cell
+        target: Module the cell exports to: the #|export_to module, or the
+            notebook's default_exp for #|export and #|exporti (None if unset)
+        order: Order value of the cell within its module
+    """
+
+    cell: Cell
+    target: str | None
+    order: int
+
+
+@dataclass(frozen=True)
+class ExportSummary:
+    """
+    Directive summary of a notebook, as used by module export.
+
+    Attributes:
+        default_exp: Module from #|default_exp, or None
+        is_function_notebook: Whether the notebook has #|export_as_func true
+        targets: Cell indices by target module, in notebook order ("" means
+            #|export without #|default_exp; see get_export_targets). Read-only.
+        cells: Exported cells, in notebook order
+        add_to_all: Names from #|add_to_all directives
+        exporti_names: Names defined in #|exporti cells (kept out of __all__)
+        function_only_error: Why the notebook cannot be exported, if it uses
+            #|top_export or #|bottom_export without being a function notebook
+    """
+
+    default_exp: str | None
+    is_function_notebook: bool
+    targets: Mapping[str, tuple[int, ...]]
+    cells: tuple[ExportCell, ...]
+    add_to_all: tuple[str, ...]
+    exporti_names: frozenset[str]
+    function_only_error: str | None = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.targets, MappingProxyType):
+            targets = {key: tuple(indices) for key, indices in self.targets.items()}
+            object.__setattr__(self, "targets", MappingProxyType(targets))
+
+    def __getstate__(self) -> dict[str, Any]:
+        # MappingProxyType cannot be pickled; process pool workers send
+        # notebooks back with their summary attached
+        state = self.__dict__.copy()
+        state["targets"] = dict(self.targets)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        object.__setattr__(self, "targets", MappingProxyType(state["targets"]))
+
+    @classmethod
+    def from_notebook(cls, notebook: Notebook) -> ExportSummary:
+        """
+        Summarize a notebook in one pass over its cells.
+
+        Args:
+            notebook: Notebook to summarize
+
+        Returns:
+            ExportSummary instance
+        """
+        from nblite.export.pipeline import CLASS_PATTERN, FUNCTION_PATTERN, VARIABLE_PATTERN
+
+        default_exp = notebook.default_exp
+        is_function_notebook = False
+        targets: dict[str, list[int]] = {}
+        cells: list[ExportCell] = []
+        add_to_all: list[str] = []
+        exporti_names: set[str] = set()
+        function_only_cell: tuple[str, int] | None = None
+
+        for cell in notebook.cells:
+            if not cell.directives:
+                continue
+
+            directive = cell.get_directive("export_as_func")
+            if directive and directive.value.strip().lower() == "true":
+                is_function_notebook = True
+
+            directive = cell.get_directive("add_to_all")
+            if directive and directive.value_parsed:
+                add_to_all.extend(directive.value_parsed)
+
+            if function_only_cell is None:
+                for name in ("top_export", "bottom_export"):
+                    if cell.has_directive(name):
+                        function_only_cell = (name, cell.index)
+                        break
+
+            if not cell.is_code:
+                continue
+
+            has_export = cell.has_directive("export") or cell.has_directive("exporti")
+            export_to = cell.get_directive("export_to")
+            if export_to is not None:
+                # #|export_to takes precedence over #|export
+                target = (
+                    export_to.value_parsed.get("module", "") if export_to.value_parsed else None
+                )
+                if target:
+                    targets.setdefault(target, []).append(cell.index)
+            elif has_export:
+                target = default_exp
+                targets.setdefault(default_exp or "", []).append(cell.index)
+            else:
+                continue
+
+            cells.append(ExportCell(cell=cell, target=target, order=_get_cell_order(cell)))
+
+            if cell.has_directive("exporti"):
+                source = cell.source_without_directives
+                for pattern in (FUNCTION_PATTERN, CLASS_PATTERN, VARIABLE_PATTERN):
+                    exporti_names.update(match.group(1) for match in pattern.finditer(source))
+
+        function_only_error = None
+        if function_only_cell is not None and not is_function_notebook:
+            name, index = function_only_cell
+            function_only_error = (
+                f"#|{name} directive can only be used in function notebooks "
+                f"(notebooks with #|export_as_func true). Found in cell {index}."
+            )
+
+        return cls(
+            default_exp=default_exp,
+            is_function_notebook=is_function_notebook,
+            targets=MappingProxyType({key: tuple(indices) for key, indices in targets.items()}),
+            cells=tuple(cells),
+            add_to_all=tuple(add_to_all),
+            exporti_names=frozenset(exporti_names),
+            function_only_error=function_only_error,
+        )
+
+    def check_function_only_directives(self) -> None:
+        """
+        Check function-only directives are only used in function notebooks.
+
+        Raises:
+            ValueError: If #|top_export or #|bottom_export is used in a
+                non-function notebook.
+        """
+        if self.function_only_error is not None:
+            raise ValueError(self.function_only_error)
+
+    def cells_for(self, target_module: str | None) -> list[ExportCell]:
+        """
+        Get the exported cells of a module.
+
+        Args:
+            target_module: Module name, or None for every exported cell
+
+        Returns:
+            Exported cells targeting target_module, in notebook order
+        """
+        if target_module is None:
+            return list(self.cells)
+        return [export_cell for export_cell in self.cells if export_cell.target == target_module]
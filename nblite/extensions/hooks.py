@@ -11,6 +11,14 @@ from collections.abc import Callable
 from enum import Enum
 from typing import Any
 
+from nblite.utils.tracing import (
+    MetricRecord,
+    SpanRecord,
+    TraceListener,
+    add_listener,
+    remove_listener,
+)
+
 __all__ = ["HookType", "HookRegistry", "hook"]
 
 
@@ -36,6 +44,16 @@ class HookType(Enum):
     # Directive hooks
     DIRECTIVE_PARSED = "directive_parsed"
 
+    # Tracing hooks (see nblite.utils.tracing), triggered on the thread
+    # doing the work, which may be a worker thread
+    SPAN_START = "span_start"
+    SPAN_END = "span_end"
+    METRIC = "metric"
+
+
+# Hook types fed by tracing events
+_TRACE_HOOK_TYPES = (HookType.SPAN_START, HookType.SPAN_END, HookType.METRIC)
+
 
 # Type alias for hook callbacks
 HookCallback = Callable[..., Any]
@@ -70,6 +88,28 @@ class HookRegistry:
             callback: The callback function to invoke.
         """
         cls._hooks[hook_type].append(callback)
+        if hook_type in _TRACE_HOOK_TYPES:
+            cls._update_trace_listener()
+
+    @classmethod
+    def unregister(cls, hook_type: HookType, callback: HookCallback) -> bool:
+        """
+        Remove a registered callback.
+
+        Args:
+            hook_type: The type of hook the callback was registered for.
+            callback: The callback function to remove.
+
+        Returns:
+            True if the callback was registered, False otherwise.
+        """
+        callbacks = cls._hooks.get(hook_type, [])
+        if callback not in callbacks:
+            return False
+        callbacks.remove(callback)
+        if hook_type in _TRACE_HOOK_TYPES:
+            cls._update_trace_listener()
+        return True
 
     @classmethod
     def trigger(cls, hook_type: HookType, **context: Any) -> list[Any]:
@@ -101,6 +141,7 @@ class HookRegistry:
             cls._hooks.clear()
         else:
             cls._hooks[hook_type] = []
+        cls._update_trace_listener()
 
     @classmethod
     def get_hooks(cls, hook_type: HookType) -> list[HookCallback]:
@@ -115,6 +156,42 @@ class HookRegistry:
         """
         return list(cls._hooks.get(hook_type, []))
 
+    @classmethod
+    def _update_trace_listener(cls) -> None:
+        """Receive tracing events only while tracing hooks are registered."""
+        if any(cls._hooks.get(hook_type) for hook_type in _TRACE_HOOK_TYPES):
+            add_listener(_trace_hooks)
+        else:
+            remove_listener(_trace_hooks)
+
+
+class _TraceHooks(TraceListener):
+    """Forwards tracing events to the SPAN_START, SPAN_END and METRIC hooks."""
+
+    def span_started(self, name: str, path: tuple[str, ...], attrs: dict[str, Any]) -> None:
+        HookRegistry.trigger(HookType.SPAN_START, name=name, path=path, attrs=attrs)
+
+    def span_finished(self, record: SpanRecord) -> None:
+        HookRegistry.trigger(
+            HookType.SPAN_END,
+            name=record.name,
+            path=record.path,
+            duration=record.duration,
+            attrs=record.attrs,
+        )
+
+    def metric(self, record: MetricRecord) -> None:
+        HookRegistry.trigger(
+            HookType.METRIC,
+            name=record.name,
+            value=record.value,
+            path=record.path,
+            attrs=record.attrs,
+        )
+
+
+_trace_hooks = _TraceHooks()
+
 
 def hook(hook_type: HookType) -> Callable[[HookCallback], HookCallback]:
     """
@@ -4,34 +4,47 @@ Fill module for nblite.
 Provides functionality to execute notebooks and fill their outputs.
 """
 
+from nblite.fill.backends import run_fill_jobs
+from nblite.fill.cache import FillStateCache
 from nblite.fill.executor import (
     FillResult,
     FillStatus,
+    async_fill_notebook,
     fill_notebook,
     fill_notebooks,
 )
 from nblite.fill.hash import (
     HASH_METADATA_KEY,
     get_notebook_hash,
+    get_notebook_hash_from_dict,
     get_notebook_hash_from_path,
     has_notebook_changed,
+    read_notebook_hashes,
 )
 from nblite.fill.kernel import (
     CUSTOM_KERNEL_NAME,
     custom_kernel_environment,
     validate_python_binary,
 )
+from nblite.fill.pool import KernelPool, PooledKernel
 
 __all__ = [
+    "async_fill_notebook",
     "fill_notebook",
     "fill_notebooks",
+    "run_fill_jobs",
     "FillResult",
     "FillStatus",
     "get_notebook_hash",
+    "get_notebook_hash_from_dict",
     "get_notebook_hash_from_path",
+    "read_notebook_hashes",
+    "FillStateCache",
     "has_notebook_changed",
     "HASH_METADATA_KEY",
     "validate_python_binary",
     "custom_kernel_environment",
     "CUSTOM_KERNEL_NAME",
+    "KernelPool",
+    "PooledKernel",
 ]
@@ -0,0 +1,247 @@
+"""
+Executor backends for filling many notebooks.
+
+Three backends run fill_notebook over a batch of notebooks:
+
+- ``thread``: a thread pool, sharing one KernelPool when kernels are reused
+  (the default)
+- ``process``: a process pool; each worker process keeps its own warm kernel
+  when kernels are reused, and notebook parsing, cleaning and hashing do not
+  contend for one GIL
+- ``async``: a single event loop driving up to n_workers kernels through
+  nbclient's async API
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing.util
+import pickle
+from collections.abc import Callable, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from nbclient.util import run_sync
+
+from nblite.config.schema import FillExecutor
+from nblite.fill.executor import FillResult, FillStatus, async_fill_notebook, fill_notebook
+from nblite.fill.pool import KernelPool
+from nblite.utils.tracing import propagate
+
+__all__ = ["run_fill_jobs"]
+
+# Kernel pool of a process-backend worker (one warm kernel per process)
+_worker_pool: KernelPool | None = None
+
+
+def _init_process_worker(kernel_name: str, reuse_kernels: bool) -> None:
+    """Set up the kernel pool of a process-backend worker."""
+    global _worker_pool
+    if reuse_kernels:
+        _worker_pool = KernelPool(kernel_name)
+        # atexit does not run in pool workers; multiprocessing finalizers do
+        multiprocessing.util.Finalize(_worker_pool, _worker_pool.close, exitpriority=10)
+
+
+def _fill_in_process(path: Path, kernel_name: str, options: dict[str, Any]) -> FillResult:
+    """Fill one notebook in a process-backend worker."""
+    result = fill_notebook(path, kernel_name=kernel_name, kernel_pool=_worker_pool, **options)
+    if result.error is not None:
+        # The result travels back to the parent; not every exception pickles
+        try:
+            pickle.dumps(result.error)
+        except Exception:
+            result.error = RuntimeError(result.message)
+    return result
+
+
+def _run_bounded(
+    executor: Executor,
+    fn: Callable[[Path], FillResult],
+    paths: Iterable[Path],
+    n_workers: int,
+    on_start: Callable[[Path], None] | None,
+    on_result: Callable[[Path, FillResult], None] | None,
+) -> list[FillResult]:
+    """
+    Run fn over paths with at most n_workers submitted at a time.
+
+    Keeping submissions bounded means on_start fires when a notebook actually
+    starts. Both callbacks run in the calling thread.
+    """
+    results: list[FillResult] = []
+    pending: dict[Future[FillResult], Path] = {}
+    remaining = iter(paths)
+
+    def submit_next() -> None:
+        path = next(remaining, None)
+        if path is None:
+            return
+        if on_start:
+            on_start(path)
+        pending[executor.submit(fn, path)] = path
+
+    for _ in range(n_workers):
+        submit_next()
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            path = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # e.g. a worker process died
+                result = FillResult(status=FillStatus.ERROR, path=path, message=str(e), error=e)
+            results.append(result)
+            if on_result:
+                on_result(path, result)
+            submit_next()
+
+    return results
+
+
+async def _run_async(
+    paths: list[Path],
+    n_workers: int,
+    kernel_name: str,
+    kernel_pool: KernelPool | None,
+    options: dict[str, Any],
+    on_start: Callable[[Path], None] | None,
+    on_result: Callable[[Path, FillResult], None] | None,
+) -> list[FillResult]:
+    """Fill notebooks concurrently on the running event loop."""
+    semaphore = asyncio.Semaphore(n_workers)
+    results: list[FillResult] = []
+
+    async def fill_one(path: Path) -> None:
+        async with semaphore:
+            if on_start:
+                on_start(path)
+            result = await async_fill_notebook(
+                path, kernel_name=kernel_name, kernel_pool=kernel_pool, **options
+            )
+        results.append(result)
+        if on_result:
+            on_result(path, result)
+
+    await asyncio.gather(*(fill_one(path) for path in paths))
+    return results
+
+
+def run_fill_jobs(
+    paths: list[Path],
+    *,
+    executor: FillExecutor | str = FillExecutor.THREAD,
+    n_workers: int = 1,
+    kernel_name: str = "python3",
+    reuse_kernels: bool = False,
+    kernel_pool: KernelPool | None = None,
+    timeout: int | None = None,
+    dry_run: bool = False,
+    remove_outputs_first: bool = False,
+    clean: bool = True,
+    save_hash: bool = True,
+    on_start: Callable[[Path], None] | None = None,
+    on_result: Callable[[Path, FillResult], None] | None = None,
+) -> list[FillResult]:
+    """
+    Fill a batch of notebooks with the chosen executor backend.
+
+    Must be called inside custom_kernel_environment when using a custom
+    Python, so that kernels (and process workers) see the kernel spec.
+
+    Args:
+        paths: Notebooks to fill.
+        executor: Backend to run on ("thread", "process" or "async").
+        n_workers: Maximum number of notebooks executing at once.
+        kernel_name: Jupyter kernel name to use.
+        reuse_kernels: If True, keep kernels warm between notebooks (see
+            KernelPool for the state that carries over).
+        kernel_pool: Pool to use for the thread and async backends (created
+            for this call if None and reuse_kernels is set). Process workers
+            always use their own kernels.
+        timeout: Cell execution timeout in seconds.
+        dry_run: If True, execute but don't save notebooks.
+        remove_outputs_first: If True, clear existing outputs before execution.
+        clean: If True, clean notebooks after execution.
+        save_hash: If True, save notebook hash in metadata.
+        on_start: Optional callback(path) when a notebook starts executing.
+        on_result: Optional callback(path, result) when a notebook finishes.
+
+    Returns:
+        FillResult objects in completion order.
+
+    Raises:
+        ValueError: If executor is not a known backend.
+    """
+    executor = FillExecutor(executor)
+    n_workers = max(1, n_workers)
+    options: dict[str, Any] = {
+        "timeout": timeout,
+        "dry_run": dry_run,
+        "remove_outputs_first": remove_outputs_first,
+        "clean": clean,
+        "save_hash": save_hash,
+    }
+
+    if executor == FillExecutor.PROCESS:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_process_worker,
+            initargs=(kernel_name, reuse_kernels),
+        ) as pool_executor:
+            return _run_bounded(
+                pool_executor,
+                partial(_fill_in_process, kernel_name=kernel_name, options=options),
+                paths,
+                n_workers,
+                on_start,
+                on_result,
+            )
+
+    owns_pool = kernel_pool is None and reuse_kernels
+    if owns_pool:
+        kernel_pool = KernelPool(kernel_name, size=n_workers)
+
+    try:
+        if executor == FillExecutor.ASYNC:
+            # Waiting for a free kernel would block the event loop
+            if kernel_pool is not None:
+                n_workers = min(n_workers, kernel_pool.size)
+            return run_sync(_run_async)(
+                paths, n_workers, kernel_name, kernel_pool, options, on_start, on_result
+            )
+
+        def fill_one(path: Path) -> FillResult:
+            return fill_notebook(path, kernel_name=kernel_name, kernel_pool=kernel_pool, **options)
+
+        if n_workers == 1:
+            # Sequential execution in the calling thread
+            results = []
+            for path in paths:
+                if on_start:
+                    on_start(path)
+                result = fill_one(path)
+                results.append(result)
+                if on_result:
+                    on_result(path, result)
+            return results
+
+        with ThreadPoolExecutor(max_workers=n_workers) as thread_executor:
+            return _run_bounded(
+                thread_executor, propagate(fill_one), paths, n_workers, on_start, on_result
+            )
+    finally:
+        if owns_pool:
+            assert kernel_pool is not None
+            kernel_pool.close()
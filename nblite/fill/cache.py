@@ -0,0 +1,195 @@
+"""
+Persistent fill state for fast change detection.
+
+Deciding whether a notebook needs filling means hashing its sources and
+outputs. FillStateCache remembers the outcome per file, keyed by size and
+mtime, so unchanged notebooks are skipped after a single stat() call.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from nblite.fill.hash import read_notebook_hashes
+
+__all__ = ["FillStateCache"]
+
+# Bump when the entry layout or the hashing changes
+FILL_STATE_VERSION = 1
+FILL_STATE_FILENAME = "fill_state.json"
+
+# Files modified this recently may change again within the same mtime tick,
+# so a stat match is not trusted on its own
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class FillStateCache:
+    """
+    Per-notebook fill hashes, persisted between runs.
+
+    Each entry stores the file's size and mtime together with the hash of its
+    current content and the hash recorded in its metadata by the last fill.
+    While size and mtime match, has_changed() answers without reading the file.
+
+    Attributes:
+        root_path: Project root directory
+        cache_dir: Directory holding the state file, or None to keep the
+                   state in memory only
+        hash_count: Number of notebooks read and hashed by this instance
+
+    Example:
+        >>> cache = FillStateCache(project.root_path, project.root_path / ".nblite/cache")
+        >>> to_fill = [p for p in paths if cache.has_changed(p)]
+        >>> cache.record(path, result.notebook_hash)
+        >>> cache.save()
+    """
+
+    def __init__(self, root_path: Path, cache_dir: Path | None = None) -> None:
+        self.root_path = Path(root_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.hash_count = 0
+        self._entries: dict[str, dict[str, int | str | None]] | None = None
+        self._dirty = False
+
+    @property
+    def state_path(self) -> Path | None:
+        """Path of the state file, or None for an in-memory cache."""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / FILL_STATE_FILENAME
+
+    def _key(self, path: Path) -> str:
+        """Cache key for a notebook path."""
+        try:
+            return path.relative_to(self.root_path).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _load(self) -> dict[str, dict[str, int | str | None]]:
+        """Load entries from disk, starting empty if the file is missing or stale."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        state_path = self.state_path
+        if state_path is None or not state_path.exists():
+            return self._entries
+
+        from nblite import __version__
+
+        try:
+            data = json.loads(state_path.read_text(encoding="utf-8"))
+            if data.get("version") == FILL_STATE_VERSION and data.get("nblite") == __version__:
+                self._entries = dict(data["notebooks"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # A corrupt state file is just a cold cache
+            self._entries = {}
+        return self._entries
+
+    def _lookup(self, path: Path, stat: os.stat_result) -> dict[str, int | str | None] | None:
+        """Get the entry for path if it still describes the file on disk."""
+        entry = self._load().get(self._key(path))
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and time.time_ns() - stat.st_mtime_ns > _RACY_WINDOW_NS
+        ):
+            return entry
+        return None
+
+    def has_changed(self, path: Path | str, stat: os.stat_result | None = None) -> bool:
+        """
+        Check if a notebook needs filling.
+
+        Args:
+            path: Path to the ipynb file.
+            stat: Stat of the file if already known (e.g. from scan_files),
+                to avoid statting it again.
+
+        Returns:
+            True if the notebook's content differs from its last fill, or it
+            was never filled with a hash.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = Path(path)
+        if stat is None:
+            stat = path.stat()
+        entry = self._lookup(path, stat)
+        if entry is None:
+            current_hash, stored_hash = read_notebook_hashes(path)
+            self.hash_count += 1
+            entry = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": current_hash,
+                "stored_hash": stored_hash,
+            }
+            self._load()[self._key(path)] = entry
+            self._dirty = True
+        return entry["stored_hash"] is None or entry["hash"] != entry["stored_hash"]
+
+    def record(self, path: Path | str, notebook_hash: str) -> None:
+        """
+        Record a notebook just written by fill with notebook_hash in its metadata.
+
+        Lets the next run skip the notebook without re-hashing it.
+
+        Args:
+            path: Path to the filled ipynb file.
+            notebook_hash: Hash of the written content (as stored in metadata).
+        """
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            self._load().pop(self._key(path), None)
+            return
+        self._load()[self._key(path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": notebook_hash,
+            "stored_hash": notebook_hash,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the state to disk if it changed.
+
+        Entries for notebooks that no longer exist are dropped. Does nothing
+        for an in-memory cache.
+        """
+        state_path = self.state_path
+        if state_path is None or not self._dirty or self._entries is None:
+            return
+
+        from nblite import __version__
+
+        for key in [k for k in self._entries if not (self.root_path / k).exists()]:
+            del self._entries[key]
+
+        assert self.cache_dir is not None
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+
+        data = {
+            "version": FILL_STATE_VERSION,
+            "nblite": __version__,
+            "notebooks": dict(sorted(self._entries.items())),
+        }
+        tmp_path = state_path.with_name(f"{state_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, state_path)
+        self._dirty = False
+
+    def __repr__(self) -> str:
+        n_entries = len(self._entries) if self._entries is not None else 0
+        return f"FillStateCache(root_path={self.root_path!r}, entries={n_entries})"
@@ -6,19 +6,24 @@ Executes notebook cells and fills outputs, respecting skip directives.
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import nbformat
-from nbconvert.preprocessors import ExecutePreprocessor
+from nbclient.exceptions import CellExecutionError
 
+from nblite.fill.cache import FillStateCache
 from nblite.fill.hash import HASH_METADATA_KEY, get_notebook_hash
+from nblite.fill.pool import KernelPool, PooledKernel
+from nblite.utils.tracing import count, span, traced
 
 if TYPE_CHECKING:
     from nblite.core.notebook import Notebook
 
 __all__ = [
+    "async_fill_notebook",
     "fill_notebook",
     "FillResult",
     "FillStatus",
@@ -35,12 +40,26 @@ class FillStatus:
 
 @dataclass
 class FillResult:
-    """Result of a fill operation."""
+    """
+    Result of a fill operation.
+
+    Attributes:
+        status: One of the FillStatus constants
+        path: Path of the notebook
+        message: Human-readable outcome
+        error: Exception raised during execution, if any
+        kernel_time: Seconds spent starting (or resetting a reused) kernel
+        execution_time: Seconds spent executing the notebook's cells
+        notebook_hash: Hash stored in the written notebook's metadata, if any
+    """
 
     status: str
     path: Path | None = None
     message: str = ""
     error: Exception | None = None
+    kernel_time: float = 0.0
+    execution_time: float = 0.0
+    notebook_hash: str | None = None
 
 
 def _mark_skipped_cells(nb: nbformat.NotebookNode) -> tuple[nbformat.NotebookNode, list[int]]:
@@ -121,6 +140,72 @@ def _restore_skipped_cells(
     return nb
 
 
+def _load_for_execution(
+    path: Path, remove_outputs_first: bool
+) -> tuple[nbformat.NotebookNode, list[int]]:
+    """Read a notebook for execution and mark the cells to skip."""
+    with open(path, encoding="utf-8") as f:
+        nb = nbformat.read(f, as_version=4)
+
+    # Optionally clear existing outputs
+    if remove_outputs_first:
+        for cell in nb.cells:
+            if cell.cell_type == "code":
+                cell.outputs = []
+                cell.execution_count = None
+
+    return _mark_skipped_cells(nb)
+
+
+def _save_filled_notebook(
+    nb: nbformat.NotebookNode,
+    skipped_indices: list[int],
+    path: Path,
+    *,
+    dry_run: bool,
+    clean: bool,
+    save_hash: bool,
+) -> str | None:
+    """
+    Restore skipped cells, then clean, hash and write the executed notebook.
+
+    Returns:
+        The hash stored in the notebook's metadata, or None if none was saved.
+    """
+    from nblite.core.notebook import Notebook
+
+    nb = _restore_skipped_cells(nb, skipped_indices)
+    if dry_run:
+        return None
+
+    # Convert to nblite Notebook for cleaning and hash calculation
+    nb_obj = Notebook.from_dict(dict(nb))
+
+    # Clean the notebook if requested (must happen BEFORE hash calculation)
+    if clean:
+        with span("fill.clean"):
+            nb_obj = nb_obj.clean()
+
+    # Calculate and store new hash if requested
+    new_hash = None
+    if save_hash:
+        with span("fill.hash"):
+            new_hash = get_notebook_hash(nb_obj)
+        nb_obj.metadata[HASH_METADATA_KEY] = new_hash
+
+    # Write back to file
+    nb_obj.to_file(path)
+    return new_hash
+
+
+def _notebook_path(notebook: Notebook | Path | str) -> Path | None:
+    """Get the file path of a notebook argument."""
+    if isinstance(notebook, (str, Path)):
+        return Path(notebook)
+    return notebook.source_path
+
+
+@traced("fill.notebook")
 def fill_notebook(
     notebook: Notebook | Path | str,
     *,
@@ -132,6 +217,7 @@ def fill_notebook(
     save_hash: bool = True,
     kernel_name: str = "python3",
     python: str | Path | None = None,
+    kernel_pool: KernelPool | None = None,
 ) -> FillResult:
     """
     Execute a notebook and fill its outputs.
@@ -150,19 +236,14 @@ def fill_notebook(
         python: Path to Python binary for execution. If set, creates a temporary
             kernel spec and wraps execution with custom_kernel_environment.
             Overrides kernel_name when set.
+        kernel_pool: Pool of warm kernels to execute on. The pool's kernel is
+            used instead of kernel_name and python. If None, a kernel is
+            started for this notebook and shut down afterwards.
 
     Returns:
         FillResult with status and any error information.
     """
-    from nblite.core.notebook import Notebook
-
-    # Handle path input
-    if isinstance(notebook, (str, Path)):
-        path = Path(notebook)
-        notebook = Notebook.from_file(path)
-    else:
-        path = notebook.source_path
-
+    path = _notebook_path(notebook)
     if path is None:
         return FillResult(
             status=FillStatus.ERROR,
@@ -190,55 +271,161 @@ def fill_notebook(
                 save_hash=save_hash,
                 kernel_name=custom_kernel_name,
                 python=None,  # Don't recurse
+                kernel_pool=kernel_pool,
             )
 
+    pool = kernel_pool if kernel_pool is not None else KernelPool(kernel_name)
+    kernel: PooledKernel | None = None
+    discard_kernel = False
+    kernel_time = 0.0
+    execution_time = 0.0
+
     try:
-        # Read notebook with nbformat for execution
-        with open(path, encoding="utf-8") as f:
-            nb = nbformat.read(f, as_version=4)
+        with span("fill.load"):
+            nb, skipped_indices = _load_for_execution(path, remove_outputs_first)
 
-        # Optionally clear existing outputs
-        if remove_outputs_first:
-            for cell in nb.cells:
-                if cell.cell_type == "code":
-                    cell.outputs = []
-                    cell.execution_count = None
+        # Execute the notebook
+        with span("fill.kernel"):
+            kernel = pool.acquire(working_dir)
+        kernel_time = kernel.acquire_time
+        client = pool.notebook_client(
+            kernel, nb, timeout=timeout, resources={"metadata": {"path": str(working_dir)}}
+        )
 
-        # Mark cells to skip
-        nb, skipped_indices = _mark_skipped_cells(nb)
+        start = time.perf_counter()
+        try:
+            with span("fill.execute"):
+                client.execute()
+        except CellExecutionError:
+            raise
+        except Exception:
+            # Timeouts and dead kernels leave the kernel in an unknown state
+            discard_kernel = True
+            raise
+        finally:
+            execution_time = time.perf_counter() - start
+            # Hand the kernel back before post-processing so others can use it
+            pool.release(kernel, discard=discard_kernel)
+            kernel = None
+
+        with span("fill.save"):
+            notebook_hash = _save_filled_notebook(
+                nb, skipped_indices, path, dry_run=dry_run, clean=clean, save_hash=save_hash
+            )
 
-        # Execute the notebook
-        ep = ExecutePreprocessor(
-            timeout=timeout,
-            kernel_name=kernel_name,
+        return FillResult(
+            status=FillStatus.SUCCESS,
+            path=path,
+            message="Notebook executed successfully",
+            kernel_time=kernel_time,
+            execution_time=execution_time,
+            notebook_hash=notebook_hash,
         )
-        resources = {"metadata": {"path": str(working_dir)}}
 
-        ep.preprocess(nb, resources)
+    except Exception as e:
+        return FillResult(
+            status=FillStatus.ERROR,
+            path=path,
+            message=str(e),
+            error=e,
+            kernel_time=kernel_time,
+            execution_time=execution_time,
+        )
+
+    finally:
+        if kernel is not None:
+            pool.release(kernel)
+        if kernel_pool is None:
+            pool.close()
+
+
+@traced("fill.notebook")
+async def async_fill_notebook(
+    notebook: Notebook | Path | str,
+    *,
+    timeout: int | None = None,
+    working_dir: Path | str | None = None,
+    dry_run: bool = False,
+    remove_outputs_first: bool = False,
+    clean: bool = True,
+    save_hash: bool = True,
+    kernel_name: str = "python3",
+    kernel_pool: KernelPool | None = None,
+) -> FillResult:
+    """
+    Execute a notebook and fill its outputs on the running event loop.
+
+    Coroutine version of fill_notebook, built on nbclient's async API so that
+    one event loop can drive many kernels at once. Custom Python binaries are
+    supported by creating the kernel pool inside custom_kernel_environment.
 
-        # Restore skipped cells
-        nb = _restore_skipped_cells(nb, skipped_indices)
+    Args:
+        notebook: The notebook to fill (Notebook object or path).
+        timeout: Cell execution timeout in seconds (None = no timeout).
+        working_dir: Working directory for execution (default: notebook's directory).
+        dry_run: If True, execute but don't save the notebook.
+        remove_outputs_first: If True, clear existing outputs before execution.
+        clean: If True, clean the notebook after execution.
+        save_hash: If True, save the notebook hash in metadata for change detection.
+        kernel_name: Jupyter kernel name to use when kernel_pool is None.
+        kernel_pool: Pool of warm kernels to execute on. If None, a kernel is
+            started for this notebook and shut down afterwards.
 
-        if not dry_run:
-            # Convert to nblite Notebook for cleaning and hash calculation
-            nb_obj = Notebook.from_dict(dict(nb))
+    Returns:
+        FillResult with status and any error information.
+    """
+    path = _notebook_path(notebook)
+    if path is None:
+        return FillResult(
+            status=FillStatus.ERROR,
+            message="Notebook has no source path",
+        )
+    working_dir = path.parent if working_dir is None else Path(working_dir)
 
-            # Clean the notebook if requested (must happen BEFORE hash calculation)
-            if clean:
-                nb_obj = nb_obj.clean()
+    pool = kernel_pool if kernel_pool is not None else KernelPool(kernel_name)
+    kernel: PooledKernel | None = None
+    discard_kernel = False
+    kernel_time = 0.0
+    execution_time = 0.0
 
-            # Calculate and store new hash if requested
-            if save_hash:
-                new_hash = get_notebook_hash(nb_obj)
-                nb_obj.metadata[HASH_METADATA_KEY] = new_hash
+    try:
+        with span("fill.load"):
+            nb, skipped_indices = _load_for_execution(path, remove_outputs_first)
+
+        with span("fill.kernel"):
+            kernel = await pool.async_acquire(working_dir)
+        kernel_time = kernel.acquire_time
+        client = pool.notebook_client(
+            kernel, nb, timeout=timeout, resources={"metadata": {"path": str(working_dir)}}
+        )
 
-            # Write back to file
-            nb_obj.to_file(path)
+        start = time.perf_counter()
+        try:
+            with span("fill.execute"):
+                await client.async_execute()
+        except CellExecutionError:
+            raise
+        except Exception:
+            # Timeouts and dead kernels leave the kernel in an unknown state
+            discard_kernel = True
+            raise
+        finally:
+            execution_time = time.perf_counter() - start
+            await pool.async_release(kernel, discard=discard_kernel)
+            kernel = None
+
+        with span("fill.save"):
+            notebook_hash = _save_filled_notebook(
+                nb, skipped_indices, path, dry_run=dry_run, clean=clean, save_hash=save_hash
+            )
 
         return FillResult(
             status=FillStatus.SUCCESS,
             path=path,
             message="Notebook executed successfully",
+            kernel_time=kernel_time,
+            execution_time=execution_time,
+            notebook_hash=notebook_hash,
         )
 
     except Exception as e:
@@ -247,9 +434,18 @@ def fill_notebook(
             path=path,
             message=str(e),
             error=e,
+            kernel_time=kernel_time,
+            execution_time=execution_time,
         )
 
+    finally:
+        if kernel is not None:
+            await pool.async_release(kernel)
+        if kernel_pool is None:
+            await pool.async_close()
 
+
+@traced("fill")
 def fill_notebooks(
     notebooks: list[Path],
     *,
@@ -263,6 +459,9 @@ def fill_notebooks(
     on_progress: callable | None = None,
     kernel_name: str = "python3",
     python: str | Path | None = None,
+    kernel_pool: KernelPool | None = None,
+    executor: str = "thread",
+    fill_state: FillStateCache | None = None,
 ) -> list[FillResult]:
     """
     Execute multiple notebooks and fill their outputs.
@@ -280,13 +479,18 @@ def fill_notebooks(
         kernel_name: Jupyter kernel name to use (default: "python3").
         python: Path to Python binary for execution. If set, creates a temporary
             kernel spec once and uses it for all notebooks. Overrides kernel_name.
+        kernel_pool: Pool of warm kernels to execute on. If None, each
+            notebook runs on a fresh kernel.
+        executor: Executor backend: "thread", "process" or "async"
+            (see nblite.fill.backends).
+        fill_state: Cache used to skip unchanged notebooks without hashing
+            them again. Filled notebooks are recorded in it; saving it is up
+            to the caller. If None, an in-memory cache is used.
 
     Returns:
         List of FillResult objects.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
-    from nblite.fill.hash import has_notebook_changed
+    from nblite.fill.backends import run_fill_jobs
 
     # If python is specified, validate upfront and wrap execution
     if python is not None:
@@ -305,19 +509,24 @@ def fill_notebooks(
                 on_progress=on_progress,
                 kernel_name=custom_kernel_name,
                 python=None,  # Don't recurse
+                kernel_pool=kernel_pool,
+                executor=executor,
+                fill_state=fill_state,
             )
 
     results: list[FillResult] = []
     to_process: list[Path] = []
+    if fill_state is None:
+        fill_state = FillStateCache(Path.cwd())
 
     # Filter unchanged notebooks if requested
     for path in notebooks:
         if skip_unchanged:
-            from nblite.core.notebook import Notebook
-
             try:
-                nb = Notebook.from_file(path)
-                if not has_notebook_changed(nb):
+                with span("fill.check"):
+                    changed = fill_state.has_changed(path)
+                if not changed:
+                    count("files.skipped", path=path)
                     result = FillResult(
                         status=FillStatus.SKIPPED,
                         path=path,
@@ -333,29 +542,22 @@ def fill_notebooks(
         to_process.append(path)
 
     # Process notebooks
-    def process_one(path: Path) -> FillResult:
-        result = fill_notebook(
-            path,
-            timeout=timeout,
-            dry_run=dry_run,
-            remove_outputs_first=remove_outputs_first,
-            clean=clean,
-            save_hash=save_hash,
-            kernel_name=kernel_name,
-        )
-        if on_progress:
-            on_progress(path, result)
-        return result
-
-    if n_workers <= 1:
-        # Sequential execution
-        for path in to_process:
-            results.append(process_one(path))
-    else:
-        # Parallel execution
-        with ThreadPoolExecutor(max_workers=n_workers) as executor:
-            futures = {executor.submit(process_one, path): path for path in to_process}
-            for future in as_completed(futures):
-                results.append(future.result())
+    filled = run_fill_jobs(
+        to_process,
+        executor=executor,
+        n_workers=n_workers,
+        kernel_name=kernel_name,
+        kernel_pool=kernel_pool,
+        timeout=timeout,
+        dry_run=dry_run,
+        remove_outputs_first=remove_outputs_first,
+        clean=clean,
+        save_hash=save_hash,
+        on_result=on_progress,
+    )
+    for result in filled:
+        if result.status == FillStatus.SUCCESS and result.notebook_hash is not None:
+            fill_state.record(result.path, result.notebook_hash)
+    results.extend(filled)
 
     return results
@@ -17,7 +17,10 @@ if TYPE_CHECKING:
 
 __all__ = [
     "get_notebook_hash",
+    "get_notebook_hash_from_dict",
+    "get_notebook_hash_from_path",
     "has_notebook_changed",
+    "read_notebook_hashes",
     "HASH_METADATA_KEY",
 ]
 
@@ -55,11 +58,29 @@ def _get_clean_cell(cell: dict[str, Any]) -> dict[str, Any]:
     if isinstance(source, list):
         source = "".join(source)
     clean_cell: dict[str, Any] = {"source": source}
-    if "outputs" in cell:
-        clean_cell["outputs"] = [_get_clean_output(o) for o in cell["outputs"]]
+    # Only code cells carry outputs (matches Cell.to_dict)
+    if cell.get("cell_type", "code") == "code":
+        clean_cell["outputs"] = [_get_clean_output(o) for o in cell.get("outputs", [])]
     return clean_cell
 
 
+def get_notebook_hash_from_dict(nb_dict: dict[str, Any]) -> str:
+    """
+    Calculate the notebook hash directly from notebook JSON.
+
+    Gives the same result as get_notebook_hash, without building a Notebook.
+
+    Args:
+        nb_dict: Notebook dictionary (e.g. from json.loads of an ipynb file).
+
+    Returns:
+        SHA256 hash string of the notebook content.
+    """
+    clean_cells = [_get_clean_cell(cell) for cell in nb_dict.get("cells", [])]
+    content = json.dumps(clean_cells, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 def get_notebook_hash(notebook: Notebook) -> str:
     """
     Calculate a hash of the notebook's source code and outputs.
@@ -74,15 +95,7 @@ def get_notebook_hash(notebook: Notebook) -> str:
     Returns:
         SHA256 hash string of the notebook content.
     """
-    # Get the raw notebook dict
-    nb_dict = notebook.to_dict()
-
-    # Extract clean cells for hashing
-    clean_cells = [_get_clean_cell(cell) for cell in nb_dict.get("cells", [])]
-
-    # Calculate hash
-    content = json.dumps(clean_cells, sort_keys=True)
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return get_notebook_hash_from_dict(notebook.to_dict())
 
 
 def has_notebook_changed(notebook: Notebook) -> bool:
@@ -98,9 +111,7 @@ def has_notebook_changed(notebook: Notebook) -> bool:
         True if the notebook has changed or has no stored hash.
     """
     # Get stored hash from metadata
-    nb_dict = notebook.to_dict()
-    metadata = nb_dict.get("metadata", {})
-    stored_hash = metadata.get(HASH_METADATA_KEY)
+    stored_hash = notebook.metadata.get(HASH_METADATA_KEY)
 
     if stored_hash is None:
         return True
@@ -111,6 +122,24 @@ def has_notebook_changed(notebook: Notebook) -> bool:
     return current_hash != stored_hash
 
 
+def read_notebook_hashes(path: Path | str) -> tuple[str, str | None]:
+    """
+    Read an ipynb file and get its current and stored hashes.
+
+    Works on the raw JSON, so no Notebook is built.
+
+    Args:
+        path: Path to the ipynb file.
+
+    Returns:
+        Tuple of (current_hash, stored_hash); stored_hash is None if the
+        notebook has never been filled with a hash.
+    """
+    nb_dict = json.loads(Path(path).read_bytes())
+    stored_hash = nb_dict.get("metadata", {}).get(HASH_METADATA_KEY)
+    return get_notebook_hash_from_dict(nb_dict), stored_hash
+
+
 def get_notebook_hash_from_path(path: Path | str) -> tuple[str, bool]:
     """
     Get the hash and change status for a notebook file.
@@ -121,10 +150,5 @@ def get_notebook_hash_from_path(path: Path | str) -> tuple[str, bool]:
     Returns:
         Tuple of (current_hash, has_changed).
     """
-    from nblite.core.notebook import Notebook
-
-    nb = Notebook.from_file(path)
-    current_hash = get_notebook_hash(nb)
-    has_changed = has_notebook_changed(nb)
-
-    return current_hash, has_changed
+    current_hash, stored_hash = read_notebook_hashes(path)
+    return current_hash, stored_hash is None or current_hash != stored_hash
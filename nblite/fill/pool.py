@@ -0,0 +1,348 @@
+"""
+Warm kernel pool for the fill feature.
+
+Starting a Jupyter kernel (process spawn plus ipykernel import) usually costs
+far more than executing a small notebook. KernelPool keeps kernels running
+between notebooks and resets part of their state before each reuse (see
+KernelPool for what is not reset).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from jupyter_client import AsyncKernelClient, AsyncKernelManager
+from nbclient import NotebookClient
+from nbclient.util import ensure_async, run_sync
+from nbformat import NotebookNode
+
+__all__ = [
+    "KernelPool",
+    "PooledKernel",
+]
+
+# Records the process state restored by _RESET_CODE, right after startup.
+# Both run through exec so that no names are bound in the user namespace.
+_SNAPSHOT_CODE = """\
+exec('''
+import decimal, os, sys, warnings
+sys._nblite_state = (
+    dict(os.environ), list(sys.path), list(warnings.filters), decimal.getcontext().copy()
+)
+''', {})
+"""
+
+# Clears the user namespace, restores os.environ, sys.path, the warnings
+# filters and the decimal context, and moves to the notebook's directory.
+# Imported modules are kept: dropping them (reset(aggressive=True)) is not
+# safe for C extensions, which cannot be imported twice.
+_RESET_CODE = """\
+exec('''
+import decimal, os, sys, warnings
+get_ipython().reset(new_session=True)
+environ, path, filters, context = sys._nblite_state
+os.environ.clear()
+os.environ.update(environ)
+sys.path[:] = path
+warnings.filters[:] = filters
+# Invalidates the per-module caches of warnings already shown
+getattr(warnings, "_filters_mutated", lambda: None)()
+decimal.setcontext(context.copy())
+os.chdir({working_dir!r})
+''', {{}})
+"""
+
+
+@dataclass
+class PooledKernel:
+    """
+    A running kernel owned by a KernelPool.
+
+    Attributes:
+        km: Kernel manager of the running kernel
+        kc: Client connected to the kernel, shared by every notebook run on it
+        acquire_time: Seconds spent starting or resetting the kernel for the
+            current notebook
+        notebooks_run: Number of notebooks this kernel was handed out for
+    """
+
+    km: AsyncKernelManager
+    kc: AsyncKernelClient
+    acquire_time: float = 0.0
+    notebooks_run: int = 0
+
+    async def async_shutdown(self) -> None:
+        """Stop the client and the kernel."""
+        try:
+            self.kc.stop_channels()
+        finally:
+            await self.km.shutdown_kernel(now=True)
+
+    def shutdown(self) -> None:
+        """Stop the client and the kernel."""
+        run_sync(self.async_shutdown)()
+
+
+class _PooledNotebookClient(NotebookClient):
+    """NotebookClient that runs on a pooled kernel's existing client."""
+
+    def __init__(self, nb: NotebookNode, kernel: PooledKernel, **kw: Any) -> None:
+        super().__init__(nb, km=kernel.km, **kw)
+        self._pooled_kc = kernel.kc
+
+    async def async_start_new_kernel_client(self) -> AsyncKernelClient:
+        self.kc = self._pooled_kc
+        return self.kc
+
+    start_new_kernel_client = run_sync(async_start_new_kernel_client)
+
+
+class KernelPool:
+    """
+    Pool of warm Jupyter kernels shared across notebook executions.
+
+    Kernels are started lazily, up to ``size`` at a time, and handed out to
+    one notebook at a time. Before each reuse the kernel's namespace is
+    cleared, os.environ, sys.path, the warnings filters and the decimal
+    context are restored to their state at kernel startup, and the working
+    directory is changed to the new notebook's. Kernels that died or failed
+    outside normal cell errors (e.g. a timeout) are shut down instead of
+    being reused.
+
+    Everything else in the kernel process carries over to the next notebook:
+    modules imported by earlier notebooks (and any module-level state or
+    monkeypatches in them), running threads, open files, logging
+    configuration, signal handlers, random seeds and other global state of
+    libraries. Only reuse kernels for notebooks that do not depend on a
+    fresh process.
+
+    The pool can be used from threads (acquire/release) or from a single
+    event loop (async_acquire/async_release). An event loop must not hold
+    more than ``size`` kernels at once, since waiting for a free kernel
+    blocks.
+
+    The pool must be created in the environment the kernels should inherit
+    (e.g. inside custom_kernel_environment when using a custom Python).
+
+    Attributes:
+        kernel_name: Jupyter kernel name used for every kernel in the pool
+        size: Maximum number of kernels running at once
+        startup_timeout: Seconds to wait for a new kernel to become ready
+        kernels_started: Number of kernels started by this pool
+
+    Example:
+        >>> with KernelPool("python3", size=4) as pool:
+        ...     fill_notebooks(paths, n_workers=4, kernel_pool=pool)
+    """
+
+    def __init__(
+        self,
+        kernel_name: str = "python3",
+        size: int = 1,
+        startup_timeout: int = 60,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Kernel pool size must be at least 1, got {size}")
+        self.kernel_name = kernel_name
+        self.size = size
+        self.startup_timeout = startup_timeout
+        self.kernels_started = 0
+        self._idle: list[PooledKernel] = []
+        self._n_running = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> KernelPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    async def _start_kernel(self, working_dir: Path) -> PooledKernel:
+        """Start a new kernel in working_dir and wait until it is ready."""
+        km = AsyncKernelManager(kernel_name=self.kernel_name)
+        await km.start_kernel(
+            extra_arguments=["--HistoryManager.hist_file=:memory:"],
+            cwd=str(working_dir),
+        )
+        kernel = PooledKernel(km=km, kc=km.client())
+        try:
+            kernel.kc.start_channels()
+            await ensure_async(kernel.kc.wait_for_ready(timeout=self.startup_timeout))
+            await self._run_silently(kernel, _SNAPSHOT_CODE, "start")
+        except BaseException:
+            await kernel.async_shutdown()
+            raise
+        return kernel
+
+    async def _run_silently(self, kernel: PooledKernel, code: str, action: str) -> None:
+        """Run code on a kernel outside the notebook, raising if it fails."""
+        reply = await kernel.kc.execute_interactive(
+            code,
+            silent=True,
+            store_history=False,
+            timeout=self.startup_timeout,
+            output_hook=lambda msg: None,
+        )
+        if reply["content"]["status"] != "ok":
+            raise RuntimeError(f"Failed to {action} kernel: {reply['content'].get('evalue', '')}")
+
+    async def _reset_kernel(self, kernel: PooledKernel, working_dir: Path) -> None:
+        """Reset a used kernel for the next notebook."""
+        await self._run_silently(kernel, _RESET_CODE.format(working_dir=str(working_dir)), "reset")
+
+    def _claim(self) -> PooledKernel | None:
+        """
+        Take an idle kernel, or reserve a slot for a new one (returns None).
+
+        Blocks while the pool is full.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Kernel pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._n_running < self.size:
+                    self._n_running += 1
+                    return None
+                self._cond.wait()
+
+    async def _prepare(self, kernel: PooledKernel | None, working_dir: Path) -> PooledKernel:
+        """Reset a claimed kernel, or start one if it is missing or dead."""
+        start = time.perf_counter()
+        try:
+            if kernel is not None:
+                try:
+                    if not await kernel.km.is_alive():
+                        raise RuntimeError("Kernel died")
+                    await self._reset_kernel(kernel, working_dir)
+                except Exception:
+                    await kernel.async_shutdown()
+                    kernel = None
+
+            if kernel is None:
+                kernel = await self._start_kernel(working_dir)
+                with self._cond:
+                    self.kernels_started += 1
+        except BaseException:
+            with self._cond:
+                self._n_running -= 1
+                self._cond.notify()
+            raise
+
+        kernel.acquire_time = time.perf_counter() - start
+        kernel.notebooks_run += 1
+        return kernel
+
+    async def async_acquire(self, working_dir: Path | str) -> PooledKernel:
+        """
+        Get a ready kernel running in working_dir (coroutine version of acquire).
+
+        Args:
+            working_dir: Directory the notebook should execute in.
+
+        Returns:
+            PooledKernel whose acquire_time is the start or reset time.
+
+        Raises:
+            RuntimeError: If the pool is closed.
+        """
+        return await self._prepare(self._claim(), Path(working_dir))
+
+    def acquire(self, working_dir: Path | str) -> PooledKernel:
+        """
+        Get a ready kernel running in working_dir.
+
+        Reuses an idle kernel if there is one, otherwise starts a new one, or
+        blocks until a kernel is released if the pool is full.
+
+        Args:
+            working_dir: Directory the notebook should execute in.
+
+        Returns:
+            PooledKernel whose acquire_time is the start or reset time
+            (time spent waiting for a free kernel is not included).
+
+        Raises:
+            RuntimeError: If the pool is closed.
+        """
+        kernel = self._claim()
+        return run_sync(self._prepare)(kernel, Path(working_dir))
+
+    def _return(self, kernel: PooledKernel, discard: bool) -> bool:
+        """Put a kernel back; returns False if it must be shut down instead."""
+        with self._cond:
+            keep = not discard and not self._closed
+            if keep:
+                self._idle.append(kernel)
+            else:
+                self._n_running -= 1
+            self._cond.notify()
+        return keep
+
+    async def async_release(self, kernel: PooledKernel, discard: bool = False) -> None:
+        """
+        Return a kernel to the pool (coroutine version of release).
+
+        Args:
+            kernel: Kernel obtained from async_acquire.
+            discard: If True, shut the kernel down instead of reusing it.
+        """
+        if not self._return(kernel, discard):
+            await kernel.async_shutdown()
+
+    def release(self, kernel: PooledKernel, discard: bool = False) -> None:
+        """
+        Return a kernel to the pool.
+
+        Args:
+            kernel: Kernel obtained from acquire.
+            discard: If True, shut the kernel down instead of reusing it.
+        """
+        if not self._return(kernel, discard):
+            kernel.shutdown()
+
+    def notebook_client(self, kernel: PooledKernel, nb: NotebookNode, **kw: Any) -> NotebookClient:
+        """
+        Create a NotebookClient that executes nb on an acquired kernel.
+
+        Args:
+            kernel: Kernel obtained from acquire or async_acquire.
+            nb: Notebook to execute (modified in place).
+            **kw: NotebookClient options (e.g. timeout, resources).
+
+        Returns:
+            NotebookClient bound to the kernel; call execute() or
+            async_execute() on it.
+        """
+        return _PooledNotebookClient(nb, kernel, kernel_name=self.kernel_name, **kw)
+
+    def _take_idle(self) -> list[PooledKernel]:
+        """Mark the pool closed and take all idle kernels."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._n_running -= len(idle)
+            self._cond.notify_all()
+        return idle
+
+    async def async_close(self) -> None:
+        """Coroutine version of close."""
+        for kernel in self._take_idle():
+            await kernel.async_shutdown()
+
+    def close(self) -> None:
+        """Shut down all idle kernels; kernels still in use are shut down on release."""
+        for kernel in self._take_idle():
+            kernel.shutdown()
+
+    def __repr__(self) -> str:
+        return (
+            f"KernelPool(kernel_name={self.kernel_name!r}, size={self.size}, "
+            f"running={self._n_running})"
+        )
@@ -6,13 +6,14 @@ This module handles:
 - Staging validation
 """
 
-from nblite.git.hooks import find_git_root, install_hooks, uninstall_hooks
+from nblite.git.hooks import find_git_root, install_hooks, run_pre_commit, uninstall_hooks
 from nblite.git.staging import ValidationResult, validate_staging
 
 __all__ = [
     "install_hooks",
     "uninstall_hooks",
     "find_git_root",
+    "run_pre_commit",
     "validate_staging",
     "ValidationResult",
 ]
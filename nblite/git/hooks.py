@@ -9,10 +9,14 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from nblite.utils.tracing import traced
+
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from nblite.core.project import NbliteProject
 
-__all__ = ["install_hooks", "uninstall_hooks", "find_git_root"]
+__all__ = ["install_hooks", "uninstall_hooks", "find_git_root", "run_pre_commit"]
 
 
 HOOK_MARKER_START = "# BEGIN NBLITE HOOK:"
@@ -132,6 +136,68 @@ def uninstall_hooks(project: NbliteProject) -> None:
         hook_path.write_text(new_content)
 
 
+@traced("git.pre_commit")
+def run_pre_commit(
+    project: NbliteProject,
+    full: bool = False,
+    git_env: Mapping[str, str] | None = None,
+) -> list[str]:
+    """
+    Run the pre-commit hook for a project.
+
+    Cleans notebooks, exports and validates the staging area, as enabled by
+    the ``git.auto_clean``, ``git.auto_export`` and ``git.validate_staging``
+    settings. Only staged notebooks are cleaned and exported (along with the
+    notebooks sharing their modules), unless full is set or the staged files
+    cannot be listed.
+
+    Args:
+        project: NbliteProject instance
+        full: Clean and export the whole project
+        git_env: GIT_* environment variables of the git command running the
+            hook, when it runs in another process (see get_staged_files)
+
+    Returns:
+        Staging validation errors (empty if the commit may proceed)
+    """
+    from nblite.config.schema import CodeLocationFormat
+    from nblite.git.staging import get_staged_files, validate_staging
+
+    git_config = project.config.git
+    staged_files = None if full else get_staged_files(project.root_path, git_env)
+
+    if staged_files is None:
+        if git_config.auto_clean:
+            project.clean()
+        if git_config.auto_export:
+            project.export()
+    elif git_config.auto_clean or git_config.auto_export:
+        staged_paths = [project.root_path / f for f in staged_files]
+        source_keys = {rule.from_key for rule in project.config.export_pipeline}
+
+        to_clean: list[Path] = []
+        to_export: list[Path] = []
+        for path in staged_paths:
+            cl = project.lineage.location_of(path, notebook_only=True)
+            if cl is None or not cl.contains(path):
+                continue
+            if cl.format == CodeLocationFormat.IPYNB:
+                to_clean.append(path)
+            if cl.key in source_keys:
+                to_export.append(path)
+
+        if git_config.auto_clean and to_clean:
+            project.clean(notebooks=to_clean)
+        if git_config.auto_export and to_export:
+            project.export(notebooks=to_export)
+
+    if git_config.validate_staging:
+        result = validate_staging(project, staged_files=staged_files)
+        if not result.valid:
+            return list(result.errors)
+    return []
+
+
 def _remove_hook_section(content: str, project_path: Path) -> str:
     """Remove the hook section for a project from hook content."""
     marker_start = f"{HOOK_MARKER_START} {project_path}"
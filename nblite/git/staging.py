@@ -6,11 +6,15 @@ Validates that git staging state is correct for nblite projects.
 
 from __future__ import annotations
 
+import os
 import subprocess
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from nblite.utils.tracing import traced
+
 if TYPE_CHECKING:
     from nblite.core.project import NbliteProject
 
@@ -35,43 +39,50 @@ class ValidationResult:
         self.valid = False
 
 
-def get_staged_files(cwd: Path) -> list[Path]:
-    """Get list of staged files."""
+def _git_env(git_env: Mapping[str, str] | None) -> dict[str, str] | None:
+    """Environment running git with git_env in place of this process's GIT_* variables."""
+    if git_env is None:
+        return None
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GIT_")}
+    env.update(git_env)
+    return env
+
+
+def _git_diff_names(
+    cwd: Path, *args: str, git_env: Mapping[str, str] | None = None
+) -> list[Path] | None:
+    """Run ``git diff --name-only`` and return the paths relative to cwd (None if git fails)."""
     result = subprocess.run(
-        ["git", "diff", "--cached", "--name-only"],
+        ["git", "diff", *args, "-z", "--name-only", "--relative"],
         cwd=cwd,
         capture_output=True,
         text=True,
+        env=_git_env(git_env),
     )
     if result.returncode != 0:
-        return []
+        return None
+    return [Path(name) for name in result.stdout.split("\0") if name]
 
-    files: list[Path] = []
-    for line in result.stdout.strip().split("\n"):
-        if line:
-            files.append(Path(line))
-    return files
 
+def get_staged_files(cwd: Path, git_env: Mapping[str, str] | None = None) -> list[Path] | None:
+    """
+    Get list of staged files, relative to cwd (None if git fails).
+
+    git_env replaces the GIT_* environment variables of this process (e.g.
+    the GIT_INDEX_FILE of the git command running a hook in another process).
+    """
+    return _git_diff_names(cwd, "--cached", git_env=git_env)
 
-def get_modified_files(cwd: Path) -> list[Path]:
-    """Get list of modified (unstaged) files."""
-    result = subprocess.run(
-        ["git", "diff", "--name-only"],
-        cwd=cwd,
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return []
 
-    files: list[Path] = []
-    for line in result.stdout.strip().split("\n"):
-        if line:
-            files.append(Path(line))
-    return files
+def get_modified_files(cwd: Path, git_env: Mapping[str, str] | None = None) -> list[Path] | None:
+    """Get list of modified (unstaged) files, relative to cwd (None if git fails)."""
+    return _git_diff_names(cwd, git_env=git_env)
 
 
-def validate_staging(project: NbliteProject) -> ValidationResult:
+@traced("git.validate")
+def validate_staging(
+    project: NbliteProject, staged_files: list[Path] | None = None
+) -> ValidationResult:
     """
     Validate git staging state for an nblite project.
 
@@ -82,35 +93,36 @@ def validate_staging(project: NbliteProject) -> ValidationResult:
 
     Args:
         project: NbliteProject instance
+        staged_files: Staged paths relative to the project root, if already
+            known (queried from git otherwise)
 
     Returns:
         ValidationResult with validation status
     """
     result = ValidationResult()
 
-    staged_files = get_staged_files(project.root_path)
+    if staged_files is None:
+        staged_files = get_staged_files(project.root_path)
     if not staged_files:
         return result
 
     # Convert to absolute paths relative to project root
     staged_abs = {project.root_path / f for f in staged_files}
 
-    # Check twins are staged together
-    for nb in project.get_notebooks():
-        if nb.source_path is None:
-            continue
-
-        nb_rel = nb.source_path.relative_to(project.root_path)
-        if nb_rel not in staged_files and nb.source_path not in staged_abs:
+    # Check twins are staged together. Only staged notebooks are visited, and
+    # twins are resolved from the project index, so only staged notebooks that
+    # changed since the last run are parsed.
+    for staged_file in staged_files:
+        nb_path = project.root_path / staged_file
+        cl = project.lineage.location_of(nb_path, notebook_only=True)
+        if cl is None or not cl.contains(nb_path):
             continue
 
-        # Notebook is staged, check twins
-        twins = project.get_notebook_twins(nb)
-        for twin in twins:
-            if twin.exists():
+        for twin in project.get_notebook_twins(nb_path):
+            if twin.exists() and twin not in staged_abs:
                 twin_rel = twin.relative_to(project.root_path)
-                if twin_rel not in staged_files and twin not in staged_abs:
-                    result.add_warning(f"Notebook {nb_rel} is staged but twin {twin_rel} is not")
+                result.add_warning(f"Notebook {staged_file} is staged but twin {twin_rel} is not")
+    project.index.save()
 
     # Check notebooks are clean
     for staged_file in staged_files:
@@ -121,9 +133,7 @@ def validate_staging(project: NbliteProject) -> ValidationResult:
         if abs_path.suffix == ".ipynb":
             # Check if notebook has outputs
             try:
-                from nblite.core.notebook import Notebook
-
-                nb = Notebook.from_file(abs_path)
+                nb = project.notebook_cache.get(abs_path, store=False)
                 for cell in nb.cells:
                     if cell.is_code and cell.outputs:
                         result.add_warning(
@@ -9,6 +9,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from nblite.utils.tracing import traced
+
 if TYPE_CHECKING:
     from nblite.core.notebook import Notebook
 
@@ -91,6 +93,7 @@ def _format_output(output: dict) -> str | None:
     return None
 
 
+@traced("readme")
 def generate_readme(
     notebook_path: Path,
     output_path: Path | None = None,
@@ -0,0 +1,28 @@
+"""
+Resident project server for nblite.
+
+An opt-in background process, one per project root, that keeps the project
+loaded between commands. Clients (``nbl --via-server``, the git hook and
+``nbl_export()`` with NBLITE_VIA_SERVER set) forward requests to it over a
+unix domain socket instead of loading the project themselves.
+"""
+
+from nblite.server.client import (
+    VIA_SERVER_ENV_VAR,
+    ServerClient,
+    start_server,
+    via_server_enabled,
+)
+from nblite.server.protocol import ServerError, server_supported, socket_path_for
+from nblite.server.server import ProjectServer
+
+__all__ = [
+    "ProjectServer",
+    "ServerClient",
+    "ServerError",
+    "VIA_SERVER_ENV_VAR",
+    "server_supported",
+    "socket_path_for",
+    "start_server",
+    "via_server_enabled",
+]
@@ -0,0 +1,39 @@
+"""
+Run the resident project server: ``python -m nblite.server ROOT``.
+
+Started by ServerClient (or ``nbl server start``); not meant to be run by hand.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from nblite.server.protocol import ServerError
+from nblite.server.server import ProjectServer
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m nblite.server")
+    parser.add_argument("root", type=Path, help="Project root directory")
+    parser.add_argument("--idle-timeout", type=float, default=900.0)
+    parser.add_argument("--socket", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    os.chdir(args.root)
+    server = ProjectServer(args.root, idle_timeout=args.idle_timeout, socket_path=args.socket)
+    try:
+        server.bind()
+    except ServerError as e:
+        print(e, file=sys.stderr)
+        # Another client started a server first
+        return 0 if "already running" in str(e) else 1
+    print(f"nblite server for {server.root_path} listening on {server.socket_path}", flush=True)
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Client for the resident project server.
+
+Kept free of heavy imports, so that thin clients (the git hook fast path
+in ``nblite.cli.main``) start in a few tens of milliseconds.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from nblite import __version__
+from nblite.server.protocol import (
+    ServerError,
+    ensure_socket_dir,
+    export_result_from_dict,
+    read_message,
+    socket_path_for,
+    write_message,
+)
+
+if TYPE_CHECKING:
+    from nblite.export.pipeline import ExportResult
+
+__all__ = ["ServerClient", "start_server", "VIA_SERVER_ENV_VAR", "via_server_enabled"]
+
+# Environment variable that routes `nbl export`, `nbl hook` and nbl_export()
+# through the server
+VIA_SERVER_ENV_VAR = "NBLITE_VIA_SERVER"
+
+DEFAULT_IDLE_TIMEOUT = 900.0
+
+# GIT_* variables holding paths, which may be relative to the working directory
+_GIT_PATH_VARS = ("GIT_DIR", "GIT_WORK_TREE", "GIT_INDEX_FILE", "GIT_OBJECT_DIRECTORY")
+
+
+def _git_environment() -> dict[str, str]:
+    """The GIT_* environment variables of this process, with absolute paths."""
+    env = {key: value for key, value in os.environ.items() if key.startswith("GIT_")}
+    for key in _GIT_PATH_VARS:
+        if env.get(key):
+            env[key] = os.path.abspath(env[key])
+    return env
+
+
+def via_server_enabled() -> bool:
+    """Whether NBLITE_VIA_SERVER asks for requests to go through the server."""
+    return os.environ.get(VIA_SERVER_ENV_VAR, "").lower() in ("true", "1", "yes")
+
+
+def start_server(
+    root_path: Path,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    socket_path: Path | None = None,
+    wait: float = 30.0,
+) -> None:
+    """
+    Start a server for a project in a detached process.
+
+    Output of the server is appended to a ``.log`` file next to its socket.
+
+    Args:
+        root_path: Project root directory
+        idle_timeout: Seconds without requests before the server exits
+        socket_path: Socket to listen on (default: socket_path_for(root_path))
+        wait: Seconds to wait for the server to accept connections
+
+    Raises:
+        ServerError: If the server did not come up in time, or the socket
+            directory is not private to this user (see ensure_socket_dir)
+    """
+    root_path = Path(root_path).resolve()
+    socket_path = socket_path or socket_path_for(root_path)
+    ensure_socket_dir(socket_path)
+    log_path = socket_path.with_suffix(".log")
+
+    # A server started from a git hook must not keep that hook's GIT_* variables
+    # (GIT_INDEX_FILE may point to a lock file); hooks send their own per request
+    env = {key: value for key, value in os.environ.items() if not key.startswith("GIT_")}
+
+    log_fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    with os.fdopen(log_fd, "ab") as log:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "nblite.server",
+                str(root_path),
+                "--idle-timeout",
+                str(idle_timeout),
+                "--socket",
+                str(socket_path),
+            ],
+            cwd=root_path,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env=env,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if _can_connect(socket_path):
+            return
+        if process.poll() is not None and not _can_connect(socket_path):
+            raise ServerError(f"Server exited with code {process.returncode}; see {log_path}")
+        time.sleep(0.01)
+    raise ServerError(f"Server did not start within {wait:.0f}s; see {log_path}")
+
+
+def _can_connect(socket_path: Path) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+class ServerClient:
+    """
+    Send requests to the server of one project.
+
+    Attributes:
+        root_path: Project root directory
+        socket_path: Socket of the project's server
+        autostart: Start a server when none is running
+        idle_timeout: Idle timeout given to servers started by this client
+
+    Example:
+        >>> client = ServerClient(Path("."))
+        >>> result, pipeline = client.export(incremental=True)
+    """
+
+    def __init__(
+        self,
+        root_path: Path | str,
+        autostart: bool = True,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        socket_path: Path | None = None,
+    ) -> None:
+        self.root_path = Path(root_path).resolve()
+        self.socket_path = socket_path or socket_path_for(self.root_path)
+        self.autostart = autostart
+        self.idle_timeout = idle_timeout
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _send(self, op: str, args: dict[str, Any]) -> dict[str, Any]:
+        try:
+            sock = self._connect()
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not self.autostart:
+                raise ServerError(f"No server running for {self.root_path}") from None
+            start_server(self.root_path, self.idle_timeout, self.socket_path)
+            sock = self._connect()
+
+        with sock, sock.makefile("rwb") as stream:
+            write_message(stream, {"op": op, "version": __version__, "args": args})
+            return read_message(stream)
+
+    def request(self, op: str, **args: Any) -> Any:
+        """
+        Send a request and return its result.
+
+        A server running another nblite version exits when it receives the
+        request; it is then restarted (with autostart) and the request retried.
+
+        Args:
+            op: Operation name ("ping", "export", "hook" or "shutdown")
+            **args: Operation arguments (JSON-serializable)
+
+        Returns:
+            The operation's result
+
+        Raises:
+            ServerError: If the server cannot be reached or the request failed
+        """
+        response = self._send(op, args)
+        if response.get("stale") and self.autostart:
+            deadline = time.monotonic() + 5
+            while self.socket_path.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            response = self._send(op, args)
+        if not response.get("ok"):
+            raise ServerError(response.get("error", "Request failed"))
+        return response.get("result")
+
+    def ping(self) -> dict[str, Any] | None:
+        """Get the server's status, or None if no server is running."""
+        if not _can_connect(self.socket_path):
+            return None
+        return self.request("ping")
+
+    def export(
+        self,
+        notebooks: list[Path] | None = None,
+        pipeline: str | None = None,
+        reverse: bool = False,
+        silence_warnings: bool = False,
+        no_header: bool | None = None,
+        incremental: bool | None = None,
+        n_workers: int | None = None,
+    ) -> tuple[ExportResult | None, str | None]:
+        """
+        Export the project on the server.
+
+        Arguments are those of NbliteProject.export; ``reverse`` uses the
+        project's reversed pipeline.
+
+        Returns:
+            Tuple of (ExportResult, pipeline used). The result is None when
+            ``reverse`` is set and no rule of the pipeline is reversible.
+        """
+        data = self.request(
+            "export",
+            notebooks=[str(Path(p).resolve()) for p in notebooks] if notebooks else None,
+            pipeline=pipeline,
+            reverse=reverse,
+            silence_warnings=silence_warnings,
+            no_header=no_header,
+            incremental=incremental,
+            n_workers=n_workers,
+        )
+        if data["result"] is None:
+            return None, None
+        return export_result_from_dict(data["result"]), data["pipeline"]
+
+    def run_hook(self, name: str, full: bool = False) -> list[str]:
+        """
+        Run a git hook on the server.
+
+        The GIT_* environment variables of this process are sent along, so
+        the server sees the index of the git command running the hook.
+
+        Args:
+            name: Hook name
+            full: Run over the whole project rather than the staged files
+
+        Returns:
+            Errors that should block the commit
+        """
+        result = self.request("hook", name=name, full=full, git_env=_git_environment())
+        return list(result["errors"])
+
+    def shutdown(self) -> bool:
+        """
+        Stop the server.
+
+        Returns:
+            True if a server was running
+        """
+        if not _can_connect(self.socket_path):
+            return False
+        try:
+            self._send("shutdown", {})
+        except (ServerError, OSError):
+            pass
+        return True
+
+    def __repr__(self) -> str:
+        return f"ServerClient(root={self.root_path!r}, socket={self.socket_path!r})"
@@ -0,0 +1,158 @@
+"""
+Wire protocol between the nblite server and its clients.
+
+Messages are JSON objects, one per line, exchanged over a unix domain
+socket. Each connection carries a single request and its response.
+
+A request looks like ``{"op": "export", "version": "...", "args": {...}}``.
+A response is ``{"ok": true, "result": ...}`` on success, or
+``{"ok": false, "error": "...", "stale": false}`` on failure. ``stale``
+means the server runs a different nblite version and is shutting down.
+"""
+
+from __future__ import annotations
+
+import getpass
+import hashlib
+import json
+import os
+import socket
+import stat
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+if TYPE_CHECKING:
+    from nblite.export.pipeline import ExportResult
+
+__all__ = [
+    "ServerError",
+    "ensure_socket_dir",
+    "export_result_from_dict",
+    "export_result_to_dict",
+    "read_message",
+    "server_supported",
+    "socket_path_for",
+    "write_message",
+]
+
+# Limit on a single message, so a misbehaving peer cannot exhaust memory
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+_EXPORT_RESULT_PATH_FIELDS = (
+    "files_created",
+    "files_updated",
+    "files_skipped",
+    "files_unchanged",
+    "files_orphaned",
+)
+
+
+class ServerError(Exception):
+    """Raised when the server cannot be reached or a request fails on it."""
+
+
+def server_supported() -> bool:
+    """Whether this platform supports unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path_for(root_path: Path | str) -> Path:
+    """
+    Get the socket path of the server for a project.
+
+    Sockets live in a per-user directory under ``$XDG_RUNTIME_DIR`` (or the
+    temp directory) rather than in the project, because socket paths are
+    limited to about 100 bytes.
+
+    Args:
+        root_path: Project root directory
+
+    Returns:
+        Path of the server's unix domain socket
+    """
+    root = os.path.realpath(root_path)
+    digest = hashlib.sha256(os.fsencode(root)).hexdigest()[:16]
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / f"nblite-{getpass.getuser()}" / f"{digest}.sock"
+
+
+def ensure_socket_dir(socket_path: Path) -> None:
+    """
+    Create the directory of a socket, and check that only this user can use it.
+
+    The directory may live in the shared temp directory under a predictable
+    name, so another user could have created it first to intercept requests
+    or redirect the server log.
+
+    Args:
+        socket_path: Path of a server socket
+
+    Raises:
+        ServerError: If the directory is a symlink, is owned by another user
+            or is accessible to other users
+    """
+    directory = socket_path.parent
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise ServerError(f"Server directory {directory} is not a directory")
+    if st.st_uid != os.getuid():
+        raise ServerError(f"Server directory {directory} is owned by another user")
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        raise ServerError(
+            f"Server directory {directory} has mode {stat.S_IMODE(st.st_mode):o}, expected 700"
+        )
+
+
+def write_message(stream: BinaryIO, message: dict[str, Any]) -> None:
+    """Write one message to a socket file."""
+    stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    stream.flush()
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any]:
+    """
+    Read one message from a socket file.
+
+    Raises:
+        ServerError: If the peer closed the connection or sent invalid data
+    """
+    line = stream.readline(MAX_MESSAGE_SIZE + 1)
+    if not line:
+        raise ServerError("Connection closed before a message was received")
+    if len(line) > MAX_MESSAGE_SIZE:
+        raise ServerError("Message too large")
+    try:
+        message = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ServerError(f"Invalid message: {e}") from None
+    if not isinstance(message, dict):
+        raise ServerError("Invalid message: expected a JSON object")
+    return message
+
+
+def export_result_to_dict(result: ExportResult) -> dict[str, Any]:
+    """Convert an ExportResult to JSON-serializable form."""
+    data: dict[str, Any] = {
+        "success": result.success,
+        "errors": list(result.errors),
+        "warnings": list(result.warnings),
+    }
+    for name in _EXPORT_RESULT_PATH_FIELDS:
+        data[name] = [str(p) for p in getattr(result, name)]
+    return data
+
+
+def export_result_from_dict(data: dict[str, Any]) -> ExportResult:
+    """Rebuild an ExportResult from export_result_to_dict output."""
+    from nblite.export.pipeline import ExportResult
+
+    result = ExportResult(
+        success=data["success"],
+        errors=list(data["errors"]),
+        warnings=list(data["warnings"]),
+    )
+    for name in _EXPORT_RESULT_PATH_FIELDS:
+        setattr(result, name, [Path(p) for p in data[name]])
+    return result
@@ -0,0 +1,250 @@
+"""
+Resident project server.
+
+Keeps an NbliteProject loaded, with its extensions, index, notebook cache
+and export manifest, and runs export and hook requests against it.
+Clients connect over a unix domain socket (see protocol.py).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import socket
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from nblite import __version__
+from nblite.server.protocol import (
+    ServerError,
+    ensure_socket_dir,
+    export_result_to_dict,
+    read_message,
+    socket_path_for,
+    write_message,
+)
+
+if TYPE_CHECKING:
+    from nblite.core.project import NbliteProject
+
+__all__ = ["ProjectServer"]
+
+# Seconds a client may take to send its request
+_REQUEST_TIMEOUT = 10.0
+
+
+class ProjectServer:
+    """
+    Serve export and hook requests for one project from a resident process.
+
+    Requests are handled one at a time. The project is reloaded when
+    nblite.toml changes; notebook caches are validated against file stats,
+    so edits made between requests are picked up. The server exits after
+    ``idle_timeout`` seconds without requests.
+
+    Attributes:
+        root_path: Project root directory
+        socket_path: Path of the listening socket
+        idle_timeout: Seconds without requests before shutting down
+        requests_served: Number of requests handled so far
+
+    Example:
+        >>> server = ProjectServer(Path("."), idle_timeout=600)
+        >>> server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        idle_timeout: float = 900.0,
+        socket_path: Path | None = None,
+    ) -> None:
+        self.root_path = Path(root_path).resolve()
+        self.socket_path = socket_path or socket_path_for(self.root_path)
+        self.idle_timeout = idle_timeout
+        self.requests_served = 0
+        self._started = time.monotonic()
+        self._project: NbliteProject | None = None
+        self._config_stat: tuple[int, int] | None = None
+        self._sock: socket.socket | None = None
+        self._running = False
+        self._handlers: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "ping": self._handle_ping,
+            "export": self._handle_export,
+            "hook": self._handle_hook,
+            "shutdown": self._handle_shutdown,
+        }
+
+    @property
+    def config_path(self) -> Path:
+        """Path of the project's config file."""
+        return self.root_path / "nblite.toml"
+
+    @property
+    def project(self) -> NbliteProject:
+        """The resident project, reloaded if nblite.toml changed."""
+        stat = self.config_path.stat()
+        config_stat = (stat.st_size, stat.st_mtime_ns)
+        if self._project is None or config_stat != self._config_stat:
+            from nblite.core.project import NbliteProject
+
+            # Extension hooks register globally; drop those of the old config
+            if self._project is not None:
+                self._project.unload_extensions()
+            self._project = NbliteProject.from_path(self.root_path)
+            self._config_stat = config_stat
+        return self._project
+
+    def bind(self) -> None:
+        """
+        Create the listening socket.
+
+        Raises:
+            ServerError: If a live server already listens on the socket, or
+                the socket directory is not private to this user
+        """
+        ensure_socket_dir(self.socket_path)
+        if self.socket_path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.socket_path))
+            except OSError:
+                # Left behind by a server that did not shut down cleanly
+                self.socket_path.unlink(missing_ok=True)
+            else:
+                raise ServerError(f"A server is already running on {self.socket_path}")
+            finally:
+                probe.close()
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(str(self.socket_path))
+            os.chmod(self.socket_path, 0o600)
+            sock.listen(16)
+        except OSError as e:
+            sock.close()
+            raise ServerError(f"Cannot listen on {self.socket_path}: {e}") from None
+        sock.settimeout(self.idle_timeout)
+        self._sock = sock
+
+    def serve_forever(self) -> None:
+        """Handle requests until shut down or idle for ``idle_timeout`` seconds."""
+        if self._sock is None:
+            self.bind()
+        assert self._sock is not None
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._sock.accept()
+                except TimeoutError:
+                    break
+                with conn:
+                    self._serve_connection(conn)
+        finally:
+            self.close()
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        conn.settimeout(_REQUEST_TIMEOUT)
+        with conn.makefile("rwb") as stream:
+            try:
+                request = read_message(stream)
+            except (ServerError, OSError):
+                return
+            # Block for as long as the request takes
+            conn.settimeout(None)
+            response = self.handle(request)
+            with contextlib.suppress(OSError):
+                write_message(stream, response)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Handle one request.
+
+        Args:
+            request: Decoded request message
+
+        Returns:
+            Response message
+        """
+        self.requests_served += 1
+        if request.get("version") != __version__:
+            # The client was upgraded: exit so that it can start a new server
+            self._running = False
+            return {
+                "ok": False,
+                "stale": True,
+                "error": f"Server runs nblite {__version__}, client {request.get('version')}",
+            }
+
+        handler = self._handlers.get(request.get("op", ""))
+        if handler is None:
+            return {"ok": False, "stale": False, "error": f"Unknown op: {request.get('op')!r}"}
+        try:
+            result = handler(request.get("args") or {})
+        except Exception as e:
+            return {"ok": False, "stale": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "result": result}
+
+    def _handle_ping(self, args: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "root": str(self.root_path),
+            "version": __version__,
+            "requests": self.requests_served,
+            "uptime": time.monotonic() - self._started,
+            "idle_timeout": self.idle_timeout,
+        }
+
+    def _handle_export(self, args: dict[str, Any]) -> dict[str, Any]:
+        project = self.project
+        # Another process may have exported since the last request
+        project.invalidate_export_manifest()
+
+        pipeline = args.get("pipeline")
+        if args.get("reverse"):
+            pipeline = project.get_reversed_pipeline()
+            if not pipeline:
+                return {"pipeline": None, "result": None}
+
+        notebooks = args.get("notebooks")
+        result = project.export(
+            notebooks=[Path(p) for p in notebooks] if notebooks else None,
+            pipeline=pipeline,
+            silence_warnings=args.get("silence_warnings", False),
+            no_header=args.get("no_header"),
+            incremental=args.get("incremental"),
+            n_workers=args.get("n_workers"),
+        )
+        return {"pipeline": pipeline, "result": export_result_to_dict(result)}
+
+    def _handle_hook(self, args: dict[str, Any]) -> dict[str, Any]:
+        name = args.get("name")
+        if name != "pre-commit":
+            return {"errors": []}
+        from nblite.git.hooks import run_pre_commit
+
+        project = self.project
+        project.invalidate_export_manifest()
+        # git runs the hook with its own GIT_INDEX_FILE (e.g. a temporary index
+        # for `git commit -a`), which only the client's environment has
+        errors = run_pre_commit(
+            project, full=bool(args.get("full", False)), git_env=args.get("git_env") or {}
+        )
+        return {"errors": errors}
+
+    def _handle_shutdown(self, args: dict[str, Any]) -> None:
+        self._running = False
+
+    def close(self) -> None:
+        """Stop listening and remove the socket."""
+        self._running = False
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+            self.socket_path.unlink(missing_ok=True)
+
+    def __repr__(self) -> str:
+        return f"ProjectServer(root={self.root_path!r}, socket={self.socket_path!r})"
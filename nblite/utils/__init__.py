@@ -2,4 +2,15 @@
 Utility functions for nblite.
 """
 
-__all__: list[str] = []
+from nblite.utils.discovery import FileEntry, scan_files
+from nblite.utils.files import WriteStatus, write_if_changed
+from nblite.utils.tracing import Profiler, span
+
+__all__: list[str] = [
+    "FileEntry",
+    "Profiler",
+    "WriteStatus",
+    "scan_files",
+    "span",
+    "write_if_changed",
+]
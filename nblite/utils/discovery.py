@@ -0,0 +1,155 @@
+"""
+File discovery for nblite.
+
+scan_files walks a directory tree with os.scandir and prunes excluded
+directories before descending into them, so checkpoint folders, caches and
+hidden trees are never listed. The file types of directory entries come from
+the directory listing itself, and each file's stat is taken at most once and
+kept on its FileEntry for later change checks.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+__all__ = ["PRUNED_DIRS", "FileEntry", "matches_glob", "scan_files"]
+
+# Directories that never contain project files
+PRUNED_DIRS = frozenset({"__pycache__", "node_modules"})
+
+
+class FileEntry:
+    """A file found by scan_files."""
+
+    __slots__ = ("path", "_entry")
+
+    def __init__(self, path: Path, entry: os.DirEntry[str]) -> None:
+        self.path = path
+        self._entry = entry
+
+    def stat(self) -> os.stat_result:
+        """Stat of the file (following symlinks), cached after the first call."""
+        return self._entry.stat()
+
+    def __repr__(self) -> str:
+        return f"FileEntry({self.path!r})"
+
+
+def matches_glob(rel_path: str, pattern: str) -> bool:
+    """Check if a relative path matches a glob pattern.
+
+    Supports ``**`` for matching across directory separators (e.g.
+    ``**/*_v1.ipynb``).  Falls back to plain ``fnmatch`` for simple
+    patterns like ``scratch/*``.
+    """
+    # Normalise separators so patterns work cross-platform
+    rel_path = rel_path.replace(os.sep, "/")
+    pattern = pattern.replace(os.sep, "/")
+
+    if "**" in pattern:
+        # fnmatch doesn't handle ** across directories, so we try matching
+        # against every possible suffix of the path components.
+        parts = rel_path.split("/")
+        for i in range(len(parts)):
+            suffix = "/".join(parts[i:])
+            if fnmatch.fnmatch(suffix, pattern):
+                return True
+        # Also try with ** expanded to zero components (e.g. **/*_v1.ipynb
+        # should match root-level *_v1.ipynb files).
+        collapsed = pattern.replace("**/", "")
+        if fnmatch.fnmatch(rel_path, collapsed):
+            return True
+        return False
+
+    return fnmatch.fnmatch(rel_path, pattern)
+
+
+def _prunes_dir(rel_dir: str, pattern: str) -> bool:
+    """Check if a glob pattern matches every file below a directory.
+
+    True for patterns ending in ``/*`` whose head matches the directory, as
+    the trailing ``*`` of fnmatch also matches ``/``.
+    """
+    for tail in ("/*", "/**"):
+        if pattern.endswith(tail) and matches_glob(rel_dir, pattern[: -len(tail)]):
+            return True
+    return False
+
+
+def scan_files(
+    root: Path,
+    suffixes: str | tuple[str, ...],
+    *,
+    ignore_dunders: bool = False,
+    ignore_hidden: bool = False,
+    exclude: Iterable[str] = (),
+    exclude_prefixes: Iterable[str] = (),
+    prune_dirs: Iterable[str] = PRUNED_DIRS,
+    recursive: bool = True,
+) -> list[FileEntry]:
+    """
+    Find the files below a directory whose names end with one of suffixes.
+
+    Directories are pruned before they are listed when they are named in
+    prune_dirs, are hidden and ignore_hidden is set, or are excluded by a
+    pattern. Symlinked directories are not followed (like Path.glob).
+
+    Args:
+        root: Directory to scan
+        suffixes: File name suffix, or a tuple of them (e.g. ".pct.py")
+        ignore_dunders: Exclude files whose names start with __
+        ignore_hidden: Exclude files whose names start with ., and hidden directories
+        exclude: Glob patterns (see matches_glob) matched against paths
+            relative to root, as used by the fill exclude_patterns
+        exclude_prefixes: Name prefixes excluding any file or directory path
+            component that starts with them, as used by the docs
+            exclude_patterns (whose trailing * are stripped)
+        prune_dirs: Directory names never descended into
+        recursive: Scan subdirectories
+
+    Returns:
+        Matching files, sorted by path (empty if root is not a directory)
+    """
+    exclude = list(exclude)
+    exclude_prefixes = tuple(exclude_prefixes)
+    prune_dirs = frozenset(prune_dirs)
+    found: list[FileEntry] = []
+    to_scan: list[tuple[Path, str]] = [(root, "")]
+
+    while to_scan:
+        directory, rel_dir = to_scan.pop()
+        try:
+            with os.scandir(directory) as entries:
+                listing = list(entries)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+        for entry in listing:
+            name = entry.name
+            rel_path = f"{rel_dir}{name}"
+            if ignore_hidden and name.startswith("."):
+                continue
+            if exclude_prefixes and name.startswith(exclude_prefixes):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                if not recursive or name in prune_dirs:
+                    continue
+                if any(_prunes_dir(rel_path, pattern) for pattern in exclude):
+                    continue
+                to_scan.append((directory / name, f"{rel_path}/"))
+                continue
+
+            if not name.endswith(suffixes) or not entry.is_file():
+                continue
+            if ignore_dunders and name.startswith("__"):
+                continue
+            if any(matches_glob(rel_path, pattern) for pattern in exclude):
+                continue
+            found.append(FileEntry(directory / name, entry))
+
+    found.sort(key=lambda f: f.path)
+    return found
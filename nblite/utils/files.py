@@ -0,0 +1,111 @@
+"""
+File writing helpers for nblite.
+
+Generated files are written through write_if_changed so that regenerating
+identical content leaves the file (and its mtime) untouched, and so that
+readers never observe a half-written file.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from enum import Enum
+from pathlib import Path
+
+from nblite.utils.tracing import count, span
+
+__all__ = ["WriteStatus", "write_if_changed"]
+
+
+def _create_temp_file(directory: str, name: str) -> tuple[int, str]:
+    """
+    Create a new temporary file next to a target file.
+
+    Unlike mkstemp (which uses mode 0600), the file is created with mode 0666
+    so that the process umask in effect now applies, as for a plain open().
+
+    Returns:
+        Tuple of (file descriptor, path)
+    """
+    for _ in range(100):
+        tmp_name = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+            return os.open(tmp_name, flags, 0o666), tmp_name
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a temporary file in {directory}")
+
+
+class WriteStatus(str, Enum):
+    """Outcome of write_if_changed."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+
+
+def write_if_changed(path: Path | str, content: str | bytes) -> WriteStatus:
+    """
+    Write content to a file only if it differs from what is already there.
+
+    The existing file is compared by size first and then byte for byte. New
+    content is written to a temporary file in the same directory and renamed
+    over the target, so the replacement is atomic. Symlinks are followed, so
+    the file they point to is rewritten and the link is kept. The mode (and,
+    where permitted, the owner) of an existing file is preserved; new files
+    get the default mode for the current umask. A file with several hard
+    links is rewritten in place instead, so that the links stay shared.
+    Parent directories are created as needed.
+
+    Args:
+        path: File to write
+        content: New content (str is encoded as UTF-8)
+
+    Returns:
+        WriteStatus.CREATED if the file did not exist, WriteStatus.UPDATED if it
+        was replaced, or WriteStatus.UNCHANGED if it already had this content
+    """
+    path = Path(path)
+    with span("file.write", path=path):
+        data = content.encode("utf-8") if isinstance(content, str) else content
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None and stat.st_size == len(data) and path.read_bytes() == data:
+            count("files.unchanged", path=path)
+            return WriteStatus.UNCHANGED
+
+        # Write to the file a symlink points to, in that file's directory
+        target = os.path.realpath(path)
+        if stat is not None and stat.st_nlink > 1:
+            with open(target, "r+b") as f:
+                f.write(data)
+                f.truncate()
+        else:
+            directory, name = os.path.split(target)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_name = _create_temp_file(directory, name)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                if stat is not None:
+                    os.chmod(tmp_name, stat.st_mode & 0o7777)
+                    owner = (stat.st_uid, stat.st_gid)
+                    if hasattr(os, "chown") and owner != (os.getuid(), os.getgid()):
+                        # Only permitted for root; other users keep their own
+                        with contextlib.suppress(OSError):
+                            os.chown(tmp_name, *owner)
+                os.replace(tmp_name, target)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
+                raise
+
+        count("files.written", path=path)
+        count("bytes.written", len(data))
+        return WriteStatus.CREATED if stat is None else WriteStatus.UPDATED
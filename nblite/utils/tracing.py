@@ -0,0 +1,497 @@
+"""
+Hierarchical timing spans and counters.
+
+Code marks the stages of a command with span (or whole functions with
+traced), and counts what it processes with count::
+
+    with span("export.write", output=path):
+        ...
+        count("bytes.written", len(data))
+
+Listeners (see TraceListener) receive span start and end events and
+metrics, each with the names of the spans enclosing it. While no listener is
+registered, span and count cost one function call. Enclosing spans are
+tracked per thread and per asyncio task (through a context variable);
+functions handed to worker threads continue the caller's span when wrapped
+with propagate.
+
+Built-in listeners:
+
+- Profiler aggregates spans into stage timings (``nbl --profile``)
+- JsonLinesSink appends events to a file; setting the NBLITE_TRACE_FILE
+  environment variable installs one for the whole process
+- Extensions receive events through the SPAN_START, SPAN_END and METRIC
+  hooks (see nblite.extensions)
+
+Counters used by nblite: ``files.read``, ``bytes.read``, ``files.written``,
+``bytes.written``, ``files.unchanged`` (writes skipped because the content
+was already there) and ``files.skipped`` (outputs and notebooks skipped
+because their inputs did not change).
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from types import TracebackType
+from typing import Any, ParamSpec, TypeVar
+
+__all__ = [
+    "TRACE_FILE_ENV_VAR",
+    "JsonLinesSink",
+    "MetricRecord",
+    "Profiler",
+    "SpanRecord",
+    "StageStats",
+    "TraceListener",
+    "add_listener",
+    "count",
+    "propagate",
+    "remove_listener",
+    "span",
+    "traced",
+    "tracing_enabled",
+]
+
+TRACE_FILE_ENV_VAR = "NBLITE_TRACE_FILE"
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Names of the spans enclosing the running code
+_current_path: ContextVar[tuple[str, ...]] = ContextVar("nblite_span_path", default=())
+
+# Listeners receiving events (usually none)
+_listeners: list[TraceListener] = []
+
+_NO_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    """
+    A finished span.
+
+    Attributes:
+        path: Names of the enclosing spans, ending with this span's name
+        start: time.perf_counter() when the span started
+        duration: Seconds the span took
+        thread_id: Native ID of the thread the span ran on
+        attrs: Attributes passed to span()
+    """
+
+    path: tuple[str, ...]
+    start: float
+    duration: float
+    thread_id: int
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+
+@dataclass(frozen=True)
+class MetricRecord:
+    """
+    A counted quantity.
+
+    Attributes:
+        name: Metric name (e.g. "bytes.written")
+        value: Amount counted
+        path: Names of the spans enclosing the count
+        attrs: Attributes passed to count()
+    """
+
+    name: str
+    value: float
+    path: tuple[str, ...]
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+class TraceListener:
+    """
+    Receiver of span and metric events.
+
+    Subclass it, override the events of interest and register an instance
+    with add_listener. Events arrive on the thread that produced them, so
+    listeners must be thread-safe.
+    """
+
+    def span_started(self, name: str, path: tuple[str, ...], attrs: dict[str, Any]) -> None:
+        """Called when a span starts; path ends with name."""
+
+    def span_finished(self, record: SpanRecord) -> None:
+        """Called when a span ends."""
+
+    def metric(self, record: MetricRecord) -> None:
+        """Called for every count()."""
+
+
+def add_listener(listener: TraceListener) -> None:
+    """Start sending events to listener (no-op if it is registered already)."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: TraceListener) -> None:
+    """Stop sending events to listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def tracing_enabled() -> bool:
+    """Whether any listener is registered (to skip computing costly attributes)."""
+    return bool(_listeners)
+
+
+class _Span:
+    """Context manager of a span while a Profiler is active."""
+
+    __slots__ = ("name", "attrs", "start", "_token")
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self) -> None:
+        path = _current_path.get() + (self.name,)
+        self._token = _current_path.set(path)
+        for listener in _listeners:
+            listener.span_started(self.name, path, self.attrs)
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        duration = time.perf_counter() - self.start
+        path = _current_path.get()
+        _current_path.reset(self._token)
+        record = SpanRecord(path, self.start, duration, threading.get_native_id(), self.attrs)
+        for listener in _listeners:
+            listener.span_finished(record)
+
+
+def span(name: str, **attrs: Any) -> AbstractContextManager[None]:
+    """
+    Time a stage of work.
+
+    Args:
+        name: Stage name, dotted by area (e.g. "export.write")
+        **attrs: Details shown in traces (e.g. the file being processed)
+
+    Returns:
+        Context manager timing its body
+    """
+    if not _listeners:
+        return _NO_SPAN
+    return _Span(name, attrs)
+
+
+def count(name: str, value: float = 1, **attrs: Any) -> None:
+    """
+    Count a quantity of work (files, bytes, ...) in the current span.
+
+    Args:
+        name: Metric name (e.g. "files.written")
+        value: Amount to add
+        **attrs: Details passed to listeners (e.g. the file)
+    """
+    if not _listeners:
+        return
+    record = MetricRecord(name, value, _current_path.get(), attrs)
+    for listener in _listeners:
+        listener.metric(record)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Decorate a function so that every call runs in span(name).
+
+    Coroutine functions are timed until the coroutine finishes.
+    """
+
+    def decorate(fn: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def run_async(*args: P.args, **kwargs: P.kwargs) -> Any:
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return run_async  # type: ignore[return-value]
+
+        @wraps(fn)
+        def run(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return run
+
+    return decorate
+
+
+def propagate(fn: Callable[P, R]) -> Callable[P, R]:
+    """
+    Make fn run inside the spans enclosing this call, on whatever thread runs it.
+
+    Threads (e.g. of a ThreadPoolExecutor) do not inherit the caller's
+    context, so without this their spans would be recorded at the top level.
+    """
+    if not _listeners:
+        return fn
+    path = _current_path.get()
+
+    @wraps(fn)
+    def run(*args: P.args, **kwargs: P.kwargs) -> R:
+        token = _current_path.set(path)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_path.reset(token)
+
+    return run
+
+
+@dataclass
+class StageStats:
+    """
+    Timings of all spans with the same path.
+
+    Attributes:
+        path: Names of the enclosing spans, ending with the stage's name
+        calls: Number of spans
+        total: Total seconds
+        max: Longest span in seconds
+        self_time: Seconds not covered by child stages (spans on worker
+            threads can make children add up to more than their parent,
+            in which case this is 0)
+    """
+
+    path: tuple[str, ...]
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    self_time: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+    @property
+    def depth(self) -> int:
+        return len(self.path) - 1
+
+
+class Profiler(TraceListener):
+    """
+    Record the spans that finish and the counts made while active.
+
+    Example:
+        >>> with Profiler() as profiler:
+        ...     project.export()
+        >>> for stage in profiler.stages():
+        ...     print("  " * stage.depth, stage.name, stage.calls, stage.total)
+        >>> profiler.write_chrome_trace("trace.json")
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[SpanRecord] = []
+        self.counters: dict[str, float] = {}
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start recording spans."""
+        self.started_at = time.perf_counter()
+        self.stopped_at = None
+        add_listener(self)
+
+    def stop(self) -> None:
+        """Stop recording spans."""
+        remove_listener(self)
+        self.stopped_at = time.perf_counter()
+
+    def __enter__(self) -> Profiler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def span_finished(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def metric(self, record: MetricRecord) -> None:
+        with self._lock:
+            self.counters[record.name] = self.counters.get(record.name, 0) + record.value
+
+    @property
+    def wall_time(self) -> float:
+        """Seconds between start() and stop() (or now, while recording)."""
+        if self.started_at is None:
+            return 0.0
+        end = self.stopped_at if self.stopped_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def stages(self) -> list[StageStats]:
+        """
+        Aggregate the recorded spans by path.
+
+        Returns:
+            One StageStats per distinct path, in tree order: every stage
+            is followed by its child stages, siblings sorted by total time
+            (longest first).
+        """
+        by_path: dict[tuple[str, ...], StageStats] = {}
+        for record in self.spans:
+            stats = by_path.get(record.path)
+            if stats is None:
+                stats = by_path[record.path] = StageStats(record.path)
+            stats.calls += 1
+            stats.total += record.duration
+            stats.max = max(stats.max, record.duration)
+
+        # Spans recorded without their enclosing span (e.g. a profiler
+        # started inside it) still need their parents in the tree
+        for path in list(by_path):
+            for i in range(1, len(path)):
+                by_path.setdefault(path[:i], StageStats(path[:i]))
+
+        children: dict[tuple[str, ...], list[StageStats]] = {}
+        for path, stats in by_path.items():
+            children.setdefault(path[:-1], []).append(stats)
+        for path, stats in by_path.items():
+            child_total = sum(child.total for child in children.get(path, []))
+            stats.self_time = max(0.0, stats.total - child_total)
+
+        ordered: list[StageStats] = []
+
+        def visit(parent: tuple[str, ...]) -> None:
+            for stats in sorted(children.get(parent, []), key=lambda s: -s.total):
+                ordered.append(stats)
+                visit(stats.path)
+
+        visit(())
+        return ordered
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """
+        The recorded spans in Chrome's trace event format.
+
+        Load the file in chrome://tracing or https://ui.perfetto.dev.
+        """
+        origin = self.started_at
+        if origin is None:
+            origin = min((record.start for record in self.spans), default=0.0)
+        pid = os.getpid()
+        events = [
+            {
+                "name": record.name,
+                "cat": record.path[0],
+                "ph": "X",
+                "ts": (record.start - origin) * 1e6,
+                "dur": record.duration * 1e6,
+                "pid": pid,
+                "tid": record.thread_id,
+                "args": {key: str(value) for key, value in record.attrs.items()},
+            }
+            for record in sorted(self.spans, key=lambda r: r.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path | str) -> None:
+        """Write chrome_trace() as JSON to path."""
+        Path(path).write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+
+# time.time() at time.perf_counter() == 0, to put span starts on the wall clock
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+class JsonLinesSink(TraceListener):
+    """
+    Append span and metric events to a JSON-lines file.
+
+    Every finished span and every count is written as one JSON object,
+    flushed immediately, so several processes can share a file::
+
+        {"type": "span", "name": "export.write", "path": ["export", "export.write"],
+         "start": 1760000000.123, "duration": 0.002, "pid": 123, "thread": 123,
+         "attrs": {"output": "/project/mypkg/core.py"}}
+        {"type": "metric", "name": "bytes.written", "value": 1234,
+         "path": ["export", "export.write", "file.write"], "pid": 123, "attrs": {...}}
+
+    Span start events are not written; ``start`` is the span's start time as
+    a Unix timestamp.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._file: Any = None
+        self._lock = threading.Lock()
+
+    def _write(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line)
+
+    def span_finished(self, record: SpanRecord) -> None:
+        self._write(
+            {
+                "type": "span",
+                "name": record.name,
+                "path": list(record.path),
+                "start": record.start + _EPOCH_OFFSET,
+                "duration": record.duration,
+                "pid": os.getpid(),
+                "thread": record.thread_id,
+                "attrs": record.attrs,
+            }
+        )
+
+    def metric(self, record: MetricRecord) -> None:
+        self._write(
+            {
+                "type": "metric",
+                "name": record.name,
+                "value": record.value,
+                "path": list(record.path),
+                "pid": os.getpid(),
+                "attrs": record.attrs,
+            }
+        )
+
+    def close(self) -> None:
+        """Close the file (it is reopened by the next event)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _install_env_sink() -> None:
+    """Send events to the file named by NBLITE_TRACE_FILE, if set."""
+    path = os.environ.get(TRACE_FILE_ENV_VAR)
+    if path:
+        add_listener(JsonLinesSink(path))
+
+
+_install_env_sink()
@@ -0,0 +1,25 @@
+"""
+Watch mode for nblite.
+
+Keeps a project loaded and re-exports it incrementally whenever notebooks in
+its code locations change (`nbl watch`).
+"""
+
+from nblite.watch.session import WatchReport, WatchSession
+from nblite.watch.watchers import (
+    FileWatcher,
+    InotifyWatcher,
+    PollingWatcher,
+    create_watcher,
+    inotify_available,
+)
+
+__all__ = [
+    "WatchSession",
+    "WatchReport",
+    "FileWatcher",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "create_watcher",
+    "inotify_available",
+]
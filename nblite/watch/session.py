@@ -0,0 +1,228 @@
+"""
+Watch session: keeps a project loaded and re-exports it as files change.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from nblite.watch.watchers import FileWatcher, create_watcher
+
+if TYPE_CHECKING:
+    from nblite.core.project import NbliteProject
+    from nblite.export.pipeline import ExportResult
+
+__all__ = ["WatchReport", "WatchSession"]
+
+
+@dataclass
+class WatchReport:
+    """
+    Outcome of one burst of changes.
+
+    Attributes:
+        changed: Source files (and config file) that changed, sorted
+        result: Export result, or None if the export raised
+        error: Exception raised by the export, if any
+        latency: Seconds from the first detected change to the end of the
+                 export (includes the debounce delay)
+        export_time: Seconds spent exporting
+        reloaded: Whether the project was reloaded (config file changed)
+        written: Output files created or updated by the export
+    """
+
+    changed: list[Path]
+    result: ExportResult | None = None
+    error: Exception | None = None
+    latency: float = 0.0
+    export_time: float = 0.0
+    reloaded: bool = False
+    written: list[Path] = field(default_factory=list)
+
+
+class WatchSession:
+    """
+    Re-export a project incrementally whenever its notebooks change.
+
+    The project (with its index, notebook cache and export manifest) stays
+    loaded between exports, so each burst of saves costs a stat of every
+    notebook plus the work for the outputs that actually changed. Bursts are
+    debounced: exporting starts once no relevant change was seen for
+    ``debounce`` seconds. Files written by the export itself are ignored.
+
+    Attributes:
+        project: The loaded project
+        debounce: Quiet period in seconds before exporting
+        max_delay: Longest time in seconds a burst is debounced for
+        watcher: Watcher over the project's notebook locations and config file
+
+    Example:
+        >>> with WatchSession(lambda: NbliteProject.from_path()) as session:
+        ...     session.run(on_report=print)
+    """
+
+    def __init__(
+        self,
+        load_project: Callable[[], NbliteProject],
+        debounce: float = 0.05,
+        max_delay: float = 1.0,
+        force_polling: bool = False,
+        poll_interval: float = 0.25,
+    ) -> None:
+        self._load_project = load_project
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._force_polling = force_polling
+        self._poll_interval = poll_interval
+        # Outputs written by our own exports: path -> (size, mtime_ns)
+        self._own_writes: dict[Path, tuple[int, int]] = {}
+        self.project = load_project()
+        self.watcher = self._create_watcher()
+
+    def __enter__(self) -> WatchSession:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def config_path(self) -> Path:
+        """Path of the project's config file."""
+        return self.project.root_path / "nblite.toml"
+
+    def _watched_dirs(self) -> list[Path]:
+        return [cl.path for cl in self.project.code_locations.values() if cl.is_notebook]
+
+    def _create_watcher(self) -> FileWatcher:
+        return create_watcher(
+            self._watched_dirs(),
+            [self.config_path],
+            force_polling=self._force_polling,
+            interval=self._poll_interval,
+        )
+
+    def _is_relevant(self, path: Path) -> bool:
+        """Whether a change to path should trigger an export."""
+        if path == self.config_path or path in self.watcher.dirs:
+            return True
+
+        own = self._own_writes.pop(path, None)
+        if own is not None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return True
+            if (stat.st_size, stat.st_mtime_ns) == own:
+                return False
+
+        for cl in self.project.code_locations.values():
+            if not cl.is_notebook:
+                continue
+            try:
+                rel_path = path.relative_to(cl.path)
+            except ValueError:
+                continue
+            return path.name.endswith(cl.file_ext) and not any(
+                part.startswith(".") for part in rel_path.parts
+            )
+        return False
+
+    def export(self) -> ExportResult:
+        """Run an incremental export and remember the files it wrote."""
+        result = self.project.export(incremental=True)
+        for path in result.files_created + result.files_updated:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            self._own_writes[path] = (stat.st_size, stat.st_mtime_ns)
+        return result
+
+    def _collect(self, timeout: float | None) -> tuple[set[Path], float] | None:
+        """Wait for a relevant change, then debounce; returns (changes, first seen)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: set[Path] = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            changed = {p for p in self.watcher.wait(remaining) if self._is_relevant(p)}
+        first_seen = time.perf_counter()
+
+        while time.perf_counter() - first_seen < self.max_delay:
+            more = self.watcher.wait(self.debounce)
+            relevant = {p for p in more if self._is_relevant(p)}
+            if not relevant:
+                break
+            changed |= relevant
+        return changed, first_seen
+
+    def run_once(self, timeout: float | None = None) -> WatchReport | None:
+        """
+        Wait for a burst of changes and export.
+
+        Args:
+            timeout: Seconds to wait for the first change (None = forever).
+
+        Returns:
+            WatchReport, or None if nothing changed before the timeout.
+        """
+        collected = self._collect(timeout)
+        if collected is None:
+            return None
+        changed, first_seen = collected
+
+        report = WatchReport(changed=sorted(changed))
+        if self.config_path in changed:
+            try:
+                project = self._load_project()
+            except Exception as e:
+                # Keep watching with the previous config until it is fixed
+                report.error = e
+                report.latency = time.perf_counter() - first_seen
+                return report
+            self.watcher.close()
+            self.project = project
+            self.watcher = self._create_watcher()
+            self._own_writes.clear()
+            report.reloaded = True
+
+        start = time.perf_counter()
+        try:
+            report.result = self.export()
+            report.written = report.result.files_created + report.result.files_updated
+        except Exception as e:
+            report.error = e
+        end = time.perf_counter()
+        report.export_time = end - start
+        report.latency = end - first_seen
+        return report
+
+    def run(
+        self,
+        on_report: Callable[[WatchReport], None],
+        stop: threading.Event | None = None,
+    ) -> None:
+        """
+        Export on every burst of changes until stopped.
+
+        Args:
+            on_report: Called with the report of each export.
+            stop: Event that ends the loop when set (checked between waits).
+        """
+        while stop is None or not stop.is_set():
+            report = self.run_once(timeout=None if stop is None else 0.5)
+            if report is not None:
+                on_report(report)
+
+    def close(self) -> None:
+        """Stop watching."""
+        self.watcher.close()
+
+    def __repr__(self) -> str:
+        return f"WatchSession(root={self.project.root_path!r}, watcher={self.watcher!r})"
@@ -0,0 +1,335 @@
+"""
+File watchers for `nbl watch`.
+
+InotifyWatcher uses Linux inotify through ctypes. PollingWatcher compares
+stat snapshots and works everywhere. create_watcher picks inotify when it is
+available and falls back to polling otherwise.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+__all__ = [
+    "FileWatcher",
+    "InotifyWatcher",
+    "PollingWatcher",
+    "create_watcher",
+    "inotify_available",
+]
+
+# From <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _walk_dirs(root: Path) -> Iterator[Path]:
+    """Yield root and its subdirectories, skipping hidden ones."""
+    if not root.is_dir():
+        return
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in dirnames:
+            yield Path(dirpath) / name
+
+
+class FileWatcher:
+    """
+    Reports files that changed under a set of directories.
+
+    Directories are watched recursively (hidden subdirectories are skipped);
+    files are watched individually.
+
+    Attributes:
+        dirs: Directories watched recursively
+        files: Individual files watched
+    """
+
+    def __init__(self, dirs: Iterable[Path], files: Iterable[Path] = ()) -> None:
+        self.dirs = [Path(d) for d in dirs]
+        self.files = [Path(f) for f in files]
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until something changes.
+
+        Returns:
+            Paths of files that were created, modified, moved or deleted
+            (empty if the timeout expired). After an event overflow, the
+            watched directories themselves are returned.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Stop watching."""
+
+    def __enter__(self) -> FileWatcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(dirs={len(self.dirs)}, files={len(self.files)})"
+
+
+class PollingWatcher(FileWatcher):
+    """
+    Watcher that compares (size, mtime) snapshots at a fixed interval.
+
+    Attributes:
+        interval: Seconds between snapshots
+    """
+
+    def __init__(
+        self, dirs: Iterable[Path], files: Iterable[Path] = (), interval: float = 0.25
+    ) -> None:
+        super().__init__(dirs, files)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        """Stat every watched file."""
+        snapshot: dict[Path, tuple[int, int]] = {}
+
+        def add(path: Path) -> None:
+            try:
+                stat = path.stat()
+            except OSError:
+                return
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+
+        for root in self.dirs:
+            for directory in _walk_dirs(root):
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_file():
+                        add(Path(entry.path))
+        for path in self.files:
+            add(path)
+        return snapshot
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.interval, remaining))
+            else:
+                time.sleep(self.interval)
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    """Load libc if it provides inotify."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+_libc: ctypes.CDLL | None = None
+_libc_loaded = False
+
+
+def _get_libc() -> ctypes.CDLL | None:
+    global _libc, _libc_loaded
+    if not _libc_loaded:
+        _libc = _load_libc()
+        _libc_loaded = True
+    return _libc
+
+
+def inotify_available() -> bool:
+    """Whether InotifyWatcher can be used on this system."""
+    return _get_libc() is not None
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Watcher backed by Linux inotify.
+
+    New subdirectories are watched as they appear. Individual files are
+    watched through their parent directory.
+
+    Raises:
+        OSError: If inotify is unavailable or a watch cannot be added
+            (e.g. the inotify watch limit is reached)
+    """
+
+    def __init__(self, dirs: Iterable[Path], files: Iterable[Path] = ()) -> None:
+        super().__init__(dirs, files)
+        libc = _get_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        # Watch descriptor -> (directory, recursive)
+        self._watches: dict[int, tuple[Path, bool]] = {}
+        self._file_names: dict[Path, set[str]] = {}
+        try:
+            for root in self.dirs:
+                for directory in _walk_dirs(root):
+                    self._add_watch(directory, recursive=True)
+            for path in self.files:
+                self._file_names.setdefault(path.parent, set()).add(path.name)
+                if path.parent not in {d for d, _ in self._watches.values()}:
+                    self._add_watch(path.parent, recursive=False)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, directory: Path, recursive: bool) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(directory))
+        previous = self._watches.get(wd)
+        # A directory watched both for files and recursively keeps recursion
+        self._watches[wd] = (directory, recursive or (previous is not None and previous[1]))
+
+    def _read_events(self) -> set[Path]:
+        """Read pending events and return the affected file paths."""
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode(errors="surrogateescape")
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    changed.update(self.dirs)
+                    continue
+                watch = self._watches.get(wd)
+                if watch is None:
+                    continue
+                directory, recursive = watch
+                if mask & _IN_IGNORED:
+                    del self._watches[wd]
+                    continue
+                if not name:
+                    continue
+                path = directory / name
+                if mask & _IN_ISDIR:
+                    if (
+                        recursive
+                        and mask & (_IN_CREATE | _IN_MOVED_TO)
+                        and not name.startswith(".")
+                    ):
+                        # Files may already exist in a directory moved into place
+                        for subdir in _walk_dirs(path):
+                            self._add_watch(subdir, recursive=True)
+                            changed.update(p for p in subdir.iterdir() if p.is_file())
+                    continue
+                if not recursive and name not in self._file_names.get(directory, set()):
+                    continue
+                if mask & _IN_CREATE:
+                    # Content arrives with the following IN_CLOSE_WRITE
+                    continue
+                changed.add(path)
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+
+    def close(self) -> None:
+        fd = getattr(self, "_fd", -1)
+        if fd >= 0:
+            os.close(fd)
+            self._fd = -1
+
+
+def create_watcher(
+    dirs: Iterable[Path],
+    files: Iterable[Path] = (),
+    force_polling: bool = False,
+    interval: float = 0.25,
+) -> FileWatcher:
+    """
+    Create the best available watcher.
+
+    Args:
+        dirs: Directories to watch recursively.
+        files: Individual files to watch.
+        force_polling: If True, always use stat polling.
+        interval: Polling interval in seconds (polling only).
+
+    Returns:
+        An InotifyWatcher if inotify works here, else a PollingWatcher.
+    """
+    dirs = list(dirs)
+    files = list(files)
+    if not force_polling and inotify_available():
+        try:
+            return InotifyWatcher(dirs, files)
+        except OSError:
+            # e.g. fs.inotify.max_user_watches reached
+            pass
+    return PollingWatcher(dirs, files, interval=interval)
@@ -8,6 +8,30 @@ from pathlib import Path
 import pytest
 
 
+def notebook_json(*sources: str, output: str | None = None) -> str:
+    """
+    Build ipynb JSON with one code cell per source.
+
+    Cells get the ids ``c0``, ``c1``, ... If ``output`` is given, every cell
+    gets a stdout stream output with that text.
+    """
+    outputs = []
+    if output is not None:
+        outputs = [{"output_type": "stream", "name": "stdout", "text": output}]
+    cells = [
+        {
+            "cell_type": "code",
+            "id": f"c{i}",
+            "source": src,
+            "metadata": {},
+            "outputs": outputs,
+            "execution_count": None,
+        }
+        for i, src in enumerate(sources)
+    ]
+    return json.dumps({"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5})
+
+
 @pytest.fixture
 def tmp_project(tmp_path: Path) -> Path:
     """Create a temporary nblite project structure."""
@@ -0,0 +1,55 @@
+"""
+Smoke tests for the benchmark suite and its synthetic projects.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent.parent / "benchmarks"
+
+
+def _run(script: str, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(BENCHMARKS_DIR / script), *args],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+class TestSyntheticProject:
+    @pytest.mark.parametrize("layout", ["ipynb", "percent", "module"])
+    def test_generated_project_exports(self, tmp_path: Path, layout: str) -> None:
+        """Test each layout generates a project that exports cleanly."""
+        proc = _run("synthetic.py", str(tmp_path), "--notebooks", "3", "--layout", layout)
+        assert proc.returncode == 0, proc.stderr
+
+        from nblite.core.project import NbliteProject
+
+        result = NbliteProject.from_path(tmp_path).export()
+        assert result.success, result.errors
+        assert (tmp_path / "synthpkg" / "sub2" / "mod2.py").exists()
+
+
+class TestSuite:
+    def test_writes_and_compares_results(self, tmp_path: Path) -> None:
+        """Test the suite writes JSON results and compares against them."""
+        output = tmp_path / "results.json"
+        args = ["--notebooks", "3", "--cells", "4", "--repeat", "2"]
+        proc = _run("suite.py", *args, "--output", str(output))
+        assert proc.returncode == 0, proc.stderr
+
+        data = json.loads(output.read_text())
+        assert data["spec"]["n_notebooks"] == 3
+        assert {"export", "clean", "docs_prepare", "validate_staging"} <= set(data["results"])
+        export = data["results"]["export"]
+        assert len(export["times"]) == 2
+        assert export["min"] <= export["median"]
+
+        proc = _run("suite.py", *args, "--only", "export", "--compare", str(output))
+        assert proc.returncode == 0, proc.stderr
+        assert "baseline ms" in proc.stdout
@@ -192,6 +192,70 @@ class TestCellSourceWithoutDirectives:
         assert cell.source_without_directives == cell.source
 
 
+class TestCellDirectiveScanCache:
+    def test_single_tokenize_per_cell(self, monkeypatch) -> None:
+        """Test directives and stripped source share one tokenize pass."""
+        from nblite.core import directive as directive_module
+
+        calls = []
+        original = directive_module._get_string_ranges
+
+        def counting(source: str):
+            calls.append(source)
+            return original(source)
+
+        monkeypatch.setattr(directive_module, "_get_string_ranges", counting)
+        cell = Cell(cell_type=CellType.CODE, source="#|export\ndef foo(): pass")
+
+        assert cell.has_directive("export")
+        assert cell.source_without_directives == "def foo(): pass"
+        assert cell.get_directive("export") is not None
+        assert len(calls) == 1
+
+    def test_no_tokenize_without_directive_marker(self, monkeypatch) -> None:
+        """Test cells without '#|' skip tokenization entirely."""
+        from nblite.core import directive as directive_module
+
+        def fail(source: str):
+            raise AssertionError("tokenize should not run")
+
+        monkeypatch.setattr(directive_module, "_get_string_ranges", fail)
+        cell = Cell(cell_type=CellType.CODE, source="x = 1\n# comment")
+
+        assert cell.directives == {}
+        assert cell.source_without_directives == cell.source
+
+    def test_cache_invalidated_on_source_change(self) -> None:
+        """Test reassigning source re-scans the cell."""
+        cell = Cell(cell_type=CellType.CODE, source="#|export\ndef foo(): pass")
+        assert cell.has_directive("export")
+
+        cell.source = "#|hide\nx = 1"
+        assert not cell.has_directive("export")
+        assert cell.has_directive("hide")
+        assert cell.source_without_directives == "x = 1"
+
+    def test_stripped_source_does_not_trigger_hooks(self) -> None:
+        """Test DIRECTIVE_PARSED fires only when directives are parsed."""
+        from nblite.extensions import HookRegistry, HookType
+
+        parsed: list[str] = []
+
+        def on_parsed(directive, cell):  # type: ignore[no-untyped-def]
+            parsed.append(directive.name)
+
+        HookRegistry.register(HookType.DIRECTIVE_PARSED, on_parsed)
+        try:
+            cell = Cell(cell_type=CellType.CODE, source="#|export\ndef foo(): pass")
+            assert cell.source_without_directives == "def foo(): pass"
+            assert parsed == []
+
+            assert cell.has_directive("export")
+            assert parsed == ["export"]
+        finally:
+            HookRegistry.unregister(HookType.DIRECTIVE_PARSED, on_parsed)
+
+
 class TestCellRepr:
     def test_repr_short_source(self) -> None:
         """Test repr with short source."""
@@ -4,13 +4,16 @@ Tests for the CLI (Milestone 8).
 
 import json
 import os
+import subprocess
+import sys
 from pathlib import Path
 
 import click
 import pytest
+import typer.main
 from typer.testing import CliRunner
 
-from nblite.cli.app import app
+from nblite.cli.app import COMMANDS, app
 
 runner = CliRunner()
 
@@ -81,6 +84,84 @@ class TestCLIBasics:
         assert "nblite" in result.output.lower()
 
 
+def _importtime(code: str) -> tuple[float, set[str]]:
+    """Run code with ``python -X importtime``; return (import seconds, modules imported)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            # Top-level import; nested ones are included in its cumulative time
+            total_us += int(cumulative)
+    return total_us / 1e6, modules
+
+
+_HEAVY_MODULES = {"nbformat", "nbconvert", "jinja2", "yaml", "pydantic", "jupyter_client"}
+
+_NBL_HELP = "import sys; sys.argv = ['nbl', '--help']; from nblite.cli import main; main()"
+
+
+class TestLazyCommands:
+    def test_commands_table_matches_registered_commands(self) -> None:
+        """Test COMMANDS lists every command with its module and short help."""
+        for name, (module, short_help) in COMMANDS.items():
+            command = typer.main.get_command(app).load_command(name)
+            assert command.callback is not None
+            assert command.callback.__module__ == module, name
+            assert (command.help or "").split("\n\n")[0].strip() == short_help, name
+
+        registered = {
+            info.name or typer.main.get_command_name(info.callback.__name__)
+            for info in app.registered_commands
+            if info.callback is not None
+        }
+        assert registered == set(COMMANDS)
+
+    def test_help_lists_commands_without_importing_them(self) -> None:
+        """Test nbl --help doesn't import command modules."""
+        _, modules = _importtime(_NBL_HELP)
+        assert "nblite.cli.app" in modules
+        assert not {m for m in modules if m.startswith("nblite.cli.commands.")}
+        assert not modules & _HEAVY_MODULES
+
+    def test_command_runs_after_lazy_load(self, sample_project: Path, monkeypatch) -> None:
+        """Test a command's module is loaded when the command is invoked."""
+        monkeypatch.chdir(sample_project)
+        result = runner.invoke(app, ["info"])
+        assert result.exit_code == 0
+        assert "nbs" in result.output
+
+    def test_unknown_command(self) -> None:
+        """Test unknown commands still fail cleanly."""
+        result = runner.invoke(app, ["no-such-command"])
+        assert result.exit_code != 0
+
+
+class TestImportTime:
+    # Budgets are several times the measured times, so that only a
+    # regression (e.g. an eager import of a heavy package) fails them.
+
+    def test_import_nblite(self) -> None:
+        """Test import nblite stays light."""
+        seconds, modules = _importtime("import nblite")
+        assert not modules & (_HEAVY_MODULES | {"typer", "rich", "nblite.docs"})
+        assert seconds < 0.25
+
+    def test_nbl_help(self) -> None:
+        """Test nbl --help stays within its import-time budget."""
+        seconds, _ = _importtime(_NBL_HELP)
+        assert seconds < 1.0
+
+
 class TestInitCommand:
     def test_init_creates_config(self, tmp_path: Path) -> None:
         """Test nbl init creates nblite.toml."""
@@ -267,6 +348,15 @@ class TestExportCommand:
         # Dry run should not create files
         assert not (sample_project / "mypackage" / "utils.py").exists()
 
+    def test_export_incremental(self, sample_project: Path) -> None:
+        """Test nbl export --incremental skips unchanged outputs."""
+        os.chdir(sample_project)
+        assert runner.invoke(app, ["export", "--incremental"]).exit_code == 0
+
+        result = runner.invoke(app, ["export", "--incremental"])
+        assert result.exit_code == 0
+        assert "1 skipped" in result.output
+
     def test_export_no_project(self, tmp_path: Path) -> None:
         """Test export without project gives error."""
         os.chdir(tmp_path)
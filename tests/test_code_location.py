@@ -3,10 +3,14 @@ Tests for the CodeLocation class (Milestone 5).
 """
 
 import json
+import sys
 from pathlib import Path
 
+import pytest
+
 from nblite.config.schema import CodeLocationFormat, ExportMode
 from nblite.core.code_location import CodeLocation
+from nblite.core.notebook_cache import NotebookCache
 
 
 class TestCodeLocationCreation:
@@ -237,6 +241,37 @@ class TestCodeLocationGetFiles:
         assert all(f.name.endswith(".pct.py") for f in files)
 
 
+class TestCodeLocationContains:
+    def test_contains_matches_get_files(self, tmp_path: Path) -> None:
+        """Test contains agrees with get_files without scanning."""
+        pts_dir = tmp_path / "pts"
+        (pts_dir / "api" / ".ipynb_checkpoints").mkdir(parents=True)
+        paths = [
+            pts_dir / "utils.pct.py",
+            pts_dir / "other.py",
+            pts_dir / "__init__.pct.py",
+            pts_dir / "api" / "routes.pct.py",
+            pts_dir / "api" / ".ipynb_checkpoints" / "routes-checkpoint.pct.py",
+        ]
+        for path in paths:
+            path.write_text("# %%")
+
+        cl = CodeLocation(key="pts", path=pts_dir, format="percent")
+        files = set(cl.get_files())
+        for path in paths:
+            assert cl.contains(path) == (path in files)
+        assert cl.contains(pts_dir / "__init__.pct.py", ignore_dunders=False)
+
+    def test_contains_outside_or_missing(self, tmp_path: Path) -> None:
+        """Test paths outside the location or not on disk are not contained."""
+        (tmp_path / "nbs").mkdir()
+        (tmp_path / "other.ipynb").write_text("{}")
+
+        cl = CodeLocation(key="nbs", path=tmp_path / "nbs", format="ipynb")
+        assert not cl.contains(tmp_path / "other.ipynb")
+        assert not cl.contains(tmp_path / "nbs" / "missing.ipynb")
+
+
 class TestCodeLocationGetNotebooks:
     def test_get_notebooks(self, tmp_path: Path) -> None:
         """Test getting notebooks from code location."""
@@ -260,6 +295,100 @@ class TestCodeLocationGetNotebooks:
         assert len(notebooks) == 1
         assert notebooks[0].code_location == "nbs"
 
+    def test_get_notebooks_without_outputs(self, tmp_path: Path) -> None:
+        """Test that get_notebooks can skip cell outputs."""
+        nbs_dir = tmp_path / "nbs"
+        nbs_dir.mkdir()
+        output = {"output_type": "stream", "name": "stdout", "text": ["hi"]}
+        nb_content = json.dumps(
+            {
+                "cells": [
+                    {"cell_type": "code", "source": "x = 1", "metadata": {}, "outputs": [output]}
+                ],
+                "metadata": {},
+                "nbformat": 4,
+                "nbformat_minor": 5,
+            }
+        )
+        (nbs_dir / "utils.ipynb").write_text(nb_content)
+
+        cl = CodeLocation(key="nbs", path=nbs_dir, format="ipynb")
+        notebooks = cl.get_notebooks(outputs=False)
+
+        assert notebooks[0].cells[0].outputs == []
+        assert not notebooks[0].outputs_loaded
+        assert cl.get_notebooks()[0].cells[0].outputs == [output]
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_get_notebooks_parallel(self, tmp_path: Path, executor: str) -> None:
+        """Test parallel loading returns notebooks in path order."""
+        nbs_dir = tmp_path / "nbs"
+        for i in range(6):
+            (nbs_dir / f"sub{i % 2}").mkdir(parents=True, exist_ok=True)
+            nb_content = json.dumps(
+                {
+                    "cells": [
+                        {"cell_type": "code", "source": f"x = {i}", "metadata": {}, "outputs": []}
+                    ],
+                    "metadata": {},
+                    "nbformat": 4,
+                    "nbformat_minor": 5,
+                }
+            )
+            (nbs_dir / f"sub{i % 2}" / f"nb{i}.ipynb").write_text(nb_content)
+
+        cache = NotebookCache()
+        cl = CodeLocation(key="nbs", path=nbs_dir, format="ipynb", notebook_cache=cache)
+        notebooks = cl.get_notebooks(n_workers=3, executor=executor)
+
+        assert [nb.source_path for nb in notebooks] == cl.get_files()
+        assert all(nb.code_location == "nbs" for nb in notebooks)
+        assert cache.load_count == 6
+        assert cl.get_notebooks() == notebooks
+        assert cache.load_count == 6
+
+    def test_get_notebooks_parallel_error(self, tmp_path: Path) -> None:
+        """Test a parallel load raises the error of the first broken notebook."""
+        nbs_dir = tmp_path / "nbs"
+        nbs_dir.mkdir()
+        for name in ("a", "c"):
+            (nbs_dir / f"{name}.ipynb").write_text(
+                json.dumps({"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5})
+            )
+        (nbs_dir / "b.ipynb").write_text("{not json")
+        (nbs_dir / "d.ipynb").write_text("")
+
+        cl = CodeLocation(key="nbs", path=nbs_dir, format="ipynb", load_workers=4)
+        with pytest.raises(Exception) as serial:
+            cl.get_notebooks(n_workers=1)
+        with pytest.raises(Exception) as parallel:
+            cl.get_notebooks()
+        assert type(parallel.value) is type(serial.value)
+        assert str(parallel.value) == str(serial.value)
+        if sys.version_info >= (3, 11):
+            assert parallel.value.__notes__ == [f"While loading notebook {nbs_dir / 'b.ipynb'}"]
+
+    def test_iter_notebooks(self, tmp_path: Path) -> None:
+        """Test iter_notebooks loads lazily, in path order, without filling the cache."""
+        nbs_dir = tmp_path / "nbs"
+        nbs_dir.mkdir()
+        for name in ("b", "a"):
+            (nbs_dir / f"{name}.ipynb").write_text(
+                json.dumps({"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 5})
+            )
+
+        cache = NotebookCache()
+        cl = CodeLocation(key="nbs", path=nbs_dir, format="ipynb", notebook_cache=cache)
+        notebooks = cl.iter_notebooks()
+        assert cache.load_count == 0
+
+        first = next(notebooks)
+        assert first.source_path == nbs_dir / "a.ipynb"
+        assert first.code_location == "nbs"
+        assert cache.load_count == 1
+        assert [nb.source_path for nb in notebooks] == [nbs_dir / "b.ipynb"]
+        assert len(cache) == 0
+
     def test_get_notebooks_module_format_returns_empty(self, tmp_path: Path) -> None:
         """Test that get_notebooks returns empty for module format."""
         lib_dir = tmp_path / "lib"
@@ -5,8 +5,10 @@ Tests for the configuration system (Milestone 4).
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
 from nblite.config import (
+    CacheConfig,
     CellReferenceStyle,
     CleanConfig,
     CodeLocationConfig,
@@ -18,6 +20,8 @@ from nblite.config import (
     ExportRule,
     ExtensionEntry,
     GitConfig,
+    LoadConfig,
+    LoadExecutor,
     NbliteConfig,
     TemplatesConfig,
     find_config_file,
@@ -117,6 +121,12 @@ class TestExportConfig:
         ec = ExportConfig()
         assert ec.include_autogenerated_warning is True
         assert ec.cell_reference_style == CellReferenceStyle.RELATIVE
+        assert ec.n_workers == 1
+
+    def test_export_config_n_workers_minimum(self) -> None:
+        """Test n_workers must be at least 1."""
+        with pytest.raises(ValidationError):
+            ExportConfig(n_workers=0)
 
     def test_export_config_custom(self) -> None:
         """Test custom export config."""
@@ -198,6 +208,43 @@ class TestDocsConfig:
         assert dc.exclude_patterns == ["__*", ".*"]
 
 
+class TestCacheConfig:
+    def test_cache_config_defaults(self) -> None:
+        """Test cache config default values."""
+        cc = CacheConfig()
+        assert cc.enabled is True
+        assert cc.path == ".nblite/cache"
+
+    def test_cache_config_loaded(self, tmp_path: Path) -> None:
+        """Test [cache] section is read from nblite.toml."""
+        config_path = tmp_path / "nblite.toml"
+        config_path.write_text('[cache]\nenabled = false\npath = "build/cache"\n')
+        config = load_config(config_path)
+        assert config.cache.enabled is False
+        assert config.cache.path == "build/cache"
+
+
+class TestLoadConfig:
+    def test_load_config_defaults(self) -> None:
+        """Test notebooks are loaded serially by default."""
+        lc = LoadConfig()
+        assert lc.n_workers == 1
+        assert lc.executor == LoadExecutor.THREAD
+
+    def test_load_config_loaded(self, tmp_path: Path) -> None:
+        """Test [load] section is read from nblite.toml."""
+        config_path = tmp_path / "nblite.toml"
+        config_path.write_text('[load]\nn_workers = 4\nexecutor = "process"\n')
+        config = load_config(config_path)
+        assert config.load.n_workers == 4
+        assert config.load.executor == LoadExecutor.PROCESS
+
+    def test_load_config_invalid_workers(self) -> None:
+        """Test n_workers must be at least 1."""
+        with pytest.raises(ValidationError):
+            LoadConfig(n_workers=0)
+
+
 class TestNbliteConfig:
     def test_minimal_config(self) -> None:
         """Test minimal valid config."""
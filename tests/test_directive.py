@@ -14,6 +14,7 @@ from nblite.core.directive import (
     list_directive_definitions,
     parse_directives_from_source,
     register_directive,
+    scan_directives,
 )
 
 
@@ -327,6 +328,84 @@ class TestSourceWithoutDirectives:
         assert "#|export" not in result
 
 
+class TestScanDirectives:
+    def test_scan_matches_separate_functions(self) -> None:
+        """Test scan_directives agrees with the individual helpers."""
+        source = 'x = "#|not_directive"\n#|export\ny = 1 #|func_return_line\n#|a \\\n#   b\nz = 2'
+        scan = scan_directives(source)
+
+        assert [d.name for d in scan.directives] == [
+            d.name for d in parse_directives_from_source(source)
+        ]
+        assert scan.source_without_directives == get_source_without_directives(source)
+        assert scan.source_without_directives == 'x = "#|not_directive"\ny = 1\nz = 2'
+        assert scan.string_ranges
+
+    def test_stripping_does_not_trigger_hooks(self) -> None:
+        """Test only parsing directives triggers DIRECTIVE_PARSED."""
+        from nblite.extensions import HookRegistry, HookType
+
+        parsed: list[str] = []
+
+        def on_parsed(directive, cell):  # type: ignore[no-untyped-def]
+            parsed.append(directive.name)
+
+        HookRegistry.register(HookType.DIRECTIVE_PARSED, on_parsed)
+        try:
+            get_source_without_directives("#|export\nx = 1")
+            scan_directives("#|export\nx = 1", trigger_hooks=False)
+            assert parsed == []
+
+            scan_directives("#|export\nx = 1")
+            assert parsed == ["export"]
+        finally:
+            HookRegistry.unregister(HookType.DIRECTIVE_PARSED, on_parsed)
+
+    def test_scan_without_marker(self) -> None:
+        """Test sources with no '#|' are returned unchanged."""
+        source = 'x = "hello"\n# comment'
+        scan = scan_directives(source)
+        assert scan.directives == []
+        assert scan.source_without_directives == source
+        assert scan.string_ranges == []
+
+
+class TestSourceIndex:
+    def test_position_in_string(self) -> None:
+        """Test containment checks for single- and multi-line strings."""
+        from nblite.core.directive import _SourceIndex
+
+        source = 'x = "abc"\ny = """\nline\n"""\nz = 1'
+        index = _SourceIndex(source)
+
+        assert index.position_in_string(0, 4)
+        assert index.position_in_string(0, 8)
+        assert not index.position_in_string(0, 9)
+        assert not index.position_in_string(0, 0)
+        assert index.position_in_string(1, 4)
+        assert index.position_in_string(2, 0)
+        assert index.position_in_string(3, 2)
+        assert not index.position_in_string(3, 3)
+        assert not index.position_in_string(4, 0)
+
+    def test_first_code_line(self) -> None:
+        """Test first code line skips comments and blank lines."""
+        from nblite.core.directive import _SourceIndex
+
+        index = _SourceIndex("#|export\n\n# comment\nx = 1\n#|hide")
+        assert index.first_code_line == 3
+        assert not index.has_code_before(3)
+        assert index.has_code_before(4)
+
+    def test_first_code_line_no_code(self) -> None:
+        """Test sources with only comments have no code line."""
+        from nblite.core.directive import _SourceIndex
+
+        index = _SourceIndex("#|export\n# comment")
+        assert index.first_code_line == 2
+        assert not index.has_code_before(2)
+
+
 class TestDirectivesInsideStrings:
     """Test that directives inside string literals are correctly ignored."""
 
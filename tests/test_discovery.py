@@ -0,0 +1,113 @@
+"""
+Tests for scandir-based file discovery.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nblite.utils.discovery import scan_files
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Create a tree of notebooks, with hidden, dunder and cache directories."""
+    for rel in (
+        "a.ipynb",
+        "__init__.ipynb",
+        ".hidden.ipynb",
+        "notes.md",
+        "sub/b.ipynb",
+        "sub/.ipynb_checkpoints/b-checkpoint.ipynb",
+        "__pycache__/c.ipynb",
+        "node_modules/pkg/d.ipynb",
+        "scratch/e.ipynb",
+        "scratch/deep/f.ipynb",
+        "_drafts/g.ipynb",
+    ):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("{}")
+    return tmp_path
+
+
+def _rel(root: Path, entries) -> list[str]:  # type: ignore[no-untyped-def]
+    return [entry.path.relative_to(root).as_posix() for entry in entries]
+
+
+@pytest.fixture
+def scanned_dirs(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record the directories listed with os.scandir."""
+    listed: list[Path] = []
+    scandir = os.scandir
+
+    def recording_scandir(path):  # type: ignore[no-untyped-def]
+        listed.append(Path(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", recording_scandir)
+    return listed
+
+
+class TestScanFiles:
+    def test_filters(self, tree: Path) -> None:
+        """Test hidden, dunder and cache paths are skipped, and results are sorted."""
+        entries = scan_files(tree, ".ipynb", ignore_dunders=True, ignore_hidden=True)
+        assert _rel(tree, entries) == [
+            "_drafts/g.ipynb",
+            "a.ipynb",
+            "scratch/deep/f.ipynb",
+            "scratch/e.ipynb",
+            "sub/b.ipynb",
+        ]
+
+    def test_no_filters(self, tree: Path) -> None:
+        """Test hidden and dunder files are kept unless ignored."""
+        names = _rel(tree, scan_files(tree, ".ipynb", prune_dirs=()))
+        assert "__init__.ipynb" in names
+        assert ".hidden.ipynb" in names
+        assert "sub/.ipynb_checkpoints/b-checkpoint.ipynb" in names
+        assert "node_modules/pkg/d.ipynb" in names
+
+    def test_prunes_before_listing(self, tree: Path, scanned_dirs: list[Path]) -> None:
+        """Test pruned directories are never listed."""
+        scan_files(tree, ".ipynb", ignore_hidden=True, exclude=["scratch/*"])
+        assert tree / "sub" in scanned_dirs
+        for pruned in ("sub/.ipynb_checkpoints", "__pycache__", "node_modules", "scratch"):
+            assert tree / pruned not in scanned_dirs
+
+    def test_exclude_globs(self, tree: Path) -> None:
+        """Test glob patterns exclude files relative to the root."""
+        entries = scan_files(tree, ".ipynb", exclude=["scratch/deep/*", "**/b.ipynb"])
+        names = _rel(tree, entries)
+        assert "scratch/e.ipynb" in names
+        assert "scratch/deep/f.ipynb" not in names
+        assert "sub/b.ipynb" not in names
+
+    def test_exclude_prefixes(self, tree: Path) -> None:
+        """Test name prefixes exclude matching files and directories."""
+        entries = scan_files(tree, (".ipynb", ".md"), exclude_prefixes=["_", "."])
+        assert _rel(tree, entries) == [
+            "a.ipynb",
+            "notes.md",
+            "scratch/deep/f.ipynb",
+            "scratch/e.ipynb",
+            "sub/b.ipynb",
+        ]
+
+    def test_not_recursive(self, tree: Path) -> None:
+        """Test recursive=False only lists the root."""
+        assert _rel(tree, scan_files(tree, ".ipynb", ignore_dunders=True, recursive=False)) == [
+            ".hidden.ipynb",
+            "a.ipynb",
+        ]
+
+    def test_missing_root(self, tmp_path: Path) -> None:
+        """Test a missing root has no files."""
+        assert scan_files(tmp_path / "missing", ".ipynb") == []
+
+    def test_stat(self, tree: Path) -> None:
+        """Test entries carry the stat of their file."""
+        entry = scan_files(tree, ".md")[0]
+        assert entry.stat().st_size == 2
+        assert entry.stat().st_mtime_ns == (tree / "notes.md").stat().st_mtime_ns
@@ -0,0 +1,201 @@
+"""
+Tests for export scheduling and parallel export.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from nblite.config import parse_export_pipeline
+from nblite.core.project import NbliteProject
+from nblite.export.scheduler import ExportTask, batch_by_output, schedule_rule_waves
+from nblite.extensions import HookRegistry, HookType
+from tests.conftest import notebook_json
+
+
+def _wave_keys(pipeline: str) -> list[list[str]]:
+    waves = schedule_rule_waves(parse_export_pipeline(pipeline))
+    return [[f"{r.from_key}->{r.to_key}" for r in wave] for wave in waves]
+
+
+@pytest.fixture
+def multi_project(tmp_path: Path) -> Path:
+    """Create a project with three locations and a few notebooks."""
+    nbs = tmp_path / "nbs"
+    (nbs / "sub").mkdir(parents=True)
+    for i in range(6):
+        folder = nbs / "sub" if i % 2 else nbs
+        (folder / f"mod{i}.ipynb").write_text(
+            notebook_json(
+                f"#|default_exp mod{i}",
+                f"#|export\ndef func{i}():\n    return {i}",
+                "#|export_to shared\nVALUE_" + str(i) + " = 1",
+            )
+        )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = '''
+nbs -> pts
+pts -> lib
+'''
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.pts]
+path = "pts"
+format = "percent"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+def _snapshot(root: Path) -> dict[str, str]:
+    return {
+        str(p.relative_to(root)): p.read_text()
+        for p in sorted(root.rglob("*"))
+        if p.is_file() and ".nblite" not in p.parts
+    }
+
+
+class TestScheduleRuleWaves:
+    def test_chain_runs_in_order(self) -> None:
+        """Test a rule reading another rule's output comes in a later wave."""
+        assert _wave_keys("nbs -> pts\npts -> lib") == [["nbs->pts"], ["pts->lib"]]
+
+    def test_independent_rules_share_a_wave(self) -> None:
+        """Test rules from the same source run together."""
+        assert _wave_keys("nbs -> pts\nnbs -> lib\npts -> docs") == [
+            ["nbs->pts", "nbs->lib"],
+            ["pts->docs"],
+        ]
+
+    def test_same_destination_keeps_order(self) -> None:
+        """Test rules writing the same location are not run together."""
+        assert _wave_keys("nbs -> lib\npts -> lib") == [["nbs->lib"], ["pts->lib"]]
+
+    def test_overwriting_a_source_keeps_order(self) -> None:
+        """Test a rule writing a location read by an earlier rule runs after it."""
+        assert _wave_keys("pts -> lib\nnbs -> pts") == [["pts->lib"], ["nbs->pts"]]
+
+    def test_empty_pipeline(self) -> None:
+        """Test an empty pipeline has no waves."""
+        assert schedule_rule_waves([]) == []
+
+
+class TestBatchByOutput:
+    def _task(self, output: str) -> ExportTask:
+        return ExportTask(
+            rule_key="a -> b",
+            from_location=None,  # type: ignore[arg-type]
+            to_location=None,  # type: ignore[arg-type]
+            output_path=Path(output),
+            sources=[],
+            outputs=False,
+            inputs={},
+            options="",
+            write=lambda nbs: None,  # type: ignore[arg-type,return-value]
+            describe=lambda nbs, e: "",
+        )
+
+    def test_unique_outputs_single_batch(self) -> None:
+        """Test tasks writing different files form one batch."""
+        tasks = [self._task("a.py"), self._task("b.py")]
+        assert batch_by_output(tasks) == [tasks]
+
+    def test_repeated_output_starts_new_batch(self) -> None:
+        """Test a second write to the same file waits for the first."""
+        tasks = [self._task("a.py"), self._task("b.py"), self._task("a.py")]
+        assert batch_by_output(tasks) == [tasks[:2], tasks[2:]]
+
+
+class TestParallelExport:
+    def test_parallel_matches_sequential(
+        self, multi_project: Path, tmp_path_factory: pytest.TempPathFactory
+    ) -> None:
+        """Test exporting with several workers writes the same files in the same order."""
+        import shutil
+
+        parallel_root = tmp_path_factory.mktemp("parallel") / "project"
+        shutil.copytree(multi_project, parallel_root)
+
+        sequential = NbliteProject.from_path(multi_project).export(n_workers=1)
+        parallel = NbliteProject.from_path(parallel_root).export(n_workers=4)
+
+        assert sequential.success and parallel.success
+        assert [p.relative_to(multi_project) for p in sequential.files_created] == [
+            p.relative_to(parallel_root) for p in parallel.files_created
+        ]
+        assert _snapshot(multi_project) == _snapshot(parallel_root)
+        assert "mypkg/shared.py" in _snapshot(parallel_root)
+
+    def test_n_workers_from_config(self, multi_project: Path) -> None:
+        """Test export.n_workers is used when n_workers is not given."""
+        config = multi_project / "nblite.toml"
+        config.write_text(config.read_text() + "\n[export]\nn_workers = 3\n")
+        project = NbliteProject.from_path(multi_project)
+        assert project.config.export.n_workers == 3
+
+        result = project.export()
+        assert result.success
+        assert (multi_project / "mypkg" / "mod5.py").exists()
+
+    def test_hooks_run_in_main_thread_in_plan_order(self, multi_project: Path) -> None:
+        """Test hooks fire from the calling thread, PRE before POST, in plan order."""
+        events: list[tuple[str, str, bool]] = []
+        main = threading.current_thread()
+
+        def on_pre(**kwargs: object) -> None:
+            path = kwargs["output_path"]
+            events.append(("pre", str(path), threading.current_thread() is main))
+
+        def on_post(**kwargs: object) -> None:
+            path = kwargs["output_path"]
+            events.append(("post", str(path), threading.current_thread() is main))
+
+        HookRegistry.register(HookType.PRE_NOTEBOOK_EXPORT, on_pre)
+        HookRegistry.register(HookType.POST_NOTEBOOK_EXPORT, on_post)
+        try:
+            NbliteProject.from_path(multi_project).export(n_workers=4)
+        finally:
+            HookRegistry.clear(HookType.PRE_NOTEBOOK_EXPORT)
+            HookRegistry.clear(HookType.POST_NOTEBOOK_EXPORT)
+
+        assert all(in_main for _, _, in_main in events)
+        pre = [path for kind, path, _ in events if kind == "pre"]
+        post = [path for kind, path, _ in events if kind == "post"]
+        assert pre == post
+        # Every pts file is written before any module is built from it
+        first_module = next(
+            i for i, path in enumerate(pre) if path.endswith(".py") and "mypkg" in path
+        )
+        assert all(path.endswith(".pct.py") for path in pre[:first_module])
+
+    def test_parallel_export_reports_errors(
+        self, multi_project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a failing output is reported without stopping the others."""
+        import nblite.core.project as project_module
+
+        original = project_module.export_notebook_to_notebook
+
+        def failing(nb, output_path, **kwargs):  # type: ignore[no-untyped-def]
+            if output_path.name == "mod2.pct.py":
+                raise RuntimeError("boom")
+            return original(nb, output_path, **kwargs)
+
+        monkeypatch.setattr(project_module, "export_notebook_to_notebook", failing)
+
+        result = NbliteProject.from_path(multi_project).export(n_workers=4)
+
+        assert result.success is False
+        assert len(result.errors) == 1
+        assert "mod2.ipynb" in result.errors[0] and "boom" in result.errors[0]
+        assert (multi_project / "pts" / "mod0.pct.py").exists()
+        assert not (multi_project / "pts" / "mod2.pct.py").exists()
@@ -0,0 +1,96 @@
+"""
+Tests for the per-notebook export summary.
+"""
+
+import pickle
+
+import pytest
+
+from nblite.core.notebook import Notebook
+from nblite.export.summary import ExportSummary
+
+
+def _notebook(*sources: str) -> Notebook:
+    return Notebook.from_dict(
+        {
+            "cells": [
+                {"cell_type": "code", "source": src, "metadata": {}, "outputs": []}
+                for src in sources
+            ],
+            "metadata": {},
+            "nbformat": 4,
+            "nbformat_minor": 5,
+        }
+    )
+
+
+class TestExportSummary:
+    def test_summary(self) -> None:
+        """Test targets, cells, orders and __all__ names are collected in one pass."""
+        nb = _notebook(
+            "#|default_exp core",
+            "#|export\ndef public(): pass",
+            "#|exporti\ndef hidden(): pass\nLIMIT = 1",
+            "#|export_to utils 5\ndef helper(): pass",
+            "#|add_to_all extra",
+            "x = 1",
+        )
+        summary = ExportSummary.from_notebook(nb)
+
+        assert summary.default_exp == "core"
+        assert not summary.is_function_notebook
+        assert dict(summary.targets) == {"core": (1, 2), "utils": (3,)}
+        assert [(c.cell.index, c.target, c.order) for c in summary.cells] == [
+            (1, "core", 0),
+            (2, "core", 0),
+            (3, "utils", 5),
+        ]
+        assert [c.cell.index for c in summary.cells_for("utils")] == [3]
+        assert summary.add_to_all == ("extra",)
+        assert summary.exporti_names == {"hidden", "LIMIT"}
+        summary.check_function_only_directives()
+
+    def test_export_without_default_exp(self) -> None:
+        """Test #|export without #|default_exp targets the "" module."""
+        summary = ExportSummary.from_notebook(_notebook("#|export\ndef f(): pass"))
+        assert dict(summary.targets) == {"": (0,)}
+        assert summary.cells[0].target is None
+
+    def test_function_only_directives(self) -> None:
+        """Test #|top_export is rejected outside function notebooks."""
+        summary = ExportSummary.from_notebook(
+            _notebook("#|default_exp core", "#|top_export\nx = 1")
+        )
+        with pytest.raises(ValueError, match="top_export.*cell 1"):
+            summary.check_function_only_directives()
+
+        summary = ExportSummary.from_notebook(
+            _notebook("#|default_exp core\n#|export_as_func true", "#|top_export\nx = 1")
+        )
+        assert summary.is_function_notebook
+        summary.check_function_only_directives()
+
+    def test_targets_read_only(self) -> None:
+        """Test targets cannot be mutated, and survive pickling read-only."""
+        summary = ExportSummary.from_notebook(
+            _notebook("#|default_exp core", "#|export\ndef f(): pass")
+        )
+        with pytest.raises(TypeError):
+            summary.targets["other"] = (0,)  # type: ignore[index]
+
+        restored = pickle.loads(pickle.dumps(summary))
+        assert restored.targets == {"core": (1,)}
+        with pytest.raises(TypeError):
+            restored.targets["other"] = (0,)  # type: ignore[index]
+
+
+class TestNotebookExportSummary:
+    def test_computed_once(self) -> None:
+        """Test the notebook reuses its summary until a cell source changes."""
+        nb = _notebook("#|default_exp core", "#|export\ndef f(): pass")
+        summary = nb.export_summary
+        assert nb.export_summary is summary
+
+        nb.cells[1].source = "def f(): pass"
+        assert nb.export_summary is not summary
+        assert nb.export_summary.cells == ()
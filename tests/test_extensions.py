@@ -23,6 +23,9 @@ class TestHookType:
             "PRE_CLEAN",
             "POST_CLEAN",
             "DIRECTIVE_PARSED",
+            "SPAN_START",
+            "SPAN_END",
+            "METRIC",
         ]
         for hook_name in expected:
             assert hasattr(HookType, hook_name)
@@ -665,3 +668,98 @@ format = "module"
         post_calls = [c for c in cell_exports if c[0] == "post"]
         assert len(pre_calls) >= 2  # At least 2 exported cells
         assert len(post_calls) >= 2
+
+
+class TestTracingHooks:
+    """Tests for the SPAN_START, SPAN_END and METRIC hooks."""
+
+    def setup_method(self) -> None:
+        """Clear hooks before each test."""
+        HookRegistry.clear()
+
+    def teardown_method(self) -> None:
+        """Clear hooks after each test."""
+        HookRegistry.clear()
+
+    def test_hooks_receive_events(self) -> None:
+        """Test tracing hooks receive spans and metrics."""
+        from nblite.utils.tracing import count, span
+
+        events = []
+
+        @hook(HookType.SPAN_START)
+        def on_start(**kwargs):
+            events.append(("start", kwargs["path"]))
+
+        @hook(HookType.SPAN_END)
+        def on_end(**kwargs):
+            events.append(("end", kwargs["path"], kwargs["duration"] >= 0))
+
+        @hook(HookType.METRIC)
+        def on_metric(**kwargs):
+            events.append(("metric", kwargs["name"], kwargs["value"], kwargs["path"]))
+
+        with span("outer", detail=1):
+            count("things", 3)
+
+        assert events == [
+            ("start", ("outer",)),
+            ("metric", "things", 3, ("outer",)),
+            ("end", ("outer",), True),
+        ]
+
+    def test_clear_stops_events(self) -> None:
+        """Test spans are no-ops again once tracing hooks are cleared."""
+        from nblite.utils.tracing import tracing_enabled
+
+        HookRegistry.register(HookType.SPAN_END, lambda **kwargs: None)
+        assert tracing_enabled()
+        HookRegistry.clear(HookType.SPAN_END)
+        assert not tracing_enabled()
+
+    def test_export_metrics(self, tmp_path: Path) -> None:
+        """Test export reports files read and written."""
+        import json
+
+        from nblite.core.project import NbliteProject
+
+        totals: dict[str, float] = {}
+
+        @hook(HookType.METRIC)
+        def on_metric(**kwargs):
+            totals[kwargs["name"]] = totals.get(kwargs["name"], 0) + kwargs["value"]
+
+        (tmp_path / "nbs").mkdir()
+        (tmp_path / "nblite.toml").write_text(
+            'export_pipeline = "nbs -> lib"\n\n'
+            '[cl.nbs]\npath = "nbs"\nformat = "ipynb"\n\n'
+            '[cl.lib]\npath = "lib"\nformat = "module"\n'
+        )
+        (tmp_path / "nbs" / "test.ipynb").write_text(
+            json.dumps(
+                {
+                    "cells": [
+                        {
+                            "cell_type": "code",
+                            "source": "#|default_exp test\n#|export\ndef foo(): pass",
+                            "metadata": {},
+                            "outputs": [],
+                        }
+                    ],
+                    "metadata": {},
+                    "nbformat": 4,
+                    "nbformat_minor": 5,
+                }
+            )
+        )
+
+        project = NbliteProject.from_path(tmp_path)
+        project.export()
+        assert totals["files.written"] == 1
+        assert totals["bytes.written"] == (tmp_path / "lib" / "test.py").stat().st_size
+        assert totals["files.read"] >= 1
+
+        totals.clear()
+        project.export(incremental=True)
+        assert totals["files.skipped"] == 1
+        assert "files.written" not in totals
@@ -0,0 +1,90 @@
+"""
+Tests for the file writing helpers.
+"""
+
+import os
+import stat
+from pathlib import Path
+
+from nblite.utils.files import WriteStatus, write_if_changed
+
+
+class TestWriteIfChanged:
+    def test_creates_file(self, tmp_path: Path) -> None:
+        """Test a missing file is created along with its parents."""
+        path = tmp_path / "a" / "b" / "out.py"
+        assert write_if_changed(path, "x = 1\n") == WriteStatus.CREATED
+        assert path.read_text() == "x = 1\n"
+
+    def test_unchanged_content_not_rewritten(self, tmp_path: Path) -> None:
+        """Test identical content leaves the file and its mtime alone."""
+        path = tmp_path / "out.py"
+        path.write_text("x = 1\n")
+        past = path.stat().st_mtime_ns - 10**9
+        os.utime(path, ns=(past, past))
+
+        assert write_if_changed(path, "x = 1\n") == WriteStatus.UNCHANGED
+        assert path.stat().st_mtime_ns == past
+
+    def test_changed_content_updated(self, tmp_path: Path) -> None:
+        """Test different content of the same size is detected."""
+        path = tmp_path / "out.py"
+        path.write_text("x = 1\n")
+        assert write_if_changed(path, "x = 2\n") == WriteStatus.UPDATED
+        assert path.read_text() == "x = 2\n"
+
+    def test_bytes_content(self, tmp_path: Path) -> None:
+        """Test bytes are written as-is."""
+        path = tmp_path / "out.bin"
+        assert write_if_changed(path, b"\x00\x01") == WriteStatus.CREATED
+        assert write_if_changed(path, b"\x00\x01") == WriteStatus.UNCHANGED
+        assert path.read_bytes() == b"\x00\x01"
+
+    def test_preserves_mode(self, tmp_path: Path) -> None:
+        """Test rewriting keeps the existing file permissions."""
+        path = tmp_path / "run.sh"
+        path.write_text("echo 1\n")
+        path.chmod(0o755)
+
+        write_if_changed(path, "echo 2\n")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o755
+
+    def test_new_file_mode(self, tmp_path: Path) -> None:
+        """Test new files get the default mode for the umask in effect when written."""
+        old_umask = os.umask(0o027)
+        try:
+            path = tmp_path / "new.py"
+            write_if_changed(path, "x = 1\n")
+        finally:
+            os.umask(old_umask)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+    def test_symlink_kept(self, tmp_path: Path) -> None:
+        """Test a symlinked file is rewritten through the link."""
+        (tmp_path / "real").mkdir()
+        target = tmp_path / "real" / "nb.ipynb"
+        target.write_text("{}")
+        link = tmp_path / "nb.ipynb"
+        link.symlink_to(target)
+
+        assert write_if_changed(link, "{ }") == WriteStatus.UPDATED
+        assert link.is_symlink()
+        assert target.read_text() == "{ }"
+        assert [p.name for p in (tmp_path / "real").iterdir()] == ["nb.ipynb"]
+
+    def test_hard_link_kept(self, tmp_path: Path) -> None:
+        """Test a file with several hard links is rewritten in place."""
+        path = tmp_path / "out.py"
+        path.write_text("x = 1\n")
+        other = tmp_path / "other.py"
+        os.link(path, other)
+
+        write_if_changed(path, "x = 22\n")
+        assert other.read_text() == "x = 22\n"
+        assert path.stat().st_ino == other.stat().st_ino
+
+    def test_no_temp_files_left(self, tmp_path: Path) -> None:
+        """Test the temporary file is renamed over the target."""
+        write_if_changed(tmp_path / "out.py", "x = 1\n")
+        write_if_changed(tmp_path / "out.py", "x = 2\n")
+        assert [p.name for p in tmp_path.iterdir()] == ["out.py"]
@@ -3,15 +3,19 @@ Tests for the fill module (notebook execution and output filling).
 """
 
 import json
+import os
 from pathlib import Path
 
 from nblite.core.notebook import Notebook
 from nblite.fill import (
     HASH_METADATA_KEY,
+    FillStateCache,
     FillStatus,
+    KernelPool,
     fill_notebook,
     fill_notebooks,
     get_notebook_hash,
+    get_notebook_hash_from_dict,
     get_notebook_hash_from_path,
     has_notebook_changed,
 )
@@ -156,6 +160,135 @@ class TestHashFunctions:
 
         assert has_notebook_changed(nb) is True
 
+    def test_get_notebook_hash_from_dict_matches(self, tmp_path: Path) -> None:
+        """Test hashing the raw JSON gives the same hash as the parsed notebook."""
+        path = create_simple_notebook(
+            tmp_path,
+            cells=[
+                {"cell_type": "markdown", "source": "# Title", "metadata": {}},
+                {
+                    "cell_type": "code",
+                    "source": ["x = 1\n", "print(x)"],
+                    "metadata": {},
+                    "outputs": [],
+                    "execution_count": None,
+                },
+            ],
+        )
+        fill_notebook(path)
+
+        raw = json.loads(path.read_text())
+        assert get_notebook_hash_from_dict(raw) == get_notebook_hash(Notebook.from_file(path))
+        assert raw["metadata"][HASH_METADATA_KEY] == get_notebook_hash_from_dict(raw)
+
+
+class TestFillStateCache:
+    """Tests for the stat-keyed fill hash cache."""
+
+    @staticmethod
+    def _age(path: Path) -> None:
+        """Move a file's mtime out of the racy window."""
+        past = path.stat().st_mtime_ns - 10 * 10**9
+        os.utime(path, ns=(past, past))
+
+    def test_unfilled_notebook_changed(self, tmp_path: Path) -> None:
+        """Test a notebook without a stored hash needs filling."""
+        path = create_simple_notebook(tmp_path)
+        cache = FillStateCache(tmp_path)
+
+        assert cache.has_changed(path) is True
+        assert cache.hash_count == 1
+
+    def test_warm_cache_does_not_hash(self, tmp_path: Path) -> None:
+        """Test an unmodified notebook is answered from the saved state."""
+        path = create_simple_notebook(tmp_path)
+        fill_notebook(path)
+        self._age(path)
+        cache_dir = tmp_path / ".nblite" / "cache"
+
+        cache = FillStateCache(tmp_path, cache_dir)
+        assert cache.has_changed(path) is False
+        cache.save()
+
+        warm = FillStateCache(tmp_path, cache_dir)
+        assert warm.has_changed(path) is False
+        assert warm.hash_count == 0
+
+    def test_modified_notebook_rehashed(self, tmp_path: Path) -> None:
+        """Test a size or mtime change makes the cache read the file again."""
+        path = create_simple_notebook(tmp_path)
+        fill_notebook(path)
+        self._age(path)
+        cache = FillStateCache(tmp_path)
+        assert cache.has_changed(path) is False
+
+        nb = json.loads(path.read_text())
+        nb["cells"][0]["source"] = "x = 2"
+        path.write_text(json.dumps(nb))
+
+        assert cache.has_changed(path) is True
+        assert cache.hash_count == 2
+
+    def test_record_marks_unchanged(self, tmp_path: Path) -> None:
+        """Test recording the hash written by fill avoids re-hashing."""
+        path = create_simple_notebook(tmp_path)
+        cache = FillStateCache(tmp_path)
+        assert cache.has_changed(path) is True
+
+        result = fill_notebook(path)
+        assert result.notebook_hash is not None
+        cache.record(path, result.notebook_hash)
+        self._age(path)
+        cache.record(path, result.notebook_hash)
+
+        assert cache.has_changed(path) is False
+        assert cache.hash_count == 1
+
+    def test_save_writes_state_and_gitignore(self, tmp_path: Path) -> None:
+        """Test the state file is written with its own .gitignore."""
+        path = create_simple_notebook(tmp_path)
+        cache_dir = tmp_path / "cache"
+        cache = FillStateCache(tmp_path, cache_dir)
+        cache.has_changed(path)
+        cache.save()
+
+        data = json.loads((cache_dir / "fill_state.json").read_text())
+        assert list(data["notebooks"]) == ["test.ipynb"]
+        assert (cache_dir / ".gitignore").read_text() == "*\n"
+
+    def test_save_drops_missing_notebooks(self, tmp_path: Path) -> None:
+        """Test entries of deleted notebooks are pruned on save."""
+        path = create_simple_notebook(tmp_path)
+        cache_dir = tmp_path / "cache"
+        cache = FillStateCache(tmp_path, cache_dir)
+        cache.has_changed(path)
+        path.unlink()
+        cache.save()
+
+        data = json.loads((cache_dir / "fill_state.json").read_text())
+        assert data["notebooks"] == {}
+
+    def test_corrupt_state_is_cold_cache(self, tmp_path: Path) -> None:
+        """Test an unreadable state file is ignored."""
+        path = create_simple_notebook(tmp_path)
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "fill_state.json").write_text("{not json")
+
+        cache = FillStateCache(tmp_path, cache_dir)
+        assert cache.has_changed(path) is True
+        assert cache.hash_count == 1
+
+    def test_in_memory_cache_saves_nothing(self, tmp_path: Path) -> None:
+        """Test a cache without a directory never writes."""
+        path = create_simple_notebook(tmp_path)
+        cache = FillStateCache(tmp_path)
+        cache.has_changed(path)
+        cache.save()
+
+        assert cache.state_path is None
+        assert [p.name for p in tmp_path.iterdir()] == ["test.ipynb"]
+
 
 class TestFillNotebook:
     """Tests for single notebook execution."""
@@ -484,6 +617,232 @@ class TestFillNotebooks:
             assert path.read_text() == original
 
 
+class TestKernelPool:
+    """Tests for reusing warm kernels across notebooks."""
+
+    def test_kernels_reused_across_notebooks(self, tmp_path: Path) -> None:
+        """Test a pool of one kernel serves several notebooks."""
+        paths = [create_simple_notebook(tmp_path, f"nb{i}.ipynb") for i in range(3)]
+
+        with KernelPool(size=1) as pool:
+            results = fill_notebooks(paths, skip_unchanged=False, kernel_pool=pool)
+
+        assert all(r.status == FillStatus.SUCCESS for r in results)
+        assert pool.kernels_started == 1
+
+    def test_pool_size_caps_kernels(self, tmp_path: Path) -> None:
+        """Test no more than size kernels are started."""
+        paths = [create_simple_notebook(tmp_path, f"nb{i}.ipynb") for i in range(4)]
+
+        with KernelPool(size=2) as pool:
+            results = fill_notebooks(paths, n_workers=2, skip_unchanged=False, kernel_pool=pool)
+
+        assert all(r.status == FillStatus.SUCCESS for r in results)
+        assert 1 <= pool.kernels_started <= 2
+
+    def test_namespace_reset_between_notebooks(self, tmp_path: Path) -> None:
+        """Test variables from one notebook are not visible in the next."""
+        first = create_simple_notebook(
+            tmp_path,
+            "first.ipynb",
+            cells=[{"cell_type": "code", "source": "leaked = 1", "metadata": {}, "outputs": []}],
+        )
+        second = create_simple_notebook(
+            tmp_path,
+            "second.ipynb",
+            cells=[
+                {
+                    "cell_type": "code",
+                    "source": "print('leaked' in dir())",
+                    "metadata": {},
+                    "outputs": [],
+                }
+            ],
+        )
+
+        with KernelPool(size=1) as pool:
+            fill_notebook(first, kernel_pool=pool)
+            result = fill_notebook(second, kernel_pool=pool)
+
+        assert result.status == FillStatus.SUCCESS
+        assert pool.kernels_started == 1
+        nb = json.loads(second.read_text())
+        assert "".join(nb["cells"][0]["outputs"][0]["text"]) == "False\n"
+
+    def test_process_state_restored_between_notebooks(self, tmp_path: Path) -> None:
+        """Test os.environ, sys.path and warnings filters set by one notebook are undone."""
+        first = create_simple_notebook(
+            tmp_path,
+            "first.ipynb",
+            cells=[
+                {
+                    "cell_type": "code",
+                    "source": (
+                        "import os, sys, warnings\n"
+                        "os.environ['NBLITE_LEAK'] = '1'\n"
+                        "sys.path.append('/nblite-leak')\n"
+                        "warnings.simplefilter('error')"
+                    ),
+                    "metadata": {},
+                    "outputs": [],
+                }
+            ],
+        )
+        second = create_simple_notebook(
+            tmp_path,
+            "second.ipynb",
+            cells=[
+                {
+                    "cell_type": "code",
+                    "source": (
+                        "import os, sys, warnings\n"
+                        "print('NBLITE_LEAK' in os.environ, '/nblite-leak' in sys.path,"
+                        " warnings.filters[0][0] == 'error')"
+                    ),
+                    "metadata": {},
+                    "outputs": [],
+                }
+            ],
+        )
+
+        with KernelPool(size=1) as pool:
+            fill_notebook(first, kernel_pool=pool)
+            result = fill_notebook(second, kernel_pool=pool)
+
+        assert result.status == FillStatus.SUCCESS
+        assert pool.kernels_started == 1
+        nb = json.loads(second.read_text())
+        assert "".join(nb["cells"][0]["outputs"][0]["text"]) == "False False False\n"
+
+    def test_working_dir_follows_notebook(self, tmp_path: Path) -> None:
+        """Test a reused kernel runs in each notebook's directory."""
+        cells = [
+            {
+                "cell_type": "code",
+                "source": "import os\nprint(os.getcwd())",
+                "metadata": {},
+                "outputs": [],
+            }
+        ]
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        path_a = create_simple_notebook(tmp_path / "a", cells=cells)
+        path_b = create_simple_notebook(tmp_path / "b", cells=cells)
+
+        with KernelPool(size=1) as pool:
+            fill_notebook(path_a, kernel_pool=pool)
+            fill_notebook(path_b, kernel_pool=pool)
+
+        for path in (path_a, path_b):
+            output = json.loads(path.read_text())["cells"][0]["outputs"][0]["text"]
+            assert Path("".join(output).strip()).resolve() == path.parent.resolve()
+
+    def test_cell_error_keeps_kernel(self, tmp_path: Path) -> None:
+        """Test a notebook raising an error does not cost a kernel restart."""
+        bad = create_simple_notebook(
+            tmp_path,
+            "bad.ipynb",
+            cells=[{"cell_type": "code", "source": "1/0", "metadata": {}, "outputs": []}],
+        )
+        good = create_simple_notebook(tmp_path, "good.ipynb")
+
+        with KernelPool(size=1) as pool:
+            assert fill_notebook(bad, kernel_pool=pool).status == FillStatus.ERROR
+            assert fill_notebook(good, kernel_pool=pool).status == FillStatus.SUCCESS
+
+        assert pool.kernels_started == 1
+
+    def test_timeout_discards_kernel(self, tmp_path: Path) -> None:
+        """Test a kernel left busy by a timeout is replaced."""
+        slow = create_simple_notebook(
+            tmp_path,
+            "slow.ipynb",
+            cells=[
+                {
+                    "cell_type": "code",
+                    "source": "import time\ntime.sleep(30)",
+                    "metadata": {},
+                    "outputs": [],
+                }
+            ],
+        )
+        good = create_simple_notebook(tmp_path, "good.ipynb")
+
+        with KernelPool(size=1) as pool:
+            assert fill_notebook(slow, timeout=1, kernel_pool=pool).status == FillStatus.ERROR
+            assert fill_notebook(good, kernel_pool=pool).status == FillStatus.SUCCESS
+
+        assert pool.kernels_started == 2
+
+    def test_result_reports_timings(self, tmp_path: Path) -> None:
+        """Test kernel startup and execution are timed separately."""
+        path = create_simple_notebook(tmp_path)
+        result = fill_notebook(path)
+
+        assert result.kernel_time > 0
+        assert result.execution_time > 0
+
+    def test_closed_pool_rejects_acquire(self, tmp_path: Path) -> None:
+        """Test a closed pool cannot hand out kernels."""
+        import pytest
+
+        pool = KernelPool()
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.acquire(tmp_path)
+
+
+class TestFillExecutors:
+    """Tests for the thread, process and async fill backends."""
+
+    def test_backends_fill_notebooks(self, tmp_path: Path) -> None:
+        """Test every backend executes and saves all notebooks."""
+        for executor in ("thread", "process", "async"):
+            nb_dir = tmp_path / executor
+            nb_dir.mkdir()
+            paths = [create_simple_notebook(nb_dir, f"nb{i}.ipynb") for i in range(3)]
+
+            results = fill_notebooks(paths, n_workers=2, skip_unchanged=False, executor=executor)
+
+            assert sorted(r.path for r in results) == sorted(paths), executor
+            assert all(r.status == FillStatus.SUCCESS for r in results), executor
+            for path in paths:
+                assert HASH_METADATA_KEY in json.loads(path.read_text())["metadata"]
+
+    def test_backends_report_errors(self, tmp_path: Path) -> None:
+        """Test cell errors come back as error results from every backend."""
+        cells = [{"cell_type": "code", "source": "1/0", "metadata": {}, "outputs": []}]
+        for executor in ("thread", "process", "async"):
+            nb_dir = tmp_path / executor
+            nb_dir.mkdir()
+            path = create_simple_notebook(nb_dir, cells=cells)
+
+            results = fill_notebooks([path], skip_unchanged=False, executor=executor)
+
+            assert results[0].status == FillStatus.ERROR, executor
+            assert "ZeroDivisionError" in results[0].message
+
+    def test_async_reuses_kernel(self, tmp_path: Path) -> None:
+        """Test the async backend runs on pooled kernels."""
+        paths = [create_simple_notebook(tmp_path, f"nb{i}.ipynb") for i in range(3)]
+
+        with KernelPool(size=1) as pool:
+            results = fill_notebooks(
+                paths, n_workers=4, skip_unchanged=False, executor="async", kernel_pool=pool
+            )
+
+        assert all(r.status == FillStatus.SUCCESS for r in results)
+        assert pool.kernels_started == 1
+
+    def test_unknown_executor(self, tmp_path: Path) -> None:
+        """Test an unknown backend name is rejected."""
+        import pytest
+
+        path = create_simple_notebook(tmp_path)
+        with pytest.raises(ValueError):
+            fill_notebooks([path], skip_unchanged=False, executor="fibers")
+
+
 class TestFillConfig:
     """Tests for fill configuration in nblite.toml."""
 
@@ -502,6 +861,8 @@ class TestFillConfig:
         assert config.exclude_dunders is True
         assert config.exclude_hidden is True
         assert config.python is None
+        assert config.reuse_kernels is False
+        assert config.executor == "thread"
 
     def test_fill_config_custom_values(self) -> None:
         """Test FillConfig with custom values."""
@@ -642,6 +1003,40 @@ format = "ipynb"
 
         assert result.exit_code == 0, f"CLI failed: {result.output}"
 
+    def test_fill_cli_executor_from_config(self, tmp_path: Path) -> None:
+        """Test fill CLI runs on the executor backend chosen in nblite.toml."""
+        import os
+
+        from typer.testing import CliRunner
+
+        from nblite.cli.app import app
+
+        nbs_dir = tmp_path / "nbs"
+        nbs_dir.mkdir()
+        config = """
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[fill]
+executor = "async"
+"""
+        (tmp_path / "nblite.toml").write_text(config)
+        paths = [create_simple_notebook(nbs_dir, f"nb{i}.ipynb") for i in range(2)]
+
+        runner = CliRunner()
+        original_cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            result = runner.invoke(app, ["fill", "--workers", "2"])
+        finally:
+            os.chdir(original_cwd)
+
+        assert result.exit_code == 0, f"CLI failed: {result.output}"
+        assert "2 succeeded" in result.output
+        for path in paths:
+            assert HASH_METADATA_KEY in json.loads(path.read_text())["metadata"]
+
     def test_fill_cli_dry_run(self, tmp_path: Path) -> None:
         """Test fill CLI with --dry-run option."""
         import os
@@ -800,6 +1195,35 @@ format = "ipynb"
         # Env var should not be set after fill completes
         assert os.environ.get(DISABLE_NBLITE_EXPORT_ENV_VAR) is None
 
+    def test_fill_cli_records_fill_state(self, tmp_path: Path) -> None:
+        """Test fill records notebook hashes so the next run skips them."""
+        from typer.testing import CliRunner
+
+        from nblite.cli.app import app
+
+        nbs_dir = tmp_path / "nbs"
+        nbs_dir.mkdir()
+        (tmp_path / "nblite.toml").write_text('[cl.nbs]\npath = "nbs"\nformat = "ipynb"\n')
+        for i in range(2):
+            create_simple_notebook(nbs_dir, f"nb{i}.ipynb")
+
+        runner = CliRunner()
+        original_cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            first = runner.invoke(app, ["fill"])
+            second = runner.invoke(app, ["fill"])
+        finally:
+            os.chdir(original_cwd)
+
+        assert first.exit_code == 0, f"CLI failed: {first.output}"
+        state = json.loads((tmp_path / ".nblite" / "cache" / "fill_state.json").read_text())
+        assert sorted(state["notebooks"]) == ["nbs/nb0.ipynb", "nbs/nb1.ipynb"]
+        assert all(e["hash"] == e["stored_hash"] for e in state["notebooks"].values())
+
+        assert second.exit_code == 0, f"CLI failed: {second.output}"
+        assert "2 skipped" in second.output
+
 
 class TestFillIntegration:
     """Integration tests for fill with project structure."""
@@ -869,36 +1293,36 @@ class TestExcludePatterns:
 
     def test_simple_glob_pattern(self) -> None:
         """Test simple glob patterns like 'scratch/*'."""
-        from nblite.cli.commands.fill import _matches_exclude_pattern
+        from nblite.utils.discovery import matches_glob
 
-        assert _matches_exclude_pattern("scratch/test.ipynb", "scratch/*")
-        assert not _matches_exclude_pattern("core/test.ipynb", "scratch/*")
+        assert matches_glob("scratch/test.ipynb", "scratch/*")
+        assert not matches_glob("core/test.ipynb", "scratch/*")
 
     def test_double_star_pattern(self) -> None:
         """Test ** patterns matching across directories."""
-        from nblite.cli.commands.fill import _matches_exclude_pattern
+        from nblite.utils.discovery import matches_glob
 
-        assert _matches_exclude_pattern("sub/deep/old_v1.ipynb", "**/*_v1.ipynb")
-        assert _matches_exclude_pattern("old_v1.ipynb", "**/*_v1.ipynb")
-        assert not _matches_exclude_pattern("sub/deep/old_v2.ipynb", "**/*_v1.ipynb")
+        assert matches_glob("sub/deep/old_v1.ipynb", "**/*_v1.ipynb")
+        assert matches_glob("old_v1.ipynb", "**/*_v1.ipynb")
+        assert not matches_glob("sub/deep/old_v2.ipynb", "**/*_v1.ipynb")
 
     def test_filename_only_pattern(self) -> None:
         """Test pattern matching just a filename."""
-        from nblite.cli.commands.fill import _matches_exclude_pattern
+        from nblite.utils.discovery import matches_glob
 
-        assert _matches_exclude_pattern("scratch.ipynb", "scratch.ipynb")
-        assert not _matches_exclude_pattern("sub/scratch.ipynb", "scratch.ipynb")
+        assert matches_glob("scratch.ipynb", "scratch.ipynb")
+        assert not matches_glob("sub/scratch.ipynb", "scratch.ipynb")
 
     def test_nested_directory_pattern(self) -> None:
         """Test patterns with nested directories."""
-        from nblite.cli.commands.fill import _matches_exclude_pattern
+        from nblite.utils.discovery import matches_glob
 
-        assert _matches_exclude_pattern("experiments/wip/test.ipynb", "experiments/*/*")
-        assert not _matches_exclude_pattern("experiments/test.ipynb", "experiments/*/*")
+        assert matches_glob("experiments/wip/test.ipynb", "experiments/*/*")
+        assert not matches_glob("experiments/test.ipynb", "experiments/*/*")
 
     def test_wildcard_in_name(self) -> None:
         """Test patterns with wildcards in filenames."""
-        from nblite.cli.commands.fill import _matches_exclude_pattern
+        from nblite.utils.discovery import matches_glob
 
-        assert _matches_exclude_pattern("test_foo.ipynb", "test_*.ipynb")
-        assert not _matches_exclude_pattern("foo_test.ipynb", "test_*.ipynb")
+        assert matches_glob("test_foo.ipynb", "test_*.ipynb")
+        assert not matches_glob("foo_test.ipynb", "test_*.ipynb")
@@ -2,14 +2,15 @@
 Tests for Git integration (Milestone 9).
 """
 
+import json
 import subprocess
 from pathlib import Path
 
 import pytest
 
 from nblite.core.project import NbliteProject
-from nblite.git.hooks import find_git_root, install_hooks, uninstall_hooks
-from nblite.git.staging import ValidationResult, validate_staging
+from nblite.git.hooks import find_git_root, install_hooks, run_pre_commit, uninstall_hooks
+from nblite.git.staging import ValidationResult, get_staged_files, validate_staging
 
 
 @pytest.fixture
@@ -236,3 +237,121 @@ class TestStagingValidation:
         result = validate_staging(project)
         # Should not have twin-related warnings
         assert not any("twin" in w.lower() for w in result.warnings)
+
+    def test_staged_files_relative_to_project(self, git_project: Path) -> None:
+        """Test staged paths are relative to a project below the git root."""
+        project_dir = git_project / "sub dir"
+        project_dir.mkdir()
+        (project_dir / "my notebook.ipynb").write_text("{}")
+        (git_project / "top.txt").write_text("")
+        subprocess.run(["git", "add", "-A"], cwd=git_project)
+
+        assert get_staged_files(project_dir) == [Path("my notebook.ipynb")]
+
+
+def _write_notebook(path: Path, *sources: str, outputs: bool = False) -> None:
+    cells = [
+        {
+            "cell_type": "code",
+            "id": f"c{i}",
+            "source": source,
+            "metadata": {},
+            "execution_count": 1 if outputs else None,
+            "outputs": [{"output_type": "stream", "name": "stdout", "text": "1"}]
+            if outputs
+            else [],
+        }
+        for i, source in enumerate(sources)
+    ]
+    path.write_text(
+        json.dumps({"cells": cells, "metadata": {}, "nbformat": 4, "nbformat_minor": 5})
+    )
+
+
+class TestPreCommit:
+    @pytest.fixture
+    def project_dir(self, git_project: Path) -> Path:
+        """Add a second notebook with outputs to the git project."""
+        _write_notebook(
+            git_project / "nbs" / "api.ipynb",
+            "#|default_exp api\n#|export\ndef bar(): pass",
+            outputs=True,
+        )
+        return git_project
+
+    def test_only_staged_notebooks(self, project_dir: Path) -> None:
+        """Test the hook cleans and exports only staged notebooks."""
+        subprocess.run(["git", "add", "nbs/utils.ipynb"], cwd=project_dir)
+
+        assert run_pre_commit(NbliteProject.from_path(project_dir)) == []
+        assert (project_dir / "mypackage" / "utils.py").exists()
+        assert not (project_dir / "mypackage" / "api.py").exists()
+        assert '"execution_count": 1' in (project_dir / "nbs" / "api.ipynb").read_text()
+
+    def test_full(self, project_dir: Path) -> None:
+        """Test full cleans and exports the whole project."""
+        subprocess.run(["git", "add", "nbs/utils.ipynb"], cwd=project_dir)
+
+        assert run_pre_commit(NbliteProject.from_path(project_dir), full=True) == []
+        assert (project_dir / "mypackage" / "api.py").exists()
+        assert '"execution_count": 1' not in (project_dir / "nbs" / "api.ipynb").read_text()
+
+    def test_git_failure_runs_full(
+        self, project_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the whole project is cleaned and exported when git cannot list staged files."""
+        subprocess.run(["git", "add", "nbs/utils.ipynb"], cwd=project_dir)
+        monkeypatch.setenv("GIT_DIR", str(project_dir / "missing"))
+
+        assert get_staged_files(project_dir) is None
+        assert run_pre_commit(NbliteProject.from_path(project_dir)) == []
+        assert (project_dir / "mypackage" / "api.py").exists()
+        assert '"execution_count": 1' not in (project_dir / "nbs" / "api.ipynb").read_text()
+
+    def test_nothing_staged(self, project_dir: Path) -> None:
+        """Test the hook does nothing when nothing is staged."""
+        assert run_pre_commit(NbliteProject.from_path(project_dir)) == []
+        assert not (project_dir / "mypackage" / "utils.py").exists()
+
+    def test_aggregated_module_keeps_other_notebooks(self, project_dir: Path) -> None:
+        """Test exporting one contributor of a module rebuilds it from all of them."""
+        _write_notebook(
+            project_dir / "nbs" / "extra.ipynb",
+            "#|export_to utils\ndef extra(): pass",
+        )
+        subprocess.run(["git", "add", "nbs/extra.ipynb"], cwd=project_dir)
+
+        assert run_pre_commit(NbliteProject.from_path(project_dir)) == []
+        module = (project_dir / "mypackage" / "utils.py").read_text()
+        assert "def foo()" in module
+        assert "def extra()" in module
+        assert not (project_dir / "mypackage" / "api.py").exists()
+
+    def test_follows_pipeline_chain(self, project_dir: Path) -> None:
+        """Test staged notebooks are exported through every rule of the pipeline."""
+        (project_dir / "nblite.toml").write_text(
+            """
+export_pipeline = '''
+nbs -> pts
+pts -> lib
+'''
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.pts]
+path = "pts"
+format = "percent"
+
+[cl.lib]
+path = "mypackage"
+format = "module"
+"""
+        )
+        subprocess.run(["git", "add", "nbs/utils.ipynb"], cwd=project_dir)
+
+        assert run_pre_commit(NbliteProject.from_path(project_dir)) == []
+        assert (project_dir / "pts" / "utils.pct.py").exists()
+        assert (project_dir / "mypackage" / "utils.py").exists()
+        assert not (project_dir / "pts" / "api.pct.py").exists()
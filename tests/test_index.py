@@ -0,0 +1,191 @@
+"""
+Tests for the persistent project index.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from nblite.core.index import INDEX_FILENAME, NotebookSummary, ProjectIndex
+from nblite.core.project import NbliteProject
+from tests.conftest import notebook_json
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    """Move a file's mtime into the past so its stat is trusted."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def index_project(tmp_path: Path) -> Path:
+    """Create a project with two notebooks."""
+    (tmp_path / "nbs").mkdir()
+    (tmp_path / "nbs" / "core.ipynb").write_text(
+        notebook_json(
+            "#|default_exp core\n#|export\ndef foo(): pass",
+            "#|export_to core.extra\ndef bar(): pass",
+            "#|unknown_thing\nx = 1",
+        )
+    )
+    (tmp_path / "nbs" / "func.ipynb").write_text(
+        notebook_json("#|default_exp func\n#|export_as_func true", "#|export\ny = 2")
+    )
+    for nb_path in (tmp_path / "nbs").iterdir():
+        _age(nb_path)
+
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = "nbs -> lib"
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.lib]
+path = "mypackage"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+class TestNotebookSummary:
+    def test_summary_fields(self, index_project: Path) -> None:
+        """Test the summary captures directive information."""
+        index = ProjectIndex(index_project)
+        summary = index.get(index_project / "nbs" / "core.ipynb")
+
+        assert summary.default_exp == "core"
+        assert summary.export_targets == ["core", "core.extra"]
+        assert summary.export_to_modules == ["core.extra"]
+        assert summary.is_function_notebook is False
+        assert summary.unrecognized_directives == [("unknown_thing", 0)]
+        assert len(summary.cell_hashes) == 3
+
+    def test_function_notebook_flag(self, index_project: Path) -> None:
+        """Test function notebooks are flagged."""
+        index = ProjectIndex(index_project)
+        summary = index.get(index_project / "nbs" / "func.ipynb")
+        assert summary.is_function_notebook is True
+
+    def test_round_trip(self, index_project: Path) -> None:
+        """Test summaries survive to_dict/from_dict."""
+        index = ProjectIndex(index_project)
+        summary = index.get(index_project / "nbs" / "core.ipynb")
+        data = json.loads(json.dumps(summary.to_dict()))
+        assert NotebookSummary.from_dict(data) == summary
+
+
+class TestProjectIndex:
+    def test_warm_cache_skips_parsing(self, index_project: Path) -> None:
+        """Test a saved index is reused without re-parsing."""
+        cache_dir = index_project / ".nblite" / "cache"
+        nb_path = index_project / "nbs" / "core.ipynb"
+
+        index = ProjectIndex(index_project, cache_dir)
+        index.get(nb_path)
+        assert index.parse_count == 1
+        index.save()
+
+        warm = ProjectIndex(index_project, cache_dir)
+        assert warm.get(nb_path).default_exp == "core"
+        assert warm.parse_count == 0
+
+    def test_touched_file_not_reparsed(self, index_project: Path) -> None:
+        """Test a changed mtime with identical content only re-hashes."""
+        cache_dir = index_project / ".nblite" / "cache"
+        nb_path = index_project / "nbs" / "core.ipynb"
+
+        index = ProjectIndex(index_project, cache_dir)
+        index.get(nb_path)
+        index.save()
+
+        nb_path.touch()
+        warm = ProjectIndex(index_project, cache_dir)
+        warm.get(nb_path)
+        assert warm.parse_count == 0
+
+    def test_modified_file_reparsed(self, index_project: Path) -> None:
+        """Test edited notebooks are re-parsed."""
+        nb_path = index_project / "nbs" / "core.ipynb"
+        index = ProjectIndex(index_project)
+        index.get(nb_path)
+
+        nb_path.write_text(notebook_json("#|default_exp renamed\n#|export\ndef foo(): pass"))
+        assert index.get(nb_path).default_exp == "renamed"
+        assert index.parse_count == 2
+
+    def test_save_writes_gitignore(self, index_project: Path) -> None:
+        """Test the cache directory ignores itself."""
+        cache_dir = index_project / ".nblite" / "cache"
+        index = ProjectIndex(index_project, cache_dir)
+        index.get(index_project / "nbs" / "core.ipynb")
+        index.save()
+
+        assert (cache_dir / INDEX_FILENAME).exists()
+        assert (cache_dir / ".gitignore").read_text() == "*\n"
+
+    def test_save_drops_deleted_notebooks(self, index_project: Path) -> None:
+        """Test entries for deleted files are pruned on save."""
+        cache_dir = index_project / ".nblite" / "cache"
+        nb_path = index_project / "nbs" / "func.ipynb"
+        index = ProjectIndex(index_project, cache_dir)
+        index.get(nb_path)
+        nb_path.unlink()
+        index.save()
+
+        data = json.loads((cache_dir / INDEX_FILENAME).read_text())
+        assert data["notebooks"] == {}
+
+    def test_corrupt_index_is_cold_cache(self, index_project: Path) -> None:
+        """Test an unreadable index file is ignored."""
+        cache_dir = index_project / ".nblite" / "cache"
+        cache_dir.mkdir(parents=True)
+        (cache_dir / INDEX_FILENAME).write_text("{not json")
+
+        index = ProjectIndex(index_project, cache_dir)
+        assert index.get(index_project / "nbs" / "core.ipynb").default_exp == "core"
+        assert index.parse_count == 1
+
+    def test_in_memory_index_does_not_write(self, index_project: Path) -> None:
+        """Test an index without cache_dir never touches disk."""
+        index = ProjectIndex(index_project)
+        index.get(index_project / "nbs" / "core.ipynb")
+        index.save()
+        assert not (index_project / ".nblite").exists()
+
+
+class TestProjectUsesIndex:
+    def test_export_populates_index(self, index_project: Path) -> None:
+        """Test a second export run reads summaries from the cache."""
+        project = NbliteProject.from_path(index_project)
+        assert project.export().success
+        assert project.index.parse_count == 2
+
+        project = NbliteProject.from_path(index_project)
+        result = project.export()
+        assert result.success
+        assert project.index.parse_count == 0
+        assert (index_project / "mypackage" / "core.py").exists()
+        assert any("unknown_thing" in w for w in result.warnings)
+
+    def test_cache_disabled(self, index_project: Path) -> None:
+        """Test [cache] enabled = false keeps the index in memory."""
+        config_path = index_project / "nblite.toml"
+        config_path.write_text(config_path.read_text() + "\n[cache]\nenabled = false\n")
+
+        project = NbliteProject.from_path(index_project)
+        assert project.export().success
+        assert project.index.cache_dir is None
+        assert not (index_project / ".nblite").exists()
+
+    def test_twins_from_path_use_index(self, index_project: Path) -> None:
+        """Test twin lookup by path resolves default_exp from the index."""
+        project = NbliteProject.from_path(index_project)
+        twins = project.get_notebook_twins(index_project / "nbs" / "core.ipynb")
+        assert twins == [index_project / "mypackage" / "core.py"]
+        assert project.index.parse_count == 1
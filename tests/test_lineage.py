@@ -0,0 +1,82 @@
+"""
+Tests for the lineage index.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from nblite.config.schema import ExportRule
+from nblite.core.code_location import CodeLocation
+from nblite.core.lineage import LineageIndex
+
+
+@pytest.fixture
+def lineage(tmp_path: Path) -> LineageIndex:
+    """Index an nbs -> pts -> lib pipeline, with a second branch nbs -> scripts."""
+    code_locations = {
+        "nbs": CodeLocation(key="nbs", path=tmp_path / "nbs", format="ipynb"),
+        "pts": CodeLocation(key="pts", path=tmp_path / "pts", format="percent"),
+        "lib": CodeLocation(key="lib", path=tmp_path / "mypkg", format="module"),
+        "scripts": CodeLocation(key="scripts", path=tmp_path / "pts" / "scripts", format="module"),
+    }
+    rules = [
+        ExportRule(from_key="nbs", to_key="pts"),
+        ExportRule(from_key="pts", to_key="lib"),
+        ExportRule(from_key="nbs", to_key="scripts"),
+    ]
+    return LineageIndex(code_locations, rules)
+
+
+class TestLocationOf:
+    def test_finds_location(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test files resolve to the location containing them."""
+        assert lineage.location_of(tmp_path / "nbs" / "a" / "core.ipynb").key == "nbs"
+        assert lineage.location_of(tmp_path / "mypkg").key == "lib"
+
+    def test_outside_locations(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test paths outside every location resolve to None."""
+        assert lineage.location_of(tmp_path / "README.md") is None
+        assert lineage.location_of(tmp_path / "nbs2" / "core.ipynb") is None
+
+    def test_nested_locations(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test the innermost location wins, unless only notebooks are wanted."""
+        path = tmp_path / "pts" / "scripts" / "run.py"
+        assert lineage.location_of(path).key == "scripts"
+        assert lineage.location_of(path, notebook_only=True).key == "pts"
+
+
+class TestDownstream:
+    def test_breadth_first(self, lineage: LineageIndex) -> None:
+        """Test downstream locations follow the pipeline breadth first."""
+        assert [cl.key for cl in lineage.downstream("nbs")] == ["pts", "scripts", "lib"]
+        assert [cl.key for cl in lineage.downstream("pts")] == ["lib"]
+        assert lineage.downstream("lib") == []
+        assert lineage.downstream("missing") == []
+
+
+class TestTwins:
+    def test_twins(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test notebook twins keep their path and module twins follow default_exp."""
+        twins = lineage.twins(tmp_path / "nbs" / "sub" / "core.ipynb", "sub.core")
+        assert [(cl.key, path) for cl, path in twins] == [
+            ("pts", tmp_path / "pts" / "sub" / "core.pct.py"),
+            ("scripts", tmp_path / "pts" / "scripts" / "sub" / "core.py"),
+            ("lib", tmp_path / "mypkg" / "sub" / "core.py"),
+        ]
+
+    def test_percent_source(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test the .pct suffix is dropped from percent notebook names."""
+        twins = lineage.twins(tmp_path / "pts" / "core.pct.py", "core")
+        assert [path for _, path in twins] == [tmp_path / "mypkg" / "core.py"]
+
+    def test_no_module_twin(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test notebooks without default_exp or in dunder folders have no module twin."""
+        no_default_exp = lineage.twins(tmp_path / "nbs" / "core.ipynb", None)
+        dunder = lineage.twins(tmp_path / "nbs" / "__tests__" / "core.ipynb", "core")
+        for twins in (no_default_exp, dunder):
+            assert [cl.key for cl, _ in twins] == ["pts"]
+
+    def test_outside_locations(self, lineage: LineageIndex, tmp_path: Path) -> None:
+        """Test files outside every location have no twins."""
+        assert lineage.twins(tmp_path / "other.ipynb", "core") == []
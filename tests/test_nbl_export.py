@@ -0,0 +1,135 @@
+"""
+Tests for nbl_export() and its cached projects.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import nblite
+from nblite import nbl_export
+from tests.conftest import notebook_json
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch) -> None:
+    monkeypatch.setattr(nblite, "_PROJECT_CACHE", {})
+    monkeypatch.delenv("NBLITE_VIA_SERVER", raising=False)
+    monkeypatch.delenv("JPY_SESSION_NAME", raising=False)
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Create an nbs -> lib project with two notebooks."""
+    (tmp_path / "nbs").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "nbs" / f"{name}.ipynb").write_text(
+            notebook_json(f"#|default_exp {name}", f"#|export\ndef {name}():\n    return 1")
+        )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = "nbs -> lib"
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+class TestNblExport:
+    def test_project_is_cached(self, project_dir: Path) -> None:
+        """Test the project is loaded once and reloaded when its config changes."""
+        nbl_export(project_dir)
+        project = nblite._PROJECT_CACHE[project_dir.resolve()][1]
+        nbl_export(project_dir)
+        assert nblite._PROJECT_CACHE[project_dir.resolve()][1] is project
+
+        config = project_dir / "nblite.toml"
+        config.write_text(config.read_text() + "\n")
+        nbl_export(project_dir)
+        assert nblite._PROJECT_CACHE[project_dir.resolve()][1] is not project
+
+    def test_rerun_is_incremental(self, project_dir: Path) -> None:
+        """Test re-running only rewrites outputs of changed notebooks."""
+        first = nbl_export(project_dir, incremental=True)
+        assert len(first.files_created) == 2
+
+        (project_dir / "nbs" / "a.ipynb").write_text(
+            notebook_json("#|default_exp a", "#|export\ndef a():\n    return 2")
+        )
+        second = nbl_export(project_dir, incremental=True)
+        assert second.files_updated == [project_dir / "mypkg" / "a.py"]
+        assert second.files_skipped == [project_dir / "mypkg" / "b.py"]
+
+        assert nbl_export(project_dir, incremental=False).files_skipped == []
+
+    def test_incremental_default(self, project_dir: Path) -> None:
+        """Test the first call follows export.incremental and later calls are incremental."""
+        nbl_export(project_dir)
+        assert len(nbl_export(project_dir).files_skipped) == 2
+
+        # A changed config reloads the project, which exports as configured
+        config = project_dir / "nblite.toml"
+        config.write_text(config.read_text() + "\n")
+        assert nbl_export(project_dir).files_skipped == []
+
+        config.write_text(config.read_text() + "\n[export]\nincremental = true\n")
+        assert len(nbl_export(project_dir).files_skipped) == 2
+
+    def test_reload_keeps_other_hooks(self, project_dir: Path) -> None:
+        """Test reloading a project only unregisters its own extension hooks."""
+        from nblite.extensions import HookRegistry, HookType
+
+        (project_dir / "ext.py").write_text(
+            "from nblite.extensions import HookType, hook\n\n"
+            "@hook(HookType.PRE_EXPORT)\n"
+            "def project_hook(**kwargs):\n"
+            "    pass\n"
+        )
+        config = project_dir / "nblite.toml"
+        config.write_text(config.read_text() + '\n[[extensions]]\npath = "ext.py"\n')
+
+        def user_hook(**kwargs):  # type: ignore[no-untyped-def]
+            pass
+
+        HookRegistry.register(HookType.PRE_EXPORT, user_hook)
+        try:
+            nbl_export(project_dir)
+            assert len(HookRegistry.get_hooks(HookType.PRE_EXPORT)) == 2
+
+            config.write_text(config.read_text() + "\n")
+            nbl_export(project_dir)
+            hooks = HookRegistry.get_hooks(HookType.PRE_EXPORT)
+            assert len(hooks) == 2
+            assert hooks[0] is user_hook
+        finally:
+            HookRegistry.clear(HookType.PRE_EXPORT)
+
+    def test_notebook_lineage(self, project_dir: Path) -> None:
+        """Test notebook= only exports that notebook's lineage."""
+        result = nbl_export(project_dir, notebook=project_dir / "nbs" / "a.ipynb")
+        assert result.success, result.errors
+        assert (project_dir / "mypkg" / "a.py").exists()
+        assert not (project_dir / "mypkg" / "b.py").exists()
+
+    def test_running_notebook(self, project_dir: Path, monkeypatch) -> None:
+        """Test notebook=True exports the lineage of the running notebook."""
+        with pytest.raises(RuntimeError, match="running notebook"):
+            nbl_export(project_dir, notebook=True)
+
+        monkeypatch.setenv("JPY_SESSION_NAME", str(project_dir / "nbs" / "b.ipynb"))
+        nbl_export(project_dir, notebook=True)
+        assert (project_dir / "mypkg" / "b.py").exists()
+        assert not (project_dir / "mypkg" / "a.py").exists()
+
+    def test_disabled(self, project_dir: Path, monkeypatch) -> None:
+        """Test NBLITE_DISABLE_EXPORT turns nbl_export into a no-op."""
+        monkeypatch.setenv("NBLITE_DISABLE_EXPORT", "true")
+        assert nbl_export(project_dir) is None
+        assert not (project_dir / "mypkg").exists()
@@ -107,6 +107,138 @@ def foo():
         assert len(nb.cells) >= 1
         assert nb.source_path == pct_path
 
+    def test_from_file_ipynb_matches_notebookx_round_trip(self, tmp_path: Path) -> None:
+        """Test that the direct ipynb loader matches loading through notebookx."""
+        import notebookx
+
+        nb_content = json.dumps(
+            {
+                "cells": [
+                    {
+                        "cell_type": "code",
+                        "source": ["#|export\n", "def foo():\n", "    return 1"],
+                        "metadata": {"tags": ["a"]},
+                        "execution_count": 2,
+                        "id": "abc",
+                        "outputs": [
+                            {"output_type": "stream", "name": "stdout", "text": ["hi\n"]},
+                            {
+                                "output_type": "execute_result",
+                                "execution_count": 2,
+                                "data": {"text/plain": ["1"]},
+                                "metadata": {},
+                            },
+                        ],
+                    },
+                    {"cell_type": "markdown", "source": "# Title", "metadata": {}},
+                ],
+                "metadata": {
+                    "kernelspec": {"display_name": "P", "language": "python", "name": "python3"}
+                },
+                "nbformat": 4,
+                "nbformat_minor": 5,
+            }
+        )
+        nb_path = tmp_path / "test.ipynb"
+        nb_path.write_text(nb_content)
+
+        nb = Notebook.from_file(nb_path)
+        expected = Notebook.from_notebookx(
+            notebookx.Notebook.from_file(str(nb_path), notebookx.Format.Ipynb)
+        )
+        assert nb.to_dict() == expected.to_dict()
+        assert nb.to_string("percent") == expected.to_string("percent")
+
+    def test_from_file_ipynb_invalid_json(self, tmp_path: Path) -> None:
+        """Test that invalid ipynb JSON raises ValueError."""
+        nb_path = tmp_path / "broken.ipynb"
+        nb_path.write_text("{not json")
+
+        with pytest.raises(ValueError):
+            Notebook.from_file(nb_path)
+
+
+class TestNotebookWithoutOutputs:
+    @pytest.fixture
+    def nb_with_outputs(self, tmp_path: Path) -> Path:
+        nb_content = json.dumps(
+            {
+                "cells": [
+                    {
+                        "cell_type": "code",
+                        "source": "#|default_exp utils\n",
+                        "metadata": {"outputs": ["kept"]},
+                        "outputs": [],
+                    },
+                    {
+                        "cell_type": "code",
+                        "source": 's = "\\"outputs\\": ["\n#|export\ndef foo(): pass',
+                        "metadata": {},
+                        "outputs": [
+                            {
+                                "output_type": "display_data",
+                                "data": {
+                                    "image/png": "A" * 10000,
+                                    "text/plain": ["x]}", '\\"outputs\\": [', "\\"],
+                                },
+                                "metadata": {},
+                            }
+                        ],
+                    },
+                ],
+                "metadata": {"outputs": [1, 2]},
+                "nbformat": 4,
+                "nbformat_minor": 5,
+            }
+        )
+        nb_path = tmp_path / "test.ipynb"
+        nb_path.write_text(nb_content)
+        return nb_path
+
+    def test_outputs_skipped(self, nb_with_outputs: Path) -> None:
+        """Test that outputs=False empties cell outputs and nothing else."""
+        full = Notebook.from_file(nb_with_outputs)
+        nb = Notebook.from_file(nb_with_outputs, outputs=False)
+
+        assert not nb.outputs_loaded
+        assert all(cell.outputs == [] for cell in nb.cells)
+        assert full.cells[1].outputs
+        assert nb.metadata == {"outputs": [1, 2]}
+        assert nb.cells[0].metadata == {"outputs": ["kept"]}
+        assert [c.source for c in nb.cells] == [c.source for c in full.cells]
+        assert nb.default_exp == "utils"
+        assert nb.cells[1].has_directive("export")
+
+    def test_outputs_skipped_across_chunks(
+        self, nb_with_outputs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test strings, escapes and outputs split between read chunks."""
+        from nblite.core import notebook
+
+        def contents(nb: Notebook) -> list:  # type: ignore[type-arg]
+            cells = [(c.source, c.metadata, c.outputs) for c in nb.cells]
+            return [nb.metadata, cells]
+
+        expected = contents(Notebook.from_file(nb_with_outputs, outputs=False))
+        for chunk_size in (1, 2, 3, 7, 64):
+            monkeypatch.setattr(notebook, "_READ_CHUNK_SIZE", chunk_size)
+            nb = Notebook.from_file(nb_with_outputs, outputs=False)
+            assert contents(nb) == expected, chunk_size
+
+    def test_percent_serialization_allowed(self, nb_with_outputs: Path) -> None:
+        """Test that notebooks without outputs can still be converted to percent."""
+        nb = Notebook.from_file(nb_with_outputs, outputs=False)
+        full = Notebook.from_file(nb_with_outputs)
+        assert nb.to_string("percent") == full.to_string("percent")
+
+    def test_ipynb_serialization_refused(self, nb_with_outputs: Path) -> None:
+        """Test that a notebook loaded without outputs cannot overwrite ipynb files."""
+        nb = Notebook.from_file(nb_with_outputs, outputs=False)
+        with pytest.raises(ValueError, match="outputs=False"):
+            nb.to_string("ipynb")
+        with pytest.raises(ValueError, match="outputs=False"):
+            nb.clean()
+
 
 class TestNotebookDirectives:
     @pytest.fixture
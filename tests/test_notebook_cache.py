@@ -0,0 +1,275 @@
+"""
+Tests for the in-memory notebook cache.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nblite.core.notebook_cache import NotebookCache
+from nblite.core.project import NbliteProject
+from tests.conftest import notebook_json
+
+
+@pytest.fixture
+def pipeline_project(tmp_path: Path) -> Path:
+    """Create a project with a two-rule pipeline and two notebooks."""
+    (tmp_path / "nbs").mkdir()
+    (tmp_path / "nbs" / "core.ipynb").write_text(
+        notebook_json("#|default_exp core\n#|export\ndef foo(): pass", output="hi\n")
+    )
+    (tmp_path / "nbs" / "utils.ipynb").write_text(
+        notebook_json("#|default_exp utils\n#|export\ndef bar(): pass")
+    )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = '''
+nbs -> pts
+pts -> lib
+'''
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.pts]
+path = "pts"
+format = "percent"
+
+[cl.lib]
+path = "mypackage"
+format = "module"
+
+[cache]
+enabled = false
+"""
+    )
+    return tmp_path
+
+
+class TestNotebookCache:
+    def test_second_get_is_cached(self, tmp_path: Path) -> None:
+        """Test an unchanged notebook is parsed once."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        cache = NotebookCache()
+
+        nb = cache.get(path)
+        assert cache.get(path) is nb
+        assert cache.load_count == 1
+        assert path in cache
+
+    def test_full_load_serves_outputs_free_request(self, tmp_path: Path) -> None:
+        """Test a notebook loaded with outputs is reused when outputs are not needed."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("print(1)", output="1\n"))
+        cache = NotebookCache()
+
+        nb = cache.get(path)
+        assert cache.get(path, outputs=False) is nb
+        assert cache.load_count == 1
+
+    def test_outputs_request_reloads_partial_notebook(self, tmp_path: Path) -> None:
+        """Test a notebook loaded without outputs is re-read when outputs are needed."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("print(1)", output="1\n"))
+        cache = NotebookCache()
+
+        partial = cache.get(path, outputs=False)
+        full = cache.get(path)
+        assert partial.outputs_loaded is False
+        assert full.outputs_loaded is True
+        assert full.cells[0].outputs
+        assert cache.load_count == 2
+
+    def test_load_outputs_loads_full_notebooks(self, tmp_path: Path) -> None:
+        """Test load_outputs makes outputs-free requests load everything."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("print(1)", output="1\n"))
+        cache = NotebookCache(load_outputs=True)
+
+        assert cache.get(path, outputs=False).outputs_loaded is True
+        cache.get(path)
+        assert cache.load_count == 1
+
+    def test_modified_file_reloaded(self, tmp_path: Path) -> None:
+        """Test a size or mtime change invalidates the cached notebook."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        cache = NotebookCache()
+        cache.get(path)
+
+        path.write_text(notebook_json("x = 12"))
+        assert cache.get(path).cells[0].source == "x = 12"
+        assert cache.load_count == 2
+
+    def test_racy_rewrite_reloaded(self, tmp_path: Path) -> None:
+        """Test a same-size rewrite within the same mtime tick is detected."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        cache = NotebookCache()
+        cache.get(path)
+
+        stat = path.stat()
+        path.write_text(notebook_json("x = 2"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert cache.get(path).cells[0].source == "x = 2"
+        assert cache.load_count == 2
+
+    def test_old_file_trusts_stat(self, tmp_path: Path) -> None:
+        """Test files modified outside the racy window are not re-read."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        os.utime(path, ns=(0, 0))
+        cache = NotebookCache()
+        nb = cache.get(path)
+
+        path.write_text(notebook_json("x = 2"))
+        os.utime(path, ns=(0, 0))
+        assert cache.get(path) is nb
+
+    def test_code_location(self, tmp_path: Path) -> None:
+        """Test code_location is set at load and cached notebooks are not modified."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        cache = NotebookCache()
+
+        unlocated = cache.get(path)
+        nb = cache.get(path, code_location="nbs")
+        assert unlocated.code_location is None
+        assert nb.code_location == "nbs"
+        assert cache.get(path, code_location="nbs") is nb
+        assert cache.get(path) is nb
+
+        other = cache.get(path, code_location="pts")
+        assert other.code_location == "pts"
+        assert nb.code_location == "nbs"
+        assert cache.get_many([path], code_location="nbs")[0] is nb
+        assert cache.load_count == 1
+
+    def test_invalidate(self, tmp_path: Path) -> None:
+        """Test invalidate drops one or all notebooks."""
+        paths = [tmp_path / "a.ipynb", tmp_path / "b.ipynb"]
+        for path in paths:
+            path.write_text(notebook_json("x = 1"))
+        cache = NotebookCache()
+        for path in paths:
+            cache.get(path)
+
+        cache.invalidate(paths[0])
+        assert paths[0] not in cache
+        assert paths[1] in cache
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_relative_and_absolute_paths_share_entry(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test paths are normalized before lookup."""
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        monkeypatch.chdir(tmp_path)
+        cache = NotebookCache()
+
+        assert cache.get("nb.ipynb") is cache.get(path)
+        assert cache.load_count == 1
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test a missing notebook raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            NotebookCache().get(tmp_path / "missing.ipynb")
+
+    def test_get_many(self, tmp_path: Path) -> None:
+        """Test get_many loads only missing notebooks, through map_fn, in order."""
+        paths = [tmp_path / f"nb{i}.ipynb" for i in range(3)]
+        for i, path in enumerate(paths):
+            path.write_text(notebook_json(f"x = {i}"))
+        cache = NotebookCache()
+        first = cache.get(paths[1])
+
+        mapped: list[Path] = []
+
+        def map_fn(fn, items):  # type: ignore[no-untyped-def]
+            mapped.extend(items)
+            return map(fn, items)
+
+        notebooks = cache.get_many(list(reversed(paths)), map_fn=map_fn)
+        assert [nb.source_path for nb in notebooks] == list(reversed(paths))
+        assert notebooks[1] is first
+        assert mapped == [paths[2], paths[0]]
+        assert cache.get(paths[0]) is notebooks[2]
+        assert cache.load_count == 3
+
+    def test_get_without_store(self, tmp_path: Path) -> None:
+        """Test store=False reuses cached notebooks but does not cache new ones."""
+        cached, other = tmp_path / "cached.ipynb", tmp_path / "other.ipynb"
+        cached.write_text(notebook_json("x = 1"))
+        other.write_text(notebook_json("y = 2"))
+        cache = NotebookCache()
+        first = cache.get(cached)
+
+        assert cache.get(cached, store=False) is first
+        assert cache.get(other, store=False) is not cache.get(other, store=False)
+        assert cache.load_count == 3
+        assert len(cache) == 1
+
+
+class TestProjectUsesNotebookCache:
+    def test_export_parses_each_file_once(self, pipeline_project: Path) -> None:
+        """Test a multi-rule export shares parses between the index and the rules."""
+        project = NbliteProject.from_path(pipeline_project)
+        result = project.export()
+
+        assert result.success
+        assert (pipeline_project / "mypackage" / "core.py").exists()
+        # Two notebooks plus the two percent files written by the first rule
+        assert project.notebook_cache.load_count == 4
+
+    def test_export_then_clean_with_load_outputs(self, pipeline_project: Path) -> None:
+        """Test clean reuses the notebooks export loaded when outputs were loaded."""
+        project = NbliteProject.from_path(pipeline_project)
+        project.notebook_cache.load_outputs = True
+
+        project.export()
+        project.clean()
+
+        assert project.notebook_cache.load_count == 4
+
+    def test_clean_invalidates_rewritten_notebooks(self, pipeline_project: Path) -> None:
+        """Test a notebook rewritten by clean is not served from the cache."""
+        project = NbliteProject.from_path(pipeline_project)
+        core = pipeline_project / "nbs" / "core.ipynb"
+
+        project.clean(remove_outputs=True)
+        assert core not in project.notebook_cache
+
+        nb = project.notebook_cache.get(core)
+        assert nb.cells[0].outputs == []
+
+    def test_code_locations_share_cache(self, pipeline_project: Path) -> None:
+        """Test get_notebooks goes through the project's notebook cache."""
+        project = NbliteProject.from_path(pipeline_project)
+
+        first = project.get_notebooks(code_location="nbs")
+        second = project.get_notebooks(code_location="nbs")
+
+        assert [a is b for a, b in zip(first, second, strict=True)] == [True, True]
+        assert project.notebook_cache.load_count == 2
+
+    def test_staging_validation_uses_cache(
+        self, pipeline_project: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the staged-notebook output check reads through the cache."""
+        from nblite.git import staging
+
+        core = pipeline_project / "nbs" / "core.ipynb"
+        monkeypatch.setattr(staging, "get_staged_files", lambda root: [Path("nbs/core.ipynb")])
+        project = NbliteProject.from_path(pipeline_project)
+        project.notebook_cache.get(core)
+
+        result = staging.validate_staging(project)
+
+        assert any("has outputs" in w for w in result.warnings)
+        assert project.notebook_cache.load_count == 1
@@ -3,6 +3,7 @@ Tests for the NbliteProject class (Milestone 7).
 """
 
 import json
+import os
 from pathlib import Path
 
 import pytest
@@ -129,6 +130,16 @@ class TestNbliteProject:
         nbs_notebooks = project.get_notebooks(code_location="nbs")
         assert len(nbs_notebooks) == 1
 
+    def test_iter_notebooks(self, sample_project: Path) -> None:
+        """Test iter_notebooks yields the same notebooks as get_notebooks."""
+        project = NbliteProject.from_path(sample_project)
+
+        streamed = list(project.iter_notebooks())
+        assert [nb.source_path for nb in streamed] == [
+            nb.source_path for nb in project.get_notebooks()
+        ]
+        assert list(project.iter_notebooks(code_location="lib")) == []
+
     def test_notebooks_property(self, sample_project: Path) -> None:
         """Test notebooks property."""
         project = NbliteProject.from_path(sample_project)
@@ -274,6 +285,155 @@ format = "ipynb"
         assert result.success
         assert (sample_project / "nbs_out" / "utils.ipynb").exists()
 
+    def test_reexport_leaves_unchanged_files_untouched(self, sample_project: Path) -> None:
+        """Test regenerating identical content does not rewrite the file."""
+        project = NbliteProject.from_path(sample_project)
+        first = project.export()
+        module = sample_project / "mypackage" / "utils.py"
+        assert module in first.files_created
+
+        past = module.stat().st_mtime_ns - 10**9
+        os.utime(module, ns=(past, past))
+
+        second = NbliteProject.from_path(sample_project).export()
+        assert second.files_created == []
+        assert second.files_updated == []
+        assert module in second.files_unchanged
+        assert module.stat().st_mtime_ns == past
+
+    def test_export_ipynb_to_ipynb_keeps_outputs(self, sample_project: Path) -> None:
+        """Test that outputs are still loaded when a rule writes an ipynb twin."""
+        nb_path = sample_project / "nbs" / "utils.ipynb"
+        data = json.loads(nb_path.read_text())
+        output = {"output_type": "stream", "name": "stdout", "text": ["hello"]}
+        data["cells"][0]["outputs"] = [output]
+        nb_path.write_text(json.dumps(data))
+
+        config_content = (sample_project / "nblite.toml").read_text()
+        config_content += """
+[cl.nbs_out]
+path = "nbs_out"
+format = "ipynb"
+"""
+        (sample_project / "nblite.toml").write_text(config_content)
+
+        project = NbliteProject.from_path(sample_project)
+        result = project.export(pipeline="nbs -> nbs_out")
+
+        assert result.success
+        twin = json.loads((sample_project / "nbs_out" / "utils.ipynb").read_text())
+        assert twin["cells"][0]["outputs"] == [output]
+
+
+class TestIncrementalExport:
+    def _write_nb(self, path: Path, *sources: str) -> None:
+        path.write_text(
+            json.dumps(
+                {
+                    "cells": [
+                        {"cell_type": "code", "source": src, "metadata": {}, "outputs": []}
+                        for src in sources
+                    ],
+                    "metadata": {},
+                    "nbformat": 4,
+                    "nbformat_minor": 5,
+                }
+            )
+        )
+
+    def test_unchanged_outputs_skipped(self, sample_project: Path) -> None:
+        """Test a second incremental run skips every output."""
+        project = NbliteProject.from_path(sample_project)
+        first = project.export(incremental=True)
+        assert first.success
+        assert first.files_skipped == []
+
+        project = NbliteProject.from_path(sample_project)
+        second = project.export(incremental=True)
+        assert second.success
+        assert second.files_created == []
+        assert sorted(second.files_skipped) == sorted(first.files_created)
+
+    def test_non_incremental_regenerates(self, sample_project: Path) -> None:
+        """Test the default mode still regenerates everything."""
+        NbliteProject.from_path(sample_project).export()
+        result = NbliteProject.from_path(sample_project).export()
+        assert result.files_skipped == []
+        assert len(result.files_unchanged) == 2
+
+    def test_changed_notebook_rebuilt(self, sample_project: Path) -> None:
+        """Test only outputs of a changed notebook are regenerated."""
+        self._write_nb(
+            sample_project / "nbs" / "other.ipynb", "#|default_exp other\n#|export\nx = 1"
+        )
+        NbliteProject.from_path(sample_project).export(incremental=True)
+
+        self._write_nb(
+            sample_project / "nbs" / "other.ipynb", "#|default_exp other\n#|export\nx = 2"
+        )
+        result = NbliteProject.from_path(sample_project).export(incremental=True)
+
+        assert sorted(result.files_updated) == [
+            sample_project / "mypackage" / "other.py",
+            sample_project / "pts" / "other.pct.py",
+        ]
+        assert sample_project / "mypackage" / "utils.py" in result.files_skipped
+        assert "x = 2" in (sample_project / "mypackage" / "other.py").read_text()
+
+    def test_aggregated_module_rebuilt_on_contributor_change(self, sample_project: Path) -> None:
+        """Test an export_to module is rebuilt when any contributor changes."""
+        other = sample_project / "nbs" / "other.ipynb"
+        self._write_nb(other, "#|export_to utils\ndef bar(): return 1")
+        NbliteProject.from_path(sample_project).export(incremental=True)
+        assert "def bar(): return 1" in (sample_project / "mypackage" / "utils.py").read_text()
+
+        self._write_nb(other, "#|export_to utils\ndef bar(): return 2")
+        result = NbliteProject.from_path(sample_project).export(incremental=True)
+
+        assert sample_project / "mypackage" / "utils.py" in result.files_updated
+        assert "def bar(): return 2" in (sample_project / "mypackage" / "utils.py").read_text()
+
+    def test_unchanged_content_reported(self, sample_project: Path) -> None:
+        """Test regenerated outputs with identical content are reported as unchanged."""
+        nb_path = sample_project / "nbs" / "utils.ipynb"
+        self._write_nb(nb_path, "#|default_exp utils\n#|export\ndef foo(): pass", "x = 1")
+        NbliteProject.from_path(sample_project).export(pipeline="nbs -> lib", incremental=True)
+
+        # Editing a non-exported cell changes the notebook but not the module
+        self._write_nb(nb_path, "#|default_exp utils\n#|export\ndef foo(): pass", "x = 2")
+        result = NbliteProject.from_path(sample_project).export(
+            pipeline="nbs -> lib", incremental=True
+        )
+        assert result.files_unchanged == [sample_project / "mypackage" / "utils.py"]
+        assert result.files_created == []
+        assert result.files_updated == []
+
+    def test_deleted_output_regenerated(self, sample_project: Path) -> None:
+        """Test outputs removed from disk are rebuilt."""
+        NbliteProject.from_path(sample_project).export(incremental=True)
+        module = sample_project / "mypackage" / "utils.py"
+        module.unlink()
+
+        result = NbliteProject.from_path(sample_project).export(incremental=True)
+        assert module in result.files_created
+        assert module.exists()
+
+    def test_orphan_reported_when_default_exp_moves(self, sample_project: Path) -> None:
+        """Test the old module is reported when #|default_exp changes."""
+        nb_path = sample_project / "nbs" / "utils.ipynb"
+        NbliteProject.from_path(sample_project).export(incremental=True)
+
+        self._write_nb(nb_path, "#|default_exp helpers\n#|export\ndef foo(): pass")
+        result = NbliteProject.from_path(sample_project).export(incremental=True)
+
+        old_module = sample_project / "mypackage" / "utils.py"
+        assert result.files_orphaned == [old_module]
+        assert any("Orphaned output" in w and "utils.py" in w for w in result.warnings)
+
+        old_module.unlink()
+        result = NbliteProject.from_path(sample_project).export(incremental=True)
+        assert result.files_orphaned == []
+
 
 class TestProjectClean:
     def test_clean_notebooks(self, sample_project: Path) -> None:
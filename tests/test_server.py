@@ -0,0 +1,366 @@
+"""
+Tests for the resident project server.
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from nblite.cli import _run_hook_via_server
+from nblite.cli.app import app
+from nblite.export.pipeline import ExportResult
+from nblite.server import (
+    ProjectServer,
+    ServerClient,
+    ServerError,
+    server_supported,
+    socket_path_for,
+)
+from nblite.server.protocol import export_result_from_dict, export_result_to_dict
+from tests.conftest import notebook_json
+
+pytestmark = pytest.mark.skipif(not server_supported(), reason="needs unix domain sockets")
+
+
+@pytest.fixture
+def server_project(tmp_path: Path) -> Path:
+    """Create an nbs -> lib project."""
+    (tmp_path / "nbs").mkdir()
+    (tmp_path / "nbs" / "core.ipynb").write_text(
+        notebook_json("#|default_exp core", "#|export\ndef foo():\n    return 1")
+    )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = "nbs -> lib"
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    """A socket path short enough for AF_UNIX (pytest's tmp_path can be too long)."""
+    directory = Path(tempfile.mkdtemp(prefix="nbl-"))
+    yield directory / "s.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_server(server_project: Path, socket_path: Path) -> Iterator[ProjectServer]:
+    """Serve server_project from a background thread."""
+    server = ProjectServer(server_project, idle_timeout=30, socket_path=socket_path)
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    ServerClient(server_project, autostart=False, socket_path=socket_path).shutdown()
+    thread.join(5)
+
+
+def _client(server: ProjectServer) -> ServerClient:
+    return ServerClient(server.root_path, autostart=False, socket_path=server.socket_path)
+
+
+class TestProtocol:
+    def test_export_result_round_trip(self) -> None:
+        """Test ExportResult survives serialization."""
+        result = ExportResult(
+            success=False,
+            files_created=[Path("/a.py")],
+            files_skipped=[Path("/b.py")],
+            errors=["boom"],
+            warnings=["careful"],
+        )
+        data = json.loads(json.dumps(export_result_to_dict(result)))
+        assert export_result_from_dict(data) == result
+
+    def test_socket_path_per_root(self, tmp_path: Path) -> None:
+        """Test each project root gets its own socket."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        assert socket_path_for(tmp_path / "a") == socket_path_for(tmp_path / "a" / ".." / "a")
+        assert socket_path_for(tmp_path / "a") != socket_path_for(tmp_path / "b")
+        assert len(str(socket_path_for(tmp_path / "a"))) < 100
+
+    def test_socket_dir_must_be_private(self, tmp_path: Path) -> None:
+        """Test socket directories that other users could control are refused."""
+        from nblite.server.protocol import ensure_socket_dir
+
+        ensure_socket_dir(tmp_path / "new" / "s.sock")
+        assert (tmp_path / "new").stat().st_mode & 0o777 == 0o700
+
+        (tmp_path / "shared").mkdir()
+        (tmp_path / "shared").chmod(0o777)
+        with pytest.raises(ServerError, match="mode 777"):
+            ensure_socket_dir(tmp_path / "shared" / "s.sock")
+
+        (tmp_path / "link").symlink_to(tmp_path / "new")
+        with pytest.raises(ServerError, match="not a directory"):
+            ensure_socket_dir(tmp_path / "link" / "s.sock")
+
+    def test_server_log_not_followed(
+        self, server_project: Path, socket_path: Path, tmp_path: Path
+    ) -> None:
+        """Test the server log is not opened through a symlink."""
+        from nblite.server import start_server
+
+        target = tmp_path / "target"
+        socket_path.with_suffix(".log").symlink_to(target)
+        with pytest.raises(OSError):
+            start_server(server_project, socket_path=socket_path)
+        assert not target.exists()
+
+
+class TestProjectServer:
+    def test_ping(self, running_server: ProjectServer) -> None:
+        """Test ping reports the server status."""
+        status = _client(running_server).ping()
+        assert status is not None
+        assert status["root"] == str(running_server.root_path)
+        assert status["idle_timeout"] == 30
+
+    def test_export(self, running_server: ProjectServer) -> None:
+        """Test exporting through the server."""
+        result, pipeline = _client(running_server).export()
+
+        assert result is not None
+        assert result.success
+        assert result.files_created == [running_server.root_path / "mypkg" / "core.py"]
+        assert pipeline is None
+        assert "return 1" in (running_server.root_path / "mypkg" / "core.py").read_text()
+
+    def test_project_stays_loaded_and_sees_edits(self, running_server: ProjectServer) -> None:
+        """Test the project is reused across requests and edits are picked up."""
+        client = _client(running_server)
+        client.export()
+        project = running_server._project
+
+        nb = running_server.root_path / "nbs" / "core.ipynb"
+        nb.write_text(notebook_json("#|default_exp core", "#|export\ndef foo():\n    return 2"))
+        result, _ = client.export(incremental=True)
+
+        assert running_server._project is project
+        assert result is not None
+        assert result.files_updated == [running_server.root_path / "mypkg" / "core.py"]
+
+    def test_config_change_reloads_project(self, running_server: ProjectServer) -> None:
+        """Test editing nblite.toml reloads the project."""
+        client = _client(running_server)
+        client.export()
+        project = running_server._project
+
+        config = running_server.root_path / "nblite.toml"
+        config.write_text(config.read_text().replace('"mypkg"', '"otherpkg"'))
+        result, _ = client.export()
+
+        assert running_server._project is not project
+        assert result is not None
+        assert result.files_created == [running_server.root_path / "otherpkg" / "core.py"]
+
+    def test_reverse_without_reversible_rules(self, running_server: ProjectServer) -> None:
+        """Test reverse export reports that nothing is reversible."""
+        assert _client(running_server).export(reverse=True) == (None, None)
+
+    def test_hook(self, running_server: ProjectServer) -> None:
+        """Test the pre-commit hook runs on the server."""
+        assert _client(running_server).run_hook("pre-commit", full=True) == []
+        assert (running_server.root_path / "mypkg" / "core.py").exists()
+
+    def test_hook_uses_client_git_env(
+        self, running_server: ProjectServer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the hook diffs against the index named by the client's GIT_* variables."""
+        from nblite.server import client
+
+        root = running_server.root_path
+        (root / "nbs" / "other.ipynb").write_text(
+            notebook_json("#|default_exp other", "#|export\ndef bar():\n    return 2")
+        )
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(["git", "add", "nbs/core.ipynb"], cwd=root, check=True)
+        index = root / ".git" / "commit-index"
+        env = {**os.environ, "GIT_INDEX_FILE": str(index)}
+        subprocess.run(["git", "add", "nbs/other.ipynb"], cwd=root, check=True, env=env)
+        monkeypatch.setattr(client, "_git_environment", lambda: {"GIT_INDEX_FILE": str(index)})
+
+        assert _client(running_server).run_hook("pre-commit") == []
+        assert (root / "mypkg" / "other.py").exists()
+        assert not (root / "mypkg" / "core.py").exists()
+
+    def test_request_error(self, running_server: ProjectServer) -> None:
+        """Test failing requests raise ServerError and keep the server up."""
+        client = _client(running_server)
+        with pytest.raises(ServerError, match="Unknown op"):
+            client.request("nope")
+        assert client.ping() is not None
+
+    def test_version_mismatch_stops_server(
+        self, running_server: ProjectServer, socket_path: Path
+    ) -> None:
+        """Test a server from another nblite version exits on request."""
+        response = running_server.handle({"op": "ping", "version": "0.0.0-other"})
+        assert response["stale"]
+        # Wake the accept loop so that it notices
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        deadline = time.monotonic() + 5
+        while socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not socket_path.exists()
+
+    def test_idle_timeout(self, server_project: Path, socket_path: Path) -> None:
+        """Test the server exits and removes its socket when idle."""
+        server = ProjectServer(server_project, idle_timeout=0.1, socket_path=socket_path)
+        server.serve_forever()
+        assert not socket_path.exists()
+
+    def test_refuses_second_server(self, running_server: ProjectServer, socket_path: Path) -> None:
+        """Test binding fails while another server is alive."""
+        other = ProjectServer(running_server.root_path, socket_path=socket_path)
+        with pytest.raises(ServerError, match="already running"):
+            other.bind()
+
+    def test_replaces_stale_socket(self, server_project: Path, socket_path: Path) -> None:
+        """Test a socket left behind by a dead server is replaced."""
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(str(socket_path))
+        dead.close()
+
+        server = ProjectServer(server_project, socket_path=socket_path)
+        server.bind()
+        server.close()
+
+
+class TestServerClient:
+    def test_no_server_without_autostart(self, server_project: Path, socket_path: Path) -> None:
+        """Test requests fail when no server runs and autostart is off."""
+        client = ServerClient(server_project, autostart=False, socket_path=socket_path)
+        assert client.ping() is None
+        assert not client.shutdown()
+        with pytest.raises(ServerError, match="No server running"):
+            client.export()
+
+    def test_autostart(self, server_project: Path, socket_path: Path) -> None:
+        """Test a detached server is started on demand and can be stopped."""
+        client = ServerClient(server_project, idle_timeout=30, socket_path=socket_path)
+        try:
+            result, _ = client.export()
+            assert result is not None
+            assert result.success
+            status = client.ping()
+            assert status is not None
+            assert status["requests"] == 2
+        finally:
+            assert client.shutdown()
+
+        deadline = time.monotonic() + 5
+        while socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not socket_path.exists()
+
+    def test_git_environment(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test GIT_* variables are collected with their paths made absolute."""
+        from nblite.server.client import _git_environment
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("GIT_INDEX_FILE", ".git/index.lock")
+        monkeypatch.setenv("GIT_PREFIX", "nbs/")
+        env = _git_environment()
+        assert env["GIT_INDEX_FILE"] == str(tmp_path / ".git" / "index.lock")
+        assert env["GIT_PREFIX"] == "nbs/"
+
+    def test_started_server_drops_git_env(
+        self, server_project: Path, socket_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a server started from a git hook does not inherit its GIT_* variables."""
+        from nblite.server import client
+
+        envs: list[dict[str, str]] = []
+
+        def popen(*args, env, **kwargs):  # type: ignore[no-untyped-def]
+            envs.append(env)
+            raise OSError("not started")
+
+        monkeypatch.setenv("GIT_INDEX_FILE", "/repo/.git/index.lock")
+        monkeypatch.setattr(client.subprocess, "Popen", popen)
+        with pytest.raises(OSError):
+            client.start_server(server_project, socket_path=socket_path)
+        assert not any(key.startswith("GIT_") for key in envs[0])
+
+
+class TestCli:
+    def test_export_via_server(self, server_project: Path, monkeypatch) -> None:
+        """Test nbl --via-server export and nbl server stop."""
+        monkeypatch.chdir(server_project)
+        runner = CliRunner()
+        try:
+            result = runner.invoke(app, ["--via-server", "export"])
+            assert result.exit_code == 0, result.output
+            assert "Export completed successfully" in result.output
+            assert (server_project / "mypkg" / "core.py").exists()
+
+            result = runner.invoke(app, ["server", "status"])
+            assert "Server running" in result.output
+        finally:
+            result = runner.invoke(app, ["server", "stop"])
+        assert "Server stopped" in result.output
+
+    def test_server_status_when_stopped(self, server_project: Path, monkeypatch) -> None:
+        """Test nbl server status without a server."""
+        monkeypatch.chdir(server_project)
+        result = CliRunner().invoke(app, ["server", "status"])
+        assert result.exit_code == 0
+        assert "No server running" in result.output
+
+    def test_overrides_run_locally(self, server_project: Path, monkeypatch) -> None:
+        """Test --via-server falls back to a local export with config overrides."""
+        monkeypatch.chdir(server_project)
+        result = CliRunner().invoke(
+            app,
+            ["--via-server", "--override-config", '{"export_pipeline": "nbs -> lib"}', "export"],
+        )
+        assert result.exit_code == 0, result.output
+        assert "running without the server" in result.output
+        assert not socket_path_for(server_project).exists()
+
+
+class TestHookFastPath:
+    def test_ignores_other_commands(self, monkeypatch) -> None:
+        """Test only hook invocations routed through the server are handled."""
+        monkeypatch.delenv("NBLITE_VIA_SERVER", raising=False)
+        assert _run_hook_via_server(["hook", "pre-commit"]) is None
+        assert _run_hook_via_server(["--via-server", "export"]) is None
+        assert _run_hook_via_server(["--via-server", "hook", "pre-commit", "-v"]) is None
+
+    def test_outside_project(self, tmp_path: Path, monkeypatch) -> None:
+        """Test the hook silently succeeds outside a project."""
+        monkeypatch.chdir(tmp_path)
+        assert _run_hook_via_server(["--via-server", "hook", "pre-commit"]) == 0
+
+    def test_runs_hook_on_server(self, server_project: Path, monkeypatch) -> None:
+        """Test the hook is forwarded to a server started on demand."""
+        monkeypatch.chdir(server_project)
+        monkeypatch.setenv("NBLITE_VIA_SERVER", "1")
+        try:
+            assert _run_hook_via_server(["hook", "pre-commit", "--full"]) == 0
+            assert (server_project / "mypkg" / "core.py").exists()
+        finally:
+            ServerClient(server_project, autostart=False).shutdown()
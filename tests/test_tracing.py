@@ -0,0 +1,323 @@
+"""
+Tests for timing spans and the profiler.
+"""
+
+import asyncio
+import json
+import os
+import pstats
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from nblite.cli.app import app
+from nblite.core.project import NbliteProject
+from nblite.utils.tracing import (
+    JsonLinesSink,
+    Profiler,
+    TraceListener,
+    add_listener,
+    count,
+    propagate,
+    remove_listener,
+    span,
+    traced,
+)
+from tests.conftest import notebook_json
+
+
+@pytest.fixture
+def project_dir(tmp_path: Path) -> Path:
+    """Create an nbs -> lib project with two notebooks."""
+    (tmp_path / "nbs").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "nbs" / f"{name}.ipynb").write_text(
+            notebook_json(f"#|default_exp {name}", "#|export\ndef foo():\n    return 1")
+        )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = "nbs -> lib"
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+def _paths(profiler: Profiler) -> list[tuple[str, ...]]:
+    return [record.path for record in profiler.spans]
+
+
+class TestSpans:
+    def test_not_recorded_without_profiler(self) -> None:
+        """Test spans outside a profiler are no-ops."""
+        with span("outside"):
+            pass
+        with Profiler() as profiler:
+            pass
+        assert profiler.spans == []
+
+    def test_nesting(self) -> None:
+        """Test spans record the names of enclosing spans."""
+        with Profiler() as profiler:
+            with span("outer", kind="test"):
+                with span("inner"):
+                    pass
+                with span("inner"):
+                    pass
+
+        assert _paths(profiler) == [("outer", "inner"), ("outer", "inner"), ("outer",)]
+        assert profiler.spans[-1].attrs == {"kind": "test"}
+        assert profiler.spans[-1].duration >= profiler.spans[0].duration
+
+    def test_exception_closes_span(self) -> None:
+        """Test a span is recorded and left when its body raises."""
+        with Profiler() as profiler:
+            with pytest.raises(ValueError), span("failing"):
+                raise ValueError("boom")
+            with span("after"):
+                pass
+        assert _paths(profiler) == [("failing",), ("after",)]
+
+    def test_traced(self) -> None:
+        """Test traced wraps functions and coroutines in a span."""
+
+        @traced("sync")
+        def work() -> int:
+            return 1
+
+        @traced("async")
+        async def async_work() -> int:
+            with span("inside"):
+                await asyncio.sleep(0)
+            return 2
+
+        with Profiler() as profiler:
+            assert work() == 1
+            assert asyncio.run(async_work()) == 2
+        assert _paths(profiler) == [("sync",), ("async", "inside"), ("async",)]
+
+    def test_propagate_to_threads(self) -> None:
+        """Test worker threads continue the caller's span when propagated."""
+
+        def work(_: int) -> None:
+            with span("work"):
+                pass
+
+        with Profiler() as profiler, span("parent"):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(propagate(work), range(2)))
+                list(executor.map(work, range(1)))
+
+        assert sorted(_paths(profiler)) == [
+            ("parent",),
+            ("parent", "work"),
+            ("parent", "work"),
+            ("work",),
+        ]
+
+
+class TestListeners:
+    def test_listener_events(self) -> None:
+        """Test listeners receive span starts, span ends and metrics in order."""
+        events = []
+
+        class Recorder(TraceListener):
+            def span_started(self, name, path, attrs):  # type: ignore[no-untyped-def]
+                events.append(("start", path))
+
+            def span_finished(self, record):  # type: ignore[no-untyped-def]
+                events.append(("end", record.path))
+
+            def metric(self, record):  # type: ignore[no-untyped-def]
+                events.append(("metric", record.name, record.value, record.path))
+
+        listener = Recorder()
+        add_listener(listener)
+        add_listener(listener)
+        try:
+            with span("stage"):
+                count("items", 2)
+        finally:
+            remove_listener(listener)
+        count("items")
+
+        assert events == [
+            ("start", ("stage",)),
+            ("metric", "items", 2, ("stage",)),
+            ("end", ("stage",)),
+        ]
+
+    def test_json_lines_sink(self, tmp_path: Path) -> None:
+        """Test the sink appends one JSON object per span and metric."""
+        sink = JsonLinesSink(tmp_path / "out" / "trace.jsonl")
+        add_listener(sink)
+        try:
+            with span("stage", file=tmp_path):
+                count("bytes.read", 10)
+        finally:
+            remove_listener(sink)
+            sink.close()
+
+        events = [json.loads(line) for line in sink.path.read_text().splitlines()]
+        assert [event["type"] for event in events] == ["metric", "span"]
+        assert events[0]["value"] == 10
+        assert events[0]["path"] == ["stage"]
+        assert events[1]["name"] == "stage"
+        assert events[1]["attrs"] == {"file": str(tmp_path)}
+        assert events[1]["pid"] == os.getpid()
+        assert abs(events[1]["start"] - time.time()) < 60
+
+    def test_env_var_sink(self, project_dir: Path) -> None:
+        """Test NBLITE_TRACE_FILE traces a whole process."""
+        trace_path = project_dir / "trace.jsonl"
+        subprocess.run(
+            [sys.executable, "-c", "from nblite.cli import main; main()", "export"],
+            cwd=project_dir,
+            env={**os.environ, "NBLITE_TRACE_FILE": str(trace_path)},
+            check=True,
+            capture_output=True,
+        )
+
+        events = [json.loads(line) for line in trace_path.read_text().splitlines()]
+        names = {event["name"] for event in events}
+        assert {"project.load", "export", "export.write", "files.written"} <= names
+
+
+class TestProfiler:
+    def test_stages(self) -> None:
+        """Test spans are aggregated by path in tree order."""
+        with Profiler() as profiler:
+            with span("short"):
+                pass
+            with span("long"):
+                for _ in range(3):
+                    with span("child"):
+                        pass
+
+        stages = profiler.stages()
+        assert [stage.path for stage in stages][0] == ("long",)
+        assert [stage.path for stage in stages][1] == ("long", "child")
+        long, child = stages[0], stages[1]
+        assert child.calls == 3
+        assert child.depth == 1
+        assert long.self_time == pytest.approx(long.total - child.total)
+        assert 0 < profiler.wall_time
+
+    def test_counters(self) -> None:
+        """Test counts are summed by metric name."""
+        with Profiler() as profiler:
+            count("files.read")
+            with span("stage"):
+                count("files.read", 2)
+                count("bytes.read", 100)
+        assert profiler.counters == {"files.read": 3, "bytes.read": 100}
+
+    def test_missing_parent(self) -> None:
+        """Test spans whose parent was not recorded still appear under it."""
+        with Profiler(), span("parent"), Profiler() as profiler, span("child"):
+            pass
+        assert [stage.path for stage in profiler.stages()] == [("parent",), ("parent", "child")]
+
+    def test_chrome_trace(self, tmp_path: Path) -> None:
+        """Test the Chrome trace has one complete event per span."""
+        with Profiler() as profiler, span("stage", path=tmp_path):
+            pass
+
+        trace_path = tmp_path / "trace.json"
+        profiler.write_chrome_trace(trace_path)
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert len(events) == 1
+        assert events[0]["name"] == "stage"
+        assert events[0]["ph"] == "X"
+        assert events[0]["ts"] >= 0
+        assert events[0]["args"] == {"path": str(tmp_path)}
+
+    def test_export_stages(self, project_dir: Path) -> None:
+        """Test export reports its stages."""
+        with Profiler() as profiler:
+            NbliteProject.from_path(project_dir).export()
+
+        paths = {stage.path for stage in profiler.stages()}
+        assert ("project.load",) in paths
+        assert ("export", "export.plan", "scan") in paths
+        assert ("export", "export.plan", "notebook.parse") in paths
+        assert ("export", "export.load") in paths
+        assert ("export", "export.write", "file.write") in paths
+
+    def test_parallel_export_stages(self, project_dir: Path) -> None:
+        """Test outputs written on worker threads are nested under export."""
+        project = NbliteProject.from_path(project_dir)
+        with Profiler() as profiler:
+            project.export(n_workers=2)
+
+        writes = [r for r in profiler.spans if r.name == "export.write"]
+        assert len(writes) == 2
+        assert all(r.path == ("export", "export.write") for r in writes)
+
+    def test_fill_stages(self, tmp_path: Path) -> None:
+        """Test fill reports kernel start, execution, cleaning and hashing."""
+        from nblite.fill import fill_notebooks
+
+        path = tmp_path / "nb.ipynb"
+        path.write_text(notebook_json("x = 1"))
+        with Profiler() as profiler:
+            fill_notebooks([path], skip_unchanged=False)
+
+        paths = {stage.path for stage in profiler.stages()}
+        notebook = ("fill", "fill.notebook")
+        assert notebook in paths
+        for stage in ("fill.load", "fill.kernel", "fill.execute", "fill.save"):
+            assert (*notebook, stage) in paths
+        assert (*notebook, "fill.save", "fill.clean") in paths
+        assert (*notebook, "fill.save", "fill.hash") in paths
+
+
+class TestProfileOption:
+    def test_profile_table(self, project_dir: Path, monkeypatch) -> None:
+        """Test --profile prints the stage table."""
+        monkeypatch.chdir(project_dir)
+        result = CliRunner().invoke(app, ["--profile", "export"])
+        assert result.exit_code == 0, result.output
+        assert "Export completed successfully" in result.output
+        assert "Profile (" in result.output
+        assert "export.write" in result.output
+        assert "files.written" in result.output
+
+    def test_trace_and_pstats(self, project_dir: Path, monkeypatch) -> None:
+        """Test --profile-trace and --profile-pstats write their files."""
+        monkeypatch.chdir(project_dir)
+        trace_path = project_dir / "trace.json"
+        pstats_path = project_dir / "profile.pstats"
+        result = CliRunner().invoke(
+            app,
+            [
+                "--profile-trace",
+                str(trace_path),
+                "--profile-pstats",
+                str(pstats_path),
+                "clean",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        names = {event["name"] for event in json.loads(trace_path.read_text())["traceEvents"]}
+        assert {"project.load", "clean", "clean.notebook"} <= names
+        assert pstats.Stats(str(pstats_path)).total_calls > 0
+
+    def test_no_profile_by_default(self, project_dir: Path, monkeypatch) -> None:
+        """Test commands print no profile unless asked to."""
+        monkeypatch.chdir(project_dir)
+        result = CliRunner().invoke(app, ["export"])
+        assert result.exit_code == 0, result.output
+        assert "Profile (" not in result.output
@@ -0,0 +1,249 @@
+"""
+Tests for watch mode (file watchers and the watch session).
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from nblite.core.project import NbliteProject
+from nblite.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    create_watcher,
+    inotify_available,
+)
+from tests.conftest import notebook_json
+
+needs_inotify = pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+
+
+@pytest.fixture
+def watch_project(tmp_path: Path) -> Path:
+    """Create an nbs -> pts -> lib project with two notebooks."""
+    (tmp_path / "nbs").mkdir()
+    (tmp_path / "nbs" / "core.ipynb").write_text(
+        notebook_json("#|default_exp core", "#|export\ndef foo():\n    return 1")
+    )
+    (tmp_path / "nbs" / "utils.ipynb").write_text(
+        notebook_json("#|default_exp utils", "#|export\ndef bar():\n    return 2")
+    )
+    (tmp_path / "nblite.toml").write_text(
+        """
+export_pipeline = '''
+nbs -> pts
+pts -> lib
+'''
+
+[cl.nbs]
+path = "nbs"
+format = "ipynb"
+
+[cl.pts]
+path = "pts"
+format = "percent"
+
+[cl.lib]
+path = "mypkg"
+format = "module"
+"""
+    )
+    return tmp_path
+
+
+def _watcher_classes() -> list[type]:
+    classes: list[type] = [PollingWatcher]
+    if inotify_available():
+        classes.append(InotifyWatcher)
+    return classes
+
+
+def _make_watcher(cls: type, dirs: list[Path], files: list[Path] = ()):  # type: ignore[assignment]
+    if cls is PollingWatcher:
+        return PollingWatcher(dirs, files, interval=0.01)
+    return cls(dirs, files)
+
+
+@pytest.mark.parametrize("watcher_cls", _watcher_classes())
+class TestWatchers:
+    def test_detects_modification(self, tmp_path: Path, watcher_cls: type) -> None:
+        """Test rewriting a file is reported."""
+        path = tmp_path / "a.ipynb"
+        path.write_text("1")
+        with _make_watcher(watcher_cls, [tmp_path]) as watcher:
+            time.sleep(0.01)
+            path.write_text("22")
+            assert path in watcher.wait(2)
+
+    def test_detects_new_file_in_new_directory(self, tmp_path: Path, watcher_cls: type) -> None:
+        """Test files in subdirectories created after the watch started are seen."""
+        with _make_watcher(watcher_cls, [tmp_path]) as watcher:
+            (tmp_path / "sub").mkdir()
+            new = tmp_path / "sub" / "b.ipynb"
+            new.write_text("x")
+            seen: set[Path] = set()
+            deadline = time.monotonic() + 2
+            while new not in seen and time.monotonic() < deadline:
+                seen |= watcher.wait(0.2)
+            assert new in seen
+
+    def test_detects_deletion_and_rename(self, tmp_path: Path, watcher_cls: type) -> None:
+        """Test deleted and renamed files are reported."""
+        old = tmp_path / "old.ipynb"
+        gone = tmp_path / "gone.ipynb"
+        old.write_text("1")
+        gone.write_text("1")
+        with _make_watcher(watcher_cls, [tmp_path]) as watcher:
+            old.rename(tmp_path / "new.ipynb")
+            gone.unlink()
+            seen: set[Path] = set()
+            deadline = time.monotonic() + 2
+            while len(seen) < 3 and time.monotonic() < deadline:
+                seen |= watcher.wait(0.2)
+            assert {old, tmp_path / "new.ipynb", gone} <= seen
+
+    def test_individual_file(self, tmp_path: Path, watcher_cls: type) -> None:
+        """Test a single watched file is reported and its siblings are not."""
+        (tmp_path / "d").mkdir()
+        config = tmp_path / "nblite.toml"
+        config.write_text("a")
+        with _make_watcher(watcher_cls, [tmp_path / "d"], [config]) as watcher:
+            (tmp_path / "other.txt").write_text("x")
+            config.write_text("bb")
+            seen: set[Path] = set()
+            deadline = time.monotonic() + 2
+            while config not in seen and time.monotonic() < deadline:
+                seen |= watcher.wait(0.2)
+            assert config in seen
+            assert tmp_path / "other.txt" not in seen
+
+    def test_timeout_without_changes(self, tmp_path: Path, watcher_cls: type) -> None:
+        """Test wait returns an empty set when nothing changes."""
+        with _make_watcher(watcher_cls, [tmp_path]) as watcher:
+            assert watcher.wait(0.05) == set()
+
+
+class TestCreateWatcher:
+    def test_force_polling(self, tmp_path: Path) -> None:
+        """Test polling can be forced."""
+        assert isinstance(create_watcher([tmp_path], force_polling=True), PollingWatcher)
+
+    @needs_inotify
+    def test_prefers_inotify(self, tmp_path: Path) -> None:
+        """Test inotify is used when available."""
+        watcher = create_watcher([tmp_path])
+        try:
+            assert isinstance(watcher, InotifyWatcher)
+        finally:
+            watcher.close()
+
+
+@pytest.mark.parametrize("force_polling", [True, False])
+class TestWatchSession:
+    def _session(self, root: Path, force_polling: bool) -> WatchSession:
+        session = WatchSession(
+            lambda: NbliteProject.from_path(root),
+            debounce=0.05,
+            force_polling=force_polling,
+            poll_interval=0.01,
+        )
+        session.export()
+        return session
+
+    def test_edit_re_exports_twin_and_module(
+        self, watch_project: Path, force_polling: bool
+    ) -> None:
+        """Test saving a notebook rewrites only its twin and module."""
+        with self._session(watch_project, force_polling) as session:
+            nb = watch_project / "nbs" / "core.ipynb"
+            nb.write_text(
+                notebook_json("#|default_exp core", "#|export\ndef foo():\n    return 42")
+            )
+
+            report = session.run_once(timeout=5)
+
+        assert report is not None
+        assert report.error is None
+        assert report.changed == [nb]
+        assert sorted(p.relative_to(watch_project) for p in report.written) == [
+            Path("mypkg/core.py"),
+            Path("pts/core.pct.py"),
+        ]
+        assert "return 42" in (watch_project / "mypkg" / "core.py").read_text()
+        assert report.latency >= report.export_time > 0
+
+    def test_own_writes_are_ignored(self, watch_project: Path, force_polling: bool) -> None:
+        """Test files written by the export do not trigger another export."""
+        with self._session(watch_project, force_polling) as session:
+            nb = watch_project / "nbs" / "utils.ipynb"
+            nb.write_text(notebook_json("#|default_exp utils", "#|export\nX = 3"))
+            assert session.run_once(timeout=5) is not None
+            assert session.run_once(timeout=0.3) is None
+
+    def test_burst_is_debounced(self, watch_project: Path, force_polling: bool) -> None:
+        """Test several quick saves produce one export."""
+        with self._session(watch_project, force_polling) as session:
+            for i in range(3):
+                for name in ("core", "utils"):
+                    (watch_project / "nbs" / f"{name}.ipynb").write_text(
+                        notebook_json(f"#|default_exp {name}", f"#|export\nV = {i}")
+                    )
+                time.sleep(0.01)
+
+            report = session.run_once(timeout=5)
+
+        assert report is not None
+        assert len(report.changed) == 2
+        assert "V = 2" in (watch_project / "mypkg" / "utils.py").read_text()
+
+    def test_config_change_reloads_project(self, watch_project: Path, force_polling: bool) -> None:
+        """Test editing nblite.toml reloads the project before exporting."""
+        with self._session(watch_project, force_polling) as session:
+            old_project = session.project
+            config = watch_project / "nblite.toml"
+            config.write_text(
+                config.read_text() + "\n[export]\ninclude_autogenerated_warning = false\n"
+            )
+
+            report = session.run_once(timeout=5)
+
+        assert report is not None
+        assert report.reloaded
+        assert session.project is not old_project
+        assert "AUTOGENERATED" not in (watch_project / "mypkg" / "core.py").read_text()
+
+    def test_export_error_is_reported(self, watch_project: Path, force_polling: bool) -> None:
+        """Test an export that raises is reported and watching continues."""
+        with self._session(watch_project, force_polling) as session:
+            (watch_project / "nbs" / "utils.ipynb").write_text(
+                notebook_json("#|default_exp core", "#|export\nY = 1")
+            )
+            report = session.run_once(timeout=5)
+
+        assert report is not None
+        assert isinstance(report.error, ValueError)
+        assert report.result is None
+
+    def test_run_until_stopped(self, watch_project: Path, force_polling: bool) -> None:
+        """Test run() reports exports until the stop event is set."""
+        reports = []
+        stop = threading.Event()
+        with self._session(watch_project, force_polling) as session:
+            thread = threading.Thread(target=session.run, args=(reports.append, stop))
+            thread.start()
+            try:
+                (watch_project / "nbs" / "core.ipynb").write_text(
+                    notebook_json("#|default_exp core", "#|export\nZ = 1")
+                )
+                deadline = time.monotonic() + 5
+                while not reports and time.monotonic() < deadline:
+                    time.sleep(0.02)
+            finally:
+                stop.set()
+                thread.join(5)
+
+        assert not thread.is_alive()
+        assert len(reports) == 1